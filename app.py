@@ -6,6 +6,8 @@ AutoMoti - Automatische Motivationsschreiben-Generierung
 import sys
 import os
 import logging
+import argparse
+from datetime import datetime
 from urllib.parse import urlparse
 from rich.console import Console
 from rich.panel import Panel
@@ -17,11 +19,18 @@ from rich.syntax import Syntax
 from rich.rule import Rule
 from config.config import Config
 from src.job_extractor import JobExtractor
-from src.ai_generator import AIGenerator
+from src.ai_generator import AIGenerator, letter_paragraphs, revisable_paragraphs
 from src.pdf_generator import PDFGenerator
 from src.template_pdf_generator import TemplateBasedPDFGenerator
 from src.docx_generator import DocxGenerator
+from src.letter_layout import build_layout
+from src.output_sink import FileSink
+from src.models import JobInfo, MotivationLetter
+from src.duplicate_detector import DuplicateIndex
+from src.prefetch import JobPrefetcher
 from src.llm_utils import LLMFactory
+from src.llm_metrics import metrics_store
+from src.profiler import profiler
 
 # Rich Console initialisieren
 console = Console()
@@ -68,8 +77,13 @@ def print_llm_info():
         padding=(1, 2)
     ))
 
-def get_user_input():
-    """Holt Benutzereingaben mit Rich Interface"""
+def get_user_input(on_url=None):
+    """
+    Holt Benutzereingaben mit Rich Interface
+    
+    Args:
+        on_url: Wird mit der URL aufgerufen, sobald sie gültig ist (z.B. zum Vorladen)
+    """
     console.print(Panel(
         "📋  Bitte geben Sie die folgenden Informationen ein:",
         title="[bold green]Eingabe erforderlich[/bold green]",
@@ -83,6 +97,8 @@ def get_user_input():
             # Einfache URL-Validierung
             parsed = urlparse(job_url)
             if parsed.scheme and parsed.netloc:
+                if on_url:
+                    on_url(job_url)
                 break
             else:
                 console.print("❌ [red]Ungültige URL. Bitte versuchen Sie es erneut.[/red]")
@@ -157,8 +173,7 @@ def show_model_selection():
     
     all_models = []
     for provider, models in available_models.items():
-        if (provider == 'openrouter' and Config.OPENROUTER_API_KEY) or \
-           (provider == 'openai' and Config.OPENAI_API_KEY):
+        if LLMFactory.is_provider_available(provider):
             for model in models:
                 all_models.append((provider, model))
                 status = "✅ Verfügbar" if model == config['model'] else "⚪ Verfügbar"
@@ -190,62 +205,291 @@ def show_model_selection():
     
     return None, None
 
+def parse_args():
+    """Liest die Kommandozeilen-Argumente"""
+    parser = argparse.ArgumentParser(description="AutomaticMotivation - Motivationsschreiben generieren")
+    parser.add_argument('--profile', action='store_true',
+                        help="Laufzeit pro Stufe messen, Wasserfall anzeigen und Trace exportieren")
+    parser.add_argument('--profile-output', default=None,
+                        help="Pfad für den Chrome-Trace (Standard: output/profile_<Zeitstempel>.json)")
+    parser.add_argument('--no-prefetch', action='store_true',
+                        help="Stellenanzeige erst nach allen Eingaben laden (Standard: PREFETCH_JOB_PAGE)")
+    parser.add_argument('--draft-model', default=Config.DRAFT_MODEL,
+                        help="Schnelles Modell für einen sofortigen Entwurf (Standard: DRAFT_MODEL, leer = aus)")
+    return parser.parse_args()
+
+def print_profile(profile_output: str = None):
+    """Zeigt den Wasserfall und exportiert den Chrome-Trace"""
+    if not profiler.enabled:
+        return
+    profiler.print_waterfall(console)
+    trace_path = profile_output or os.path.join(
+        "output", f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    profiler.export_chrome_trace(trace_path)
+    console.print(f"🧭  Trace gespeichert: [bold blue]{trace_path}[/bold blue] (chrome://tracing oder ui.perfetto.dev)")
+
+def ask_duplicate_action(duplicate):
+    """Zeigt eine bereits verarbeitete, nahezu identische Stelle und fragt nach dem weiteren Vorgehen"""
+    job_info = duplicate.job_info or {}
+    
+    duplicate_table = Table(show_header=False)
+    duplicate_table.add_column("Detail", style="cyan")
+    duplicate_table.add_column("Wert", style="white")
+    duplicate_table.add_row("🔗  URL", duplicate.url)
+    duplicate_table.add_row("📐  Ähnlichkeit", f"{duplicate.similarity:.0%}")
+    duplicate_table.add_row("🏢  Unternehmen", job_info.get('company', '-'))
+    duplicate_table.add_row("💼  Position", job_info.get('position', '-'))
+    for label, path in duplicate.outputs.items():
+        duplicate_table.add_row(f"📄  {label.upper()}-Datei", path)
+    
+    console.print(Panel(
+        duplicate_table,
+        title="[bold yellow]♻️  Stelle bereits verarbeitet[/bold yellow]",
+        border_style="yellow",
+        padding=(1, 2)
+    ))
+    
+    choices = {'n': 'new', 's': 'skip'}
+    prompt = "[n] Neu verarbeiten, [s] Überspringen"
+    if duplicate.job_info and duplicate.letter:
+        choices['w'] = 'reuse'
+        prompt = "[w] Wiederverwenden (ohne LLM), " + prompt
+    
+    choice = Prompt.ask(prompt, choices=list(choices), default='w' if 'w' in choices else 'n')
+    return choices[choice]
+
+def render_documents(motivation_letter, replace_paths=None, output_dir="output"):
+    """
+    Erstellt PDF (Template-basiert) und DOCX und gibt die Pfade samt Template-Info zurück
+    
+    Args:
+        motivation_letter: Zu rendernder Brief
+        replace_paths: (PDF, DOCX) eines Entwurfs, die durch die neuen Dateien ersetzt werden
+        output_dir: Ausgabeverzeichnis
+    """
+    # Template-basierte PDF-Erstellung verwenden
+    pdf_generator = TemplateBasedPDFGenerator("templates/template.pdf")
+    
+    # Template-Info anzeigen
+    template_info = pdf_generator.get_template_info()
+    
+    # Brieftext einmal aufbereiten (Absätze, Links) - für PDF und DOCX gemeinsam
+    layout = build_layout(motivation_letter)
+    
+    with profiler.span('render_pdf', 'render'):
+        pdf_path = pdf_generator.create_pdf(motivation_letter, output_dir, layout=layout)
+    
+    # DOCX-Generierung hinzufügen
+    docx_generator = DocxGenerator()
+    docx_path = docx_generator.create_docx(motivation_letter, FileSink(output_dir), layout=layout)
+    
+    if replace_paths:
+        # Der Sink vergibt bei bestehenden Dateien einen neuen Namen; die neuen Dateien
+        # werden daher atomar über die des Entwurfs gelegt
+        for new_path, draft_path in zip((pdf_path, docx_path), replace_paths):
+            os.replace(new_path, draft_path)
+        pdf_path, docx_path = replace_paths
+    return pdf_path, docx_path, template_info
+
+def generate_with_draft(ai_generator, job_description, personal_info, provider, draft_model):
+    """
+    Rendert sofort einen Entwurf des schnellen Modells und ersetzt ihn durch die finale Fassung
+    
+    Beide Modelle erhalten denselben Prompt und starten gleichzeitig. Bricht der Benutzer
+    das Warten ab (Strg+C) oder schlägt die finale Fassung fehl, bleibt der Entwurf.
+    
+    Returns:
+        (Brief, Pfade (PDF, DOCX) des gerenderten Entwurfs oder None)
+    """
+    with console.status(f"[bold blue]2️⃣  Generiere Entwurf mit {draft_model}...[/bold blue]"), \
+            profiler.span('draft'):
+        draft, final = ai_generator.generate_draft_and_final(
+            job_description, LLMFactory.create_llm(provider, draft_model), personal_info
+        )
+    
+    draft_paths = None
+    if draft is not None:
+        with profiler.span('rendering'):
+            pdf_path, docx_path, _ = render_documents(draft)
+        draft_paths = (pdf_path, docx_path)
+        console.print(Panel(
+            f"📝  [green]Entwurf erstellt:[/green] [bold blue]{pdf_path}[/bold blue]\n"
+            f"📝  [green]Entwurf erstellt:[/green] [bold blue]{docx_path}[/bold blue]\n"
+            f"[dim]Die finale Fassung ersetzt den Entwurf, sobald sie fertig ist (Strg+C = Entwurf behalten)[/dim]",
+            title=f"[bold green]✅  Entwurf ({draft_model})[/bold green]",
+            border_style="green"
+        ))
+    
+    _, final_model = LLMFactory.describe_llm(ai_generator.llm)
+    try:
+        with console.status(f"[bold blue]2️⃣  Finale Fassung mit {final_model}...[/bold blue]"), \
+                profiler.span('generation'):
+            return final.result(), draft_paths
+    except KeyboardInterrupt:
+        if draft is None:
+            raise
+        console.print("⏹️  [yellow]Finale Fassung abgebrochen - der Entwurf bleibt erhalten.[/yellow]")
+    except Exception as e:
+        if draft is None:
+            raise
+        logger.error(f"Finale Fassung fehlgeschlagen: {e}")
+        console.print(f"⚠️  [yellow]Finale Fassung fehlgeschlagen ({e}) - der Entwurf bleibt erhalten.[/yellow]")
+    return draft, draft_paths
+
+def revise_paragraphs(ai_generator, motivation_letter, job_description):
+    """
+    Überarbeitet einzelne Absätze nacheinander, bis der Benutzer zufrieden ist
+    
+    Pro Runde geht nur der gewählte Absatz samt Nachbarn an das LLM; der neue Absatz
+    wird erst nach Bestätigung übernommen. Anrede und Schluss sind fest und nicht wählbar.
+    Schlägt eine Überarbeitung fehl, bleibt der bisherige Brief erhalten.
+    """
+    while True:
+        paragraphs = letter_paragraphs(motivation_letter.content)
+        revisable = revisable_paragraphs(motivation_letter.content)
+        numbers = {index: number for number, index in enumerate(revisable, 1)}
+        paragraph_table = Table(show_header=True, header_style="bold magenta")
+        paragraph_table.add_column("Nr.", style="cyan", justify="right")
+        paragraph_table.add_column("Absatz", style="white")
+        for index, paragraph in enumerate(paragraphs):
+            if index in numbers:
+                paragraph_table.add_row(str(numbers[index]), paragraph)
+            else:
+                paragraph_table.add_row("–", paragraph, style="dim")
+        console.print(Panel(
+            paragraph_table,
+            title="[bold blue]✏️  Absätze des Motivationsschreibens[/bold blue]",
+            border_style="blue"
+        ))
+        
+        choice = Prompt.ask("Absatz-Nummer (Enter = fertig)",
+                            choices=[''] + [str(number) for number in range(1, len(revisable) + 1)],
+                            default='', show_choices=False)
+        if not choice:
+            return motivation_letter
+        index = revisable[int(choice) - 1]
+        instruction = Prompt.ask("Überarbeitungswunsch (optional)", default='').strip() or None
+        
+        try:
+            with console.status(f"[bold blue]✏️  Überarbeite Absatz {choice}...[/bold blue]"), \
+                    profiler.span('revision'):
+                revised = ai_generator.regenerate_paragraph(motivation_letter, index, job_description, instruction)
+        except Exception as e:
+            logger.error(f"Absatz-Überarbeitung fehlgeschlagen: {e}")
+            console.print(f"⚠️  [yellow]Überarbeitung fehlgeschlagen ({e}) - der bisherige Absatz bleibt erhalten.[/yellow]")
+            continue
+        
+        console.print(Panel(paragraphs[index], title="[bold]Bisher[/bold]", border_style="dim"))
+        console.print(Panel(letter_paragraphs(revised.content)[index], title="[bold green]Neu[/bold green]",
+                            border_style="green"))
+        if Confirm.ask("Neuen Absatz übernehmen?", default=True):
+            motivation_letter = revised
+
 def main():
     """Hauptfunktion mit Rich Interface"""
+    args = parse_args()
+    if args.profile:
+        profiler.enable()
+    
+    prefetcher = None
     try:
+        # Während Begrüßung und Eingaben: LLM-Verbindung, Template und Stellenanzeige vorladen
+        prefetch = Config.PREFETCH_JOB_PAGE and not args.no_prefetch
+        job_extractor = JobExtractor()
+        duplicate_index = DuplicateIndex()
+        prefetcher = JobPrefetcher(job_extractor, duplicate_index)
+        if prefetch:
+            prefetcher.warm_up()
+        
         print_welcome()
         print_llm_info()
         
         # Modellauswahl
         provider, model = show_model_selection()
         
-        # Benutzereingaben
-        job_url, personal_info = get_user_input()
+        # Benutzereingaben (Abruf und Extraktion starten, sobald die URL gültig ist)
+        job_url, personal_info = get_user_input(on_url=prefetcher.prefetch if prefetch else None)
         
         # Verarbeitung starten
         console.print(Rule("[bold green]🔄  Verarbeitung startet[/bold green]"))
         
-        # 1. Job-Informationen extrahieren
-        with console.status("[bold blue]1️⃣  Extrahiere Job-Informationen...[/bold blue]"):
-            job_extractor = JobExtractor()
-            job_description = job_extractor.extract_from_url(job_url)
+        # 1. Stellenanzeige laden und auf Duplikate prüfen (meist bereits im Hintergrund erledigt)
+        with console.status("[bold blue]1️⃣  Lade Stellenanzeige...[/bold blue]"), \
+                profiler.span('prefetch_wait'):
+            prefetched = prefetcher.get(job_url)
+        html_content, job_text, duplicate = prefetched.html_content, prefetched.job_text, prefetched.duplicate
         
-        console.print(Panel(
-            f"✅  [green]Job extrahiert:[/green] {job_description.company} - {job_description.position}",
-            title="[bold green]✅  Job-Extraktion erfolgreich[/bold green]",
-            border_style="green"
-        ))
+        action = ask_duplicate_action(duplicate) if duplicate else 'new'
+        if action == 'skip':
+            console.print(Panel(
+                f"⏭️  [yellow]Übersprungen – bereits verarbeitet als {duplicate.url}[/yellow]",
+                border_style="yellow"
+            ))
+            print_profile(args.profile_output)
+            return
         
-        # 2. Motivationsschreiben generieren
-        with console.status("[bold blue]2️⃣  Generiere Motivationsschreiben...[/bold blue]"):
+        ai_generator = None
+        draft_paths = None
+        if action == 'reuse':
+            job_description = JobInfo(**duplicate.job_info)
+            motivation_letter = MotivationLetter(**duplicate.letter)
+            motivation_letter.date = datetime.now()
+            console.print(Panel(
+                f"♻️  [green]Job-Informationen und Motivationsschreiben übernommen:[/green] "
+                f"{job_description.company} - {job_description.position}",
+                title="[bold green]✅  Wiederverwendung (ohne LLM)[/bold green]",
+                border_style="green"
+            ))
+        else:
+            job_description = prefetched.job_info
+            if job_description is None:
+                with console.status("[bold blue]1️⃣  Extrahiere Job-Informationen...[/bold blue]"), \
+                        profiler.span('extraction'):
+                    job_description = job_extractor.extract_from_url(job_url, html_content=html_content)
+            
+            prefetch_info = " (vorab im Hintergrund)" if prefetched.job_info is not None else ""
+            console.print(Panel(
+                f"✅  [green]Job extrahiert{prefetch_info}:[/green] {job_description.company} - {job_description.position}",
+                title="[bold green]✅  Job-Extraktion erfolgreich[/bold green]",
+                border_style="green"
+            ))
+            
+            # 2. Motivationsschreiben generieren
             ai_generator = AIGenerator()
             
             # Spezifisches Modell verwenden, falls ausgewählt
             if provider and model:
                 ai_generator.llm = LLMFactory.create_llm(provider, model)
             
-            motivation_letter = ai_generator.generate_motivation_letter(job_description, personal_info)
+            if args.draft_model and args.draft_model != LLMFactory.describe_llm(ai_generator.llm)[1]:
+                # Entwurf sofort rendern, finale Fassung ersetzt ihn im nächsten Schritt
+                motivation_letter, draft_paths = generate_with_draft(ai_generator, job_description, personal_info,
+                                                                     provider, args.draft_model)
+            else:
+                with console.status("[bold blue]2️⃣  Generiere Motivationsschreiben...[/bold blue]"), \
+                        profiler.span('generation'):
+                    motivation_letter = ai_generator.generate_motivation_letter(job_description, personal_info)
+            
+            model_info = f" mit {model} ({provider})" if provider and model else ""
+            console.print(Panel(
+                f"✅  [green]Motivationsschreiben generiert{model_info}[/green]",
+                title="[bold green]✅  AI-Generierung erfolgreich[/bold green]",
+                border_style="green"
+            ))
         
-        model_info = f" mit {model} ({provider})" if provider and model else ""
-        console.print(Panel(
-            f"✅  [green]Motivationsschreiben generiert{model_info}[/green]",
-            title="[bold green]✅  AI-Generierung erfolgreich[/bold green]",
-            border_style="green"
-        ))
+        # Optional einzelne Absätze überarbeiten statt den ganzen Brief neu zu generieren
+        if Confirm.ask("✏️  Einzelne Absätze überarbeiten?", default=False):
+            if ai_generator is None:
+                ai_generator = AIGenerator()
+                if provider and model:
+                    ai_generator.llm = LLMFactory.create_llm(provider, model)
+            motivation_letter = revise_paragraphs(ai_generator, motivation_letter, job_description)
         
-        # 3. PDF & DOCX erstellen
-        with console.status("[bold blue]3️⃣  Erstelle PDF und DOCX...[/bold blue]"):
-            # Template-basierte PDF-Erstellung verwenden
-            pdf_generator = TemplateBasedPDFGenerator("templates/template.pdf")
-            
-            # Template-Info anzeigen
-            template_info = pdf_generator.get_template_info()
-            
-            pdf_path = pdf_generator.create_pdf(motivation_letter)
-            
-            # DOCX-Generierung hinzufügen
-            docx_generator = DocxGenerator()
-            docx_path = docx_generator.create_docx(motivation_letter)
+        # 3. PDF & DOCX erstellen (ersetzt die Dateien eines Entwurfs)
+        with console.status("[bold blue]3️⃣  Erstelle PDF und DOCX...[/bold blue]"), \
+                profiler.span('rendering'):
+            pdf_path, docx_path, template_info = render_documents(motivation_letter, draft_paths)
         
         pdf_info = Text()
         pdf_info.append("✅  PDF erstellt: ", style="green")
@@ -265,6 +509,10 @@ def main():
             border_style="green"
         ))
         
+        # Für spätere Duplikat-Prüfungen merken
+        duplicate_index.add(job_url, job_text, job_description, motivation_letter,
+                            outputs={'pdf': pdf_path, 'docx': docx_path})
+        
         # 4. Zusammenfassung
         console.print(Rule("[bold green]🎉 FERTIG![/bold green]"))
         
@@ -279,11 +527,17 @@ def main():
         summary_table.add_row("💼  Position", job_description.position)
         summary_table.add_row("👤  Bewerber", personal_info['name'])
         
-        # Kosten anzeigen (wenn verfügbar)
-        if provider and model:
-            estimated_cost = LLMFactory.estimate_cost(provider, model, 1000, 500)
-            if estimated_cost > 0:
-                summary_table.add_row("💰 Geschätzte Kosten", f"${estimated_cost:.4f}")
+        # Tatsächlicher Token-Verbrauch und Kosten pro Stufe
+        stage_rollup = metrics_store.rollup(metrics_store.session_records, key=('stage', 'model'))
+        for (stage, stage_model), stats in stage_rollup.items():
+            summary_table.add_row(
+                f"🔢  LLM {stage}",
+                f"{stats['input_tokens']} in / {stats['output_tokens']} out · "
+                f"{stats['latency_total']:.1f}s · {stage_model}"
+            )
+        total_cost = sum(stats['cost'] for stats in stage_rollup.values())
+        if stage_rollup:
+            summary_table.add_row("💰 Kosten", f"${total_cost:.4f}")
         
         console.print(Panel(
             summary_table,
@@ -298,6 +552,8 @@ def main():
             padding=(1, 2)
         ))
         
+        print_profile(args.profile_output)
+        
     except KeyboardInterrupt:
         console.print("\n❌ [red]Vorgang abgebrochen.[/red]")
         sys.exit(1)
@@ -309,6 +565,9 @@ def main():
             border_style="red"
         ))
         sys.exit(1)
+    finally:
+        if prefetcher:
+            prefetcher.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+AutoMoti Batch - Motivationsschreiben für viele Stellen mit persistenter Warteschlange
+
+    python batch.py add <url> [<url> ...]   # oder: --file urls.txt
+    python batch.py run                     # Warteschlange abarbeiten (fortsetzbar)
+    python batch.py worker --workers 4      # Mehrere Worker-Prozesse auf derselben Warteschlange
+    python batch.py status                  # Warteschlange und Durchsatz pro Stufe
+    python batch.py retry                   # Fehlgeschlagene Stellen erneut einreihen
+"""
+
+import sys
+import logging
+import argparse
+import multiprocessing
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+from config.config import Config
+from src.job_queue import JobQueue, STATES, FAILED, RENDERED
+from src.batch_processor import BatchProcessor, run_worker
+
+console = Console()
+
+logging.basicConfig(
+    level=getattr(logging, Config.LOG_LEVEL),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+STATE_STYLES = {
+    'pending': 'white', 'fetched': 'cyan', 'extracted': 'blue',
+    'generated': 'magenta', 'rendered': 'green', 'failed': 'red'
+}
+
+
+def parse_args():
+    """Liest die Kommandozeilen-Argumente"""
+    parser = argparse.ArgumentParser(description="AutomaticMotivation - Batch-Verarbeitung")
+    parser.add_argument('--queue', default=None, help=f"Warteschlangen-Datei (Standard: {Config.BATCH_QUEUE_FILE})")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser('add', help="URLs einreihen")
+    add_parser.add_argument('urls', nargs='*', help="Stellen-URLs")
+    add_parser.add_argument('--file', help="Datei mit einer URL pro Zeile")
+
+    run_parser = subparsers.add_parser('run', help="Warteschlange abarbeiten")
+    run_parser.add_argument('--max-jobs', type=int, default=None, help="Höchstens so viele Stellen fertigstellen")
+    run_parser.add_argument('--output-dir', default="output", help="Ausgabeverzeichnis für PDF und DOCX")
+    run_parser.add_argument('--no-wait', action='store_true',
+                            help="Nicht auf zurückgestellte Stellen (Wartezeit nach Fehler) warten")
+    run_parser.add_argument('--no-reuse', action='store_true', help="Duplikate trotzdem vollständig verarbeiten")
+
+    worker_parser = subparsers.add_parser('worker', help="Worker-Prozesse starten (auch auf mehreren Hosts)")
+    worker_parser.add_argument('--workers', type=int, default=Config.BATCH_WORKERS,
+                               help="Anzahl Worker-Prozesse auf diesem Host")
+    worker_parser.add_argument('--output-dir', default="output", help="Gemeinsames Ausgabeverzeichnis")
+    worker_parser.add_argument('--no-reuse', action='store_true', help="Duplikate trotzdem vollständig verarbeiten")
+
+    subparsers.add_parser('status', help="Warteschlange und Durchsatz anzeigen")
+
+    retry_parser = subparsers.add_parser('retry', help="Fehlgeschlagene Stellen erneut einreihen")
+    retry_parser.add_argument('urls', nargs='*', help="Nur diese URLs (Standard: alle fehlgeschlagenen)")
+    return parser.parse_args()
+
+
+def command_add(queue: JobQueue, args):
+    urls = list(args.urls)
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            urls.extend(f.read().splitlines())
+    added = queue.add(urls)
+    console.print(f"📥  [green]{added} neue Stelle(n) eingereiht[/green] ({len(urls) - added} bereits vorhanden)")
+
+
+def print_progress(job, stage):
+    """Fortschritt einer Stelle nach jeder Stufe"""
+    if job.state == RENDERED:
+        reused = f" (wiederverwendet von {job.duplicate_of})" if job.duplicate_of else ""
+        console.print(f"✅  [green]{job.url}[/green]{reused}\n    📄 {job.pdf_path}\n    📄 {job.docx_path}")
+    elif job.state == FAILED:
+        console.print(f"❌  [red]{job.url}: {stage} endgültig fehlgeschlagen[/red] ({job.last_error})")
+    elif job.last_error and job.stage == stage:
+        console.print(f"⚠️  [yellow]{job.url}: {stage} fehlgeschlagen, Versuch {job.attempts}[/yellow] "
+                      f"({job.last_error})")
+    else:
+        console.print(f"   [dim]{job.url}: {stage} → {job.state}[/dim]")
+
+
+def command_run(queue: JobQueue, args):
+    processor = BatchProcessor(queue, output_dir=args.output_dir, reuse_duplicates=not args.no_reuse)
+    try:
+        finished = processor.run(max_jobs=args.max_jobs, wait_for_retries=not args.no_wait,
+                                 on_progress=print_progress)
+    except KeyboardInterrupt:
+        console.print("\n⏸️  [yellow]Unterbrochen - 'python batch.py run' setzt an derselben Stelle fort.[/yellow]")
+        sys.exit(130)
+    console.print(Panel(f"🎉  {finished} Stelle(n) fertiggestellt", border_style="green"))
+    command_status(queue, args)
+
+
+def worker_process(queue_file, output_dir, reuse_duplicates, index):
+    try:
+        run_worker(queue_file, output_dir, reuse_duplicates, index, on_progress=print_progress)
+    except KeyboardInterrupt:
+        pass
+
+
+def command_worker(queue: JobQueue, args):
+    """Startet mehrere Worker-Prozesse; jeder holt sich Stellen per Lease aus der Warteschlange"""
+    queue_file = str(queue.db_file)
+    console.print(f"👷  [bold]{args.workers} Worker[/bold] auf {queue_file}")
+    processes = [
+        multiprocessing.Process(target=worker_process, args=(queue_file, args.output_dir, not args.no_reuse, index),
+                                name=f"worker-{index}")
+        for index in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Worker erhalten das Signal ebenfalls und geben ihre Leases frei
+        for process in processes:
+            process.join()
+        console.print("\n⏸️  [yellow]Unterbrochen - offene Stellen werden beim nächsten Start fortgesetzt.[/yellow]")
+        sys.exit(130)
+    command_status(queue, args)
+
+
+def command_status(queue: JobQueue, args):
+    counts = queue.counts()
+    state_table = Table(show_header=True, header_style="bold magenta")
+    state_table.add_column("Zustand", style="cyan")
+    state_table.add_column("Stellen", justify="right")
+    for state in STATES:
+        state_table.add_row(f"[{STATE_STYLES[state]}]{state}[/{STATE_STYLES[state]}]", str(counts[state]))
+    open_jobs = sum(counts[state] for state in STATES if state not in (RENDERED, FAILED))
+    state_table.add_row("[bold]offen[/bold]", f"[bold]{open_jobs}[/bold]")
+
+    stage_table = Table(show_header=True, header_style="bold magenta")
+    stage_table.add_column("Stufe", style="cyan")
+    stage_table.add_column("Erledigt", justify="right")
+    stage_table.add_column("Fehler", justify="right")
+    stage_table.add_column("Ø Dauer", justify="right")
+    stage_table.add_column("Durchsatz", justify="right")
+    for stage, stats in queue.stage_stats().items():
+        stage_table.add_row(
+            stage, str(stats['done']), str(stats['errors']),
+            f"{stats['mean_duration']:.2f}s", f"{stats['throughput_per_min']:.1f}/min"
+        )
+
+    console.print(Panel(state_table, title="[bold blue]📋  Warteschlange[/bold blue]", border_style="blue"))
+    console.print(Panel(stage_table, title="[bold blue]⏱️  Durchsatz pro Stufe[/bold blue]", border_style="blue"))
+
+    leases = queue.active_leases()
+    if leases:
+        lease_table = Table(show_header=True, header_style="bold magenta")
+        lease_table.add_column("Worker", style="cyan")
+        lease_table.add_column("URL", style="white")
+        lease_table.add_column("Stufe")
+        lease_table.add_column("Lease", justify="right")
+        for lease in leases:
+            lease_table.add_row(lease['worker'], lease['url'], lease['stage'], f"{lease['expires_in']:.0f}s")
+        console.print(Panel(lease_table, title="[bold blue]👷  In Bearbeitung[/bold blue]", border_style="blue"))
+
+    failed = queue.failed_jobs()
+    if failed:
+        failed_table = Table(show_header=True, header_style="bold red")
+        failed_table.add_column("URL", style="white")
+        failed_table.add_column("Fehler", style="red")
+        for job in failed:
+            failed_table.add_row(job.url, job.last_error or '')
+        console.print(Panel(failed_table, title="[bold red]❌  Fehlgeschlagen[/bold red]", border_style="red"))
+
+
+def command_retry(queue: JobQueue, args):
+    reset = queue.retry_failed(args.urls or None)
+    console.print(f"🔁  [green]{reset} Stelle(n) erneut eingereiht[/green]")
+
+
+def main():
+    args = parse_args()
+    queue = JobQueue(args.queue)
+    try:
+        {
+            'add': command_add,
+            'run': command_run,
+            'worker': command_worker,
+            'status': command_status,
+            'retry': command_retry
+        }[args.command](queue, args)
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+DOCX-Durchsatz: python-docx gegen den direkten XML-Writer
+
+Rendert dieselben Briefe (gleiches Brief-Layout, mit GitHub- und LinkedIn-Links) über
+beide Pfade des DocxGenerator, prüft, dass die Pakete dieselben Teile, Absätze und
+Hyperlink-Relationships enthalten, und misst Dokumente pro Sekunde.
+
+    python benchmarks/docx_throughput.py --letters 200
+"""
+
+import re
+import sys
+import time
+import zipfile
+import logging
+import argparse
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List
+
+# Pfad zum Hauptverzeichnis hinzufügen
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.run_benchmarks import summarize
+from src.models import MotivationLetter
+from src.letter_layout import build_layout
+from src.docx_generator import DocxGenerator
+
+console = Console()
+
+PROJECT_URLS = {
+    'AutomaticMotivation': 'https://github.com/username/AutomaticMotivation',
+    'ZurdLLMWS': 'https://github.com/username/ZurdLLMWS',
+    'Auto-search-jobs': 'https://github.com/username/Auto-search-jobs'
+}
+LINKEDIN_URL = 'https://linkedin.com/in/username'
+COMPANIES = [('Helvetia Data Solutions AG', 'Europaallee 41, 8004 Zürich'),
+             ('Stadtwerke Aarau AG', 'Obere Vorstadt 2, 5000 Aarau'),
+             ('Alpine Analytics', 'Steinenberg 5, 4051 Basel')]
+
+
+def make_letters(count: int) -> List[MotivationLetter]:
+    letters = []
+    for index in range(count):
+        company, address = COMPANIES[index % len(COMPANIES)]
+        letters.append(MotivationLetter(
+            sender_name="Max Muster", sender_address="Musterweg 1, 6235 Winikon",
+            sender_phone="+41 79 000 00 00", sender_email="max@example.com",
+            recipient_name="Frau Meier", recipient_company=company,
+            recipient_company_address=address, recipient_address=address,
+            subject=f"Bewerbung als Data Engineer ({index + 1})",
+            content=(
+                "Sehr geehrte Frau Meier,\n\n"
+                f"mit grossem Interesse habe ich Ihre Ausschreibung bei {company} gelesen. "
+                "In AutomaticMotivation und ZurdLLMWS habe ich LLM-Pipelines end-to-end gebaut.\n\n"
+                "Mit Auto-search-jobs automatisiere ich die Stellensuche; Details finden Sie in meinem "
+                "LinkedIn-Profil.\n\n"
+                "Gerne überzeuge ich Sie in einem persönlichen Gespräch von meiner Motivation."
+            )
+        ))
+    return letters
+
+
+def package_structure(data: bytes) -> Dict[str, object]:
+    """Was scripts/analyze_hyperlinks.py prüft: Teile, Hyperlink-Ziele, Hyperlinks und Text"""
+    with zipfile.ZipFile(BytesIO(data)) as archive:
+        rels = archive.read('word/_rels/document.xml.rels').decode('utf-8')
+        document = archive.read('word/document.xml').decode('utf-8')
+        names = sorted(archive.namelist())
+    return {
+        'parts': names,
+        'targets': re.findall(r'<Relationship[^>]*Type="[^"]*hyperlink[^"]*"[^>]*Target="([^"]+)"', rels),
+        'hyperlinks': re.findall(r'<w:hyperlink[^>]*r:id="([^"]+)"[^>]*>(.*?)</w:hyperlink>', document, re.DOTALL),
+        'text': re.sub(r'<[^>]+>', '', document)
+    }
+
+
+def measure(generator: DocxGenerator, letters, layouts) -> List[float]:
+    durations = []
+    for letter, layout in zip(letters, layouts):
+        start = time.perf_counter()
+        generator.render_docx_bytes(letter, layout)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DOCX-Durchsatz python-docx vs. direkter Writer")
+    parser.add_argument('--letters', type=int, default=200, help="Anzahl gerenderter Briefe pro Pfad")
+    parser.add_argument('--warmup', type=int, default=5, help="Verworfene Aufwärm-Briefe")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    letters = make_letters(args.letters)
+    layouts = [build_layout(letter, PROJECT_URLS, LINKEDIN_URL) for letter in letters]
+    generators = {'python-docx': DocxGenerator(fast_writer=False), 'fast': DocxGenerator(fast_writer=True)}
+
+    for letter, layout in zip(letters[:len(COMPANIES)], layouts):
+        reference, fast = (package_structure(generator.render_docx_bytes(letter, layout))
+                           for generator in generators.values())
+        assert reference == fast, f"Struktur weicht ab für {letter.recipient_company}"
+    console.print(f"✅  Gleiche Paketstruktur ({len(reference['parts'])} Teile, "
+                  f"{len(reference['hyperlinks'])} Hyperlinks)")
+
+    results = {}
+    for name, generator in generators.items():
+        measure(generator, letters[:args.warmup], layouts[:args.warmup])
+        results[name] = summarize(measure(generator, letters, layouts))
+
+    table = Table(title="⏱️  DOCX-Rendering", show_header=True, header_style="bold magenta")
+    table.add_column("Pfad", style="cyan")
+    table.add_column("Briefe", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("Dokumente/s", justify="right")
+    for name, stats in results.items():
+        table.add_row(name, str(stats['runs']), f"{stats['p50_ms']:.2f} ms", f"{stats['p95_ms']:.2f} ms",
+                      f"{stats['throughput_per_s']:.1f}")
+    console.print(table)
+    speedup = results['fast']['throughput_per_s'] / results['python-docx']['throughput_per_s']
+    console.print(f"Beschleunigung: [bold green]{speedup:.1f}x[/bold green]")
+
+
+if __name__ == "__main__":
+    main()
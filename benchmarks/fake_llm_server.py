@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Deterministischer Fake für den OpenAI-kompatiblen Chat-Completions-Endpunkt
+Beantwortet Extraktion, Projektauswahl und Generierung mit festen Antworten,
+liefert Usage-Daten und simuliert eine konfigurierbare Latenz
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Set
+
+EXTRACTION_RESPONSE = """UNTERNEHMEN: {company}
+POSITION: {position}
+BEREICH: Informatik
+STANDORT: {location}
+ADRESSE: {location}, Schweiz
+KONTAKTPERSON: Sandra Keller
+KONTAKT_TITEL: HR Business Partner
+EMAIL: jobs@example.ch
+TELEFON: +41 44 555 12 34
+BESCHREIBUNG: Entwicklung und Betrieb von Anwendungen und Services im Team, Mitarbeit an Architektur und Projekten.
+ANFORDERUNGEN: Abgeschlossene Ausbildung in Informatik, mehrjährige Erfahrung mit Python und SQL, Kenntnisse in Docker und CI/CD, sehr gute Deutsch- und Englischkenntnisse.
+BENEFITS: Flexible Arbeitszeiten, Homeoffice, Weiterbildungsbudget
+ARBEITSZEIT: 80-100%
+GEHALT: Nicht angegeben"""
+
+REQUIREMENTS_RESPONSE = """Abgeschlossene Ausbildung in Informatik
+Mehrjährige Erfahrung mit Python
+Kenntnisse in Docker und CI/CD
+Teamfähigkeit und Kommunikationsstärke
+Sehr gute Deutschkenntnisse"""
+
+LETTER_RESPONSE = """mit grossem Interesse habe ich Ihre Ausschreibung gelesen und bewerbe mich hiermit auf die ausgeschriebene Stelle. Die Kombination aus anspruchsvollen technischen Aufgaben und der engen Zusammenarbeit im Team entspricht genau dem, was ich in meiner nächsten beruflichen Station suchen.
+
+In meiner bisherigen Tätigkeit habe ich Anwendungen in Python entwickelt, betrieben und kontinuierlich verbessert. Im Projekt invoice-ocr-pipeline habe ich eine Verarbeitungsstrecke für Rechnungen mit FastAPI und Docker aufgebaut, die die manuelle Erfassung um rund 70 Prozent reduziert hat. Dabei habe ich gelernt, robuste Schnittstellen zu entwerfen und Qualität durch automatisierte Tests und CI/CD sicherzustellen.
+
+Besonders motiviert mich die Möglichkeit, Verantwortung für produktive Systeme zu übernehmen und gemeinsam mit Fachbereichen Lösungen zu entwickeln. Meine strukturierte Arbeitsweise, meine Freude an sauberem Code und meine Kommunikationsstärke möchte ich gerne in Ihr Team einbringen.
+
+Gerne überzeuge ich Sie in einem persönlichen Gespräch von meiner Motivation und meinen Fähigkeiten. Ich freue mich auf Ihre Rückmeldung."""
+
+PARAGRAPH_RESPONSE = """In meiner bisherigen Tätigkeit habe ich produktive Python-Anwendungen verantwortet und im Projekt invoice-ocr-pipeline mit FastAPI und Docker eine Rechnungsverarbeitung aufgebaut, die die manuelle Erfassung um rund 70 Prozent reduziert hat. Automatisierte Tests und CI/CD waren dabei fester Bestandteil meiner Arbeit."""
+
+# Abschnittsweise Generierung: die Absätze von LETTER_RESPONSE als einzelne Abschnitte
+SECTION_RESPONSES = dict(zip(('EINLEITUNG', 'ERFAHRUNG', 'MOTIVATION'), LETTER_RESPONSE.split('\n\n')))
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def build_response_content(messages: List[Dict[str, str]]) -> str:
+    """Wählt die passende Antwort anhand von Schlüsselwörtern im Prompt"""
+    prompt = '\n'.join(str(message.get('content', '')) for message in messages)
+
+    if 'Extrahiere folgende Informationen' in prompt:
+        # Einfache, deterministische Ableitung aus dem Stellentext
+        text_lines = prompt.split('TEXT:', 1)[-1].strip().splitlines()
+        position = next((line.strip() for line in text_lines if line.strip()), 'Software Engineer')
+        company_match = re.search(r'([A-ZÄÖÜ][\w&.-]*(?: [A-ZÄÖÜ][\w&.-]*)* (?:AG|GmbH|SA))', prompt)
+        location_match = re.search(r'\b(Zürich|Basel|Bern|Aarau|Luzern|St\. Gallen)\b', prompt)
+        return EXTRACTION_RESPONSE.format(
+            company=company_match.group(1) if company_match else 'Beispiel AG',
+            position=position[:80],
+            location=location_match.group(1) if location_match else 'Zürich'
+        )
+    if 'Gib NUR die Nummern' in prompt:
+        return '1, 2'
+    if 'die 5 wichtigsten Anforderungen' in prompt:
+        return REQUIREMENTS_RESPONSE
+    if 'ÜBERARBEITE DEN ABSATZ' in prompt:
+        return PARAGRAPH_RESPONSE
+    section_match = re.search(r'SCHREIBE NUR DEN ABSCHNITT (\w+)', prompt)
+    if section_match and section_match.group(1) in SECTION_RESPONSES:
+        return SECTION_RESPONSES[section_match.group(1)]
+    return LETTER_RESPONSE
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: '_FakeHTTPServer'
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        messages = payload.get('messages', [])
+        model = payload.get('model', 'benchmark/fake-model')
+
+        if model in self.server.failing_models:
+            # Gestörtes Modell (z.B. für Tests des ModelRouter)
+            time.sleep(self.server.latency)
+            self.send_error(500, 'Modell gestört')
+            return
+
+        content = build_response_content(messages)
+        prompt_tokens = sum(_estimate_tokens(str(m.get('content', ''))) for m in messages)
+        completion_tokens = _estimate_tokens(content)
+
+        # Latenz: Grundlatenz plus Generierungszeit pro Output-Token
+        latency = self.server.model_latency.get(model, self.server.latency)
+        if self.server.tail_fraction and self.server.next_random() < self.server.tail_fraction:
+            latency += self.server.tail_latency  # Langsamer Ausreißer
+        latency += self.server.take_slow_request()
+        time.sleep(latency + self.server.latency_per_token * completion_tokens)
+
+        body = json.dumps({
+            'id': f"chatcmpl-bench-{self.server.next_id()}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        }).encode('utf-8')
+
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client hat die Anfrage abgebrochen (z.B. Hedging)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float, latency_per_token: float):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.latency_per_token = latency_per_token
+        self.model_latency: Dict[str, float] = {}
+        self.failing_models: Set[str] = set()
+        self.tail_fraction = 0.0
+        self.tail_latency = 0.0
+        self._random = random.Random(42)  # Reproduzierbare Ausreißer
+        self.slow_requests = 0
+        self.slow_latency = 0.0
+        self._counter = 0
+        self._counter_lock = threading.Lock()
+
+    def take_slow_request(self) -> float:
+        """Zusätzliche Latenz, falls noch gezielt verlangsamte Anfragen ausstehen"""
+        with self._counter_lock:
+            if not self.slow_requests:
+                return 0.0
+            self.slow_requests -= 1
+            return self.slow_latency
+
+    def next_random(self) -> float:
+        with self._counter_lock:
+            return self._random.random()
+
+    def next_id(self) -> int:
+        with self._counter_lock:
+            self._counter += 1
+            return self._counter
+
+
+class FakeLLMServer:
+    """
+    Lokaler OpenAI-kompatibler Server für Benchmarks
+
+    Args:
+        latency: Grundlatenz pro Aufruf in Sekunden
+        latency_per_token: Zusätzliche Latenz pro Output-Token in Sekunden
+        model_latency: Abweichende Grundlatenz pro Modell
+        failing_models: Modelle, die mit HTTP 500 antworten
+        tail_fraction: Anteil der Aufrufe mit zusätzlicher Latenz tail_latency (Ausreißer)
+    """
+
+    def __init__(self, latency: float = 0.0, latency_per_token: float = 0.0, port: int = 0,
+                 model_latency: Optional[Dict[str, float]] = None, failing_models: Iterable[str] = (),
+                 tail_fraction: float = 0.0, tail_latency: float = 0.0):
+        self._server = _FakeHTTPServer(('127.0.0.1', port), latency, latency_per_token)
+        self._server.tail_fraction = tail_fraction
+        self._server.tail_latency = tail_latency
+        self._server.model_latency.update(model_latency or {})
+        self._server.failing_models.update(failing_models)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def failing_models(self) -> Set[str]:
+        """Veränderbar, während der Server läuft"""
+        return self._server.failing_models
+
+    @property
+    def model_latency(self) -> Dict[str, float]:
+        """Veränderbar, während der Server läuft"""
+        return self._server.model_latency
+
+    def slow_next(self, count: int, latency: float):
+        """Die nächsten count Anfragen dauern zusätzlich latency Sekunden"""
+        with self._server._counter_lock:
+            self._server.slow_requests = count
+            self._server.slow_latency = latency
+
+    def start(self) -> 'FakeLLMServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Offline-Adapter für requests
+Beantwortet alle HTTP-Aufrufe über requests aus dem aufgezeichneten Korpus
+(Stellenseiten, GitHub-API) und liefert für alles andere 404 - ohne Netzwerk
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Tuple
+from unittest import mock
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+FIXTURES_DIR = Path(__file__).parent.parent / 'testing' / 'fixtures'
+
+
+def load_job_pages(fixtures_dir: Path = FIXTURES_DIR) -> Dict[str, Path]:
+    """Lädt das Manifest der aufgezeichneten Stellenseiten (URL -> HTML-Datei)"""
+    pages_dir = fixtures_dir / 'job_pages'
+    with open(pages_dir / 'manifest.json', 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    return {page['url']: pages_dir / page['file'] for page in manifest['pages']}
+
+
+class OfflineHTTP:
+    """
+    Kontextmanager, der requests.Session.send durch den Korpus ersetzt
+
+    Gezählt werden alle Anfragen, damit Benchmarks auch die Anzahl
+    ausgehender Aufrufe pro Lauf ausweisen können.
+    """
+
+    GITHUB_REPOS = re.compile(r'^https://api\.github\.com/users/[^/]+/repos')
+
+    def __init__(self, fixtures_dir: Path = FIXTURES_DIR):
+        self.fixtures_dir = Path(fixtures_dir)
+        self.pages = load_job_pages(self.fixtures_dir)
+        self.request_count = 0
+        # Als Funktion (nicht gebundene Methode) patchen, damit die Session als erstes Argument ankommt
+        self._patcher = mock.patch.object(
+            requests.Session, 'send', lambda session, request, **kwargs: self._send(session, request, **kwargs)
+        )
+
+    def __enter__(self):
+        self._patcher.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._patcher.stop()
+        return False
+
+    def _lookup(self, url: str) -> Tuple[int, bytes, str]:
+        page = self.pages.get(url)
+        if page is not None:
+            return 200, page.read_bytes(), 'text/html; charset=utf-8'
+
+        if self.GITHUB_REPOS.match(url):
+            # Nur die erste Seite liefern, damit die Paginierung endet
+            if 'page=' in url and not re.search(r'[?&]page=1(&|$)', url):
+                return 200, b'[]', 'application/json'
+            return 200, (self.fixtures_dir / 'github_repos.json').read_bytes(), 'application/json'
+
+        return 404, b'', 'text/plain'
+
+    def _send(self, session: requests.Session, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        self.request_count += 1
+        status, body, content_type = self._lookup(request.url)
+
+        response = requests.Response()
+        response.status_code = status
+        response._content = body
+        response.url = request.url
+        response.request = request
+        response.encoding = 'utf-8'
+        response.reason = 'OK' if status == 200 else 'Not Found'
+        response.headers = CaseInsensitiveDict({'Content-Type': content_type})
+        return response
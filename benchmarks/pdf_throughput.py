@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+PDF-Durchsatz: platypus gegen den Canvas-Renderer
+
+Rendert dieselben Briefe (gleiches Brief-Layout, mit GitHub- und LinkedIn-Links) über
+beide Pfade des PDFGenerator bzw. TemplateBasedPDFGenerator, prüft, dass Text und Links
+übereinstimmen, und misst Dokumente pro Sekunde. Zusätzlich wird die Bearbeitungsschleife
+gemessen: derselbe Brief wird mit jeweils einem geänderten Satz neu gerendert, mit und
+ohne Absatz-Layout-Cache.
+
+    python benchmarks/pdf_throughput.py --letters 200
+"""
+
+import sys
+import time
+import logging
+import argparse
+from io import BytesIO
+from pathlib import Path
+from typing import List
+
+# Pfad zum Hauptverzeichnis hinzufügen
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import pdfplumber
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.run_benchmarks import summarize
+from benchmarks.docx_throughput import COMPANIES, LINKEDIN_URL, PROJECT_URLS, make_letters
+from src.letter_layout import build_layout
+from src.layout_cache import LayoutCache
+from src.pdf_generator import PDFGenerator
+from src.template_pdf_generator import TemplateBasedPDFGenerator
+
+console = Console()
+
+GENERATORS = {'standard': PDFGenerator, 'template': TemplateBasedPDFGenerator}
+
+
+def page_content(data: bytes):
+    """Wörter und Link-Ziele aller Seiten"""
+    with pdfplumber.open(BytesIO(data)) as pdf:
+        return ([word['text'] for page in pdf.pages for word in page.extract_words()],
+                [link['uri'] for page in pdf.pages for link in page.hyperlinks])
+
+
+def measure(generator, letters, layouts) -> List[float]:
+    durations = []
+    for letter, layout in zip(letters, layouts):
+        start = time.perf_counter()
+        generator.render_pdf_bytes(letter, layout)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def measure_edit_loop(generator, letter, edits: int):
+    """Re-Render nach je einer kleinen Änderung im ersten Absatz: Layout- und Gesamtzeit"""
+    layout_durations, render_durations = [], []
+    for index in range(edits):
+        content = letter.content.replace("gelesen.", f"gelesen ({index}).", 1)
+        edited = type(letter)(**{**vars(letter), 'content': content})
+        layout = build_layout(edited, PROJECT_URLS, LINKEDIN_URL)
+        blocks = generator._letter_blocks(edited, layout)
+
+        start = time.perf_counter()
+        generator.canvas_renderer.layout(blocks)
+        layout_durations.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        generator.render_pdf_bytes(edited, layout)
+        render_durations.append(time.perf_counter() - start)
+    return summarize(layout_durations), summarize(render_durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF-Durchsatz platypus vs. Canvas-Renderer")
+    parser.add_argument('--letters', type=int, default=200, help="Anzahl gerenderter Briefe pro Pfad")
+    parser.add_argument('--warmup', type=int, default=5, help="Verworfene Aufwärm-Briefe")
+    parser.add_argument('--edits', type=int, default=100, help="Re-Renders in der Bearbeitungsschleife")
+    parser.add_argument('--generator', choices=list(GENERATORS), default='standard',
+                        help="PDFGenerator oder TemplateBasedPDFGenerator")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    letters = make_letters(args.letters)
+    layouts = [build_layout(letter, PROJECT_URLS, LINKEDIN_URL) for letter in letters]
+    generator_class = GENERATORS[args.generator]
+    generators = {'platypus': generator_class(use_canvas=False), 'canvas': generator_class(use_canvas=True)}
+
+    for letter, layout in zip(letters[:len(COMPANIES)], layouts):
+        reference, canvas = (page_content(generator.render_pdf_bytes(letter, layout))
+                             for generator in generators.values())
+        assert reference == canvas, f"Inhalt weicht ab für {letter.recipient_company}"
+    console.print(f"✅  Gleicher Inhalt ({len(reference[0])} Wörter, {len(reference[1])} Links)")
+
+    results = {}
+    for name, generator in generators.items():
+        measure(generator, letters[:args.warmup], layouts[:args.warmup])
+        results[name] = summarize(measure(generator, letters, layouts))
+
+    table = Table(title=f"⏱️  PDF-Rendering ({generator_class.__name__})", show_header=True,
+                  header_style="bold magenta")
+    table.add_column("Pfad", style="cyan")
+    table.add_column("Briefe", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("Dokumente/s", justify="right")
+    for name, stats in results.items():
+        table.add_row(name, str(stats['runs']), f"{stats['p50_ms']:.2f} ms", f"{stats['p95_ms']:.2f} ms",
+                      f"{stats['throughput_per_s']:.1f}")
+    console.print(table)
+    speedup = results['canvas']['throughput_per_s'] / results['platypus']['throughput_per_s']
+    console.print(f"Beschleunigung: [bold green]{speedup:.1f}x[/bold green]")
+
+    edit_results = {}
+    for name, cache in (('ohne Cache', LayoutCache(0)), ('mit Cache', LayoutCache(1024))):
+        generator = generator_class(use_canvas=True)
+        generator.canvas_renderer.cache = cache
+        measure_edit_loop(generator, letters[0], args.warmup)
+        edit_results[name] = measure_edit_loop(generator, letters[0], args.edits)
+        cache_stats = cache.stats()
+        console.print(f"{name}: Trefferquote {cache_stats['hit_rate']:.0%}")
+
+    table = Table(title="✏️  Bearbeitungsschleife (Canvas)", show_header=True, header_style="bold magenta")
+    table.add_column("Layout-Cache", style="cyan")
+    table.add_column("Layout p50", justify="right")
+    table.add_column("Rendern p50", justify="right")
+    table.add_column("Dokumente/s", justify="right")
+    for name, (layout_stats, render_stats) in edit_results.items():
+        table.add_row(name, f"{layout_stats['p50_ms']:.3f} ms", f"{render_stats['p50_ms']:.2f} ms",
+                      f"{render_stats['throughput_per_s']:.1f}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
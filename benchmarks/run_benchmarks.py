@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Reproduzierbare Offline-Benchmarks für AutomaticMotivation
+
+Misst Extraktion, Stellenanalyse, Generierung sowie PDF- und DOCX-Rendering
+einzeln und Ende-zu-Ende gegen aufgezeichnete Stellenseiten und einen lokalen
+LLM-Fake. Ergebnisse werden unter benchmarks/results/<Zeitstempel>_<commit>.json
+gespeichert, damit Regressionen zwischen Commits als Zahlen sichtbar werden.
+"""
+
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import subprocess
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Pfad zum Hauptverzeichnis hinzufügen
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from rich.console import Console
+from rich.table import Table
+
+from config.config import Config
+from benchmarks.fake_llm_server import FakeLLMServer
+from benchmarks.offline_http import OfflineHTTP, load_job_pages
+
+console = Console()
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+STAGES = ['extraction', 'analysis', 'generation', 'render_pdf', 'render_docx', 'end_to_end']
+BENCHMARK_MODEL = 'benchmark/fake-model'
+
+
+def git_revision() -> Dict[str, object]:
+    """Ermittelt Commit und Arbeitsstand für die Zuordnung der Ergebnisse"""
+    try:
+        sha = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT_DIR,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return {'sha': sha, 'dirty': dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {'sha': 'unknown', 'dirty': False}
+
+
+def configure_offline(work_dir: Path, base_url: str):
+    """Lenkt LLM, Caches und Metriken auf den Fake bzw. ein temporäres Verzeichnis um"""
+    from src.llm_metrics import metrics_store
+
+    Config.USE_OPENROUTER = True
+    Config.OPENROUTER_API_KEY = 'benchmark'
+    Config.OPENROUTER_BASE_URL = base_url
+    Config.OPENROUTER_MODEL = BENCHMARK_MODEL
+    Config.GITHUB_API_TOKEN = None
+    Config.GITHUB_CACHE_FILE = work_dir / 'github_cache.json'
+    Config.GITHUB_PROJECT_STORE_FILE = work_dir / 'github_projects.json'
+    Config.LLM_METRICS_FILE = work_dir / 'llm_calls.jsonl'
+    metrics_store.metrics_file = Config.LLM_METRICS_FILE
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    """Kennzahlen einer Stufe in Millisekunden"""
+    from src.llm_metrics import percentile
+
+    total = sum(durations)
+    return {
+        'runs': len(durations),
+        'mean_ms': round(total / len(durations) * 1000, 2) if durations else 0.0,
+        'p50_ms': round(percentile(durations, 50) * 1000, 2),
+        'p95_ms': round(percentile(durations, 95) * 1000, 2),
+        'p99_ms': round(percentile(durations, 99) * 1000, 2),
+        'throughput_per_s': round(len(durations) / total, 3) if total else 0.0
+    }
+
+
+def run_pipeline(url: str, components: Dict[str, object], output_dir: Path,
+                 timings: Dict[str, List[float]]):
+    """Ein vollständiger Durchlauf für eine Stellenseite"""
+    personal_info = Config.get_personal_info()
+    job_extractor = components['job_extractor']
+    ai_generator = components['ai_generator']
+    pdf_generator = components['pdf_generator']
+    docx_generator = components['docx_generator']
+
+    pipeline_start = time.perf_counter()
+
+    start = time.perf_counter()
+    job_description = job_extractor.extract_from_url(url)
+    timings['extraction'].append(time.perf_counter() - start)
+
+    # Stellenanalyse separat messen (läuft in der Generierung erneut)
+    start = time.perf_counter()
+    ai_generator.job_analyzer.analyze_job(
+        job_description.position, job_description.description, job_description.requirements
+    )
+    analysis_duration = time.perf_counter() - start
+    timings['analysis'].append(analysis_duration)
+
+    start = time.perf_counter()
+    motivation_letter = ai_generator.generate_motivation_letter(job_description, personal_info)
+    timings['generation'].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pdf_generator.create_pdf(motivation_letter, output_dir=str(output_dir))
+    timings['render_pdf'].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    docx_generator.create_docx(motivation_letter)
+    timings['render_docx'].append(time.perf_counter() - start)
+
+    # Ende-zu-Ende ohne die zusätzliche Analyse-Messung
+    timings['end_to_end'].append(time.perf_counter() - pipeline_start - analysis_duration)
+
+
+def run_benchmarks(iterations: int, warmup: int, latency: float, latency_per_token: float,
+                   tail_fraction: float = 0.0, tail_latency: float = 0.0) -> Dict[str, object]:
+    """Führt alle Benchmarks aus und gibt das Ergebnis-Dictionary zurück"""
+    pages = load_job_pages()
+    timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+
+    with tempfile.TemporaryDirectory(prefix='am_bench_') as tmp, \
+            FakeLLMServer(latency, latency_per_token, tail_fraction=tail_fraction,
+                          tail_latency=tail_latency) as server, \
+            OfflineHTTP() as offline:
+        work_dir = Path(tmp)
+        configure_offline(work_dir, server.base_url)
+
+        from src.job_extractor import JobExtractor
+        from src.ai_generator import AIGenerator
+        from src.template_pdf_generator import TemplateBasedPDFGenerator
+        from src.docx_generator import DocxGenerator
+        from src.llm_metrics import metrics_store
+
+        docx_generator = DocxGenerator()
+        docx_generator.output_dir = str(work_dir)
+        components = {
+            'job_extractor': JobExtractor(),
+            'ai_generator': AIGenerator(),
+            'pdf_generator': TemplateBasedPDFGenerator(str(ROOT_DIR / 'templates' / 'template.pdf')),
+            'docx_generator': docx_generator
+        }
+
+        for _ in range(warmup):
+            for url in pages:
+                run_pipeline(url, components, work_dir, {stage: [] for stage in STAGES})
+
+        metrics_store.session_records.clear()
+        requests_before = offline.request_count
+
+        for iteration in range(iterations):
+            for url in pages:
+                run_pipeline(url, components, work_dir, timings)
+            console.print(f"  Iteration {iteration + 1}/{iterations} abgeschlossen")
+
+        runs = iterations * len(pages)
+        llm_rollup = metrics_store.rollup(metrics_store.session_records, ('stage',))
+        http_requests = offline.request_count - requests_before
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {
+            'iterations': iterations,
+            'warmup': warmup,
+            'pages': len(pages),
+            'llm_latency_s': latency,
+            'llm_latency_per_token_s': latency_per_token,
+            'llm_tail_fraction': tail_fraction,
+            'llm_tail_latency_s': tail_latency,
+            'sectioned_generation': Config.SECTIONED_GENERATION,
+            'hedged_requests': Config.HEDGED_REQUESTS
+        },
+        'stages': {stage: summarize(durations) for stage, durations in timings.items()},
+        'llm_calls_per_run': {
+            stage: round(stats['calls'] / runs, 2) for (stage,), stats in llm_rollup.items()
+        },
+        'http_requests_per_run': round(http_requests / runs, 2)
+    }
+
+
+def save_results(results: Dict[str, object]) -> Path:
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    suffix = results['git']['sha'] + ('-dirty' if results['git']['dirty'] else '')
+    path = RESULTS_DIR / f"{timestamp}_{suffix}.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def load_baseline(compare: str) -> Optional[Dict[str, object]]:
+    """Lädt ein früheres Ergebnis ('latest' = jüngstes in benchmarks/results)"""
+    if compare == 'latest':
+        candidates = sorted(RESULTS_DIR.glob('*.json'))
+        if not candidates:
+            return None
+        path = candidates[-1]
+    else:
+        path = Path(compare)
+    with open(path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    baseline['_path'] = str(path)
+    return baseline
+
+
+def print_results(results: Dict[str, object], baseline: Optional[Dict[str, object]] = None):
+    """Gibt die Kennzahlen pro Stufe aus (optional mit Abweichung zur Baseline)"""
+    title = f"⏱️  Benchmark {results['git']['sha']}"
+    if baseline:
+        title += f" vs. {baseline['git']['sha']}"
+
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Stufe", style="cyan")
+    table.add_column("Läufe", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("Durchsatz/s", justify="right")
+    if baseline:
+        table.add_column("Δ p50", justify="right")
+        table.add_column("Δ p95", justify="right")
+        table.add_column("Δ p99", justify="right")
+
+    for stage in STAGES:
+        stats = results['stages'][stage]
+        row = [stage, str(stats['runs']), f"{stats['p50_ms']:.1f} ms",
+               f"{stats['p95_ms']:.1f} ms", f"{stats.get('p99_ms', 0.0):.1f} ms",
+               f"{stats['throughput_per_s']:.2f}"]
+        if baseline:
+            base = baseline['stages'].get(stage)
+            for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+                if base and base.get(key):
+                    delta = (stats[key] - base[key]) / base[key] * 100
+                    color = 'red' if delta > 10 else 'green' if delta < -10 else 'white'
+                    row.append(f"[{color}]{delta:+.1f}%[/{color}]")
+                else:
+                    row.append('-')
+        table.add_row(*row)
+
+    console.print(table)
+    calls = ', '.join(f"{stage} {count}" for stage, count in results['llm_calls_per_run'].items())
+    console.print(f"LLM-Aufrufe pro Lauf: {calls or '-'}")
+    console.print(f"HTTP-Anfragen pro Lauf: {results['http_requests_per_run']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline-Benchmarks der Pipeline")
+    parser.add_argument('--iterations', type=int, default=5, help="Durchläufe über alle Stellenseiten")
+    parser.add_argument('--warmup', type=int, default=1, help="Verworfene Aufwärm-Durchläufe")
+    parser.add_argument('--latency', type=float, default=0.05, help="LLM-Grundlatenz pro Aufruf in Sekunden")
+    parser.add_argument('--latency-per-token', type=float, default=0.0,
+                        help="Zusätzliche LLM-Latenz pro Output-Token in Sekunden")
+    parser.add_argument('--sectioned', action='store_true',
+                        help="Brieftext abschnittsweise parallel generieren (SECTIONED_GENERATION)")
+    parser.add_argument('--tail-fraction', type=float, default=0.0,
+                        help="Anteil langsamer LLM-Ausreißer (z.B. 0.05)")
+    parser.add_argument('--tail-latency', type=float, default=2.0,
+                        help="Zusätzliche Latenz der Ausreißer in Sekunden")
+    parser.add_argument('--hedge', action='store_true',
+                        help="Langsame LLM-Aufrufe hedgen (HEDGED_REQUESTS)")
+    parser.add_argument('--compare', help="Ergebnisdatei (oder 'latest') als Vergleichsbasis")
+    parser.add_argument('--no-save', action='store_true', help="Ergebnis nicht speichern")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.sectioned:
+        Config.SECTIONED_GENERATION = True
+    if args.hedge:
+        Config.HEDGED_REQUESTS = True
+    # Vergleichsbasis vor dem Speichern laden, damit 'latest' nicht der aktuelle Lauf ist
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    console.print(f"🏁 Benchmark: {args.iterations} Iterationen, LLM-Latenz {args.latency}s "
+                  f"+ {args.latency_per_token}s/Token")
+    results = run_benchmarks(args.iterations, args.warmup, args.latency, args.latency_per_token,
+                             args.tail_fraction, args.tail_latency)
+
+    print_results(results, baseline)
+    if not args.no_save:
+        path = save_results(results)
+        console.print(f"💾 Ergebnis gespeichert: [bold blue]{path}[/bold blue]")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,45 @@ class Config:
     OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo-instruct')
     OPENAI_TEMPERATURE = float(os.getenv('OPENAI_TEMPERATURE', '0.7'))
     
+    # Token-Budgets für Prompts
+    PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '6000'))
+    EXTRACTION_TOKEN_BUDGET = int(os.getenv('EXTRACTION_TOKEN_BUDGET', '2500'))
+    DEFAULT_CONTEXT_WINDOW = int(os.getenv('DEFAULT_CONTEXT_WINDOW', '16385'))
+    
+    # Brieftext in Abschnitten parallel generieren (Einleitung, Erfahrung, Motivation)
+    SECTIONED_GENERATION = os.getenv('SECTIONED_GENERATION', 'false').lower() == 'true'
+    # CLI: Stellenanzeige schon während der Eingaben laden und extrahieren
+    PREFETCH_JOB_PAGE = os.getenv('PREFETCH_JOB_PAGE', 'true').lower() == 'true'
+    # Schnelles Modell für einen sofortigen Entwurf im CLI (leer = aus), z.B. openai/gpt-4o-mini
+    DRAFT_MODEL = os.getenv('DRAFT_MODEL', '')
+    
+    # Modell pro Pipeline-Stufe (leer = schnelles Modell des Providers für Extraktion,
+    # Projektauswahl und Anforderungen bzw. Hauptmodell für das Schreiben)
+    EXTRACTION_MODEL = os.getenv('EXTRACTION_MODEL', '')
+    PROJECT_SELECTION_MODEL = os.getenv('PROJECT_SELECTION_MODEL', '')
+    REQUIREMENTS_MODEL = os.getenv('REQUIREMENTS_MODEL', '')
+    GENERATION_MODEL = os.getenv('GENERATION_MODEL', '')
+    
+    # Adaptive Modellwahl anhand beobachteter Latenz, Fehlerquote und Kosten (src/model_router.py)
+    ADAPTIVE_ROUTING = os.getenv('ADAPTIVE_ROUTING', 'true').lower() == 'true'
+    ROUTER_WINDOW_SECONDS = float(os.getenv('ROUTER_WINDOW_SECONDS', '900'))  # Nur Aufrufe der letzten N Sekunden
+    ROUTER_WINDOW_CALLS = int(os.getenv('ROUTER_WINDOW_CALLS', '50'))  # Höchstens N Aufrufe pro Modell
+    ROUTER_MIN_CALLS = int(os.getenv('ROUTER_MIN_CALLS', '5'))  # Aufrufe, bevor ein Modell bewertet wird
+    ROUTER_MAX_ERROR_RATE = float(os.getenv('ROUTER_MAX_ERROR_RATE', '0.3'))  # Fehler + Timeouts, ab der umgeleitet wird
+    ROUTER_LATENCY_BUDGET = os.getenv('ROUTER_LATENCY_BUDGET', '')  # p95 in Sekunden, z.B. "20" oder "extraction=5,generation=30"
+    ROUTER_COST_BUDGET = os.getenv('ROUTER_COST_BUDGET', '')  # USD pro Aufruf, gleiches Format
+    ROUTER_FALLBACK_MODELS = os.getenv('ROUTER_FALLBACK_MODELS', '')  # z.B. "openai:gpt-4o-mini,anthropic/claude-3-haiku"
+    
+    # Hedging: zweite Anfrage, wenn ein Aufruf länger als das p90 seiner Stufe braucht (src/hedging.py)
+    HEDGED_REQUESTS = os.getenv('HEDGED_REQUESTS', 'false').lower() == 'true'
+    HEDGE_PERCENTILE = float(os.getenv('HEDGE_PERCENTILE', '90'))
+    HEDGE_BUDGET = float(os.getenv('HEDGE_BUDGET', '0.1'))  # Höchstanteil zusätzlicher Anfragen (0.1 = 10 %)
+    HEDGE_MIN_SAMPLES = int(os.getenv('HEDGE_MIN_SAMPLES', '10'))  # Beobachtete Aufrufe pro Stufe und Modell
+    HEDGE_TARGET = os.getenv('HEDGE_TARGET', 'same')  # same = gleiches Modell, fallback = Ausweichmodell des Routers
+    
+    # LLM-Metriken (Tokens, Kosten, Latenz pro Aufruf)
+    LLM_METRICS_FILE = Path(os.getenv('LLM_METRICS_FILE', Path(__file__).parent.parent / 'metrics' / 'llm_calls.jsonl'))
+    
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
@@ -34,6 +73,32 @@ class Config:
     GITHUB_API_TOKEN = os.getenv('GITHUB_API_TOKEN')
     GITHUB_CACHE_DURATION = 3600  # 1 Stunde in Sekunden
     GITHUB_CACHE_FILE = Path(__file__).parent / 'github_cache.json'
+    _github_cache_memo = None  # (Pfad, mtime, Daten) - vermeidet erneutes Parsen in langlebigen Prozessen
+    GITHUB_PROJECT_STORE_FILE = Path(os.getenv('GITHUB_PROJECT_STORE_FILE', Path(__file__).parent / 'github_projects.json'))
+    
+    # Duplikat-Erkennung (quer gepostete Stellen)
+    DUPLICATE_INDEX_FILE = Path(os.getenv('DUPLICATE_INDEX_FILE', Path(__file__).parent / 'duplicate_index.json'))
+    DUPLICATE_THRESHOLD = float(os.getenv('DUPLICATE_THRESHOLD', '0.8'))
+    
+    # Batch-Verarbeitung (persistente Warteschlange)
+    BATCH_QUEUE_FILE = Path(os.getenv('BATCH_QUEUE_FILE', Path(__file__).parent / 'job_queue.sqlite3'))
+    BATCH_MAX_RETRIES = int(os.getenv('BATCH_MAX_RETRIES', '3'))
+    BATCH_RETRY_DELAY = float(os.getenv('BATCH_RETRY_DELAY', '30'))  # Sekunden, verdoppelt sich pro Versuch
+    BATCH_VISIBILITY_TIMEOUT = float(os.getenv('BATCH_VISIBILITY_TIMEOUT', '300'))  # Lease-Dauer in Sekunden
+    BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', '1'))
+    
+    # API-Server (server.py)
+    SERVER_HOST = os.getenv('SERVER_HOST', '127.0.0.1')
+    SERVER_PORT = int(os.getenv('SERVER_PORT', '8000'))
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', '2'))
+    SERVER_QUEUE_TIMEOUT = float(os.getenv('SERVER_QUEUE_TIMEOUT', '30'))  # Sekunden Warten auf freien Worker
+    SERVER_SAVE_FILES = os.getenv('SERVER_SAVE_FILES', 'false').lower() == 'true'  # PDF/DOCX zusätzlich nach output/api/
+    
+    # Rendering
+    DOCX_FAST_WRITER = os.getenv('DOCX_FAST_WRITER', 'false').lower() == 'true'  # DOCX direkt als XML statt python-docx
+    PDF_FONT_DIR = os.getenv('PDF_FONT_DIR', 'fonts')  # Aptos-Display.ttf + Aptos-Display-Bold.ttf (sonst Helvetica)
+    PDF_CANVAS_RENDERER = os.getenv('PDF_CANVAS_RENDERER', 'true').lower() == 'true'  # Einseitige PDFs direkt auf den Canvas
+    LAYOUT_CACHE_SIZE = int(os.getenv('LAYOUT_CACHE_SIZE', '2048'))  # Umbrochene Absätze im Speicher (0 = aus)
     
     # App Settings
     USE_OPENROUTER = bool(OPENROUTER_API_KEY)
@@ -56,6 +121,16 @@ class Config:
                 'provider': 'openai'
             }
     
+    @classmethod
+    def get_stage_model(cls, stage: str) -> str:
+        """Konfiguriertes Modell einer Pipeline-Stufe (leer = Standard)"""
+        return {
+            'extraction': cls.EXTRACTION_MODEL,
+            'project_selection': cls.PROJECT_SELECTION_MODEL,
+            'requirements': cls.REQUIREMENTS_MODEL,
+            'generation': cls.GENERATION_MODEL
+        }.get(stage) or ''
+    
     @classmethod
     def get_personal_info(cls):
         """Gibt die persönlichen Informationen zurück"""
@@ -131,11 +206,17 @@ class Config:
     
     @classmethod
     def _load_github_cache(cls):
-        """Lädt GitHub-Cache aus Datei"""
+        """Lädt GitHub-Cache aus Datei (nur erneut, wenn sich die Datei geändert hat)"""
         try:
             if cls.GITHUB_CACHE_FILE.exists():
+                mtime = cls.GITHUB_CACHE_FILE.stat().st_mtime_ns
+                memo = cls._github_cache_memo
+                if memo and memo[0] == cls.GITHUB_CACHE_FILE and memo[1] == mtime:
+                    return memo[2]
                 with open(cls.GITHUB_CACHE_FILE, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    data = json.load(f)
+                cls._github_cache_memo = (cls.GITHUB_CACHE_FILE, mtime, data)
+                return data
         except Exception as e:
             print(f"Fehler beim Laden des GitHub-Cache: {e}")
         return None
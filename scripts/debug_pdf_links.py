@@ -5,6 +5,13 @@ Test-Skript für GitHub-Links in PDF
 
 from src.pdf_generator import PDFGenerator
 from src.models import MotivationLetter
+from src.letter_layout import Block, link_runs, reportlab_markup
+from config.config import Config
+
+
+def add_links(text):
+    """ReportLab-Markup eines Absatzes mit GitHub- und LinkedIn-Links"""
+    return reportlab_markup(Block(link_runs(text, Config.get_github_project_urls(), Config.PERSONAL_LINKEDIN)))
 
 # Test-Motivationsschreiben mit GitHub-Projekten
 test_letter = MotivationLetter(
@@ -28,12 +35,12 @@ print(f"PDF erstellt: {filepath}")
 # Test der GitHub-Link-Verarbeitung
 print("\nTest der GitHub-Link-Verarbeitung:")
 paragraph_text = "Ich habe bereits an mehreren Projekten gearbeitet, darunter AutomaticMotivation und ZurdLLMWS. Diese Projekte zeigen meine Fähigkeiten in der Softwareentwicklung."
-processed_text = generator._add_github_links_to_paragraph(paragraph_text)
+processed_text = add_links(paragraph_text)
 print(f"Original: {paragraph_text}")
 print(f"Verarbeitet: {processed_text}")
 
 # LinkedIn-Test
 linkedin_text = "Mein LinkedIn-Profil finden Sie unter meinem Namen."
-processed_linkedin = generator._add_github_links_to_paragraph(linkedin_text)
+processed_linkedin = add_links(linkedin_text)
 print(f"LinkedIn Original: {linkedin_text}")
 print(f"LinkedIn Verarbeitet: {processed_linkedin}")
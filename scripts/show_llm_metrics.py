@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Auswertung der LLM-Metriken (Tokens, Kosten, Latenz) pro Stufe und Modell
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# Pfad zum Hauptverzeichnis hinzufügen
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from rich.console import Console
+from rich.table import Table
+from src.llm_metrics import LLMMetricsStore
+
+console = Console()
+
+def print_rollup(title: str, rollup: dict, key_names: list):
+    """Gibt eine Auswertung als Tabelle aus"""
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    for name in key_names:
+        table.add_column(name, style="cyan")
+    table.add_column("Aufrufe", justify="right")
+    table.add_column("Fehler", justify="right")
+    table.add_column("Input", justify="right")
+    table.add_column("Output", justify="right")
+    table.add_column("Kosten", justify="right", style="yellow")
+    table.add_column("Zeit gesamt", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+
+    for group_key, stats in sorted(rollup.items(), key=lambda item: -item[1]['latency_total']):
+        table.add_row(
+            *[str(value) for value in group_key],
+            str(stats['calls']),
+            str(stats['errors'] + stats['timeouts']),
+            str(stats['input_tokens']),
+            str(stats['output_tokens']),
+            f"${stats['cost']:.4f}",
+            f"{stats['latency_total']:.1f}s",
+            f"{stats['latency_p50']:.2f}s",
+            f"{stats['latency_p95']:.2f}s"
+        )
+
+    console.print(table)
+
+def show_llm_metrics(hours: float = None):
+    """Zeigt die LLM-Metriken pro Stufe und pro Modell"""
+    store = LLMMetricsStore()
+    since = time.time() - hours * 3600 if hours else None
+    records = store.load(since=since)
+
+    if not records:
+        console.print(f"Keine LLM-Metriken gefunden in {store.metrics_file}")
+        return
+
+    console.print(f"📊 {len(records)} LLM-Aufrufe aus {store.metrics_file}\n")
+    print_rollup("Pro Stufe", store.rollup(records, ('stage',)), ["Stufe"])
+    print_rollup("Pro Modell", store.rollup(records, ('provider', 'model')), ["Provider", "Modell"])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM-Metriken auswerten")
+    parser.add_argument('--hours', type=float, help="Nur Aufrufe der letzten N Stunden")
+    args = parser.parse_args()
+
+    show_llm_metrics(args.hours)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Modellwahl pro Stufe anhand der gespeicherten LLM-Metriken: Kandidaten, Kennzahlen
+und das Modell, das der Router für den nächsten Aufruf wählen würde
+"""
+
+import sys
+import os
+import argparse
+
+# Pfad zum Hauptverzeichnis hinzufügen
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from rich.console import Console
+from rich.table import Table
+from src.llm_metrics import LLMMetricsStore
+from src.model_router import ModelRouter
+
+console = Console()
+
+STAGES = ['extraction', 'project_selection', 'requirements', 'generation']
+
+def show_model_routing(window_minutes: float = None):
+    """Zeigt pro Stufe die Kandidaten mit Kennzahlen und die Routing-Entscheidung"""
+    store = LLMMetricsStore()
+    router = ModelRouter(store, window_seconds=window_minutes * 60 if window_minutes else None)
+    console.print(f"🧭 Routing aus {store.metrics_file} (Zeitfenster {router.window_seconds / 60:.0f} min)\n")
+
+    for stage in STAGES:
+        decision = router.choose(stage, record=False)
+        table = Table(title=f"{stage}: {decision.model} ({decision.provider})", caption=decision.reason,
+                      show_header=True, header_style="bold magenta")
+        table.add_column("Modell", style="cyan")
+        table.add_column("Provider", style="yellow")
+        table.add_column("Aufrufe", justify="right")
+        table.add_column("Fehler", justify="right")
+        table.add_column("Timeouts", justify="right")
+        table.add_column("p50", justify="right")
+        table.add_column("p95", justify="right")
+        table.add_column("Kosten/Aufruf", justify="right", style="yellow")
+        table.add_column("Status")
+
+        for stats in decision.candidates:
+            status = "🔴 gestört" if stats.degraded else ("🟢 im Budget" if stats.within_budget else "🟡 über Budget")
+            table.add_row(
+                ("➜ " if stats.model == decision.model and stats.provider == decision.provider else "") + stats.model,
+                stats.provider,
+                str(stats.calls),
+                f"{stats.error_rate:.0%}",
+                f"{stats.timeout_rate:.0%}",
+                f"{stats.latency_p50:.2f}s",
+                f"{stats.latency_p95:.2f}s",
+                f"${stats.cost_per_call:.4f}",
+                status
+            )
+
+        console.print(table)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Modellwahl pro Stufe anzeigen")
+    parser.add_argument('--window', type=float, help="Zeitfenster in Minuten (Standard: ROUTER_WINDOW_SECONDS)")
+    args = parser.parse_args()
+
+    show_model_routing(args.window)
@@ -36,8 +36,9 @@ def test_full_functionality():
     print("\nTeste DOCX-Link-Verarbeitung...")
     test_text = "Ich habe an AutomaticMotivation, ZurdLLMWS und python-ftp-data-uploader gearbeitet."
     
-    # Simuliere _add_text_with_github_links
+    # Link-Erkennung wie im Brief-Layout
     from config.config import Config
+    from src.letter_layout import Block, link_runs, reportlab_markup
     import re
     
     project_urls = Config.get_github_project_urls()
@@ -52,7 +53,7 @@ def test_full_functionality():
         print(f"  {match} -> {url}")
     
     print("\nTeste PDF-Link-Verarbeitung...")
-    processed_text = pdf_generator._add_github_links_to_paragraph(test_text)
+    processed_text = reportlab_markup(Block(link_runs(test_text, project_urls, Config.PERSONAL_LINKEDIN)))
     print(f"Original: {test_text}")
     print(f"Verarbeitet: {processed_text}")
 
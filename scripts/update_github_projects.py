@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+GitHub-Projekt-Store aktualisieren (Metadaten und README-Zusammenfassungen)
+"""
+
+import sys
+import os
+import argparse
+
+# Pfad zum Hauptverzeichnis hinzufügen
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config.config import Config
+from src.github_project_store import GitHubProjectStore
+
+def update_github_projects(force: bool = False):
+    """Aktualisiert den persistenten GitHub-Projekt-Store"""
+    username = Config.get_github_username()
+    if not username:
+        print("❌ PERSONAL_GITHUB ist nicht konfiguriert")
+        return False
+
+    print("=" * 60)
+    print(f"🔄 Aktualisiere GitHub-Projekt-Store für {username}")
+    print("=" * 60)
+
+    store = GitHubProjectStore()
+    if not store.refresh(username, force=force):
+        print("❌ Aktualisierung fehlgeschlagen - bestehender Store bleibt erhalten")
+        return False
+
+    projects = store.get_projects(username, refresh=False)
+    for project in projects:
+        print(f"\n📦 {project.name} ({project.language or 'unbekannt'}, {project.stars} ⭐)")
+        print(f"   {project.description or '-'}")
+        if project.readme_summary:
+            print(f"   README: {project.readme_summary}")
+
+    print(f"\n✅ {len(projects)} Projekte gespeichert in {store.store_file}")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GitHub-Projekt-Store aktualisieren")
+    parser.add_argument('--force', action='store_true', help="Alle READMEs neu laden")
+    args = parser.parse_args()
+
+    sys.exit(0 if update_github_projects(force=args.force) else 1)
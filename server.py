@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+AutoMoti Server - Langlebiger HTTP-API-Server
+
+    python server.py [--host 127.0.0.1] [--port 8000] [--workers 2]
+
+    POST /letters   {"url": "..."} oder {"job_info": {...}}, optional "personal_info",
+                    "include_content": false (ohne Base64), "save_files": true (auch auf Festplatte)
+    POST /letters?format=pdf|docx   Dokument direkt als Datei-Download streamen
+    POST /letters/revise   {"letter": {...}, "job_info": {...}, "paragraph": 2}, optional
+                    "instruction": "..." - überarbeitet nur diesen Absatz und rendert neu
+    GET  /health    Status und freie Worker
+    GET  /routing   Modellwahl pro Stufe mit Begründung und Kennzahlen (src/model_router.py)
+
+Importe, LLM-Clients, Template-Analyse und Caches werden einmal beim Start
+aufgebaut und über alle Anfragen geteilt.
+"""
+
+import json
+import logging
+import argparse
+from urllib.parse import urlsplit, parse_qs, quote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from rich.console import Console
+from config.config import Config
+from src.letter_service import LetterService, ServiceBusyError
+
+console = Console()
+
+logging.basicConfig(
+    level=getattr(logging, Config.LOG_LEVEL),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MAX_BODY_SIZE = 1024 * 1024
+CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+}
+
+
+class LetterRequestHandler(BaseHTTPRequestHandler):
+    """HTTP-Handler für /letters, /health und /routing"""
+
+    server_version = "AutoMoti/1.0"
+
+    @property
+    def service(self) -> LetterService:
+        return self.server.service
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/health':
+            self._send_json(200, {
+                'status': 'ok',
+                'workers': self.service.workers,
+                'available': self.service.available,
+                **self.service.stats
+            })
+        elif self.path.rstrip('/') == '/routing':
+            from src.model_router import get_model_router
+            self._send_json(200, get_model_router().snapshot())
+        else:
+            self._send_json(404, {'error': 'Nicht gefunden'})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/')
+        if path not in ('/letters', '/letters/revise'):
+            self._send_json(404, {'error': 'Nicht gefunden'})
+            return
+        document_format = parse_qs(url.query).get('format', [None])[0]
+        if document_format is not None and path == '/letters/revise':
+            self._send_json(400, {'error': "'format' wird nur von /letters unterstützt"})
+            return
+        if document_format is not None and document_format not in CONTENT_TYPES:
+            self._send_json(400, {'error': f"Unbekanntes Format: {document_format} (pdf oder docx)"})
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0 or length > MAX_BODY_SIZE:
+            self._send_json(400 if length <= 0 else 413, {'error': 'Ungültige Anfragegröße'})
+            return
+        try:
+            payload = json.loads(self.rfile.read(length))
+            if not isinstance(payload, dict):
+                raise ValueError("JSON-Objekt erwartet")
+        except ValueError as e:
+            self._send_json(400, {'error': f"Ungültiges JSON: {e}"})
+            return
+
+        try:
+            if path == '/letters/revise':
+                result = self.service.revise_paragraph(payload, include_content=payload.get('include_content', True))
+                self._send_json(200, result)
+            elif document_format:
+                result = self.service.render_letter(payload)
+                self._send_document(result['documents'][document_format], document_format, result['id'])
+            else:
+                result = self.service.create_letter(payload, include_content=payload.get('include_content', True))
+                self._send_json(200, result)
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+        except ServiceBusyError as e:
+            self._send_json(503, {'error': str(e)}, {'Retry-After': '5'})
+        except Exception as e:
+            logger.error(f"Fehler bei POST {path}: {e}")
+            self._send_json(500, {'error': str(e)})
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_document(self, document: dict, document_format: str, request_id: str):
+        """Schickt die im Speicher gerenderten Bytes ohne Umweg über die Festplatte"""
+        content = document['content']
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPES[document_format])
+        self.send_header('Content-Length', str(len(content)))
+        # Header sind Latin-1: ASCII-Fallback plus UTF-8-Name nach RFC 5987
+        ascii_name = document['filename'].encode('ascii', 'replace').decode('ascii').replace('?', '_')
+        self.send_header('Content-Disposition',
+                         f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(document['filename'])}")
+        self.send_header('X-Request-Id', request_id)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} - {format % args}")
+
+
+class LetterServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer mit geteiltem LetterService"""
+
+    daemon_threads = True
+
+    def __init__(self, address, service: LetterService):
+        super().__init__(address, LetterRequestHandler)
+        self.service = service
+
+
+def parse_args():
+    """Liest die Kommandozeilen-Argumente"""
+    parser = argparse.ArgumentParser(description="AutomaticMotivation - HTTP-API-Server")
+    parser.add_argument('--host', default=Config.SERVER_HOST, help="Adresse (Standard: %(default)s)")
+    parser.add_argument('--port', type=int, default=Config.SERVER_PORT, help="Port (Standard: %(default)s)")
+    parser.add_argument('--workers', type=int, default=Config.SERVER_WORKERS,
+                        help="Gleichzeitig bearbeitete Anfragen (Standard: %(default)s)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with console.status(f"[bold blue]Wärme {args.workers} Pipelines vor...[/bold blue]"):
+        service = LetterService(workers=args.workers)
+
+    server = LetterServer((args.host, args.port), service)
+    console.print(f"🚀  [bold green]AutoMoti-Server läuft auf http://{args.host}:{server.server_port}[/bold green] "
+                  f"({args.workers} Worker)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n👋  [yellow]Server beendet.[/yellow]")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
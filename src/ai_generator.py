@@ -1,49 +1,89 @@
-from langchain_openai import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
 from config.config import Config
 from src.models import JobInfo, JobDescription, MotivationLetter
 from src.github_project_extractor import GitHubProjectExtractor
 from src.linkedin_extractor import LinkedInExtractor
 from src.intelligent_job_analyzer import IntelligentJobAnalyzer, JobCategory
 from src.recipient_controller import RecipientController
+from src.llm_utils import LLMFactory
+from src.llm_metrics import tracked_invoke
+from src.profiler import profiler
+from src.letter_layout import SALUTATION_PREFIXES, CLOSING_PREFIXES
+from src.token_budget import TokenBudgeter, PromptSection, deduplicate_text, count_tokens, truncate_to_tokens
 
 logger = logging.getLogger(__name__)
 
+MOTIVATION_SYSTEM_PROMPT = """Du bist ein Experte für das Schreiben von überzeugenden Motivationsschreiben. 
+                Erstelle ein professionelles, spezifisches Motivationsschreiben auf Deutsch, das:
+                1. Direkt auf die Stellenbeschreibung und spezifische Anforderungen eingeht
+                2. Konkrete Projekterfahrungen mit messbaren Erfolgen hervorhebt
+                3. Spezifische Technologien und Kennzahlen erwähnt
+                4. Beratungs- und Teamarbeitserfahrung betont
+                5. Branchen-spezifische Kenntnisse demonstriert
+                6. Eine klare Problem-Lösung-Erfolg Struktur verwendet
+                7. Formell aber persönlich und überzeugend ist
+                8. Konkrete Beispiele statt allgemeiner Aussagen nutzt"""
+
+PARAGRAPH_SYSTEM_PROMPT = """Du bist ein Experte für das Schreiben von überzeugenden Motivationsschreiben.
+                Du überarbeitest einen einzelnen Absatz eines bestehenden Motivationsschreibens auf Deutsch.
+                Der neue Absatz fügt sich nahtlos zwischen die Nachbarabsätze ein und du gibst
+                ausschließlich diesen Absatz zurück."""
+
+# Anfang des fest vorgegebenen Schlusssatzes (siehe _create_motivation_prompt)
+FINAL_SENTENCE_PREFIX = ("Ich freue mich darauf, Sie in einem persönlichen Gespräch von meiner Motivation und "
+                         "Eignung zu überzeugen")
+
+# Obergrenze der Antwort relativ zur Länge des alten Absatzes
+PARAGRAPH_OUTPUT_FACTOR = 2
+PARAGRAPH_MIN_OUTPUT_TOKENS = 150
+JOB_SUMMARY_TOKENS = 200
+
+# Abschnitte der parallelen Generierung: (Name, Titel, Aufgabe, max. Output-Tokens).
+# Der Schluss ist als fester Schlusssatz vorgegeben und braucht keinen eigenen Aufruf.
+LETTER_SECTIONS = [
+    ('introduction', 'EINLEITUNG',
+     "Ein Absatz (3-4 Sätze) mit Bezug auf Stelle und Unternehmen und dem Grund der Bewerbung", 250),
+    ('experience', 'ERFAHRUNG',
+     "Ein bis zwei Absätze mit konkreter Berufserfahrung, Technologien und messbaren Erfolgen "
+     "passend zu den Schlüsselanforderungen", 500),
+    ('motivation', 'MOTIVATION',
+     "Ein Absatz dazu, was an Stelle und Unternehmen reizt und was die Bewerbung ins Team einbringt "
+     "(Arbeitsweise, Zusammenarbeit)", 300),
+]
+
+
+def letter_paragraphs(content: str) -> list:
+    """Nicht-leere Absätze eines Brieftexts (getrennt durch Leerzeilen)"""
+    return [paragraph.strip() for paragraph in content.split('\n\n') if paragraph.strip()]
+
+
+def revisable_paragraphs(content: str) -> list:
+    """Indizes der überarbeitbaren Absätze (ohne Anrede, festen Schlusssatz und Grußformel)"""
+    return [
+        index for index, paragraph in enumerate(letter_paragraphs(content))
+        if not (paragraph.startswith(SALUTATION_PREFIXES) and len(paragraph.split()) <= 8)
+        and not paragraph.startswith(CLOSING_PREFIXES + (FINAL_SENTENCE_PREFIX,))
+    ]
+
+
 class AIGenerator:
     def __init__(self):
         self.config = Config.get_llm_config()
         self.llm = self._initialize_llm()
+        self.requirements_llm = self._initialize_llm('requirements', max_tokens=500)
         self.github_extractor = GitHubProjectExtractor()
         self.linkedin_extractor = LinkedInExtractor()
         self.job_analyzer = IntelligentJobAnalyzer()
         self.recipient_controller = RecipientController()
+        self.last_prompt_report = None
         
-    def _initialize_llm(self):
-        """Initialisiert das LLM basierend auf der Konfiguration"""
+    def _initialize_llm(self, stage: str = 'generation', **kwargs):
+        """Initialisiert das LLM einer Stufe (Schreiben standardmäßig mit dem Hauptmodell)"""
         try:
-            if self.config['provider'] == 'openrouter':
-                # OpenRouter mit OpenAI-kompatibler API
-                llm = ChatOpenAI(
-                    api_key=self.config['api_key'],
-                    base_url=self.config['base_url'],
-                    model=self.config['model'],
-                    temperature=0.7,
-                    max_tokens=2000
-                )
-                logger.info(f"OpenRouter LLM initialisiert mit Model: {self.config['model']}")
-            else:
-                # Standard OpenAI
-                llm = ChatOpenAI(
-                    api_key=self.config['api_key'],
-                    model=self.config['model'],
-                    temperature=self.config['temperature'],
-                    max_tokens=2000
-                )
-                logger.info(f"OpenAI LLM initialisiert mit Model: {self.config['model']}")
-            
-            return llm
-            
+            return LLMFactory.create_llm_for_stage(stage, **kwargs)
         except Exception as e:
             logger.error(f"Fehler bei LLM-Initialisierung: {e}")
             raise
@@ -94,103 +134,337 @@ class AIGenerator:
             return "Sehr geehrte Damen und Herren,"
     
     def generate_motivation_letter(self, job_description: JobDescription, 
-                                 personal_info: dict = None) -> MotivationLetter:
+                                 personal_info: dict = None, sectioned: bool = None) -> MotivationLetter:
         """
         Generiert ein Motivationsschreiben basierend auf der Stellenbeschreibung
         
         Args:
             job_description: Extrahierte Stellenbeschreibung
             personal_info: Persönliche Informationen des Bewerbers
+            sectioned: Abschnitte parallel generieren (Standard: Config.SECTIONED_GENERATION)
             
         Returns:
             MotivationLetter: Generiertes Motivationsschreiben
         """
         try:
-            # Verwende Config-Werte falls personal_info nicht gegeben
-            if personal_info is None:
-                personal_info = Config.get_personal_info()
+            personal_info, normalized_job_description, messages, prompt_parts = self._prepare_generation(
+                job_description, personal_info)
+            content = self._generate_content(messages, prompt_parts, self.llm, sectioned)
+            motivation_letter = self._build_letter(content, normalized_job_description, personal_info)
             
-            # Normalisiere Empfänger-Informationen vor der Verarbeitung
-            normalized_job_description = self.recipient_controller.normalize_recipient_info(job_description)
-            recipient_validation = self.recipient_controller.validate_recipient_info(job_description)
+            logger.info("Motivationsschreiben erfolgreich generiert")
+            return motivation_letter
             
-            # Logge Validierungsergebnisse
-            if recipient_validation['warnings']:
-                logger.warning(f"Empfänger-Informationen Warnungen: {recipient_validation['warnings']}")
-            if recipient_validation['recommendations']:
-                logger.info(f"Empfänger-Informationen Empfehlungen: {recipient_validation['recommendations']}")
+        except Exception as e:
+            logger.error(f"Fehler bei Motivationsschreiben-Generierung: {e}")
+            raise
+    
+    def generate_draft_and_final(self, job_description: JobDescription, draft_llm,
+                                 personal_info: dict = None) -> Tuple[Optional[MotivationLetter], Future]:
+        """
+        Schneller Entwurf mit einem günstigen Modell, finale Fassung im Hintergrund
+        
+        Der Prompt wird einmal gebaut. Das konfigurierte Modell (self.llm) startet sofort in
+        einem Hintergrund-Thread, der Entwurf läuft parallel mit draft_llm und ist in der
+        Regel deutlich früher fertig.
+        
+        Args:
+            job_description: Extrahierte Stellenbeschreibung
+            draft_llm: Schnelles LLM für den Entwurf
+            personal_info: Persönliche Informationen des Bewerbers
             
-            # Intelligente Stellenanalyse durchführen (mit normalisierten Daten)
+        Returns:
+            (Entwurf oder None, falls der Entwurf fehlschlägt; Future mit der finalen Fassung)
+        """
+        personal_info, normalized_job_description, messages, prompt_parts = self._prepare_generation(
+            job_description, personal_info)
+        sectioned = Config.SECTIONED_GENERATION
+        
+        def generate_final() -> MotivationLetter:
+            content = self._generate_content(messages, prompt_parts, self.llm, sectioned)
+            logger.info("Finale Fassung generiert")
+            return self._build_letter(content, normalized_job_description, personal_info)
+        
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='upgrade')
+        final = executor.submit(generate_final)
+        executor.shutdown(wait=False)
+        
+        try:
+            content = self._generate_content(messages, prompt_parts, draft_llm, sectioned, stage='draft')
+            draft = self._build_letter(content, normalized_job_description, personal_info)
+            logger.info(f"Entwurf mit {LLMFactory.describe_llm(draft_llm)[1]} generiert")
+        except Exception as e:
+            logger.warning(f"Entwurf fehlgeschlagen, warte auf finale Fassung: {e}")
+            draft = None
+        return draft, final
+    
+    def _prepare_generation(self, job_description: JobDescription, personal_info: Optional[dict]):
+        """
+        Normalisiert den Empfänger, analysiert die Stelle und baut die Nachrichten für das LLM
+        
+        Returns:
+            (personal_info, normalisierte Stellenbeschreibung, Nachrichten,
+             Kontext für die abschnittsweise Generierung)
+        """
+        # Verwende Config-Werte falls personal_info nicht gegeben
+        if personal_info is None:
+            personal_info = Config.get_personal_info()
+        
+        # Normalisiere Empfänger-Informationen vor der Verarbeitung
+        normalized_job_description = self.recipient_controller.normalize_recipient_info(job_description)
+        recipient_validation = self.recipient_controller.validate_recipient_info(job_description)
+        
+        # Logge Validierungsergebnisse
+        if recipient_validation['warnings']:
+            logger.warning(f"Empfänger-Informationen Warnungen: {recipient_validation['warnings']}")
+        if recipient_validation['recommendations']:
+            logger.info(f"Empfänger-Informationen Empfehlungen: {recipient_validation['recommendations']}")
+        
+        # Intelligente Stellenanalyse durchführen (mit normalisierten Daten)
+        with profiler.span('job_analysis'):
             job_analysis = self.job_analyzer.analyze_job(
                 normalized_job_description.position,
                 normalized_job_description.description,
                 normalized_job_description.requirements
             )
+        
+        # Speichere die Analyse für späteren Zugriff
+        self._current_job_analysis = job_analysis
+        
+        logger.info(f"Stellenanalyse: {job_analysis['category'].value} (Confidence: {job_analysis['analysis_confidence']:.2f})")
+        
+        # Prompt für die Motivationsschreiben-Generierung (mit normalisierten Daten)
+        prompt, prompt_parts = self._create_motivation_prompt(normalized_job_description, personal_info)
+        
+        # LLM-Aufruf mit neuer invoke Methode
+        messages = [
+            SystemMessage(content=MOTIVATION_SYSTEM_PROMPT),
+            HumanMessage(content=prompt)
+        ]
+        return personal_info, normalized_job_description, messages, prompt_parts
+    
+    def _generate_content(self, messages: list, prompt_parts: Dict[str, str], llm, sectioned: bool = None,
+                          stage: str = 'generation') -> str:
+        """Brieftext mit einem Aufruf oder abschnittsweise (siehe _generate_sections)"""
+        if sectioned if sectioned is not None else Config.SECTIONED_GENERATION:
+            return self._generate_sections(llm, prompt_parts, stage)
+        return tracked_invoke(llm, messages, stage=stage).content
+    
+    def _build_letter(self, content: str, normalized_job_description: JobDescription,
+                      personal_info: dict) -> MotivationLetter:
+        """Filtert den Brieftext und erstellt das MotivationLetter-Objekt"""
+        # Post-Generation-Filter für IT-Support-Stellen
+        if hasattr(self, '_current_job_analysis') and self._current_job_analysis['category'] == JobCategory.IT_SUPPORT:
+            original_content = content
+            content = self._remove_github_project_mentions(content)
+            if original_content != content:
+                logger.info("IT-Support-Stelle: GitHub-Projekt-Erwähnungen aus Content entfernt")
+            else:
+                logger.info("IT-Support-Stelle: Keine GitHub-Projekt-Erwähnungen im Content gefunden")
+        
+        # MotivationLetter-Objekt erstellen (mit normalisierten Daten)
+        # Subject mit Position und Arbeitszeit kombinieren
+        position_with_hours = normalized_job_description.position
+        if normalized_job_description.working_hours and normalized_job_description.working_hours != "Nicht angegeben":
+            position_with_hours = f"{normalized_job_description.position} {normalized_job_description.working_hours}"
+        
+        return MotivationLetter(
+            recipient_company=normalized_job_description.company,
+            recipient_company_address=normalized_job_description.address,
+            recipient_name=normalized_job_description.contact_person or normalized_job_description.company,
+            recipient_address=normalized_job_description.location,  # Nutze location für Kontaktperson-Adresse
+            subject=f"Bewerbung als {position_with_hours}",
+            content=content,
+            sender_name=personal_info["name"],
+            sender_address=personal_info["address"],
+            sender_phone=personal_info["phone"],
+            sender_email=personal_info["email"]
+        )
+    
+    def _generate_sections(self, llm, parts: Dict[str, str], stage: str = 'generation') -> str:
+        """
+        Generiert die Abschnitte des Brieftexts gleichzeitig und setzt sie zusammen
+        
+        Alle Aufrufe teilen den Kontext aus _create_motivation_prompt; die Wartezeit
+        entspricht damit ungefähr dem längsten Abschnitt statt dem ganzen Brief.
+        Anrede und Schlusssatz werden fest gesetzt, nicht generiert.
+        
+        Args:
+            llm: LLM für die Abschnitte
+            parts: Gemeinsamer Kontext, Anrede und Schlusssatz (aus _create_motivation_prompt)
+            stage: Stufe für die Metriken
+        
+        Returns:
+            Brieftext mit Anrede, Abschnitten und Schlusssatz
+        """
+        overview = '\n'.join(f"        - {title}: {task}" for _, title, task, _ in LETTER_SECTIONS)
+        
+        def generate(section) -> str:
+            name, title, task, max_tokens = section
+            prompt = parts['context'] + f"""
+        ABSCHNITTSWEISE GENERIERUNG:
+        Das Motivationsschreiben entsteht in Abschnitten, die gleichzeitig geschrieben werden:
+{overview}
+        - SCHLUSS: "{parts['final_sentence']}" (fest vorgegeben)
+        
+        SCHREIBE NUR DEN ABSCHNITT {title}: {task}
+        1. Keine Anrede, keine Grußformel, kein Name und keine Überschrift
+        2. Nimm keine Inhalte der anderen Abschnitte vorweg
+        3. Formell aber persönlich, auf Deutsch
+        """
+            messages = [
+                SystemMessage(content=MOTIVATION_SYSTEM_PROMPT),
+                HumanMessage(content=prompt)
+            ]
+            response = tracked_invoke(llm.bind(max_tokens=max_tokens), messages, stage=f'{stage}:{name}')
+            return response.content
+        
+        with ThreadPoolExecutor(max_workers=len(LETTER_SECTIONS), thread_name_prefix='section') as executor:
+            sections = list(executor.map(generate, LETTER_SECTIONS))
+        
+        content = self._stitch_sections(sections, parts['salutation'], parts['final_sentence'])
+        logger.info(f"{len(LETTER_SECTIONS)} Abschnitte parallel generiert ({len(content.split())} Wörter)")
+        return content
+    
+    @staticmethod
+    def _stitch_sections(sections: list, salutation: str, final_sentence: str) -> str:
+        """
+        Konsistenzdurchlauf: setzt die Abschnitte in fester Reihenfolge zusammen
+        
+        Entfernt pro Abschnitt Anreden, Grußformeln, Überschriften und den Schlusssatz
+        sowie Sätze, die schon in einem früheren Abschnitt stehen.
+        """
+        paragraphs = []
+        for section in sections:
+            section = deduplicate_text(section.replace(final_sentence, ''), paragraphs)
+            for paragraph in letter_paragraphs(section):
+                paragraph = paragraph.strip('"„“” ')
+                if (paragraph.startswith(SALUTATION_PREFIXES) and len(paragraph.split()) <= 8
+                        or paragraph.startswith(CLOSING_PREFIXES)
+                        or paragraph.endswith(':') and len(paragraph.split()) <= 4):
+                    continue
+                paragraphs.append(' '.join(paragraph.split()))
+        return '\n\n'.join([salutation] + paragraphs + [final_sentence])
+    
+    def regenerate_paragraph(self, motivation_letter: MotivationLetter, paragraph_index: int,
+                             job_description: JobDescription, instruction: str = None) -> MotivationLetter:
+        """
+        Überarbeitet einen einzelnen Absatz statt den ganzen Brief neu zu generieren
+        
+        Das LLM erhält nur den Absatz, seine Nachbarabsätze und eine kompakte
+        Stellenzusammenfassung; die Antwort wird auf die Größe des Absatzes begrenzt und
+        an derselben Stelle in den Brief eingesetzt.
+        
+        Args:
+            motivation_letter: Bestehendes Motivationsschreiben
+            paragraph_index: Index des Absatzes (0-basiert, siehe letter_paragraphs und revisable_paragraphs)
+            job_description: Stellenbeschreibung des Briefs
+            instruction: Optionaler Überarbeitungswunsch (z.B. "konkreter, mehr Kennzahlen")
             
-            # Speichere die Analyse für späteren Zugriff
+        Returns:
+            MotivationLetter: Neuer Brief mit ersetztem Absatz (das Original bleibt unverändert)
+        """
+        paragraphs = letter_paragraphs(motivation_letter.content)
+        if not 0 <= paragraph_index < len(paragraphs):
+            raise ValueError(f"Absatz {paragraph_index} existiert nicht (Brief hat {len(paragraphs)} Absätze)")
+        if paragraph_index not in revisable_paragraphs(motivation_letter.content):
+            raise ValueError(f"Absatz {paragraph_index} ist Anrede oder Schluss und wird nicht überarbeitet")
+        
+        try:
+            normalized_job_description = self.recipient_controller.normalize_recipient_info(job_description)
+            with profiler.span('job_analysis'):
+                job_analysis = self.job_analyzer.analyze_job(
+                    normalized_job_description.position,
+                    normalized_job_description.description,
+                    normalized_job_description.requirements
+                )
             self._current_job_analysis = job_analysis
             
-            logger.info(f"Stellenanalyse: {job_analysis['category'].value} (Confidence: {job_analysis['analysis_confidence']:.2f})")
+            target = paragraphs[paragraph_index]
+            previous_paragraph = paragraphs[paragraph_index - 1] if paragraph_index > 0 else "(Anfang des Schreibens)"
+            next_paragraph = (paragraphs[paragraph_index + 1] if paragraph_index + 1 < len(paragraphs)
+                              else "(Ende des Schreibens)")
+            it_support = job_analysis['category'] == JobCategory.IT_SUPPORT
+            it_support_rule = "\n            5. Keine GitHub-Projekte oder Softwareentwicklung erwähnen" if it_support else ""
+            
+            prompt = f"""
+            ÜBERARBEITE DEN ABSATZ eines bestehenden Motivationsschreibens.
+            
+            STELLE (Kurzfassung):
+            {self._job_summary(normalized_job_description, job_analysis)}
             
-            # Prompt für die Motivationsschreiben-Generierung (mit normalisierten Daten)
-            prompt = self._create_motivation_prompt(normalized_job_description, personal_info)
+            VORHERIGER ABSATZ:
+            {previous_paragraph}
+            
+            ZU ÜBERARBEITENDER ABSATZ:
+            {target}
+            
+            NÄCHSTER ABSATZ:
+            {next_paragraph}
+            
+            ÜBERARBEITUNGSWUNSCH: {instruction or "Konkreter, überzeugender und enger auf die Stelle bezogen"}
+            
+            ANFORDERUNGEN:
+            1. Gib NUR den neuen Absatz zurück - ohne Anrede, Grußformel, Überschrift oder Anführungszeichen
+            2. Ein einzelner Absatz ohne Leerzeilen, ungefähr gleich lang wie der bisherige Absatz
+            3. Keine Wiederholung von Inhalten der Nachbarabsätze, die Übergänge müssen passen
+            4. Formell aber persönlich, auf Deutsch{it_support_rule}
+            """
             
-            # LLM-Aufruf mit neuer invoke Methode
             messages = [
-                SystemMessage(content="""Du bist ein Experte für das Schreiben von überzeugenden Motivationsschreiben. 
-                Erstelle ein professionelles, spezifisches Motivationsschreiben auf Deutsch, das:
-                1. Direkt auf die Stellenbeschreibung und spezifische Anforderungen eingeht
-                2. Konkrete Projekterfahrungen mit messbaren Erfolgen hervorhebt
-                3. Spezifische Technologien und Kennzahlen erwähnt
-                4. Beratungs- und Teamarbeitserfahrung betont
-                5. Branchen-spezifische Kenntnisse demonstriert
-                6. Eine klare Problem-Lösung-Erfolg Struktur verwendet
-                7. Formell aber persönlich und überzeugend ist
-                8. Konkrete Beispiele statt allgemeiner Aussagen nutzt"""),
+                SystemMessage(content=PARAGRAPH_SYSTEM_PROMPT),
                 HumanMessage(content=prompt)
             ]
             
-            response = self.llm.invoke(messages)
-            content = response.content
+            # Antwort auf die Größenordnung des Absatzes begrenzen statt 2000 Tokens für den ganzen Brief
+            max_tokens = max(PARAGRAPH_MIN_OUTPUT_TOKENS, count_tokens(target) * PARAGRAPH_OUTPUT_FACTOR)
+            response = tracked_invoke(self.llm.bind(max_tokens=max_tokens), messages, stage='revision')
+            new_paragraph = self._clean_paragraph(response.content)
             
-            # Post-Generation-Filter für IT-Support-Stellen
-            if hasattr(self, '_current_job_analysis') and self._current_job_analysis['category'] == JobCategory.IT_SUPPORT:
-                original_content = content
-                content = self._remove_github_project_mentions(content)
-                if original_content != content:
-                    logger.info("IT-Support-Stelle: GitHub-Projekt-Erwähnungen aus Content entfernt")
-                else:
-                    logger.info("IT-Support-Stelle: Keine GitHub-Projekt-Erwähnungen im Content gefunden")
-            
-            # MotivationLetter-Objekt erstellen (mit normalisierten Daten)
-            # Subject mit Position und Arbeitszeit kombinieren
-            position_with_hours = normalized_job_description.position
-            if normalized_job_description.working_hours and normalized_job_description.working_hours != "Nicht angegeben":
-                position_with_hours = f"{normalized_job_description.position} {normalized_job_description.working_hours}"
-            
-            motivation_letter = MotivationLetter(
-                recipient_company=normalized_job_description.company,
-                recipient_company_address=normalized_job_description.address,
-                recipient_name=normalized_job_description.contact_person or normalized_job_description.company,
-                recipient_address=normalized_job_description.location,  # Nutze location für Kontaktperson-Adresse
-                subject=f"Bewerbung als {position_with_hours}",
-                content=content,
-                sender_name=personal_info["name"],
-                sender_address=personal_info["address"],
-                sender_phone=personal_info["phone"],
-                sender_email=personal_info["email"]
-            )
+            if it_support:
+                new_paragraph = self._remove_github_project_mentions(new_paragraph)
+            if not new_paragraph:
+                raise ValueError("LLM hat keinen verwertbaren Absatz geliefert")
             
-            logger.info("Motivationsschreiben erfolgreich generiert")
-            return motivation_letter
+            paragraphs[paragraph_index] = new_paragraph
+            logger.info(f"Absatz {paragraph_index} überarbeitet ({len(target)} -> {len(new_paragraph)} Zeichen)")
+            return type(motivation_letter)(**{**vars(motivation_letter), 'content': '\n\n'.join(paragraphs)})
             
         except Exception as e:
-            logger.error(f"Fehler bei Motivationsschreiben-Generierung: {e}")
+            logger.error(f"Fehler bei Absatz-Überarbeitung: {e}")
             raise
     
+    def _job_summary(self, job_description: JobDescription, job_analysis: dict) -> str:
+        """Kompakte Stellenzusammenfassung für die Absatz-Überarbeitung"""
+        lines = [
+            f"Unternehmen: {job_description.company}",
+            f"Position: {job_description.position}",
+            f"Bereich: {job_analysis['category'].value}"
+        ]
+        if job_analysis.get('key_requirements'):
+            lines.append(f"Schlüsselanforderungen: {', '.join(job_analysis['key_requirements'][:6])}")
+        if job_description.requirements and job_description.requirements != "Nicht angegeben":
+            lines.append(f"Anforderungen: {truncate_to_tokens(job_description.requirements, JOB_SUMMARY_TOKENS)}")
+        return '\n            '.join(lines)
+    
+    @staticmethod
+    def _clean_paragraph(content: str) -> str:
+        """Entfernt Anführungszeichen, Anrede und Grußformel und fasst die Antwort zu einem Absatz zusammen"""
+        parts = [part.strip() for part in letter_paragraphs(content.strip().strip('"„“”'))]
+        parts = [part for part in parts
+                 if not (part.startswith(SALUTATION_PREFIXES) and len(part.split()) <= 8)
+                 and not part.startswith(CLOSING_PREFIXES)]
+        return ' '.join(' '.join(part.split()) for part in parts).strip('"„“” ')
+    
+    @profiler.traced('prompt_building')
     def _create_motivation_prompt(self, job_description: JobDescription, 
-                                personal_info: dict) -> str:
-        """Erstellt den Prompt für die Motivationsschreiben-Generierung"""
+                                personal_info: dict) -> Tuple[str, Dict[str, str]]:
+        """
+        Erstellt den Prompt für die Motivationsschreiben-Generierung
+        
+        Returns:
+            (Prompt für den ganzen Brief, Kontext für die abschnittsweise Generierung)
+        """
         
         # Generiere die korrekte Anrede
         salutation = self._generate_salutation(job_description)
@@ -237,20 +511,31 @@ class AIGenerator:
         # Erstelle stellenspezifische Prompts basierend auf der Analyse
         specific_instructions = self._create_job_specific_instructions(job_analysis)
         
-        prompt = f"""
+        # Variable Abschnitte: Anforderungen ohne Wiederholungen aus der Beschreibung
+        requirements = deduplicate_text(job_description.requirements, [job_description.description])
+        prompt_sections = [
+            PromptSection('requirements', requirements, priority=5, min_tokens=250),
+            PromptSection('description', job_description.description, priority=4, min_tokens=150),
+            PromptSection('projects', project_descriptions, priority=3, min_tokens=150),
+            PromptSection('linkedin', linkedin_info, priority=2),
+            PromptSection('benefits', job_description.benefits or '', priority=1),
+        ]
+        
+        def render_prompt(sections: dict) -> str:
+            return f"""
         Erstelle ein professionelles Motivationsschreiben für folgende Stellenausschreibung:
 
         STELLENBESCHREIBUNG:
         Unternehmen: {job_description.company}
         Position: {job_description.position}
         Bereich: {job_description.department or 'Nicht angegeben'}
-        Beschreibung: {job_description.description}
+        Beschreibung: {sections['description']}
         
         Anforderungen:
-        {job_description.requirements}
+        {sections['requirements']}
         
         Angebotene Leistungen:
-        {job_description.benefits or 'Nicht angegeben'}
+        {sections['benefits'] or 'Nicht angegeben'}
         
         Kontaktperson: {job_description.contact_person or 'Nicht angegeben'}
         Adresse: {job_description.address}
@@ -270,10 +555,10 @@ class AIGenerator:
         Fähigkeiten: {personal_info['skills']}
 
         RELEVANTE GITHUB-PROJEKTE:
-        {project_descriptions if project_descriptions else 'Keine GitHub-Projekte für diese Stellenkategorie erforderlich'}
+        {sections['projects'] if sections['projects'] else 'Keine GitHub-Projekte für diese Stellenkategorie erforderlich'}
 
         LINKEDIN-PROFIL-INFORMATIONEN:
-        {linkedin_info if linkedin_info else 'Keine LinkedIn-Informationen verfügbar'}
+        {sections['linkedin'] if sections['linkedin'] else 'Keine LinkedIn-Informationen verfügbar'}
 
         ANREDE:
         Verwende EXAKT diese Anrede: "{salutation}"
@@ -284,11 +569,11 @@ class AIGenerator:
         
         # Stelle-spezifische Schlusssätze basierend auf GitHub-Projekt-Verfügbarkeit
         if job_analysis['category'] == JobCategory.IT_SUPPORT or not project_descriptions:
-            final_sentence = "Ich freue mich darauf, Sie in einem persönlichen Gespräch von meiner Motivation und Eignung zu überzeugen und dabei gezielt auf meine Qualifikationen sowie Ihre Fragen einzugehen."
+            final_sentence = f"{FINAL_SENTENCE_PREFIX} und dabei gezielt auf meine Qualifikationen sowie Ihre Fragen einzugehen."
         else:
-            final_sentence = "Ich freue mich darauf, Sie in einem persönlichen Gespräch von meiner Motivation und Eignung zu überzeugen und dabei gezielt auf relevante Projekte sowie Ihre Fragen einzugehen."
+            final_sentence = f"{FINAL_SENTENCE_PREFIX} und dabei gezielt auf relevante Projekte sowie Ihre Fragen einzugehen."
         
-        prompt += f"""
+        prompt_tail = f"""
         ANFORDERUNGEN FÜR DAS MOTIVATIONSSCHREIBEN:
         1. Schreibe ein überzeugendes, professionelles Motivationsschreiben auf Deutsch
         2. Gehe direkt auf die Stellenbeschreibung und spezifische Anforderungen ein
@@ -334,9 +619,27 @@ class AIGenerator:
             """
 
         # Vervollständige den Prompt
-        prompt += project_instructions
+        prompt_tail += project_instructions
+        
+        # Variable Abschnitte an das Token-Budget des Modells anpassen
+        provider, model = LLMFactory.describe_llm(self.llm)
+        budgeter = TokenBudgeter(provider, model, output_tokens=getattr(self.llm, 'max_tokens', None) or 2000)
+        empty_sections = {section.name: '' for section in prompt_sections}
+        fixed_tokens = (budgeter.count(render_prompt(empty_sections) + prompt_tail)
+                        + budgeter.count(MOTIVATION_SYSTEM_PROMPT))
+        fitted_sections, report = budgeter.fit(prompt_sections, fixed_tokens=fixed_tokens)
+        prompt = render_prompt(fitted_sections) + prompt_tail
+        
+        # Gemeinsamer Kontext für die abschnittsweise Generierung (ohne Anweisungen zum Gesamtbrief)
+        prompt_parts = {
+            'context': render_prompt(fitted_sections) + project_instructions,
+            'salutation': salutation,
+            'final_sentence': final_sentence
+        }
+        self.last_prompt_report = report
+        logger.info(f"Prompt-Budget Motivationsschreiben: {report.summary()}")
         
-        return prompt
+        return prompt, prompt_parts
     
     def _generate_success_examples(self, project) -> str:
         """Generiert realistische Erfolgsbeispiele basierend auf dem Projekt-Typ"""
@@ -504,6 +807,7 @@ class AIGenerator:
               Technologie: {project.language}
               GitHub-URL: {project.url}
               Topics: {', '.join(project.topics) if project.topics else 'Keine'}
+              README-Zusammenfassung: {project.readme_summary or 'Nicht verfügbar'}
               Popularität: {project.stars} Sterne
               Potenzielle Erfolge: {success_examples}
               
@@ -584,7 +888,7 @@ class AIGenerator:
                 HumanMessage(content=prompt)
             ]
             
-            response = self.llm.invoke(messages)
+            response = tracked_invoke(self.requirements_llm, messages, stage='requirements')
             requirements = [req.strip() for req in response.content.split('\n') if req.strip()]
             
             logger.info(f"Wichtigste Anforderungen extrahiert: {requirements}")
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Batch-Verarbeitung für AutomaticMotivation
+Arbeitet die persistente Warteschlange Stufe für Stufe ab:
+fetch (inkl. Duplikat-Prüfung) → extract → generate → render
+Mehrere Worker (Prozesse oder Hosts) teilen sich eine Warteschlange über Leases.
+"""
+
+import os
+import socket
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from config.config import Config
+from src.models import JobInfo, MotivationLetter, model_to_dict
+from src.job_queue import JobQueue, QueuedJob, LeaseLostError, NEXT_STATE, GENERATED, RENDERED
+from src.duplicate_detector import DuplicateIndex, posting_text
+from src.output_sink import FileSink
+from src.letter_layout import build_layout
+from src.profiler import profiler
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id(index: int = 0) -> str:
+    """Eindeutige Worker-Kennung (Host, Prozess, Index)"""
+    return f"{socket.gethostname()}-{os.getpid()}-{index}"
+
+
+class LeaseHeartbeat:
+    """Verlängert den Lease einer Stelle im Hintergrund, solange sie bearbeitet wird"""
+
+    def __init__(self, queue: JobQueue, job: QueuedJob, interval: float):
+        self.queue = queue
+        self.job = job
+        self.interval = interval
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{job.id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.job):
+                    self.lost = True
+                    logger.warning(f"Lease für {self.job.url} verloren")
+                    return
+            except Exception as e:
+                logger.error(f"Heartbeat für {self.job.url} fehlgeschlagen: {e}")
+
+
+class BatchProcessor:
+    """
+    Verarbeitet Stellen aus der Warteschlange
+
+    Jede Stufe liest ihre Eingaben aus der Warteschlange und schreibt ihre
+    Ergebnisse zusammen mit dem Zustandswechsel zurück. Extractor, Generator
+    und Renderer werden erst bei Bedarf erzeugt und für alle Stellen geteilt.
+
+    Stellen werden per Lease reserviert; ein Heartbeat verlängert ihn, solange
+    eine Stufe läuft. PDF und DOCX landen pro Stelle in ``<output_dir>/<id>/``,
+    damit parallele Worker sich im gemeinsamen Ausgabeverzeichnis nicht überschreiben.
+    """
+
+    def __init__(self, queue: Optional[JobQueue] = None, personal_info: Optional[Dict[str, str]] = None,
+                 output_dir: str = "output", duplicate_index: Optional[DuplicateIndex] = None,
+                 reuse_duplicates: bool = True, worker_id: Optional[str] = None, poll_interval: float = 1.0):
+        self.queue = queue or JobQueue()
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_interval = poll_interval
+        self.personal_info = personal_info or Config.get_personal_info()
+        self.output_dir = output_dir
+        self.duplicate_index = duplicate_index if duplicate_index is not None else DuplicateIndex()
+        self.reuse_duplicates = reuse_duplicates
+        self._job_extractor = None
+        self._ai_generator = None
+        self._pdf_generator = None
+        self._docx_generator = None
+        self._stages: Dict[str, Callable[[QueuedJob], Dict]] = {
+            'fetch': self._fetch,
+            'extract': self._extract,
+            'generate': self._generate,
+            'render': self._render
+        }
+
+    @property
+    def job_extractor(self):
+        if self._job_extractor is None:
+            from src.job_extractor import JobExtractor
+            self._job_extractor = JobExtractor()
+        return self._job_extractor
+
+    @property
+    def ai_generator(self):
+        if self._ai_generator is None:
+            from src.ai_generator import AIGenerator
+            self._ai_generator = AIGenerator()
+        return self._ai_generator
+
+    @property
+    def pdf_generator(self):
+        if self._pdf_generator is None:
+            from src.template_pdf_generator import TemplateBasedPDFGenerator
+            self._pdf_generator = TemplateBasedPDFGenerator("templates/template.pdf")
+        return self._pdf_generator
+
+    @property
+    def docx_generator(self):
+        if self._docx_generator is None:
+            from src.docx_generator import DocxGenerator
+            self._docx_generator = DocxGenerator()
+        return self._docx_generator
+
+    def run(self, max_jobs: Optional[int] = None, wait_for_retries: bool = True,
+            on_progress: Optional[Callable[[QueuedJob, str], None]] = None) -> int:
+        """
+        Arbeitet die Warteschlange ab, bis keine offenen Stellen mehr übrig sind
+
+        Args:
+            max_jobs: Höchstens so viele Stellen fertigstellen (None = alle)
+            wait_for_retries: Auf zurückgestellte und von anderen Workern reservierte Stellen warten
+            on_progress: Callback (Stelle, Stufe) nach jeder Stufe
+
+        Returns:
+            Anzahl von diesem Worker fertig gerenderter Stellen
+        """
+        finished = 0
+        while max_jobs is None or finished < max_jobs:
+            job = self.queue.lease_job(self.worker_id)
+            if job is None:
+                if not wait_for_retries or not self.queue.has_open_jobs():
+                    break
+                ready_at = self.queue.next_ready_at() or time.time()
+                time.sleep(min(max(ready_at - time.time(), 0.05), self.poll_interval))
+                continue
+
+            if self.process(job, on_progress) == RENDERED:
+                finished += 1
+        return finished
+
+    def process(self, job: QueuedJob, on_progress: Optional[Callable[[QueuedJob, str], None]] = None) -> str:
+        """
+        Führt alle offenen Stufen einer Stelle aus (bis fertig oder Fehler)
+
+        Returns:
+            Zustand nach der Verarbeitung
+        """
+        try:
+            with LeaseHeartbeat(self.queue, job, self.queue.visibility_timeout / 3):
+                return self._process_stages(job, on_progress)
+        except LeaseLostError as e:
+            # Ein anderer Worker hat die Stelle übernommen; das eigene Ergebnis wird verworfen
+            logger.warning(str(e))
+            return job.state
+        finally:
+            if job.lease_token:
+                self.queue.release(job)
+
+    def _process_stages(self, job: QueuedJob, on_progress: Optional[Callable[[QueuedJob, str], None]]) -> str:
+        while job.stage:
+            stage = job.stage
+            started_at = time.time()
+            try:
+                with profiler.span(f"batch_{stage}", 'batch'):
+                    artifacts = self._stages[stage](job)
+            except KeyboardInterrupt:
+                # Stufe nicht abgeschlossen: beim nächsten Lauf wird genau sie wiederholt
+                raise
+            except Exception as e:
+                logger.error(f"Stufe {stage} fehlgeschlagen für {job.url}: {e}")
+                self.queue.fail_stage(job, f"{type(e).__name__}: {e}", started_at)
+                if on_progress:
+                    on_progress(job, stage)
+                return job.state
+
+            new_state = artifacts.pop('state', NEXT_STATE[job.state])
+            self.queue.complete_stage(job, new_state, started_at, **artifacts)
+            for key, value in artifacts.items():
+                setattr(job, key, value)
+            if on_progress:
+                on_progress(job, stage)
+        return job.state
+
+    def job_output_dir(self, job: QueuedJob) -> str:
+        """Ausgabeverzeichnis einer Stelle im (gemeinsamen) Ausgabeverzeichnis"""
+        return os.path.join(self.output_dir, f"{job.id:05d}")
+
+    def _fetch(self, job: QueuedJob) -> Dict:
+        html_content = self.job_extractor.fetch(job.url)
+        if self.reuse_duplicates:
+            duplicate = self.duplicate_index.find_duplicate(posting_text(html_content), exclude_url=job.url)
+            if duplicate and duplicate.job_info and duplicate.letter:
+                # Quer gepostete Stelle: JobInfo und Brief übernehmen, nur neu rendern
+                logger.info(f"{job.url} ist ein Duplikat von {duplicate.url} - LLM-Stufen übersprungen")
+                return {'state': GENERATED, 'html': html_content, 'job_info': duplicate.job_info,
+                        'letter': duplicate.letter, 'duplicate_of': duplicate.url}
+        return {'html': html_content}
+
+    def _extract(self, job: QueuedJob) -> Dict:
+        job_info = self.job_extractor.extract_from_url(job.url, html_content=job.html)
+        return {'job_info': model_to_dict(job_info)}
+
+    def _generate(self, job: QueuedJob) -> Dict:
+        letter = self.ai_generator.generate_motivation_letter(JobInfo(**job.job_info), self.personal_info)
+        return {'letter': model_to_dict(letter)}
+
+    def _render(self, job: QueuedJob) -> Dict:
+        letter = MotivationLetter(**job.letter)
+        if job.duplicate_of:
+            letter.date = datetime.now()
+        # Eigenes Verzeichnis pro Stelle: eine wiederholte Render-Stufe ersetzt ihre eigenen Dateien
+        sink = FileSink(self.job_output_dir(job), overwrite=True)
+        layout = build_layout(letter)
+        pdf_path = self.pdf_generator.create_pdf(letter, sink=sink, layout=layout)
+        docx_path = self.docx_generator.create_docx(letter, sink=sink, layout=layout)
+
+        self.duplicate_index.add(job.url, posting_text(job.html or ''), JobInfo(**job.job_info), letter,
+                                 outputs={'pdf': pdf_path, 'docx': docx_path})
+        return {'pdf_path': pdf_path, 'docx_path': docx_path}
+
+
+def run_worker(queue_file: Optional[str] = None, output_dir: str = "output", reuse_duplicates: bool = True,
+               index: int = 0, on_progress: Optional[Callable[[QueuedJob, str], None]] = None) -> int:
+    """
+    Einstiegspunkt eines Worker-Prozesses (eigene Datenbankverbindung und eigene LLM-Clients)
+
+    Returns:
+        Anzahl fertig gerenderter Stellen
+    """
+    queue = JobQueue(queue_file)
+    try:
+        processor = BatchProcessor(queue, output_dir=output_dir, reuse_duplicates=reuse_duplicates,
+                                   worker_id=default_worker_id(index))
+        logger.info(f"Worker {processor.worker_id} gestartet")
+        return processor.run(on_progress=on_progress)
+    finally:
+        queue.close()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Canvas-Renderer für AutomaticMotivation
+Ein Motivationsschreiben ist eine Seite mit festem Aufbau. Statt es durch den
+platypus-Fluss (SimpleDocTemplate, Paragraph, Spacer) zu schicken, werden die
+Textblöcke mit den gecachten Schriftmetriken aus src/pdf_styles.py umbrochen, ihre
+Positionen vorab berechnet und direkt auf den Canvas gezeichnet. Passt der Text nicht
+auf die Seite, meldet der Renderer LayoutOverflow und der Generator fällt auf platypus
+zurück. Umbrochene Absätze liegen im Layout-Cache (src/layout_cache.py), ein erneutes
+Rendern nach kleinen Änderungen umbricht nur die geänderten Absätze.
+
+Abstände und Zeilenpositionen folgen den Regeln des platypus-Frames (spaceBefore/
+spaceAfter überlappen, erste Grundlinie = Oberkante - Schriftgröße), damit beide
+Wege dasselbe Seitenbild liefern.
+"""
+
+import re
+import logging
+from dataclasses import dataclass
+from typing import BinaryIO, List, Optional, Tuple
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph, Spacer
+from src.letter_layout import Block, LetterLayout, Run, reportlab_markup
+from src.models import MotivationLetter
+from src.pdf_styles import bold_font, text_width
+from src.layout_cache import LayoutCache, layout_cache
+
+logger = logging.getLogger(__name__)
+
+FRAME_PADDING = 6  # Standard-Padding des platypus-Frames von SimpleDocTemplate
+FUZZ = 1e-6
+
+
+class LayoutOverflow(Exception):
+    """Der Brief passt nicht auf eine Seite - platypus muss umbrechen"""
+
+
+@dataclass
+class TextBlock:
+    """Ein Absatz im Seitenaufbau: Style-Name und Zeilen (je eine Liste von Runs)"""
+    style: str
+    lines: List[List[Run]]
+    space_after: float = 0.0  # zusätzlicher Abstand danach (entspricht einem platypus-Spacer)
+
+
+def letter_blocks(motivation_letter: MotivationLetter, layout: LetterLayout, sender_lines: List[str],
+                  date_text: str) -> List[TextBlock]:
+    """
+    Seitenaufbau eines Motivationsschreibens (Absender, Empfänger, Datum, Betreff, Text, Gruß)
+
+    Args:
+        motivation_letter: Das Motivationsschreiben
+        layout: Brief-Layout mit Anrede, Absätzen und Links
+        sender_lines: Zeilen des Absenderblocks
+        date_text: Ort und Datum
+    """
+    recipient_lines = []
+    if motivation_letter.recipient_company and motivation_letter.recipient_company != "Nicht angegeben":
+        recipient_lines.append([Run(motivation_letter.recipient_company, bold=True)])
+
+    address = motivation_letter.recipient_company_address
+    if address and address != "Nicht angegeben":
+        recipient_lines.extend([Run(line)] for line in (address.split(", ") if ", " in address else [address]))
+
+    if (motivation_letter.recipient_name and
+            motivation_letter.recipient_name != "Nicht angegeben" and
+            motivation_letter.recipient_name != motivation_letter.recipient_company):
+        recipient_lines.append([])  # Leerzeile
+        recipient_lines.append([Run(f"z.H. {motivation_letter.recipient_name}")])
+
+    blocks = [
+        TextBlock('Sender', [[Run(line)] for line in sender_lines], space_after=12),
+        TextBlock('Recipient', recipient_lines or [[Run("Empfänger")]]),
+        TextBlock('Date', [[Run(date_text)]]),
+        TextBlock('Subject', [[Run(motivation_letter.subject, bold=True)]])
+    ]
+    if layout.salutation:
+        blocks.append(TextBlock('MainText', [[Run(layout.salutation)]], space_after=6))
+    blocks.extend(TextBlock('MainText', [block.runs], space_after=6) for block in layout.blocks)
+    blocks.append(TextBlock('Closing', [[Run(layout.closing)]]))
+    blocks.append(TextBlock('Signature', [[Run(layout.signature)]]))
+    return blocks
+
+
+def platypus_story(blocks: List[TextBlock], styles) -> list:
+    """Dieselben Blöcke als platypus-Story (Fallback bei Überlauf)"""
+    story = []
+    for block in blocks:
+        markup = '<br/>'.join(reportlab_markup(Block(line)) for line in block.lines)
+        story.append(Paragraph(markup, styles[block.style]))
+        if block.space_after:
+            story.append(Spacer(1, block.space_after))
+    return story
+
+
+# Ein Wort besteht aus Fragmenten (Text, Schrift, Link), z.B. Link "LinkedIn-Profil" + "."
+Fragment = Tuple[str, str, Optional[str]]
+
+
+class CanvasLetterRenderer:
+    """
+    Zeichnet die Textblöcke eines Briefs direkt auf eine Canvas-Seite
+
+    Args:
+        styles: Stylesheet des Generators (Schrift, Größe, Zeilenabstand, Ausrichtung, Abstände)
+        pagesize: Seitengröße
+        margin: Seitenrand (wie rightMargin/leftMargin/topMargin/bottomMargin von SimpleDocTemplate)
+        cache: Absatz-Layout-Cache (Standard: prozessweiter layout_cache)
+    """
+
+    def __init__(self, styles, pagesize=A4, margin: float = 2 * cm, cache: Optional[LayoutCache] = None):
+        self.styles = styles
+        self.page_width, self.page_height = pagesize
+        self.left = margin + FRAME_PADDING
+        self.width = self.page_width - 2 * margin - 2 * FRAME_PADDING
+        self.top = self.page_height - margin - FRAME_PADDING
+        self.bottom = margin + FRAME_PADDING
+        self.cache = layout_cache if cache is None else cache
+
+    def render(self, blocks: List[TextBlock], stream: BinaryIO):
+        """
+        Berechnet alle Positionen und zeichnet die Seite in den Stream
+
+        Raises:
+            LayoutOverflow: Text passt nicht auf eine Seite (es wurde nichts geschrieben)
+        """
+        lines = self.layout(blocks)
+
+        pdf = canvas.Canvas(stream, pagesize=(self.page_width, self.page_height))
+        text = pdf.beginText()
+        current = (None, None, None)
+        word_space = 0.0
+        for x, y, line_word_space, segments in lines:
+            text.setTextOrigin(x, y)
+            if line_word_space != word_space:
+                text.setWordSpace(line_word_space)
+                word_space = line_word_space
+            for segment_text, font_name, font_size, color, link in segments:
+                if current[:2] != (font_name, font_size):
+                    text.setFont(font_name, font_size)
+                if current[2] != color:
+                    text.setFillColor(color)
+                current = (font_name, font_size, color)
+                text.textOut(segment_text)
+                width = text_width(segment_text, font_name, font_size) + segment_text.count(' ') * word_space
+                if link:
+                    pdf.linkURL(link, (x, y - 0.2 * font_size, x + width, y + font_size), relative=0)
+                x += width
+        pdf.drawText(text)
+        pdf.showPage()
+        pdf.save()
+
+    def layout(self, blocks: List[TextBlock]) -> List[tuple]:
+        """
+        Umbruch und Positionen aller Zeilen nach den Regeln des platypus-Frames
+
+        Returns:
+            Liste von (x, y, Wortabstand, Segmente) mit Segmenten (Text, Schrift, Größe, Farbe, Link)
+        """
+        placed = []
+        y = self.top
+        previous_space_after = 0.0
+        at_top = True
+
+        for block in blocks:
+            style = self.styles[block.style]
+            space_before = 0.0 if at_top else max(style.spaceBefore - previous_space_after, 0)
+            height, lines = self._block_layout(block, style)
+
+            block_top = y - space_before
+            if block_top - height < self.bottom - FUZZ:
+                raise LayoutOverflow(f"Block '{block.style}' passt nicht mehr auf die Seite")
+            placed.extend((x, block_top - offset, word_space, segments) for x, offset, word_space, segments in lines)
+
+            y = block_top - height - style.spaceAfter
+            previous_space_after = style.spaceAfter
+            if block.space_after:
+                # Spacer: verbraucht seinen Platz und setzt den überlappenden Abstand zurück
+                y -= block.space_after
+                previous_space_after = 0.0
+            at_top = False
+        return placed
+
+    def _block_layout(self, block: TextBlock, style) -> Tuple[float, tuple]:
+        """
+        Höhe und Zeilen eines Blocks relativ zu seiner Oberkante (gecacht)
+
+        Der Schlüssel umfasst Text, Links und Fettdruck der Runs, alle Style-Werte, die den
+        Umbruch beeinflussen, sowie Spaltenbreite und linken Rand.
+        """
+        key = (
+            tuple(tuple((run.text, run.link, run.bold) for run in line) for line in block.lines),
+            style.fontName, style.fontSize, style.leading, style.alignment, str(style.textColor),
+            self.width, self.left
+        )
+
+        def compute():
+            lines, offset = [], style.fontSize
+            for words, width, last in self._wrap(block.lines, style):
+                lines.append(self._place_line(words, width, last, offset, style))
+                offset += style.leading
+            return len(lines) * style.leading, tuple(lines)
+
+        return self.cache.get_or_compute(key, compute)
+
+    def _wrap(self, lines: List[List[Run]], style) -> List[Tuple[List[List[Fragment]], float, bool]]:
+        """Greedy-Umbruch an Leerzeichen wie Paragraph; liefert (Wörter, Breite, letzte Zeile)"""
+        space = text_width(' ', style.fontName, style.fontSize)
+        wrapped = []
+        for runs in lines:
+            words = self._words(runs, style)
+            line, line_width = [], 0.0
+            for word in words:
+                word_width = sum(text_width(text, font, style.fontSize) for text, font, _ in word)
+                if word_width > self.width + FUZZ:
+                    # Überlange Wörter (z.B. URLs) trennt nur platypus
+                    raise LayoutOverflow("Wort breiter als die Textspalte")
+                if line and line_width + space + word_width > self.width + FUZZ:
+                    wrapped.append((line, line_width, False))
+                    line, line_width = [], 0.0
+                line_width += (space if line else 0) + word_width
+                line.append(word)
+            wrapped.append((line, line_width, True))
+        return wrapped
+
+    @staticmethod
+    def _words(runs: List[Run], style) -> List[List[Fragment]]:
+        words, current = [], []
+        for run in runs:
+            font = bold_font(style.fontName) if run.bold else style.fontName
+            for part in re.split(r'(\s+)', run.text):
+                if not part:
+                    continue
+                if part.isspace():
+                    if current:
+                        words.append(current)
+                        current = []
+                else:
+                    current.append((part, font, run.link))
+        if current:
+            words.append(current)
+        return words
+
+    def _place_line(self, words, line_width: float, last: bool, offset: float, style) -> tuple:
+        """Startpunkt, Grundlinien-Abstand zur Blockoberkante, Wortabstand (Blocksatz wie platypus
+        über setWordSpace) und Segmente einer Zeile"""
+        free = self.width - line_width
+        if style.alignment == TA_RIGHT:
+            x = self.left + free
+        elif style.alignment == TA_CENTER:
+            x = self.left + free / 2
+        else:
+            x = self.left
+        word_space = 0.0
+        if style.alignment == TA_JUSTIFY and not last and len(words) > 1:
+            word_space = free / (len(words) - 1)
+
+        # Fragmente samt Leerzeichen zu Segmenten gleicher Schrift und gleichen Links zusammenfassen
+        fragments = []
+        for index, word in enumerate(words):
+            if index:
+                previous_link, next_link = fragments[-1][2], word[0][2]
+                if previous_link == next_link or not previous_link:
+                    fragments.append((' ', fragments[-1][1], previous_link))
+                else:
+                    fragments.append((' ', style.fontName, None))
+            fragments.extend(word)
+
+        segments = []
+        for text, font, link in fragments:
+            if segments and segments[-1][1] == font and segments[-1][4] == link:
+                segments[-1][0] += text
+            else:
+                segments.append([text, font, style.fontSize, colors.blue if link else style.textColor, link])
+        return x, offset, word_space, tuple(tuple(segment) for segment in segments)
@@ -4,6 +4,7 @@ import logging
 from typing import Optional, Dict, Any
 from urllib.parse import quote
 import time
+from src.profiler import profiler
 
 class CompanyAddressSearcher:
     """
@@ -17,6 +18,7 @@ class CompanyAddressSearcher:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
     
+    @profiler.traced('address_search', 'http')
     def search_company_address(self, company_name: str, location: Optional[str] = None) -> Optional[str]:
         """
         Sucht automatisch nach der Adresse eines Unternehmens
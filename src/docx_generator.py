@@ -6,7 +6,8 @@ Erstellt Microsoft Word-Dokumente basierend auf Motivationsschreiben
 
 import os
 from datetime import datetime
-from typing import Optional
+from io import BytesIO
+from typing import BinaryIO, Optional
 from docx import Document
 from docx.shared import Inches, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
@@ -16,6 +17,10 @@ from docx.oxml import parse_xml
 from docx.oxml.ns import nsdecls, qn
 from src.models import MotivationLetter
 from config.config import Config
+from src.profiler import profiler
+from src.output_sink import FileSink
+from src.letter_layout import LetterLayout, Block, Run, build_layout
+from src.fast_docx_writer import FastDocxWriter
 import re
 import logging
 
@@ -24,8 +29,15 @@ logger = logging.getLogger(__name__)
 class DocxGenerator:
     """Klasse zur Erstellung von DOCX-Dokumenten für Motivationsschreiben"""
     
-    def __init__(self):
-        """Initialisiert den DOCX Generator"""
+    def __init__(self, fast_writer: Optional[bool] = None):
+        """
+        Initialisiert den DOCX Generator
+        
+        Args:
+            fast_writer: Direkten XML-Writer statt python-docx verwenden (Standard: Config.DOCX_FAST_WRITER)
+        """
+        use_fast_writer = Config.DOCX_FAST_WRITER if fast_writer is None else fast_writer
+        self.fast_writer = FastDocxWriter() if use_fast_writer else None
         self.output_dir = "output"
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
@@ -44,17 +56,48 @@ class DocxGenerator:
             # Fallback zu Calibri wenn Aptos Display nicht verfügbar
             run.font.name = self.font_fallback
     
-    def create_docx(self, motivation_letter: MotivationLetter) -> str:
+    def create_docx(self, motivation_letter: MotivationLetter, sink: Optional[FileSink] = None,
+                    layout: Optional[LetterLayout] = None) -> str:
         """
         Erstellt ein DOCX-Dokument aus einem Motivationsschreiben
         
         Args:
             motivation_letter: Das Motivationsschreiben-Objekt
+            sink: Optionaler Datei-Sink (Standard: FileSink(self.output_dir))
+            layout: Bereits aufgebautes Brief-Layout (sonst wird es hier erstellt)
             
         Returns:
             str: Pfad zur erstellten DOCX-Datei
         """
+        docx_bytes = self.render_docx_bytes(motivation_letter, layout)
+        try:
+            return (sink or FileSink(self.output_dir)).write(self._generate_filename(motivation_letter), docx_bytes)
+        except Exception as e:
+            raise Exception(f"Fehler beim Erstellen der DOCX-Datei: {e}")
+    
+    def render_docx_bytes(self, motivation_letter: MotivationLetter, layout: Optional[LetterLayout] = None) -> bytes:
+        """Rendert das DOCX im Speicher und gibt die Bytes zurück"""
+        buffer = BytesIO()
+        self.render_docx(motivation_letter, buffer, layout)
+        return buffer.getvalue()
+    
+    @profiler.traced('render_docx', 'render')
+    def render_docx(self, motivation_letter: MotivationLetter, stream: BinaryIO,
+                    layout: Optional[LetterLayout] = None):
+        """
+        Rendert das DOCX-Dokument in einen beschreibbaren Stream (BytesIO, Datei, ...)
+        
+        Args:
+            motivation_letter: Das Motivationsschreiben-Objekt
+            stream: Beschreibbares Binär-Objekt mit write()
+            layout: Bereits aufgebautes Brief-Layout (sonst wird es hier erstellt)
+        """
         try:
+            layout = layout or build_layout(motivation_letter)
+            if self.fast_writer:
+                self.fast_writer.write(motivation_letter, layout, self._date_line(motivation_letter), stream)
+                return
+            
             # Neues Dokument erstellen
             doc = Document()
             
@@ -90,20 +133,14 @@ class DocxGenerator:
             # Leerzeile
             doc.add_paragraph()
             
-            # Hauptinhalt (Anrede ist bereits im Content enthalten)
-            self._add_main_content(doc, motivation_letter)
+            # Anrede und Hauptinhalt
+            self._add_main_content(doc, layout)
             
             # Grußformel
-            self._add_closing(doc, motivation_letter)
-            
-            # Dateiname generieren
-            filename = self._generate_filename(motivation_letter)
-            filepath = os.path.join(self.output_dir, filename)
+            self._add_closing(doc, layout)
             
-            # Dokument speichern
-            doc.save(filepath)
-            
-            return filepath
+            # Dokument in den Stream speichern
+            doc.save(stream)
             
         except Exception as e:
             raise Exception(f"Fehler beim Erstellen der DOCX-Datei: {e}")
@@ -210,14 +247,16 @@ class DocxGenerator:
         date_paragraph = doc.add_paragraph()
         date_paragraph.alignment = WD_ALIGN_PARAGRAPH.RIGHT
         
-        # Ort aus Adresse extrahieren
-        location = self._extract_location_from_address(motivation_letter.sender_address)
-        current_date = datetime.now().strftime("%d.%m.%Y")
-        
-        date_run = date_paragraph.add_run(f"{location}, {current_date}")
+        date_run = date_paragraph.add_run(self._date_line(motivation_letter))
         date_run.font.size = Pt(11)
         date_run.font.name = 'Aptos Display'
     
+    def _date_line(self, motivation_letter: MotivationLetter) -> str:
+        """Ort (aus der Absenderadresse) und aktuelles Datum"""
+        location = self._extract_location_from_address(motivation_letter.sender_address)
+        current_date = datetime.now().strftime("%d.%m.%Y")
+        return f"{location}, {current_date}"
+    
     def _add_subject(self, doc: Document, motivation_letter: MotivationLetter):
         """Fügt Betreff hinzu"""
         subject_paragraph = doc.add_paragraph()
@@ -226,141 +265,24 @@ class DocxGenerator:
         subject_run.font.name = 'Aptos Display'
         subject_run.bold = True
     
-    def _add_main_content(self, doc: Document, motivation_letter: MotivationLetter):
-        """Fügt Hauptinhalt hinzu mit GitHub-Projekt-Hyperlinks"""
-        # Motivationsschreiben in Absätze aufteilen
-        paragraphs = motivation_letter.content.split('\n\n')
-        
-        for paragraph_text in paragraphs:
-            if paragraph_text.strip():
-                # Entferne nur doppelte Anreden aus dem Inhalt, aber behalte die erste
-                cleaned_text = paragraph_text.strip()
-                
-                # Überspringe Grußformeln, da sie separat hinzugefügt werden
-                if (cleaned_text.startswith('Mit freundlichen Grüßen') or
-                    cleaned_text.startswith('Mit freundlichen Grüssen') or
-                    cleaned_text.startswith('Freundliche Grüße') or
-                    cleaned_text.startswith('Freundliche Grüsse') or
-                    cleaned_text in ['Mit freundlichen Grüßen', 'Mit freundlichen Grüssen']):
-                    continue
-                
-                # Entferne auch Namen am Ende, die wie eine Signatur aussehen
-                # Prüfe, ob der Absatz nur aus einem Namen besteht (weniger als 4 Wörter)
-                words = cleaned_text.split()
-                if len(words) <= 3:
-                    # Prüfe, ob es sich um eine Signatur handelt
-                    # Typische Signaturen: "Daniel Zurmühle", "Ihr Daniel Zurmühle", etc.
-                    if any(word.lower() in ['daniel', 'zurmühle'] for word in words):
-                        continue
-                
-                content_paragraph = doc.add_paragraph()
-                
-                # Prüfe auf GitHub-Projekt-Erwähnungen und erstelle Hyperlinks
-                self._add_text_with_github_links(content_paragraph, cleaned_text)
-                
-                # Zeilenabstand setzen
-                paragraph_format = content_paragraph.paragraph_format
-                paragraph_format.space_after = Pt(6)
-                paragraph_format.line_spacing = 1.15
-    
-    def _add_text_with_github_links(self, paragraph, text):
-        """Fügt Text mit GitHub-Projekt-Hyperlinks und LinkedIn-Links hinzu"""
-        # Dynamische GitHub-Projekt-URLs aus Config laden
-        project_urls = Config.get_github_project_urls()
-        
-        # Erstelle Regex-Pattern dynamisch aus verfügbaren Projekten
-        if project_urls:
-            # Escape spezielle Regex-Zeichen in Projektnamen
-            escaped_projects = [re.escape(project) for project in project_urls.keys()]
-            github_project_pattern = f"({'|'.join(escaped_projects)})"
-        else:
-            # Fallback-Pattern falls keine Projekte verfügbar
-            github_project_pattern = r'(AutomaticMotivation|ZurdLLMWS|Auto-search-jobs)'
-        
-        # Regex-Pattern für LinkedIn-Erwähnungen
-        # Sucht nach: "LinkedIn-Profil" oder "LinkedIn Profil"
-        linkedin_pattern = r"(LinkedIn[\s\-]?Profil)"
-        
-        # Verarbeite zuerst GitHub-Projekte, dann LinkedIn
-        processed_text = text
-        
-        # GitHub-Projekt-Links verarbeiten
-        def replace_project_with_link(match):
-            project_name = match.group(1)    # "ProjectName"
-            
-            # GitHub-URL für das Projekt suchen
-            github_url = self._get_github_url_for_project(project_name)
-            
-            if github_url:
-                return f'GITHUB_LINK:{project_name}:{github_url}'
-            else:
-                return project_name
-        
-        # LinkedIn-Links verarbeiten
-        def replace_linkedin_with_link(match):
-            linkedin_text = match.group(1)
-            linkedin_url = Config.PERSONAL_LINKEDIN
-            if linkedin_url:
-                return f'LINKEDIN_LINK:{linkedin_text}:{linkedin_url}'
-            else:
-                return linkedin_text
-        
-        # Ersetze GitHub-Projekte
-        processed_text = re.sub(github_project_pattern, replace_project_with_link, processed_text)
-        
-        # Ersetze LinkedIn-Erwähnungen
-        processed_text = re.sub(linkedin_pattern, replace_linkedin_with_link, processed_text)
-        
-        # Jetzt den Text mit den Markierungen verarbeiten
-        self._process_text_with_links(paragraph, processed_text)
-    
-    def _process_text_with_links(self, paragraph, text):
-        """Verarbeitet Text mit GitHub- und LinkedIn-Link-Markierungen"""
-        # Split text by link markers - berücksichtigt URLs mit ://
-        parts = re.split(r'(GITHUB_LINK:[^:]+:https?://[^\s]+|LINKEDIN_LINK:[^:]+:https?://[^\s]+)', text)
-        
-        for part in parts:
-            if part.startswith('GITHUB_LINK:'):
-                # Extract GitHub link info
-                try:
-                    _, link_text, url = part.split(':', 2)
-                    self._add_hyperlink(paragraph, link_text, url)
-                except ValueError:
-                    # Fallback bei Parsing-Fehlern
-                    run = paragraph.add_run(part)
-                    self._set_font(run, size=11, bold=False)
-            elif part.startswith('LINKEDIN_LINK:'):
-                # Extract LinkedIn link info
-                try:
-                    _, link_text, url = part.split(':', 2)
-                    self._add_hyperlink(paragraph, link_text, url)
-                except ValueError:
-                    # Fallback bei Parsing-Fehlern
-                    run = paragraph.add_run(part)
-                    self._set_font(run, size=11, bold=False)
-            else:
-                # Regular text
-                if part:
-                    run = paragraph.add_run(part)
-                    self._set_font(run, size=11, bold=False)
-    
-    def _extract_github_projects_from_text(self, text):
-        """Extrahiert GitHub-Projektnamen aus dem Text"""
-        # Diese Methode könnte erweitert werden, um dynamisch Projekte zu erkennen
-        common_projects = ['AutomaticMotivation', 'ZurdLLMWS', 'Auto-search-jobs']
-        found_projects = []
-        
-        for project in common_projects:
-            if project in text:
-                found_projects.append(project)
-        
-        return found_projects
-    
-    def _get_github_url_for_project(self, project_name):
-        """Gibt die GitHub-URL für ein Projekt zurück"""
-        # Verwende Config für dynamische URL-Generierung
-        project_urls = Config.get_github_project_urls()
-        return project_urls.get(project_name)
+    def _add_main_content(self, doc: Document, layout: LetterLayout):
+        """Fügt Anrede und Hauptinhalt mit GitHub-Projekt- und LinkedIn-Hyperlinks hinzu"""
+        paragraphs = ([Block([Run(layout.salutation)])] if layout.salutation else []) + layout.blocks
+        
+        for block in paragraphs:
+            content_paragraph = doc.add_paragraph()
+            
+            for run in block.runs:
+                if run.link:
+                    self._add_hyperlink(content_paragraph, run.text, run.link)
+                else:
+                    text_run = content_paragraph.add_run(run.text)
+                    self._set_font(text_run, size=11, bold=False)
+            
+            # Zeilenabstand setzen
+            paragraph_format = content_paragraph.paragraph_format
+            paragraph_format.space_after = Pt(6)
+            paragraph_format.line_spacing = 1.15
     
     def _add_hyperlink(self, paragraph, text, url):
         """Fügt einen Hyperlink zu einem Absatz hinzu"""
@@ -412,6 +334,9 @@ class DocxGenerator:
             # Text-Element
             text_elem = OxmlElement('w:t')
             text_elem.text = text
+            if text != text.strip():
+                # Leerzeichen am Rand erhalten (wie bei add_run)
+                text_elem.set(qn('xml:space'), 'preserve')
             run.append(text_elem)
             
             hyperlink.append(run)
@@ -425,14 +350,14 @@ class DocxGenerator:
             run = paragraph.add_run(text)
             self._set_font(run, size=11, bold=False)
     
-    def _add_closing(self, doc: Document, motivation_letter: MotivationLetter):
+    def _add_closing(self, doc: Document, layout: LetterLayout):
         """Fügt Grußformel hinzu"""
         # Leerzeile vor Grußformel
         doc.add_paragraph()
         
         # Grußformel
         closing_paragraph = doc.add_paragraph()
-        closing_run = closing_paragraph.add_run("Freundliche Grüsse")
+        closing_run = closing_paragraph.add_run(layout.closing)
         closing_run.font.size = Pt(11)
         closing_run.font.name = 'Aptos Display'
         
@@ -441,7 +366,7 @@ class DocxGenerator:
         
         # Name für Unterschrift
         signature_paragraph = doc.add_paragraph()
-        signature_run = signature_paragraph.add_run(f"{motivation_letter.sender_name}")
+        signature_run = signature_paragraph.add_run(layout.signature)
         signature_run.font.size = Pt(11)
         signature_run.font.name = 'Aptos Display'
     
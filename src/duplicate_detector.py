@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Duplikat-Erkennung für AutomaticMotivation
+MinHash-Signaturen über Wort-Shingles des bereinigten Stellentexts mit LSH-Index.
+Erkennt quer gepostete Stellen (mehrere Boards, Agenturen) schon beim Abruf,
+damit JobInfo und Motivationsschreiben wiederverwendet werden können.
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: nur prozessinterne Sperre
+    fcntl = None
+
+from bs4 import BeautifulSoup
+
+from config.config import Config
+from src.models import model_to_dict
+
+logger = logging.getLogger(__name__)
+
+# Mersenne-Primzahl für die Permutationen (a * h + b) mod p
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def posting_text(html_content: str) -> str:
+    """Bereinigter, sichtbarer Text einer Stellenseite (ohne Navigation, Scripts, Footer)"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    for tag in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'form', 'noscript']):
+        tag.decompose()
+    return soup.get_text(' ')
+
+
+def shingles(text: str, size: int = 5) -> Set[str]:
+    """Wort-Shingles eines normalisierten Textes"""
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+@dataclass
+class DuplicateMatch:
+    """Treffer im Duplikat-Index"""
+    url: str
+    similarity: float
+    entry: Dict[str, Any]
+
+    @property
+    def job_info(self) -> Optional[Dict[str, Any]]:
+        return self.entry.get('job_info')
+
+    @property
+    def letter(self) -> Optional[Dict[str, Any]]:
+        return self.entry.get('letter')
+
+    @property
+    def outputs(self) -> Dict[str, str]:
+        return self.entry.get('outputs') or {}
+
+
+class MinHasher:
+    """Deterministische MinHash-Signaturen (identisch über Prozesse und Läufe)"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, shingle_set: Set[str]) -> List[int]:
+        if not shingle_set:
+            return [_MAX_HASH] * self.num_perm
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+            for shingle in shingle_set
+        ]
+        return [
+            min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._params
+        ]
+
+    @staticmethod
+    def similarity(first: List[int], second: List[int]) -> float:
+        """Geschätzte Jaccard-Ähnlichkeit zweier Signaturen"""
+        if not first or len(first) != len(second):
+            return 0.0
+        return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+class DuplicateIndex:
+    """
+    Persistenter LSH-Index über MinHash-Signaturen
+
+    Die Signatur wird in ``bands`` Bänder zerlegt; Stellen, die in mindestens
+    einem Band übereinstimmen, sind Kandidaten und werden über die geschätzte
+    Jaccard-Ähnlichkeit gegen den Schwellwert geprüft.
+
+    Schreibzugriffe mehrerer Prozesse (Batch-Worker) werden über eine Dateisperre
+    serialisiert: Laden, Ändern und Ersetzen der Datei geschehen unter derselben Sperre.
+    """
+
+    INDEX_VERSION = 1
+
+    def __init__(self, index_file: Optional[Path] = None, threshold: Optional[float] = None,
+                 num_perm: int = 128, bands: int = 16):
+        self.index_file = Path(index_file or Config.DUPLICATE_INDEX_FILE)
+        self.threshold = threshold if threshold is not None else Config.DUPLICATE_THRESHOLD
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._version: Optional[Tuple[int, int, int]] = None  # Stand der geladenen Datei
+        self._buckets: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def signature(self, text: str) -> List[int]:
+        return self.hasher.signature(shingles(text))
+
+    def find_duplicate(self, text: str, exclude_url: Optional[str] = None) -> Optional[DuplicateMatch]:
+        """
+        Sucht die ähnlichste bereits verarbeitete Stelle
+
+        Args:
+            text: Bereinigter Stellentext
+            exclude_url: Eigene URL (nicht als Duplikat melden)
+
+        Returns:
+            DuplicateMatch oder None
+        """
+        shingle_set = shingles(text)
+        if not shingle_set:
+            return None
+        signature = self.hasher.signature(shingle_set)
+        with self._lock:
+            entries = self._load()
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates.update(self._buckets.get(key, ()))
+            candidates.discard(exclude_url)
+
+            best = None
+            for url in candidates:
+                similarity = MinHasher.similarity(signature, entries[url]['signature'])
+                if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                    best = DuplicateMatch(url, similarity, entries[url])
+
+        if best:
+            logger.info(f"Duplikat erkannt: {best.url} (Ähnlichkeit {best.similarity:.2f})")
+        return best
+
+    def add(self, url: str, text: str, job_info: Any = None, letter: Any = None,
+            outputs: Optional[Dict[str, str]] = None):
+        """Nimmt eine verarbeitete Stelle in den Index auf (bzw. aktualisiert sie)"""
+        signature = self.signature(text)
+        with self._lock, self._file_lock():
+            entries = self._load()
+            previous = entries.get(url, {})
+            entries[url] = {
+                'signature': signature,
+                'added_at': previous.get('added_at', time.time()),
+                'job_info': model_to_dict(job_info) if job_info is not None else previous.get('job_info'),
+                'letter': model_to_dict(letter) if letter is not None else previous.get('letter'),
+                'outputs': outputs or previous.get('outputs') or {}
+            }
+            for key in self._band_keys(signature):
+                self._buckets.setdefault(key, set()).add(url)
+            self._save()
+
+    def update(self, url: str, job_info: Any = None, letter: Any = None,
+               outputs: Optional[Dict[str, str]] = None):
+        """Ergänzt JobInfo, Brief oder Ausgabedateien einer bereits indexierten Stelle"""
+        with self._lock, self._file_lock():
+            entry = self._load().get(url)
+            if entry is None:
+                return
+            if job_info is not None:
+                entry['job_info'] = model_to_dict(job_info)
+            if letter is not None:
+                entry['letter'] = model_to_dict(letter)
+            if outputs:
+                entry['outputs'] = outputs
+            self._save()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def _band_keys(self, signature: List[int]) -> List[str]:
+        return [
+            f"{band}:{hashlib.blake2b(repr(signature[band * self.rows:(band + 1) * self.rows]).encode(), digest_size=8).hexdigest()}"
+            for band in range(self.bands)
+        ]
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Lädt den Index (erneut, wenn ein anderer Prozess ihn geändert hat) und baut die LSH-Buckets auf"""
+        version = self._file_version()
+        if self._entries is None or version != self._version:
+            self._entries = {}
+            self._version = version
+            try:
+                if version is not None:
+                    with open(self.index_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    if data.get('version') == self.INDEX_VERSION and data.get('num_perm') == self.hasher.num_perm:
+                        self._entries = data.get('entries', {})
+            except Exception as e:
+                logger.error(f"Fehler beim Laden des Duplikat-Index: {e}")
+
+            self._buckets = {}
+            for url, entry in self._entries.items():
+                for key in self._band_keys(entry['signature']):
+                    self._buckets.setdefault(key, set()).add(url)
+        return self._entries
+
+    @contextmanager
+    def _file_lock(self):
+        """Sperrt den Index prozessübergreifend (Sperrdatei, da os.replace die Indexdatei austauscht)"""
+        if fcntl is None:
+            yield
+            return
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.index_file.with_name(self.index_file.name + '.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save(self):
+        """Speichert den Index atomar (Aufrufer hält die Dateisperre)"""
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.index_file.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': self.INDEX_VERSION,
+                    'num_perm': self.hasher.num_perm,
+                    'entries': self._entries
+                }, f, ensure_ascii=False)
+            # Stand der eigenen Datei merken, nicht den nach dem Ersetzen gelesenen
+            stat = os.stat(tmp_path)
+            os.replace(tmp_path, self.index_file)
+            self._version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except Exception as e:
+            logger.error(f"Fehler beim Speichern des Duplikat-Index: {e}")
+
+    def _file_version(self) -> Optional[Tuple[int, int, int]]:
+        """Inode, Änderungszeit und Größe der Indexdatei (jeder Speichervorgang erzeugt eine neue Datei)"""
+        try:
+            stat = self.index_file.stat()
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
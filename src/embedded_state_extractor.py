@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Embedded-State-Extraktor für AutomaticMotivation
+Liest Stellendaten aus den Daten-Inseln JavaScript-gerenderter Seiten
+(__NEXT_DATA__, window.__INITIAL_STATE__, Nuxt-Payloads, eingebettete JSON-Antworten),
+damit leere HTML-Shells ohne Headless-Browser mit einem einzigen Abruf auskommen
+"""
+
+import json
+import re
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from src.job_posting_mapper import html_to_text, map_job_posting, requirements_from_description
+
+logger = logging.getLogger(__name__)
+
+# Zuweisungen wie window.__INITIAL_STATE__ = {...} oder window.__APOLLO_STATE__={...}
+STATE_ASSIGNMENT = re.compile(
+    r'(?:window|self|globalThis)\.(__[A-Z0-9_]+__|[A-Za-z_$][\w$]*(?:State|Data|DATA|STATE))\s*=\s*'
+)
+JSON_PARSE_ASSIGNMENT = re.compile(r'''JSON\.parse\(\s*(['"])(.*?)(?<!\\)\1\s*\)''', re.DOTALL)
+
+# Schlüssel-Aliase für Stellenobjekte in Framework-States
+FIELD_ALIASES = {
+    'position': ('title', 'jobTitle', 'job_title', 'positionName', 'position', 'name'),
+    'company': ('companyName', 'company_name', 'company', 'employer', 'hiringOrganization', 'organization',
+                'employerName', 'organisation'),
+    'location': ('location', 'city', 'jobLocation', 'workplace', 'locationName', 'place', 'town'),
+    'description': ('description', 'jobDescription', 'descriptionHtml', 'content', 'body', 'text', 'teaser'),
+    'requirements': ('requirements', 'qualifications', 'profile', 'skills', 'yourProfile', 'candidateProfile'),
+    'benefits': ('benefits', 'offer', 'weOffer', 'perks'),
+    'working_hours': ('workload', 'employmentGrade', 'employmentType', 'workingHours', 'workHours'),
+    'department': ('department', 'team', 'division')
+}
+CONTACT_KEYS = ('contact', 'contactPerson', 'recruiter', 'applicationContact', 'hiringManager')
+
+# Mindestanzahl erkannter Felder, damit ein Objekt als Stellenanzeige gilt
+MIN_JOB_SCORE = 3
+MAX_DEPTH = 25
+
+
+def find_data_islands(soup: BeautifulSoup) -> List[Tuple[str, Any]]:
+    """
+    Sucht alle eingebetteten JSON-Zustände einer Seite
+
+    Returns:
+        Liste von (Quelle, geparstes JSON)
+    """
+    islands = []
+    decoder = json.JSONDecoder()
+
+    for script in soup.find_all('script'):
+        raw = script.string or script.get_text() or ''
+        if not raw.strip():
+            continue
+        script_type = (script.get('type') or '').lower()
+        script_id = script.get('id') or ''
+
+        if script_type == 'application/ld+json':
+            continue  # JSON-LD wird separat ausgewertet
+
+        if script_id == '__NUXT_DATA__':
+            data = _loads(raw)
+            if data is not None:
+                islands.append(('nuxt', unflatten_nuxt_payload(data)))
+            continue
+
+        if script_type == 'application/json' or script_id == '__NEXT_DATA__':
+            data = _loads(raw)
+            if data is not None:
+                islands.append((script_id or 'application/json', data))
+            continue
+
+        for match in STATE_ASSIGNMENT.finditer(raw):
+            start = _skip_whitespace(raw, match.end())
+            if start < len(raw) and raw[start] in '{[':
+                try:
+                    data, _ = decoder.raw_decode(raw, start)
+                    islands.append((match.group(1), data))
+                except json.JSONDecodeError:
+                    continue
+
+        for match in JSON_PARSE_ASSIGNMENT.finditer(raw):
+            try:
+                islands.append(('JSON.parse', json.loads(_decode_js_string(match.group(2)))))
+            except (json.JSONDecodeError, ValueError):
+                continue
+
+    return islands
+
+
+def unflatten_nuxt_payload(payload: Any) -> Any:
+    """
+    Löst das Nuxt-3-Payload-Format (devalue) auf
+
+    Das Payload ist ein flaches Array; Objekte und Listen referenzieren andere
+    Einträge über ihren Index. Wrapper wie ["Reactive", i] werden entpackt.
+    """
+    if not isinstance(payload, list) or not payload:
+        return payload
+
+    cache: Dict[int, Any] = {}
+    wrappers = {'Reactive', 'ShallowReactive', 'Ref', 'ShallowRef', 'EmptyRef', 'EmptyShallowRef', 'NuxtError'}
+
+    def resolve(index: Any, depth: int = 0) -> Any:
+        if not isinstance(index, int) or index < 0 or index >= len(payload) or depth > MAX_DEPTH * 4:
+            return None
+        if index in cache:
+            return cache[index]
+
+        value = payload[index]
+        if isinstance(value, dict):
+            result = {}
+            cache[index] = result
+            for key, ref in value.items():
+                result[key] = resolve(ref, depth + 1)
+            return result
+        if isinstance(value, list):
+            if value and isinstance(value[0], str) and value[0] in wrappers:
+                result = resolve(value[1], depth + 1) if len(value) > 1 else None
+            elif value and value[0] in ('Date', 'BigInt', 'RegExp') and len(value) > 1:
+                result = value[1]
+            elif value and value[0] == 'Set':
+                result = [resolve(ref, depth + 1) for ref in value[1:]]
+            else:
+                result = []
+                cache[index] = result
+                result.extend(resolve(ref, depth + 1) for ref in value)
+            cache[index] = result
+            return result
+        cache[index] = value
+        return value
+
+    return resolve(0)
+
+
+def _loads(raw: str) -> Optional[Any]:
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+
+
+def _decode_js_string(body: str) -> str:
+    """Dekodiert den Inhalt eines JS-String-Literals (einfache oder doppelte Anführungszeichen)"""
+    # In ein JSON-String-Literal übersetzen: \' und \xNN gibt es in JSON nicht,
+    # unmaskierte doppelte Anführungszeichen müssen maskiert werden
+    parts = []
+    index = 0
+    while index < len(body):
+        char = body[index]
+        if char == '\\' and index + 1 < len(body):
+            escaped = body[index + 1]
+            if escaped == "'":
+                parts.append("'")
+            elif escaped == 'x' and re.match(r'[0-9a-fA-F]{2}', body[index + 2:index + 4]):
+                parts.append('\\u00' + body[index + 2:index + 4])
+                index += 2
+            else:
+                parts.append(char + escaped)
+            index += 2
+            continue
+        parts.append('\\"' if char == '"' else char)
+        index += 1
+    return json.loads('"' + ''.join(parts) + '"')
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    while position < len(text) and text[position].isspace():
+        position += 1
+    return position
+
+
+def _iter_objects(data: Any, depth: int = 0) -> Iterable[Dict[str, Any]]:
+    """Durchläuft alle Objekte eines JSON-Baums (begrenzte Tiefe)"""
+    if depth > MAX_DEPTH:
+        return
+    if isinstance(data, dict):
+        yield data
+        for value in data.values():
+            yield from _iter_objects(value, depth + 1)
+    elif isinstance(data, list):
+        for item in data:
+            yield from _iter_objects(item, depth + 1)
+
+
+def _as_text(value: Any) -> str:
+    """Liest Text aus Strings, Listen oder Objekten (name/city/label/value)"""
+    if value is None or isinstance(value, bool):
+        return ''
+    if isinstance(value, str):
+        return html_to_text(value)
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, list):
+        parts = [_as_text(item) for item in value]
+        return '; '.join(part for part in parts if part)
+    if isinstance(value, dict):
+        for key in ('name', 'city', 'addressLocality', 'label', 'title', 'value', 'text', 'description'):
+            if value.get(key):
+                return _as_text(value[key])
+        address = value.get('address')
+        if address:
+            return _as_text(address)
+    return ''
+
+
+def _lookup(obj: Dict[str, Any], aliases: Tuple[str, ...]) -> Any:
+    for key in aliases:
+        if key in obj and obj[key] not in (None, '', [], {}):
+            return obj[key]
+    return None
+
+
+def _score(obj: Dict[str, Any]) -> int:
+    """Bewertet, wie sehr ein Objekt einer Stellenanzeige ähnelt"""
+    score = 0
+    for field_name, aliases in FIELD_ALIASES.items():
+        value = _lookup(obj, aliases)
+        if value is None:
+            continue
+        if field_name == 'description':
+            # Beschreibung zählt nur, wenn sie nach Fließtext aussieht
+            score += 2 if len(_as_text(value)) >= 200 else 0
+        else:
+            score += 1
+    # 'name' allein ist zu unspezifisch (Menüpunkte, Kategorien, ...)
+    if _lookup(obj, ('title', 'jobTitle', 'job_title', 'positionName', 'position')) is None:
+        score -= 1
+    return score
+
+
+def map_state_object(obj: Dict[str, Any]) -> Dict[str, str]:
+    """Überführt ein Stellenobjekt aus einem Framework-State in JobInfo-Felder"""
+    types = obj.get('@type')
+    if types == 'JobPosting' or (isinstance(types, list) and 'JobPosting' in types):
+        return map_job_posting(obj)
+
+    fields = {}
+    for field_name, aliases in FIELD_ALIASES.items():
+        value = _lookup(obj, aliases)
+        if value is not None:
+            fields[field_name] = _as_text(value)
+
+    description = _lookup(obj, FIELD_ALIASES['description'])
+    if not fields.get('requirements') and isinstance(description, str):
+        fields['requirements'] = requirements_from_description(description)
+
+    contact = _lookup(obj, CONTACT_KEYS)
+    if isinstance(contact, dict):
+        fields['contact_person'] = _as_text(contact.get('name') or contact.get('fullName'))
+        fields['contact_title'] = _as_text(contact.get('title') or contact.get('jobTitle') or contact.get('position'))
+        fields['email'] = _as_text(contact.get('email'))
+        fields['phone'] = _as_text(contact.get('phone') or contact.get('telephone'))
+
+    return {key: value for key, value in fields.items() if value}
+
+
+def find_job_object(soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+    """Sucht in allen Daten-Inseln das Objekt, das am ehesten eine Stellenanzeige ist"""
+    best, best_score = None, MIN_JOB_SCORE - 1
+    for source, data in find_data_islands(soup):
+        for obj in _iter_objects(data):
+            score = _score(obj)
+            if score > best_score:
+                best, best_score = obj, score
+                logger.debug(f"Stellenobjekt-Kandidat in {source} (Score {score})")
+    return best
+
+
+def extract_embedded_fields(soup: BeautifulSoup) -> Dict[str, str]:
+    """JobInfo-Felder aus eingebetteten Daten (leeres Dict, wenn nichts gefunden)"""
+    job_object = find_job_object(soup)
+    if job_object is None:
+        return {}
+    fields = map_state_object(job_object)
+    if fields:
+        logger.info(f"Stellendaten aus eingebettetem State gelesen: {', '.join(sorted(fields))}")
+    return fields
+
+
+def extract_embedded_text(soup: BeautifulSoup) -> str:
+    """Lesbarer Stellentext aus eingebetteten Daten (für den LLM-Fallback)"""
+    fields = extract_embedded_fields(soup)
+    if not fields:
+        return ''
+    labels = {
+        'position': 'Titel', 'company': 'Unternehmen', 'location': 'Standort', 'department': 'Bereich',
+        'working_hours': 'Pensum', 'description': 'Beschreibung', 'requirements': 'Anforderungen',
+        'benefits': 'Benefits', 'contact_person': 'Kontakt', 'email': 'E-Mail', 'phone': 'Telefon'
+    }
+    return '\n'.join(f"{label}: {fields[key]}" for key, label in labels.items() if fields.get(key))
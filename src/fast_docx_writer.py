@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Schneller DOCX-Writer für AutomaticMotivation
+Erzeugt das Motivationsschreiben ohne python-docx-Objektbaum: ein einmal erstelltes
+Basis-Paket (Styles, Theme, Settings, ...) liegt fertig gezippt im Speicher, pro Brief
+werden nur word/document.xml und dessen Relationships als Text erzeugt und angehängt.
+Die Struktur entspricht dem python-docx-Pfad des DocxGenerator (gleiche Absätze, Runs,
+Formatierung und Hyperlink-Relationships), siehe scripts/analyze_hyperlinks.py.
+"""
+
+import re
+import zipfile
+import threading
+import logging
+from io import BytesIO
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+from src.models import MotivationLetter
+from src.letter_layout import LetterLayout
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_PART = 'word/document.xml'
+DOCUMENT_RELS_PART = 'word/_rels/document.xml.rels'
+HYPERLINK_RELTYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink"
+
+FONT = '<w:rFonts w:ascii="Aptos Display" w:hAnsi="Aptos Display"/>'
+NOT_BOLD = '<w:b w:val="0"/>'
+
+# Absatzformate wie im python-docx-Pfad (space_after/line_spacing aus DocxGenerator)
+COMPACT = '<w:pPr><w:spacing w:after="0" w:line="240" w:lineRule="auto"/></w:pPr>'
+COMPACT_RIGHT = '<w:pPr><w:spacing w:after="0" w:line="240" w:lineRule="auto"/><w:jc w:val="right"/></w:pPr>'
+COMPACT_TIGHT = '<w:pPr><w:spacing w:after="0" w:before="0" w:line="240" w:lineRule="auto"/></w:pPr>'
+RIGHT = '<w:pPr><w:jc w:val="right"/></w:pPr>'
+BODY = '<w:pPr><w:spacing w:after="120" w:line="276" w:lineRule="auto"/></w:pPr>'
+EMPTY_PARAGRAPH = '<w:p/>'
+
+
+def _text(text: str) -> str:
+    """w:t-Elemente eines Runs; Zeilenumbrüche und Tabs wie python-docx als w:br/w:tab"""
+    parts = []
+    for piece in re.split(r'([\t\n])', text):
+        if piece == '\n':
+            parts.append('<w:br/>')
+        elif piece == '\t':
+            parts.append('<w:tab/>')
+        elif piece:
+            preserve = ' xml:space="preserve"' if piece != piece.strip() else ''
+            parts.append(f'<w:t{preserve}>{escape(piece)}</w:t>')
+    return ''.join(parts)
+
+
+def _run(text: str, properties: str) -> str:
+    return f'<w:r><w:rPr>{properties}</w:rPr>{_text(text)}</w:r>'
+
+
+def _paragraph(runs: str, properties: str = '') -> str:
+    return f'<w:p>{properties}{runs}</w:p>'
+
+
+class FastDocxWriter:
+    """
+    Schreibt Motivationsschreiben direkt als DOCX-Paket
+
+    Das Basis-Paket wird beim ersten Gebrauch einmal aus einem leeren python-docx-Dokument
+    (mit den Seitenrändern des DocxGenerator) erzeugt und prozessweit geteilt.
+    """
+
+    _base_lock = threading.Lock()
+    _base: Optional[Dict[str, object]] = None
+
+    @classmethod
+    def _load_base(cls) -> Dict[str, object]:
+        with cls._base_lock:
+            if cls._base is None:
+                cls._base = cls._build_base()
+            return cls._base
+
+    @staticmethod
+    def _build_base() -> Dict[str, object]:
+        """Leeres Dokument speichern und alles außer document.xml (+ Relationships) behalten"""
+        from docx import Document
+        from docx.shared import Inches
+
+        document = Document()
+        for section in document.sections:
+            section.top_margin = Inches(1.0)
+            section.bottom_margin = Inches(1.0)
+            section.left_margin = Inches(1.0)
+            section.right_margin = Inches(1.0)
+        template = BytesIO()
+        document.save(template)
+
+        base = BytesIO()
+        with zipfile.ZipFile(template) as source, zipfile.ZipFile(base, 'w', zipfile.ZIP_DEFLATED) as target:
+            document_xml = source.read(DOCUMENT_PART).decode('utf-8')
+            rels_xml = source.read(DOCUMENT_RELS_PART).decode('utf-8')
+            for info in source.infolist():
+                if info.filename not in (DOCUMENT_PART, DOCUMENT_RELS_PART):
+                    target.writestr(info, source.read(info.filename))
+
+        body_start = document_xml.index('<w:body>') + len('<w:body>')
+        section_start = document_xml.index('<w:sectPr')
+        relationship_ids = [int(number) for number in re.findall(r'Id="rId(\d+)"', rels_xml)]
+        logger.info(f"DOCX-Basis-Paket erstellt ({len(base.getvalue())} Bytes)")
+        return {
+            'package': base.getvalue(),
+            'document_head': document_xml[:body_start],
+            'document_tail': document_xml[section_start:],
+            'rels_head': rels_xml[:rels_xml.rindex('</Relationships>')],
+            'next_rid': max(relationship_ids, default=0) + 1
+        }
+
+    def render(self, motivation_letter: MotivationLetter, layout: LetterLayout, date_line: str) -> bytes:
+        """
+        Rendert das DOCX-Paket
+
+        Args:
+            motivation_letter: Das Motivationsschreiben (Absender, Empfänger, Betreff)
+            layout: Brief-Layout (Anrede, Absätze, Links, Grußformel)
+            date_line: Ort und Datum, z.B. "Zürich, 19.10.2026"
+        """
+        base = self._load_base()
+        hyperlinks: List[Tuple[str, str]] = []
+        relationship_ids: Dict[str, str] = {}
+
+        def hyperlink(text: str, url: str) -> str:
+            if not url.startswith(('http://', 'https://')):
+                return _run(text, FONT + '<w:sz w:val="22"/>')
+            if url not in relationship_ids:
+                relationship_ids[url] = f"rId{base['next_rid'] + len(hyperlinks)}"
+                hyperlinks.append((relationship_ids[url], url))
+            return (f'<w:hyperlink r:id="{relationship_ids[url]}"><w:r><w:rPr>{FONT}<w:sz w:val="22"/>'
+                    f'<w:color w:val="0000FF"/><w:u w:val="single"/></w:rPr>{_text(text)}</w:r>'
+                    f'</w:hyperlink>')
+
+        body = [
+            self._sender(motivation_letter), EMPTY_PARAGRAPH,
+            *self._recipient(motivation_letter), EMPTY_PARAGRAPH,
+            _paragraph(_run(date_line, FONT + '<w:sz w:val="22"/>'), RIGHT), EMPTY_PARAGRAPH,
+            _paragraph(_run(motivation_letter.subject, FONT + '<w:b/><w:sz w:val="28"/>')), EMPTY_PARAGRAPH
+        ]
+
+        blocks = ([[(layout.salutation, None)]] if layout.salutation else []) + \
+            [[(run.text, run.link) for run in block.runs] for block in layout.blocks]
+        for runs in blocks:
+            body.append(_paragraph(''.join(
+                hyperlink(text, link) if link else _run(text, FONT + NOT_BOLD + '<w:sz w:val="22"/>')
+                for text, link in runs
+            ), BODY))
+
+        body += [
+            EMPTY_PARAGRAPH, _paragraph(_run(layout.closing, FONT + '<w:sz w:val="22"/>')),
+            EMPTY_PARAGRAPH, _paragraph(_run(layout.signature, FONT + '<w:sz w:val="22"/>'))
+        ]
+
+        document_xml = base['document_head'] + ''.join(body) + base['document_tail']
+        rels_xml = base['rels_head'] + ''.join(
+            f'<Relationship Id="{rid}" Type="{HYPERLINK_RELTYPE}" Target={quoteattr(url)} TargetMode="External"/>'
+            for rid, url in hyperlinks
+        ) + '</Relationships>'
+
+        package = BytesIO(base['package'])
+        package.seek(0, 2)
+        with zipfile.ZipFile(package, 'a', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(DOCUMENT_PART, document_xml.encode('utf-8'))
+            archive.writestr(DOCUMENT_RELS_PART, rels_xml.encode('utf-8'))
+        return package.getvalue()
+
+    def write(self, motivation_letter: MotivationLetter, layout: LetterLayout, date_line: str, stream: BinaryIO):
+        """Rendert das DOCX-Paket in einen beschreibbaren Stream"""
+        stream.write(self.render(motivation_letter, layout, date_line))
+
+    @staticmethod
+    def _sender(motivation_letter: MotivationLetter) -> str:
+        address_parts = motivation_letter.sender_address.split(', ')
+        if len(address_parts) >= 2:
+            address_lines = [address_parts[0].strip(), address_parts[1].strip()]
+        else:
+            address_lines = [motivation_letter.sender_address]
+
+        runs = [_run(f"{line}\n", FONT + NOT_BOLD + '<w:sz w:val="22"/>')
+                for line in [motivation_letter.sender_name, *address_lines]]
+        runs.append(_run(f"{motivation_letter.sender_phone}\n", FONT + '<w:sz w:val="22"/>'))
+        runs.append(_run(motivation_letter.sender_email, FONT + '<w:sz w:val="22"/>'))
+        return _paragraph(''.join(runs), COMPACT_RIGHT)
+
+    @staticmethod
+    def _recipient(motivation_letter: MotivationLetter) -> List[str]:
+        paragraphs = [_paragraph(
+            _run(motivation_letter.recipient_company, FONT + NOT_BOLD + '<w:sz w:val="22"/><w:u w:val="none"/>'),
+            COMPACT
+        )]
+        address = motivation_letter.recipient_company_address
+        if address and address != "Nicht angegeben":
+            for part in address.split(','):
+                part = part.strip()
+                if part:
+                    paragraphs.append(_paragraph(_run(part, FONT + '<w:sz w:val="22"/>'), COMPACT_TIGHT))
+
+        if (motivation_letter.recipient_name and
+                motivation_letter.recipient_name != "Nicht angegeben" and
+                motivation_letter.recipient_name != motivation_letter.recipient_company):
+            paragraphs.append(EMPTY_PARAGRAPH)
+            paragraphs.append(_paragraph(
+                _run(f"z.H. {motivation_letter.recipient_name}", FONT + '<w:sz w:val="22"/>'), COMPACT_TIGHT
+            ))
+        return paragraphs
@@ -9,9 +9,12 @@ import json
 import re
 from typing import List, Dict, Optional
 from dataclasses import dataclass
-from langchain_openai import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage
 from config.config import Config
+from src.github_project_store import GitHubProjectStore
+from src.llm_utils import LLMFactory
+from src.llm_metrics import tracked_invoke
+from src.profiler import profiler
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,6 +29,8 @@ class GitHubProject:
     topics: List[str]
     stars: int
     is_fork: bool
+    readme_summary: str = ''
+    pushed_at: str = ''
     
 class GitHubProjectExtractor:
     """Klasse zum Extrahieren relevanter GitHub-Projekte"""
@@ -33,30 +38,18 @@ class GitHubProjectExtractor:
     def __init__(self):
         self.config = Config.get_llm_config()
         self.llm = self._initialize_llm()
+        self.project_store = GitHubProjectStore()
         
     def _initialize_llm(self):
-        """Initialisiert das LLM für die Projekt-Auswahl"""
+        """Initialisiert das LLM für die Projekt-Auswahl (standardmäßig das schnelle Modell des Providers)"""
         try:
-            if self.config['provider'] == 'openrouter':
-                llm = ChatOpenAI(
-                    api_key=self.config['api_key'],
-                    base_url=self.config['base_url'],
-                    model=self.config['model'],
-                    temperature=0.3,  # Niedrigere Temperatur für konsistente Auswahl
-                    max_tokens=1000
-                )
-            else:
-                llm = ChatOpenAI(
-                    api_key=self.config['api_key'],
-                    model=self.config['model'],
-                    temperature=0.3,
-                    max_tokens=1000
-                )
-            return llm
+            # Niedrigere Temperatur für konsistente Auswahl
+            return LLMFactory.create_llm_for_stage('project_selection', temperature=0.3, max_tokens=1000)
         except Exception as e:
             logger.error(f"Fehler bei LLM-Initialisierung: {e}")
             raise
     
+    @profiler.traced('github_projects')
     def get_github_projects(self, github_url: str) -> List[GitHubProject]:
         """
         Ruft alle öffentlichen Repositories von GitHub ab mit Caching
@@ -69,9 +62,15 @@ class GitHubProjectExtractor:
         """
         try:
             # Extrahiere Username aus URL
-            username = github_url.split('/')[-1]
+            username = github_url.rstrip('/').split('/')[-1]
+            
+            # Bevorzugt: Persistenter Projekt-Store mit echten Metadaten
+            projects = self.project_store.get_projects(username)
+            if projects:
+                logger.info(f"Erfolgreich {len(projects)} Projekte aus Projekt-Store geladen")
+                return projects
             
-            # Nutze Config-Cache für Projekt-URLs
+            # Fallback: Config-Cache für Projekt-URLs
             project_urls = Config.get_github_project_urls()
             
             # Wenn wir bereits URLs haben, verwende sie
@@ -260,6 +259,7 @@ class GitHubProjectExtractor:
                    Beschreibung: {project.description}
                    Sprache: {project.language}
                    Topics: {', '.join(project.topics) if project.topics else 'Keine'}
+                   README: {project.readme_summary or 'Keine Zusammenfassung'}
                    Sterne: {project.stars}
                    URL: {project.url}
                 """
@@ -305,7 +305,7 @@ class GitHubProjectExtractor:
                 HumanMessage(content=prompt)
             ]
             
-            response = self.llm.invoke(messages)
+            response = tracked_invoke(self.llm, messages, stage='project_selection')
             response_content = response.content.strip()
             
             # Prüfe, ob keine relevanten Projekte gefunden wurden
@@ -358,10 +358,13 @@ class GitHubProjectExtractor:
             description = f"'{project.name}' ({project.language}): {project.description}"
             if project.topics:
                 description += f" [Topics: {', '.join(project.topics)}]"
+            if project.readme_summary and project.readme_summary != project.description:
+                description += f" README: {project.readme_summary}"
             project_descriptions.append(description)
         
         return "; ".join(project_descriptions)
     
+    @profiler.traced('project_selection')
     def get_relevant_projects_for_job(self, github_url: str, job_position: str, 
                                     job_requirements: str, max_projects: int = 3) -> List[GitHubProject]:
         """
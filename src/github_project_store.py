@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+GitHub Project Store für AutomaticMotivation
+Persistenter Projekt-Speicher mit vollständigen Metadaten und README-Zusammenfassungen
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import requests
+
+from config.config import Config
+from src.profiler import profiler
+
+if TYPE_CHECKING:
+    from src.github_project_extractor import GitHubProject
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = "https://api.github.com"
+
+
+class GitHubProjectStore:
+    """
+    Persistenter Speicher für GitHub-Projekte
+
+    Der Store wird inkrementell aufgebaut: Bei einer Aktualisierung wird nur die
+    Repository-Liste abgefragt. READMEs werden nur für neue oder seit der letzten
+    Aktualisierung veränderte Repositories (``pushed_at``) erneut geladen.
+    """
+
+    STORE_VERSION = 1
+
+    def __init__(self, store_file: Optional[Path] = None):
+        self.store_file = Path(store_file or Config.GITHUB_PROJECT_STORE_FILE)
+        self._data = None
+        self._lock = threading.Lock()
+
+    def get_projects(self, username: str, refresh: bool = True) -> List["GitHubProject"]:
+        """
+        Gibt alle gespeicherten Projekte eines Benutzers zurück
+
+        Args:
+            username: GitHub-Benutzername
+            refresh: Veralteten Store vor der Rückgabe aktualisieren
+
+        Returns:
+            Liste von GitHubProject-Objekten (ohne Forks, nach Sternen sortiert)
+        """
+        from src.github_project_extractor import GitHubProject
+
+        with self._lock:
+            data = self._load()
+            if refresh and (data.get('username') != username or not self._is_fresh(data)):
+                self._refresh_locked(username)
+                data = self._load()
+
+            if data.get('username') != username:
+                return []
+
+            projects = [
+                GitHubProject(
+                    name=entry['name'],
+                    description=entry.get('description') or entry.get('readme_summary') or '',
+                    url=entry['url'],
+                    language=entry.get('language') or '',
+                    topics=entry.get('topics') or [],
+                    stars=entry.get('stars', 0),
+                    is_fork=entry.get('is_fork', False),
+                    readme_summary=entry.get('readme_summary') or '',
+                    pushed_at=entry.get('pushed_at') or ''
+                )
+                for entry in data.get('projects', {}).values()
+                if not entry.get('is_fork', False)
+            ]
+
+        projects.sort(key=lambda x: x.stars, reverse=True)
+        return projects
+
+    def refresh(self, username: str, force: bool = False) -> bool:
+        """
+        Aktualisiert den Store inkrementell von der GitHub-API
+
+        Args:
+            username: GitHub-Benutzername
+            force: READMEs aller Repositories neu laden
+
+        Returns:
+            True wenn die Aktualisierung erfolgreich war
+        """
+        with self._lock:
+            return self._refresh_locked(username, force)
+
+    @profiler.traced('github_store_refresh', 'http')
+    def _refresh_locked(self, username: str, force: bool = False) -> bool:
+        data = self._load()
+        # Letzten Versuch auch bei Fehlern merken, damit nicht jeder Brief die API abfragt
+        data['checked_at'] = time.time()
+
+        repos = self._fetch_repo_list(username)
+        if repos is None:
+            # Benutzer des Versuchs mitspeichern, sonst gilt der Store für ihn nie als aktuell
+            if data.get('username') != username:
+                data.update({'username': username, 'projects': {}})
+            data['version'] = self.STORE_VERSION
+            self._save(data)
+            return False
+
+        known = data.get('projects', {}) if data.get('username') == username else {}
+        projects = {}
+        readme_fetches = 0
+
+        for repo in repos:
+            if repo.get('private', True):
+                continue
+
+            name = repo.get('name', '')
+            entry = known.get(name, {})
+            unchanged = (not force and entry.get('pushed_at') == repo.get('pushed_at')
+                         and 'readme_summary' in entry)
+
+            if unchanged:
+                readme_summary = entry['readme_summary']
+            else:
+                readme_summary = self._fetch_readme_summary(username, name)
+                readme_fetches += 1
+
+            projects[name] = {
+                'name': name,
+                'description': repo.get('description') or '',
+                'url': repo.get('html_url', ''),
+                'language': repo.get('language') or '',
+                'topics': repo.get('topics') or [],
+                'stars': repo.get('stargazers_count', 0),
+                'is_fork': repo.get('fork', False),
+                'pushed_at': repo.get('pushed_at') or '',
+                'readme_summary': readme_summary
+            }
+
+        data.update({
+            'version': self.STORE_VERSION,
+            'username': username,
+            'updated_at': time.time(),
+            'projects': projects
+        })
+        self._save(data)
+
+        # URL-Cache synchron halten, damit die Hyperlink-Erkennung dieselben Projekte kennt
+        Config._save_github_cache({name: entry['url'] for name, entry in projects.items()})
+
+        logger.info(f"GitHub-Projekt-Store aktualisiert: {len(projects)} Projekte, {readme_fetches} READMEs geladen")
+        return True
+
+    def _is_fresh(self, data: Dict) -> bool:
+        """Prüft ob der Store (oder der letzte Aktualisierungsversuch) noch aktuell ist"""
+        checked_at = data.get('checked_at') or data.get('updated_at') or 0
+        return time.time() - checked_at < Config.GITHUB_CACHE_DURATION
+
+    def _api_headers(self, accept: str = 'application/vnd.github.v3+json') -> Dict[str, str]:
+        headers = {
+            'Accept': accept,
+            'User-Agent': 'AutomaticMotivation/1.0'
+        }
+        if Config.GITHUB_API_TOKEN:
+            headers['Authorization'] = f'token {Config.GITHUB_API_TOKEN}'
+        return headers
+
+    def _fetch_repo_list(self, username: str) -> Optional[List[Dict]]:
+        """Lädt die vollständige Repository-Liste (mit Paginierung)"""
+        repos = []
+        page = 1
+        try:
+            while True:
+                response = requests.get(
+                    f"{GITHUB_API_URL}/users/{username}/repos",
+                    headers=self._api_headers(),
+                    params={'per_page': 100, 'page': page},
+                    timeout=10
+                )
+                response.raise_for_status()
+                batch = response.json()
+                repos.extend(batch)
+                if len(batch) < 100:
+                    return repos
+                page += 1
+        except requests.RequestException as e:
+            logger.error(f"Fehler beim Abrufen der Repository-Liste: {e}")
+            return None
+
+    def _fetch_readme_summary(self, username: str, repo_name: str) -> str:
+        """Lädt das README eines Repositories und fasst es zusammen"""
+        try:
+            response = requests.get(
+                f"{GITHUB_API_URL}/repos/{username}/{repo_name}/readme",
+                headers=self._api_headers('application/vnd.github.raw'),
+                timeout=10
+            )
+            if response.status_code == 404:
+                return ''
+            response.raise_for_status()
+            return summarize_readme(response.text)
+        except requests.RequestException as e:
+            logger.warning(f"README für {repo_name} konnte nicht geladen werden: {e}")
+            return ''
+
+    def _load(self) -> Dict:
+        """Lädt den Store aus der Datei (einmal pro Instanz)"""
+        if self._data is None:
+            self._data = {}
+            try:
+                if self.store_file.exists():
+                    with open(self.store_file, 'r', encoding='utf-8') as f:
+                        loaded = json.load(f)
+                    if loaded.get('version') == self.STORE_VERSION:
+                        self._data = loaded
+            except Exception as e:
+                logger.error(f"Fehler beim Laden des GitHub-Projekt-Store: {e}")
+        return self._data
+
+    def _save(self, data: Dict):
+        """Speichert den Store atomar"""
+        self._data = data
+        try:
+            self.store_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.store_file.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.store_file)
+        except Exception as e:
+            logger.error(f"Fehler beim Speichern des GitHub-Projekt-Store: {e}")
+
+
+def summarize_readme(markdown: str, max_chars: int = 300) -> str:
+    """
+    Erstellt eine kurze Zusammenfassung aus einem README
+
+    Entfernt Code-Blöcke, Bilder, Badges, HTML und Überschriften und verwendet die
+    ersten aussagekräftigen Absätze bis zur maximalen Länge.
+    """
+    if not markdown:
+        return ''
+
+    text = re.sub(r'```.*?```', '', markdown, flags=re.DOTALL)
+    text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
+    text = re.sub(r'!\[[^\]]*\]\([^)]*\)', '', text)
+    text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'<[^>]+>', '', text)
+
+    paragraphs = []
+    for block in re.split(r'\n\s*\n', text):
+        lines = [line.strip() for line in block.splitlines()]
+        lines = [line for line in lines
+                 if line and not line.startswith(('#', '|', '---', '===', '>'))]
+        paragraph = ' '.join(line.lstrip('-*+ ').strip() for line in lines)
+        paragraph = re.sub(r'[*_`]', '', paragraph)
+        paragraph = re.sub(r'\s+', ' ', paragraph).strip()
+        if len(paragraph) >= 40:
+            paragraphs.append(paragraph)
+
+    summary = ' '.join(paragraphs)
+    if len(summary) <= max_chars:
+        return summary
+
+    # Auf Satzgrenze kürzen
+    cut = summary[:max_chars]
+    sentence_end = max(cut.rfind('. '), cut.rfind('! '), cut.rfind('? '))
+    if sentence_end > max_chars // 2:
+        return cut[:sentence_end + 1]
+    return cut.rsplit(' ', 1)[0] + ' …'
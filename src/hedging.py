@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Hedging von LLM-Aufrufen gegen langsame Ausreißer
+Ist ein Aufruf nach dem beobachteten p90 seiner Stufe noch nicht zurück, geht eine
+zweite, gleiche Anfrage an dasselbe Modell oder ein Ausweichmodell. Die schnellere Antwort
+gewinnt, die andere Anfrage wird abgebrochen. Ein Budget begrenzt den Anteil zusätzlicher
+Anfragen und damit die Mehrkosten.
+"""
+
+import time
+import asyncio
+import logging
+import threading
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from config.config import Config
+from src.llm_metrics import LLMMetricsStore, metrics_store, percentile
+
+logger = logging.getLogger(__name__)
+
+HISTORY_SECONDS = 24 * 3600
+
+
+@dataclass
+class HedgeResult:
+    """Antwort eines (ggf. gehedgten) Aufrufs"""
+    response: Any
+    llm: Any  # LLM, dessen Antwort gewonnen hat
+    hedged: bool = False
+    cancelled_llm: Any = None  # Abgebrochene Anfrage (für die Kostenerfassung)
+    cancelled_latency: float = 0.0
+
+
+class _EventLoopThread:
+    """Eigener Event-Loop im Hintergrund: die Async-Clients bleiben an einen Loop gebunden"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='llm-hedging', daemon=True)
+        self._thread.start()
+
+    def run(self, coroutine) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+
+class RequestHedger:
+    """
+    Führt LLM-Aufrufe mit Hedging aus
+
+    Die Verzögerung bis zur zweiten Anfrage ist das Perzentil der beobachteten Latenzen
+    (pro Stufe und Modell, aus den LLM-Metriken). Solange weniger als min_samples
+    Beobachtungen vorliegen, wird nicht gehedgt.
+
+    Args:
+        store: Metrik-Speicher, dessen Aufrufe beobachtet werden
+        hedge_percentile: Perzentil der Latenz, ab dem gehedgt wird
+        budget: Höchstanteil zusätzlicher Anfragen an allen Aufrufen (0.1 = 10 %)
+        min_samples: Mindestanzahl beobachteter Aufrufe pro Stufe und Modell
+        window_calls: Größe des Fensters für Latenzen und Budget
+    """
+
+    def __init__(self, store: Optional[LLMMetricsStore] = None, hedge_percentile: Optional[float] = None,
+                 budget: Optional[float] = None, min_samples: Optional[int] = None, window_calls: int = 100):
+        store = store or metrics_store
+        self.hedge_percentile = hedge_percentile if hedge_percentile is not None else Config.HEDGE_PERCENTILE
+        self.budget = budget if budget is not None else Config.HEDGE_BUDGET
+        self.min_samples = min_samples if min_samples is not None else Config.HEDGE_MIN_SAMPLES
+        self.window_calls = window_calls
+
+        self._latencies: Dict[Tuple[str, str, str], Deque[float]] = {}  # (Stufe, Provider, Modell)
+        self._calls: Deque[bool] = deque(maxlen=window_calls)  # True = gehedgt
+        self._lock = threading.Lock()
+        self._loop: Optional[_EventLoopThread] = None
+        # Latenzen früherer Läufe, damit auch kurze CLI-Läufe hedgen können
+        for record in store.load(since=time.time() - HISTORY_SECONDS):
+            self.observe(record)
+        store.subscribe(self.observe)
+
+    def observe(self, record: Dict[str, Any]):
+        """Nimmt die Latenz eines erfolgreichen Aufrufs auf (wird vom Metrik-Speicher aufgerufen)"""
+        if record.get('status') != 'ok':
+            return
+        key = (record.get('stage', '').split(':', 1)[0], record.get('provider', ''), record.get('model', ''))
+        with self._lock:
+            self._latencies.setdefault(key, deque(maxlen=self.window_calls)).append(record.get('latency', 0.0))
+
+    def hedge_delay(self, stage: str, provider: str, model: str) -> Optional[float]:
+        """Wartezeit bis zur zweiten Anfrage (None = zu wenige Beobachtungen)"""
+        with self._lock:
+            latencies = list(self._latencies.get((stage.split(':', 1)[0], provider, model), ()))
+        if len(latencies) < self.min_samples:
+            return None
+        return percentile(latencies, self.hedge_percentile)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Anteil gehedgter Aufrufe im Fenster"""
+        with self._lock:
+            calls, hedged = len(self._calls), sum(self._calls)
+        return {'calls': calls, 'hedged': hedged, 'hedge_rate': round(hedged / calls, 3) if calls else 0.0,
+                'budget': self.budget}
+
+    def invoke(self, llm: Any, messages: List[Any], stage: str, provider: str, model: str,
+               hedge_llm: Optional[Callable[[], Any]] = None) -> HedgeResult:
+        """
+        Ruft das LLM auf und hedgt, falls die Antwort länger als das p90 der Stufe braucht
+
+        Args:
+            llm: Primäres LLM
+            messages: Nachrichten für den Aufruf
+            stage, provider, model: Stufe und Modell des primären Aufrufs (für die Verzögerung)
+            hedge_llm: Liefert das LLM für die zweite Anfrage (Standard: dasselbe LLM)
+        """
+        delay = self.hedge_delay(stage, provider, model)
+        if delay is None or self.budget <= 0:
+            self._count(False)
+            return HedgeResult(llm.invoke(messages), llm)
+
+        with self._lock:
+            if self._loop is None:
+                self._loop = _EventLoopThread()
+        return self._loop.run(self._race(llm, messages, delay, hedge_llm or (lambda: llm), stage))
+
+    async def _race(self, llm: Any, messages: List[Any], delay: float,
+                    hedge_llm: Callable[[], Any], stage: str) -> HedgeResult:
+        primary = asyncio.ensure_future(llm.ainvoke(messages))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            self._count(False)
+            return HedgeResult(primary.result(), llm)
+        if not self._take_budget():
+            return HedgeResult(await primary, llm)
+
+        second_llm = hedge_llm()
+        logger.info(f"Hedging {stage}: keine Antwort nach {delay:.2f}s, zweite Anfrage gesendet")
+        hedge_start = time.perf_counter()
+        secondary = asyncio.ensure_future(second_llm.ainvoke(messages))
+        owners = {primary: llm, secondary: second_llm}
+
+        pending, errors = {primary, secondary}, []
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((task for task in done if task.exception() is None), None)
+            errors += [task.exception() for task in done if task.exception() is not None]
+            if winner is not None:
+                loser = next(iter(pending), None)
+                if loser is not None:
+                    loser.cancel()
+                elapsed = time.perf_counter() - hedge_start
+                return HedgeResult(
+                    winner.result(), owners[winner], hedged=True,
+                    cancelled_llm=owners[loser] if loser is not None else None,
+                    # Die primäre Anfrage lief schon delay Sekunden länger
+                    cancelled_latency=elapsed + (delay if loser is primary else 0.0)
+                )
+        raise errors[0]
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            allowed = sum(self._calls) + 1 <= self.budget * (len(self._calls) + 1)
+            self._calls.append(allowed)
+        if not allowed:
+            logger.debug("Hedging-Budget ausgeschöpft")
+        return allowed
+
+    def _count(self, hedged: bool):
+        with self._lock:
+            self._calls.append(hedged)
+
+
+# Ein Hedger pro Metrik-Speicher, damit Verzögerung und Budget aus den eigenen Aufrufen stammen
+_request_hedgers: "weakref.WeakKeyDictionary[LLMMetricsStore, RequestHedger]" = weakref.WeakKeyDictionary()
+_request_hedger_lock = threading.Lock()
+
+
+def get_request_hedger(store: Optional[LLMMetricsStore] = None) -> RequestHedger:
+    """Hedger für einen Metrik-Speicher (Standard: prozessweiter Speicher; wird beim ersten Bedarf angelegt)"""
+    store = store or metrics_store
+    with _request_hedger_lock:
+        hedger = _request_hedgers.get(store)
+        if hedger is None:
+            hedger = _request_hedgers[store] = RequestHedger(store)
+        return hedger
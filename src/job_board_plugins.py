@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Job-Board-Plugins für AutomaticMotivation
+Seitenspezifische Extraktoren, ausgewählt über Hostname oder URL-Muster.
+Plugins liefern JobInfo-Felder aus stabilen Selektoren oder öffentlichen
+JSON-APIs; der generische LLM-Pfad bleibt der Fallback.
+"""
+
+import html
+import re
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from src.job_posting_mapper import (
+    html_to_text, requirements_from_description, find_job_postings, map_job_posting,
+    extract_contact_details, missing_fields, REQUIREMENT_HEADINGS
+)
+from src.embedded_state_extractor import extract_embedded_fields
+
+logger = logging.getLogger(__name__)
+
+BENEFIT_HEADINGS = re.compile(r'wir bieten|benefits|vorteile|unser angebot|what we offer|perks', re.IGNORECASE)
+
+_PLUGINS: List['JobBoardPlugin'] = []
+
+
+class JobBoardPlugin:
+    """
+    Basisklasse für Job-Board-Plugins
+
+    Ein Plugin passt auf Hostnamen (inkl. Subdomains) und optional ein Pfadmuster.
+    Es kann eine öffentliche JSON-API (``api_url``/``extract_api``), feste
+    HTML-Selektoren (``extract_html``) und kuratierte Firmendaten bereitstellen.
+    """
+
+    name = 'generic'
+    hosts: Tuple[str, ...] = ()
+    path_pattern: Optional[str] = None
+    # Kuratierte Daten für Unternehmen, deren Seiten keine Kontaktdaten enthalten
+    company_names: Tuple[str, ...] = ()
+    company_defaults: Dict[str, str] = {}
+
+    def matches(self, url: str) -> bool:
+        parsed = urlparse(url)
+        host = (parsed.hostname or '').lower()
+        if not any(host == h or host.endswith('.' + h) for h in self.hosts):
+            return False
+        return self.path_pattern is None or re.search(self.path_pattern, parsed.path) is not None
+
+    def api_url(self, url: str) -> Optional[str]:
+        """URL der öffentlichen JSON-API für diese Stellenanzeige (None = keine API)"""
+        return None
+
+    def extract_api(self, data: Any, url: str) -> Dict[str, str]:
+        """JobInfo-Felder aus der API-Antwort"""
+        return {}
+
+    def extract_html(self, soup: BeautifulSoup, url: str) -> Dict[str, str]:
+        """JobInfo-Felder aus festen Selektoren der HTML-Seite"""
+        return {}
+
+    def matches_company(self, company: Optional[str]) -> bool:
+        company = (company or '').lower()
+        return bool(company) and any(name in company for name in self.company_names)
+
+
+def register_plugin(plugin_class):
+    """Registriert ein Plugin (als Klassen-Decorator verwendbar)"""
+    _PLUGINS.append(plugin_class())
+    return plugin_class
+
+
+def get_plugins() -> List[JobBoardPlugin]:
+    return list(_PLUGINS)
+
+
+def find_plugin(url: str) -> Optional[JobBoardPlugin]:
+    """Gibt das erste passende Plugin für eine URL zurück"""
+    for plugin in _PLUGINS:
+        if plugin.matches(url):
+            return plugin
+    return None
+
+
+def apply_company_defaults(fields: Dict[str, str], url: str = '') -> Dict[str, str]:
+    """Ergänzt bzw. ersetzt Felder durch kuratierte Firmendaten passender Plugins"""
+    for plugin in _PLUGINS:
+        if plugin.company_defaults and (plugin.matches_company(fields.get('company')) or (url and plugin.matches(url))):
+            fields.update(plugin.company_defaults)
+            logger.info(f"Kuratierte Firmendaten angewendet: {plugin.name}")
+            break
+    return fields
+
+
+def extract_known_fields(soup: BeautifulSoup, url: str,
+                         known_fields: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Sammelt alle ohne LLM bestimmbaren JobInfo-Felder einer Seite
+
+    Reihenfolge (frühere Quellen haben Vorrang): bekannte Felder (z.B. aus einer
+    Job-Board-API), Plugin-Selektoren, JSON-LD JobPosting, eingebettete
+    Framework-States (__NEXT_DATA__, Nuxt, ...), Kontaktdaten per Regex.
+    Kuratierte Firmendaten werden zuletzt angewendet.
+    """
+    fields = {key: value for key, value in (known_fields or {}).items() if value}
+
+    def merge(values: Dict[str, str]):
+        for key, value in values.items():
+            if value:
+                fields.setdefault(key, value)
+
+    plugin = find_plugin(url)
+    if plugin:
+        merge(plugin.extract_html(soup, url))
+
+    for posting in find_job_postings(soup):
+        mapped = map_job_posting(posting)
+        if mapped:
+            merge(mapped)
+            break
+
+    if missing_fields(fields):
+        merge(extract_embedded_fields(soup))
+
+    merge(extract_contact_details(soup.get_text(' ')))
+    return apply_company_defaults(fields, url)
+
+
+def _select_text(soup: BeautifulSoup, selector: str) -> str:
+    element = soup.select_one(selector)
+    return element.get_text(' ', strip=True) if element else ''
+
+
+def _section_items(lists: List[Dict[str, str]], pattern: re.Pattern) -> str:
+    """Sammelt die Listeneinträge aller Abschnitte, deren Überschrift auf das Muster passt"""
+    items = []
+    for section in lists or []:
+        if pattern.search(section.get('text', '')):
+            soup = BeautifulSoup(section.get('content', ''), 'html.parser')
+            items.extend(li.get_text(' ', strip=True) for li in soup.find_all('li'))
+    return '; '.join(item for item in items if item)
+
+
+def _city(location: str) -> str:
+    """'Basel, Switzerland' -> 'Basel'"""
+    return location.split(',')[0].strip() if location else ''
+
+
+def _slug_to_name(slug: str) -> str:
+    return ' '.join(part.capitalize() for part in re.split(r'[-_]', slug) if part)
+
+
+@register_plugin
+class GreenhousePlugin(JobBoardPlugin):
+    """Greenhouse: öffentliche Job-Board-API, HTML-Selektoren als Fallback"""
+
+    name = 'greenhouse'
+    hosts = ('boards.greenhouse.io', 'job-boards.greenhouse.io', 'job-boards.eu.greenhouse.io')
+    URL_PATTERN = re.compile(r'^/(?P<board>[^/]+)/jobs/(?P<job_id>\d+)')
+
+    def api_url(self, url: str) -> Optional[str]:
+        match = self.URL_PATTERN.match(urlparse(url).path)
+        if not match:
+            return None
+        return f"https://boards-api.greenhouse.io/v1/boards/{match['board']}/jobs/{match['job_id']}"
+
+    def extract_api(self, data: Any, url: str) -> Dict[str, str]:
+        # Greenhouse liefert den Inhalt HTML-escaped
+        content_html = html.unescape(data.get('content') or '')
+        match = self.URL_PATTERN.match(urlparse(url).path)
+        company = data.get('company_name') or (_slug_to_name(match['board']) if match else '')
+        return {
+            'position': data.get('title', ''),
+            'company': company,
+            'location': _city((data.get('location') or {}).get('name', '')),
+            'description': html_to_text(content_html),
+            'requirements': requirements_from_description(content_html)
+        }
+
+    def extract_html(self, soup: BeautifulSoup, url: str) -> Dict[str, str]:
+        content = soup.select_one('#content')
+        company = re.sub(r'^\s*at\s+', '', _select_text(soup, '.company-name'))
+        return {
+            'position': _select_text(soup, '.app-title'),
+            'company': company,
+            'location': _city(_select_text(soup, '.location')),
+            'description': html_to_text(str(content)) if content else '',
+            'requirements': requirements_from_description(str(content)) if content else ''
+        }
+
+
+@register_plugin
+class LeverPlugin(JobBoardPlugin):
+    """Lever: öffentliche Postings-API"""
+
+    name = 'lever'
+    hosts = ('jobs.lever.co', 'jobs.eu.lever.co')
+    URL_PATTERN = re.compile(r'^/(?P<company>[^/]+)/(?P<posting_id>[0-9a-f-]{36})')
+
+    def api_url(self, url: str) -> Optional[str]:
+        parsed = urlparse(url)
+        match = self.URL_PATTERN.match(parsed.path)
+        if not match:
+            return None
+        api_host = 'api.eu.lever.co' if parsed.hostname.endswith('eu.lever.co') else 'api.lever.co'
+        return f"https://{api_host}/v0/postings/{match['company']}/{match['posting_id']}"
+
+    def extract_api(self, data: Any, url: str) -> Dict[str, str]:
+        categories = data.get('categories') or {}
+        lists = data.get('lists') or []
+        match = self.URL_PATTERN.match(urlparse(url).path)
+
+        description = data.get('descriptionPlain') or html_to_text(data.get('description', ''))
+        for section in lists:
+            description += f"\n{section.get('text', '')}\n{html_to_text(section.get('content', ''))}"
+
+        return {
+            'position': data.get('text', ''),
+            'company': _slug_to_name(match['company']) if match else '',
+            'department': categories.get('team', ''),
+            'location': _city(categories.get('location', '')),
+            'working_hours': categories.get('commitment', ''),
+            'description': description.strip(),
+            'requirements': _section_items(lists, REQUIREMENT_HEADINGS),
+            'benefits': _section_items(lists, BENEFIT_HEADINGS)
+                        or html_to_text(data.get('additionalPlain') or data.get('additional') or '')
+        }
+
+
+@register_plugin
+class JobsChPlugin(JobBoardPlugin):
+    """jobs.ch (und baugleiche Portale): JSON-LD plus data-cy-Selektoren"""
+
+    name = 'jobs.ch'
+    hosts = ('jobs.ch', 'jobup.ch')
+    path_pattern = r'/(?:de|fr|en)/(?:stellenangebote|offres-emplois|jobs)/'
+
+    def extract_html(self, soup: BeautifulSoup, url: str) -> Dict[str, str]:
+        description = soup.select_one('[data-cy="vacancy-description"]')
+        description_html = str(description) if description else ''
+        return {
+            'position': _select_text(soup, '[data-cy="job-title"]'),
+            'company': _select_text(soup, '[data-cy="company-name"]'),
+            'location': _city(_select_text(soup, '[data-cy="job-location"]')),
+            'description': html_to_text(description_html),
+            'requirements': requirements_from_description(description_html)
+        }
+
+
+@register_plugin
+class DatalynxPlugin(JobBoardPlugin):
+    """Datalynx (onlyfy): Kontaktdaten stehen nicht auf der Seite und werden ergänzt"""
+
+    name = 'datalynx'
+    hosts = ('datalynx.onlyfy.jobs', 'datalynx.ch')
+    company_names = ('datalynx',)
+    company_defaults = {
+        'company': 'Datalynx AG',
+        'address': 'Aeschenplatz 6, 4052 Basel, Schweiz',
+        'contact_person': 'Jan Schmitz-Elsen',
+        'contact_title': 'Team Lead Talent Acquisition',
+        'email': 'jan.schmitz@datalynx.ch',
+        'phone': '+41 79 425 10 45'
+    }
@@ -2,16 +2,42 @@ import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import re
-import json
 from typing import Dict, List, Optional
 import logging
-from langchain_openai import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage
 from src.models import JobInfo, JobDescription
+from src.llm_utils import LLMFactory
+from src.llm_metrics import tracked_invoke
+from src.profiler import profiler
+from src.token_budget import TokenBudgeter, PromptSection, deduplicate_text
+from src.job_posting_mapper import find_job_postings, map_job_posting, missing_fields, REQUIRED_FIELDS
+from src.job_board_plugins import find_plugin, apply_company_defaults, extract_known_fields
+from src.embedded_state_extractor import extract_embedded_text
 from config.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Felder der LLM-Extraktion: Schlüssel im Antwortformat -> (JobInfo-Feld, Formatbeschreibung)
+LLM_FIELDS = {
+    'UNTERNEHMEN': ('company', '[Name des Unternehmens]'),
+    'POSITION': ('position', '[Stellenbezeichnung]'),
+    'BEREICH': ('department', '[Abteilung/Bereich, falls genannt]'),
+    'STANDORT': ('location', '[Arbeitsort]'),
+    'ADRESSE': ('address', '[Vollständige Adresse des Unternehmens mit Straße, PLZ und Ort]'),
+    'KONTAKTPERSON': ('contact_person', '[Vollständiger Name der Kontaktperson, z.B. "Jan Schmitz-Elsen"]'),
+    'KONTAKT_TITEL': ('contact_title', '[Titel der Kontaktperson, z.B. "Team Lead Talent Acquisition"]'),
+    'EMAIL': ('email', '[E-Mail-Adresse der Kontaktperson]'),
+    'TELEFON': ('phone', '[Telefonnummer der Kontaktperson]'),
+    'BESCHREIBUNG': ('description', '[Kurze Beschreibung der Position und Hauptaufgaben]'),
+    'ANFORDERUNGEN': ('requirements', '[Alle wichtigen Anforderungen, Qualifikationen und Voraussetzungen in einem zusammenhängenden Text]'),
+    'BENEFITS': ('benefits', '[Angebotene Leistungen]'),
+    'ARBEITSZEIT': ('working_hours', '[Arbeitszeiten, falls genannt]'),
+    'GEHALT': ('salary', '[Gehaltsangaben, falls genannt]'),
+}
+
+EXTRACTION_SYSTEM_PROMPT = ("Du bist ein Experte für die Extraktion von Stelleninformationen. "
+                            "Analysiere Stellenausschreibungen präzise und strukturiert.")
+
 class JobExtractor:
     """Klasse zum Extrahieren von Job-Informationen aus URLs"""
     
@@ -21,54 +47,94 @@ class JobExtractor:
         self.logger = logging.getLogger(__name__)
         
     def _initialize_llm(self):
-        """Initialisiert das LLM basierend auf der Konfiguration"""
+        """Initialisiert das LLM für die Extraktion (standardmäßig das schnelle Modell des Providers)"""
         try:
-            if self.config['provider'] == 'openrouter':
-                llm = ChatOpenAI(
-                    api_key=self.config['api_key'],
-                    base_url=self.config['base_url'],
-                    model=self.config['model'],
-                    temperature=0.7,
-                    max_tokens=2000
-                )
-            else:
-                llm = ChatOpenAI(
-                    api_key=self.config['api_key'],
-                    model=self.config['model'],
-                    temperature=self.config['temperature'],
-                    max_tokens=2000
-                )
-            return llm
+            return LLMFactory.create_llm_for_stage('extraction', max_tokens=2000)
         except Exception as e:
-            self.logger.error(f"Fehler bei LLM-Initialisierung: {e}")
+            logger.error(f"Fehler bei LLM-Initialisierung: {e}")
             raise
         
-    def extract_from_url(self, url: str) -> JobInfo:
+    def extract_from_url(self, url: str, html_content: Optional[str] = None) -> JobInfo:
         """
         Extrahiert Job-Informationen aus einer URL
         
         Args:
             url (str): URL der Stellenanzeige
+            html_content: Bereits geladenes HTML (z.B. aus der Duplikat-Prüfung)
             
         Returns:
             JobInfo: Extrahierte Job-Informationen
         """
         try:
-            # Webseite laden
-            html_content = self._fetch_webpage(url)
+            # Job-Boards mit öffentlicher API direkt abfragen
+            plugin = find_plugin(url)
+            api_fields = self._extract_via_api(plugin, url) if plugin else {}
+            if api_fields and not missing_fields(api_fields):
+                self.logger.info(f"Job-Informationen über {plugin.name}-API übernommen (ohne LLM)")
+                return self._build_job_info(url, apply_company_defaults(api_fields, url))
             
-            # Text extrahieren
-            clean_text = self._extract_text_from_html(html_content)
-            
-            # Mit LangChain strukturiert extrahieren
-            job_info = self._extract_structured_info(clean_text, url)
+            # Webseite laden
+            if html_content is None:
+                html_content = self.fetch(url)
             
-            return job_info
+            return self.extract_from_html(html_content, url, known_fields=api_fields)
             
         except Exception as e:
             self.logger.error(f"Fehler beim Extrahieren von URL {url}: {e}")
             raise
+    
+    def fetch(self, url: str) -> str:
+        """Lädt den HTML-Inhalt einer Stellenanzeige"""
+        return self._fetch_webpage(url)
+    
+    def extract_from_html(self, html_content: str, url: str, known_fields: Optional[Dict[str, str]] = None) -> JobInfo:
+        """
+        Extrahiert Job-Informationen aus bereits geladenem HTML
+        
+        Felder aus Job-Board-Plugins, strukturierten Daten (JSON-LD JobPosting) und per
+        Regex gefundene Kontaktdaten werden direkt übernommen. Das LLM wird nur für
+        noch fehlende Pflichtfelder aufgerufen.
+        
+        Args:
+            html_content: HTML der Stellenanzeige
+            url: URL der Stellenanzeige
+            known_fields: Bereits bekannte Felder (z.B. aus einer Job-Board-API)
             
+        Returns:
+            JobInfo: Extrahierte Job-Informationen
+        """
+        with profiler.span('structured_data'):
+            soup = BeautifulSoup(html_content, 'html.parser')
+            fields = extract_known_fields(soup, url, known_fields)
+        
+        missing = missing_fields(fields)
+        if not missing:
+            self.logger.info(f"Job-Informationen aus strukturierten Daten übernommen (ohne LLM): "
+                             f"{fields['company']} - {fields['position']}")
+            return self._build_job_info(url, fields)
+        
+        if fields:
+            self.logger.info(f"Strukturierte Daten unvollständig, LLM ergänzt: {', '.join(missing)}")
+        
+        clean_text = self._extract_text_from_html(html_content)
+        return self._extract_structured_info(clean_text, url, known_fields=fields)
+            
+    @profiler.traced('job_board_api', 'http')
+    def _extract_via_api(self, plugin, url: str) -> Dict[str, str]:
+        """Fragt die öffentliche JSON-API eines Job-Boards ab (leeres Dict bei Fehler)"""
+        api_url = plugin.api_url(url)
+        if not api_url:
+            return {}
+        try:
+            response = requests.get(api_url, headers={'Accept': 'application/json'}, timeout=15)
+            response.raise_for_status()
+            fields = plugin.extract_api(response.json(), url)
+            return {key: value for key, value in fields.items() if value}
+        except (requests.RequestException, ValueError) as e:
+            self.logger.warning(f"{plugin.name}-API nicht verfügbar, verwende HTML: {e}")
+            return {}
+    
+    @profiler.traced('fetch_webpage', 'http')
     def _fetch_webpage(self, url: str) -> str:
         """Lädt den HTML-Inhalt einer Webseite"""
         try:
@@ -85,40 +151,44 @@ class JobExtractor:
             self.logger.error(f"Fehler beim Laden der Webseite {url}: {e}")
             raise
             
+    @profiler.traced('html_cleaning')
     def _extract_text_from_html(self, html_content: str) -> str:
         """Extrahiert bereinigten Text aus HTML und strukturierte Daten"""
         try:
             soup = BeautifulSoup(html_content, 'html.parser')
             
-            # Zuerst nach strukturierten JSON-LD Daten suchen
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            for script in json_ld_scripts:
+            # Zuerst nach strukturierten JSON-LD Daten suchen (auch in Listen und @graph)
+            for data in find_job_postings(soup):
                 try:
-                    data = json.loads(script.string)
-                    if data.get('@type') == 'JobPosting':
-                        # Strukturierte Daten gefunden - erstelle sauberen Text
-                        structured_text = f"""
-                        STELLENANZEIGE - STRUKTURIERTE DATEN:
-                        
-                        Titel: {data.get('title', '')}
-                        Unternehmen: {data.get('hiringOrganization', {}).get('name', '')}
-                        Standort: {data.get('jobLocation', {}).get('address', {}).get('addressLocality', '')}
-                        Datum: {data.get('datePosted', '')}
-                        
-                        BESCHREIBUNG:
-                        {data.get('description', '')}
-                        
-                        ZUSÄTZLICHE INFORMATIONEN:
-                        Anstellungsart: {data.get('employmentType', '')}
-                        Qualifikationen: {data.get('qualifications', '')}
-                        """
-                        
-                        self.logger.info("JSON-LD JobPosting-Daten gefunden und verwendet")
-                        return structured_text
+                    mapped = map_job_posting(data)
+                    # Strukturierte Daten gefunden - erstelle sauberen Text
+                    structured_text = f"""
+                    STELLENANZEIGE - STRUKTURIERTE DATEN:
+                    
+                    Titel: {mapped.get('position', '')}
+                    Unternehmen: {mapped.get('company', '')}
+                    Standort: {mapped.get('location', '')}
+                    Adresse: {mapped.get('address', '')}
+                    Datum: {data.get('datePosted', '')}
+                    
+                    BESCHREIBUNG:
+                    {mapped.get('description', '')}
+                    
+                    ZUSÄTZLICHE INFORMATIONEN:
+                    Anstellungsart: {mapped.get('working_hours', '')}
+                    Qualifikationen: {mapped.get('requirements', '')}
+                    Benefits: {mapped.get('benefits', '')}
+                    """
+                    
+                    self.logger.info("JSON-LD JobPosting-Daten gefunden und verwendet")
+                    return structured_text
                 except Exception as e:
                     self.logger.debug(f"Fehler beim Parsen von JSON-LD: {e}")
                     continue
             
+            # Daten-Inseln JavaScript-gerenderter Seiten (vor dem Entfernen der Scripts lesen)
+            embedded_text = extract_embedded_text(soup)
+            
             # Erweiterte HTML-Extraktion mit Struktur-Erkennung
             extracted_sections = self._extract_structured_sections(soup)
             
@@ -134,6 +204,10 @@ class JobExtractor:
             chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
             text = ' '.join(chunk for chunk in chunks if chunk)
             
+            if embedded_text:
+                self.logger.info("Eingebettete Stellendaten gefunden und verwendet")
+                extracted_sections = f"EINGEBETTETE STELLENDATEN:\n{embedded_text}\n\n{extracted_sections}".strip()
+            
             # Kombiniere strukturierte Sections mit dem normalen Text
             if extracted_sections:
                 combined_text = f"""
@@ -238,25 +312,32 @@ class JobExtractor:
             self.logger.debug(f"Fehler beim Sammeln von nachfolgendem Content: {e}")
             return ""
             
-    def _extract_structured_info(self, text: str, url: str) -> JobInfo:
-        """Extrahiert strukturierte Informationen mit LLM"""
+    def _extract_structured_info(self, text: str, url: str, known_fields: Optional[Dict[str, str]] = None) -> JobInfo:
+        """
+        Extrahiert strukturierte Informationen mit LLM
+        
+        Args:
+            text: Bereinigter Text der Stellenanzeige
+            url: URL der Stellenanzeige
+            known_fields: Bereits bekannte JobInfo-Felder - werden nicht erneut abgefragt
+        """
+        known_fields = known_fields or {}
         try:
-            prompt = f"""
+            # Nur Felder abfragen, die nicht bereits aus strukturierten Daten bekannt sind
+            requested_format = '\n            '.join(
+                f"{key}: {description}" for key, (field_name, description) in LLM_FIELDS.items()
+                if not known_fields.get(field_name)
+            )
+            
+            def render_prompt(page_text: str) -> str:
+                return f"""
             Analysiere die folgende Stellenausschreibung und extrahiere die relevanten Informationen:
 
             TEXT:
-            {text[:8000]}
+            {page_text}
 
-            WICHTIGE HINWEISE FÜR DATALYNX JOBS:
-            - Wenn es sich um eine Datalynx-Position handelt, verwende diese Informationen:
-              * Unternehmen: Datalynx AG
-              * Firmenadresse: Aeschenplatz 6, 4052 Basel, Schweiz
-              * Kontaktperson: Jan Schmitz-Elsen
-              * Titel: Team Lead Talent Acquisition
-              * Email: jan.schmitz@datalynx.ch
-              * Telefon: +41 79 425 10 45
+            HINWEISE ZUR ADRESSE:
             - Wenn der Arbeitsort "Basel" ist, verwende "Basel, Schweiz" als Adresse
-            - Wenn "Datalynx AG" im Text erwähnt wird, verwende dies als Unternehmen
 
             BESONDERE AUFMERKSAMKEIT FÜR ANFORDERUNGEN:
             - Suche nach Abschnitten wie "Anforderungen", "Voraussetzungen", "Qualifikationen", "Sie bringen mit", "Requirements", "Ihr Profil"
@@ -266,71 +347,66 @@ class JobExtractor:
 
             Extrahiere folgende Informationen und gib sie in diesem Format zurück:
             
-            UNTERNEHMEN: [Name des Unternehmens]
-            POSITION: [Stellenbezeichnung]
-            BEREICH: [Abteilung/Bereich, falls genannt]
-            STANDORT: [Arbeitsort]
-            ADRESSE: [Vollständige Adresse des Unternehmens mit Straße, PLZ und Ort]
-            KONTAKTPERSON: [Vollständiger Name der Kontaktperson, z.B. "Jan Schmitz-Elsen"]
-            KONTAKT_TITEL: [Titel der Kontaktperson, z.B. "Team Lead Talent Acquisition"]
-            EMAIL: [E-Mail-Adresse der Kontaktperson]
-            TELEFON: [Telefonnummer der Kontaktperson]
-            BESCHREIBUNG: [Kurze Beschreibung der Position und Hauptaufgaben]
-            ANFORDERUNGEN: [Alle wichtigen Anforderungen, Qualifikationen und Voraussetzungen in einem zusammenhängenden Text]
-            BENEFITS: [Angebotene Leistungen]
-            ARBEITSZEIT: [Arbeitszeiten, falls genannt]
-            GEHALT: [Gehaltsangaben, falls genannt]
+            {requested_format}
             
             WICHTIGE HINWEISE: 
             - Suche im gesamten Text nach "Kontakt", "Ansprechpartner", "Contact" Abschnitten
-            - Nutze die oben genannten Datalynx-Kontaktdaten wenn es eine Datalynx-Position ist
             - Wenn keine spezifische Kontaktperson gefunden wird, schreibe "Nicht angegeben"
             - Bei Arbeitsort "Basel" verwende "Basel, Schweiz" als Adresse
             - Für ANFORDERUNGEN: Fasse alle relevanten Qualifikationen, Kenntnisse und Erfahrungen zusammen
             """
             
+            # Wiederholungen entfernen und Text auf das Extraktions-Budget abzüglich der Anweisungen kürzen
+            provider, model = LLMFactory.describe_llm(self.llm)
+            budgeter = TokenBudgeter(provider, model, max_prompt_tokens=Config.EXTRACTION_TOKEN_BUDGET)
+            fixed_tokens = budgeter.count(render_prompt('')) + budgeter.count(EXTRACTION_SYSTEM_PROMPT)
+            fitted, report = budgeter.fit([PromptSection('text', deduplicate_text(text), priority=0)],
+                                          fixed_tokens=fixed_tokens)
+            prompt = render_prompt(fitted['text'])
+            
             messages = [
-                SystemMessage(content="Du bist ein Experte für die Extraktion von Stelleninformationen. Analysiere Stellenausschreibungen präzise und strukturiert."),
+                SystemMessage(content=EXTRACTION_SYSTEM_PROMPT),
                 HumanMessage(content=prompt)
             ]
             
-            response = self.llm.invoke(messages)
+            self.logger.info(f"Prompt-Budget Extraktion: {report.summary()}")
+            
+            response = tracked_invoke(self.llm, messages, stage='extraction')
             extracted_info = self._parse_llm_response(response.content)
             
-            # JobInfo-Objekt erstellen
-            job_info = JobInfo(
-                url=url,
-                company=extracted_info.get('UNTERNEHMEN', 'Nicht angegeben') or 'Nicht angegeben',
-                position=extracted_info.get('POSITION', 'Nicht angegeben') or 'Nicht angegeben',
-                department=extracted_info.get('BEREICH') or None,
-                location=extracted_info.get('STANDORT', 'Nicht angegeben') or 'Nicht angegeben',
-                address=extracted_info.get('ADRESSE', 'Nicht angegeben') or 'Nicht angegeben',
-                contact_person=extracted_info.get('KONTAKTPERSON') or None,
-                contact_title=extracted_info.get('KONTAKT_TITEL') or None,
-                email=extracted_info.get('EMAIL') or None,
-                phone=extracted_info.get('TELEFON') or None,
-                description=extracted_info.get('BESCHREIBUNG', 'Nicht angegeben') or 'Nicht angegeben',
-                requirements=extracted_info.get('ANFORDERUNGEN', 'Nicht angegeben') or 'Nicht angegeben',
-                benefits=extracted_info.get('BENEFITS') or None,
-                working_hours=extracted_info.get('ARBEITSZEIT') or None,
-                salary=extracted_info.get('GEHALT') or None
-            )
+            # LLM-Ergebnis mit bekannten Feldern zusammenführen (bekannte Felder haben Vorrang)
+            fields = {
+                field_name: extracted_info[key]
+                for key, (field_name, _) in LLM_FIELDS.items()
+                if extracted_info.get(key)
+            }
+            fields.update(known_fields)
+            apply_company_defaults(fields, url)
+            job_info = self._build_job_info(url, fields)
             
             self.logger.info(f"Job-Informationen erfolgreich extrahiert: {job_info.company} - {job_info.position}")
             return job_info
             
         except Exception as e:
             self.logger.error(f"Fehler bei der strukturierten Extraktion: {e}")
-            # Fallback-JobInfo erstellen
-            return JobInfo(
-                url=url,
-                company="Nicht extrahiert",
-                position="Nicht extrahiert",
-                address="Nicht extrahiert",
-                location="Nicht extrahiert",
-                description="Fehler bei der Extraktion",
-                requirements="Fehler bei der Extraktion"
-            )
+            # Fallback-JobInfo erstellen (bereits bekannte Felder bleiben erhalten)
+            fallback = {
+                'company': "Nicht extrahiert",
+                'position': "Nicht extrahiert",
+                'address': "Nicht extrahiert",
+                'location': "Nicht extrahiert",
+                'description': "Fehler bei der Extraktion",
+                'requirements': "Fehler bei der Extraktion"
+            }
+            fallback.update(known_fields)
+            return self._build_job_info(url, fallback)
+    
+    def _build_job_info(self, url: str, fields: Dict[str, str]) -> JobInfo:
+        """Erstellt ein JobInfo-Objekt; fehlende Pflichtfelder werden mit 'Nicht angegeben' belegt"""
+        values = {field_name: fields.get(field_name) or None for field_name, _ in LLM_FIELDS.values()}
+        for field_name in REQUIRED_FIELDS + ('address',):
+            values[field_name] = values[field_name] or 'Nicht angegeben'
+        return JobInfo(url=url, **values)
             
     def _parse_llm_response(self, response: str) -> Dict[str, str]:
         """Parst die LLM-Antwort in ein Dictionary"""
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+JobPosting-Mapper für AutomaticMotivation
+Überführt schema.org JobPosting (JSON-LD) deterministisch in JobInfo-Felder und
+erkennt E-Mail-Adressen und Telefonnummern per Regex - ganz ohne LLM-Aufruf
+"""
+
+import json
+import re
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# Felder, ohne die keine brauchbare Bewerbung erstellt werden kann.
+# Adresse und Kontaktperson ergänzt bei Bedarf der RecipientController.
+REQUIRED_FIELDS = ('company', 'position', 'location', 'description', 'requirements')
+
+COUNTRY_NAMES = {
+    'CH': 'Schweiz', 'CHE': 'Schweiz', 'SWITZERLAND': 'Schweiz',
+    'DE': 'Deutschland', 'DEU': 'Deutschland', 'GERMANY': 'Deutschland',
+    'AT': 'Österreich', 'AUT': 'Österreich', 'AUSTRIA': 'Österreich',
+    'LI': 'Liechtenstein', 'LIE': 'Liechtenstein'
+}
+
+EMPLOYMENT_TYPES = {
+    'FULL_TIME': 'Vollzeit',
+    'PART_TIME': 'Teilzeit',
+    'CONTRACTOR': 'Freie Mitarbeit',
+    'TEMPORARY': 'Befristet',
+    'INTERN': 'Praktikum',
+    'PER_DIEM': 'Tageweise',
+    'OTHER': ''
+}
+
+SALARY_UNITS = {'YEAR': 'pro Jahr', 'MONTH': 'pro Monat', 'WEEK': 'pro Woche', 'DAY': 'pro Tag', 'HOUR': 'pro Stunde'}
+
+# Überschriften, unter denen Anforderungen in der Beschreibung stehen
+REQUIREMENT_HEADINGS = re.compile(
+    r'anforderungen|voraussetzungen|qualifikation|ihr profil|dein profil|sie bringen|du bringst|'
+    r'requirements|qualifications|your profile|what you bring|you have|must have',
+    re.IGNORECASE
+)
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+PHONE_PATTERN = re.compile(
+    r'(?:(?:\+|00)\d{2,3}[\s./-]?(?:\(0\))?[\s./-]?|\b0)\d{2,3}[\s./-]?\d{3}[\s./-]?\d{2}[\s./-]?\d{2,3}\b'
+)
+
+
+def html_to_text(html: str) -> str:
+    """Wandelt HTML aus JSON-LD-Feldern in gut lesbaren Text um"""
+    if not html:
+        return ''
+    if '<' not in html:
+        return re.sub(r'\s+', ' ', html).strip()
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for li in soup.find_all('li'):
+        li.insert_before('\n- ')
+    for block in soup.find_all(['p', 'br', 'div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol']):
+        block.insert_after('\n')
+
+    lines = (re.sub(r'[ \t\xa0]+', ' ', line).strip() for line in soup.get_text().splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def find_job_postings(soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    """
+    Sucht alle schema.org JobPosting-Objekte in den JSON-LD-Blöcken einer Seite
+
+    Berücksichtigt Listen, @graph-Container und @type als Liste.
+    """
+    postings = []
+    for script in soup.find_all('script', type='application/ld+json'):
+        raw = script.string or script.get_text()
+        if not raw or not raw.strip():
+            continue
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            # Manche Seiten liefern JSON-LD mit Steuerzeichen in Strings
+            try:
+                data = json.loads(raw, strict=False)
+            except json.JSONDecodeError as e:
+                logger.debug(f"Ungültiges JSON-LD übersprungen: {e}")
+                continue
+        postings.extend(_iter_job_postings(data))
+    return postings
+
+
+def _iter_job_postings(data: Any) -> Iterable[Dict[str, Any]]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_job_postings(item)
+    elif isinstance(data, dict):
+        types = data.get('@type')
+        types = types if isinstance(types, list) else [types]
+        if 'JobPosting' in types:
+            yield data
+        if '@graph' in data:
+            yield from _iter_job_postings(data['@graph'])
+
+
+def _first(value: Any) -> Any:
+    return value[0] if isinstance(value, list) and value else value
+
+
+def _text(value: Any) -> str:
+    """Liest Text aus Strings, Listen oder Objekten mit name/description"""
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return '; '.join(part for part in (_text(item) for item in value) if part)
+    if isinstance(value, dict):
+        return _text(value.get('name') or value.get('description') or value.get('value'))
+    return html_to_text(str(value))
+
+
+def _map_location(job_location: Any) -> Dict[str, str]:
+    """Ermittelt Standort und Adresse aus jobLocation (Place oder Liste davon)"""
+    place = _first(job_location)
+    if not isinstance(place, dict):
+        return {'location': _text(place)} if place else {}
+
+    address = place.get('address') or {}
+    if isinstance(address, str):
+        return {'location': address, 'address': address}
+
+    locality = _text(address.get('addressLocality'))
+    street = _text(address.get('streetAddress'))
+    postal_code = _text(address.get('postalCode'))
+    country = _text(address.get('addressCountry'))
+    country = COUNTRY_NAMES.get(country.upper(), country)
+
+    result = {}
+    if locality:
+        result['location'] = locality
+    parts = [street, ' '.join(part for part in (postal_code, locality) if part), country]
+    parts = [part for part in parts if part]
+    # Eine vollständige Adresse braucht Straße oder PLZ, sonst ergänzt der RecipientController
+    if street or postal_code:
+        result['address'] = ', '.join(parts)
+    return result
+
+
+def _map_salary(base_salary: Any) -> str:
+    """Formatiert baseSalary (MonetaryAmount) als Text"""
+    if not isinstance(base_salary, dict):
+        return _text(base_salary)
+
+    currency = base_salary.get('currency', '')
+    value = base_salary.get('value')
+    unit = ''
+    if isinstance(value, dict):
+        unit = SALARY_UNITS.get(str(value.get('unitText', '')).upper(), '')
+        if value.get('minValue') and value.get('maxValue'):
+            amount = f"{value['minValue']} - {value['maxValue']}"
+        else:
+            amount = str(value.get('value') or value.get('minValue') or value.get('maxValue') or '')
+    else:
+        amount = str(value or '')
+
+    return ' '.join(part for part in (currency, amount, unit) if part) if amount else ''
+
+
+def requirements_from_description(description_html: str) -> str:
+    """Sucht in der HTML-Beschreibung die Liste unter einer Anforderungs-Überschrift"""
+    if not description_html or '<' not in description_html:
+        return ''
+
+    soup = BeautifulSoup(description_html, 'html.parser')
+    for heading in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'strong', 'b', 'p']):
+        heading_text = heading.get_text(strip=True)
+        if not heading_text or len(heading_text) > 60 or not REQUIREMENT_HEADINGS.search(heading_text):
+            continue
+        following = heading.find_next(['ul', 'ol'])
+        if following:
+            items = [li.get_text(' ', strip=True) for li in following.find_all('li')]
+            if items:
+                return '; '.join(items)
+    return ''
+
+
+def map_job_posting(posting: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Überführt ein JobPosting-Objekt in JobInfo-Felder
+
+    Args:
+        posting: schema.org JobPosting als Dictionary
+
+    Returns:
+        Dictionary mit den gefundenen JobInfo-Feldern (fehlende Felder fehlen)
+    """
+    fields: Dict[str, str] = {}
+
+    fields['position'] = _text(posting.get('title'))
+    organization = posting.get('hiringOrganization')
+    fields['company'] = _text(organization.get('name') if isinstance(organization, dict) else organization)
+    fields.update(_map_location(posting.get('jobLocation')))
+    if not fields.get('location') and str(posting.get('jobLocationType', '')).upper() == 'TELECOMMUTE':
+        fields['location'] = 'Remote'
+
+    description_html = posting.get('description') or ''
+    fields['description'] = html_to_text(description_html) if isinstance(description_html, str) else _text(description_html)
+
+    requirements = [
+        _text(posting.get(key))
+        for key in ('qualifications', 'skills', 'experienceRequirements', 'educationRequirements')
+    ]
+    fields['requirements'] = '; '.join(part for part in requirements if part) \
+        or requirements_from_description(description_html if isinstance(description_html, str) else '')
+
+    fields['benefits'] = _text(posting.get('jobBenefits'))
+    fields['salary'] = _map_salary(posting.get('baseSalary'))
+
+    working_hours = _text(posting.get('workHours'))
+    if not working_hours and '%' not in fields['position']:
+        employment_types = posting.get('employmentType') or []
+        employment_types = employment_types if isinstance(employment_types, list) else [employment_types]
+        working_hours = ' / '.join(
+            label for label in (EMPLOYMENT_TYPES.get(str(t).upper(), str(t)) for t in employment_types) if label
+        )
+    fields['working_hours'] = working_hours
+
+    contact = _first(posting.get('applicationContact'))
+    if isinstance(contact, dict):
+        fields['contact_person'] = _text(contact.get('name'))
+        fields['contact_title'] = _text(contact.get('jobTitle') or contact.get('contactType'))
+        fields['email'] = _text(contact.get('email'))
+        fields['phone'] = _text(contact.get('telephone'))
+
+    return {key: value for key, value in fields.items() if value}
+
+
+def extract_contact_details(text: str) -> Dict[str, str]:
+    """
+    Sucht E-Mail-Adresse und Telefonnummer im Seitentext
+
+    Bevorzugt werden persönliche Adressen gegenüber generischen
+    (z.B. vorname.nachname@ statt info@ oder jobs@).
+    """
+    details = {}
+    if not text:
+        return details
+
+    emails = [email for email in EMAIL_PATTERN.findall(text)
+              if not email.lower().endswith(('.png', '.jpg', '.gif', '.svg'))]
+    if emails:
+        generic = ('info@', 'jobs@', 'job@', 'hr@', 'karriere@', 'career@', 'careers@', 'noreply@', 'no-reply@')
+        personal = [email for email in emails if not email.lower().startswith(generic)]
+        details['email'] = (personal or emails)[0]
+
+    for match in PHONE_PATTERN.finditer(text):
+        phone = re.sub(r'\s+', ' ', match.group(0)).strip()
+        if len(re.sub(r'\D', '', phone)) >= 9:
+            details['phone'] = phone
+            break
+
+    return details
+
+
+def missing_fields(fields: Dict[str, Optional[str]], required: Iterable[str] = REQUIRED_FIELDS) -> List[str]:
+    """Gibt die Pflichtfelder zurück, die noch nicht gefüllt sind"""
+    return [name for name in required if not fields.get(name)]
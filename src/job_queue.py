@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Job-Warteschlange für AutomaticMotivation
+Persistente SQLite-Warteschlange für Batch-Läufe. Jede Stelle durchläuft die
+Zustände pending → fetched → extracted → generated → rendered; Zwischenergebnisse
+werden mit dem Zustandswechsel gespeichert, damit ein Neustart (Absturz, Ctrl-C,
+Provider-Ausfall) genau dort weitermacht, wo die Verarbeitung stehen geblieben ist.
+Mehrere Worker teilen sich die Warteschlange über Leases mit Sichtbarkeits-Timeout.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+FETCHED = 'fetched'
+EXTRACTED = 'extracted'
+GENERATED = 'generated'
+RENDERED = 'rendered'
+FAILED = 'failed'
+
+STATES = (PENDING, FETCHED, EXTRACTED, GENERATED, RENDERED, FAILED)
+# Stufe, die aus einem Zustand in den nächsten führt
+STAGES = {PENDING: 'fetch', FETCHED: 'extract', EXTRACTED: 'generate', GENERATED: 'render'}
+NEXT_STATE = {PENDING: FETCHED, FETCHED: EXTRACTED, EXTRACTED: GENERATED, GENERATED: RENDERED}
+ARTIFACT_COLUMNS = ('html', 'job_info', 'letter', 'pdf_path', 'docx_path', 'duplicate_of')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL DEFAULT 'pending',
+    failed_state TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    html TEXT,
+    job_info TEXT,
+    letter TEXT,
+    pdf_path TEXT,
+    docx_path TEXT,
+    duplicate_of TEXT,
+    lease_owner TEXT,
+    lease_token TEXT,
+    lease_expires_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, next_attempt_at);
+CREATE TABLE IF NOT EXISTS stage_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    success INTEGER NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_stage_runs_stage ON stage_runs (stage, started_at);
+"""
+# Nachträglich hinzugekommene Spalten (Warteschlangen älterer Versionen)
+MIGRATIONS = {
+    'lease_owner': 'ALTER TABLE jobs ADD COLUMN lease_owner TEXT',
+    'lease_token': 'ALTER TABLE jobs ADD COLUMN lease_token TEXT',
+    'lease_expires_at': 'ALTER TABLE jobs ADD COLUMN lease_expires_at REAL NOT NULL DEFAULT 0'
+}
+# Stelle ist bearbeitbar: nicht fertig, Wartezeit abgelaufen, kein gültiger Lease
+READY_CONDITION = 'state NOT IN (?, ?) AND next_attempt_at <= ? AND lease_expires_at <= ?'
+
+
+class LeaseLostError(Exception):
+    """Der Lease einer Stelle ist abgelaufen und wurde von einem anderen Worker übernommen"""
+
+
+@dataclass
+class QueuedJob:
+    """Eine Stelle in der Warteschlange mit ihren bisherigen Zwischenergebnissen"""
+    id: int
+    url: str
+    state: str
+    attempts: int
+    last_error: Optional[str] = None
+    html: Optional[str] = None
+    job_info: Optional[Dict[str, Any]] = None
+    letter: Optional[Dict[str, Any]] = None
+    pdf_path: Optional[str] = None
+    docx_path: Optional[str] = None
+    duplicate_of: Optional[str] = None
+    lease_owner: Optional[str] = None
+    lease_token: Optional[str] = None
+
+    @property
+    def stage(self) -> Optional[str]:
+        """Nächste auszuführende Stufe (None = fertig oder fehlgeschlagen)"""
+        return STAGES.get(self.state)
+
+
+class JobQueue:
+    """
+    Persistente Warteschlange für Batch-Läufe
+
+    Ein Zustandswechsel und die Ergebnisse der Stufe werden in einer Transaktion
+    geschrieben. Bricht eine Stufe ab, bleibt die Stelle im vorherigen Zustand und
+    nur diese Stufe wird beim nächsten Lauf wiederholt.
+
+    Worker holen Stellen mit ``lease_job``; der Lease ist ``visibility_timeout``
+    Sekunden gültig und wird per ``heartbeat`` verlängert. Stirbt ein Worker,
+    läuft sein Lease ab und ein anderer übernimmt die Stelle ab der offenen Stufe.
+    Ergebnisse eines Workers ohne gültigen Lease werden verworfen (LeaseLostError).
+    """
+
+    def __init__(self, db_file: Optional[Path] = None, max_retries: Optional[int] = None,
+                 retry_delay: Optional[float] = None, visibility_timeout: Optional[float] = None):
+        self.db_file = Path(db_file or Config.BATCH_QUEUE_FILE)
+        self.max_retries = max_retries if max_retries is not None else Config.BATCH_MAX_RETRIES
+        self.retry_delay = retry_delay if retry_delay is not None else Config.BATCH_RETRY_DELAY
+        self.visibility_timeout = visibility_timeout if visibility_timeout is not None \
+            else Config.BATCH_VISIBILITY_TIMEOUT
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_file), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(SCHEMA)
+            columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(jobs)')}
+            for column, statement in MIGRATIONS.items():
+                if column not in columns:
+                    self._conn.execute(statement)
+
+    def close(self):
+        self._conn.close()
+
+    def add(self, urls: Iterable[str]) -> int:
+        """
+        Fügt URLs hinzu (bereits vorhandene werden ignoriert)
+
+        Returns:
+            Anzahl neu eingereihter URLs
+        """
+        now = time.time()
+        added = 0
+        with self._lock, self._conn:
+            for url in urls:
+                url = url.strip()
+                if not url or url.startswith('#'):
+                    continue
+                cursor = self._conn.execute(
+                    'INSERT OR IGNORE INTO jobs (url, created_at, updated_at) VALUES (?, ?, ?)',
+                    (url, now, now)
+                )
+                added += cursor.rowcount
+        return added
+
+    def lease_job(self, worker_id: str) -> Optional[QueuedJob]:
+        """
+        Holt die nächste bearbeitbare Stelle (älteste zuerst) und reserviert sie für einen Worker
+
+        Auswahl und Reservierung sind ein einziges UPDATE und damit auch zwischen
+        mehreren Prozessen atomar.
+
+        Returns:
+            Reservierte Stelle oder None, wenn gerade keine bearbeitbar ist
+        """
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f'UPDATE jobs SET lease_owner = ?, lease_token = ?, lease_expires_at = ? '
+                f'WHERE id = (SELECT id FROM jobs WHERE {READY_CONDITION} ORDER BY id LIMIT 1) '
+                f'AND {READY_CONDITION}',
+                (worker_id, token, now + self.visibility_timeout, RENDERED, FAILED, now, now, RENDERED, FAILED, now, now)
+            )
+            if cursor.rowcount == 0:
+                return None
+            row = self._conn.execute('SELECT * FROM jobs WHERE lease_token = ?', (token,)).fetchone()
+        return self._to_job(row)
+
+    def heartbeat(self, job: QueuedJob) -> bool:
+        """
+        Verlängert den Lease einer Stelle
+
+        Returns:
+            False, wenn der Lease inzwischen einem anderen Worker gehört
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND lease_token = ?',
+                (time.time() + self.visibility_timeout, job.id, job.lease_token)
+            )
+        return cursor.rowcount == 1
+
+    def release(self, job: QueuedJob):
+        """Gibt den Lease einer Stelle frei (sofern er noch diesem Worker gehört)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'UPDATE jobs SET lease_owner = NULL, lease_token = NULL, lease_expires_at = 0 '
+                'WHERE id = ? AND lease_token = ?',
+                (job.id, job.lease_token)
+            )
+        job.lease_owner = None
+        job.lease_token = None
+
+    def has_open_jobs(self) -> bool:
+        """Gibt es noch nicht abgeschlossene Stellen (auch zurückgestellte oder reservierte)?"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM jobs WHERE state NOT IN (?, ?) LIMIT 1', (RENDERED, FAILED)
+            ).fetchone()
+        return row is not None
+
+    def next_ready_at(self) -> Optional[float]:
+        """Zeitpunkt, ab dem die nächste zurückgestellte oder reservierte Stelle frei wird"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT MIN(MAX(next_attempt_at, lease_expires_at)) FROM jobs WHERE state NOT IN (?, ?)',
+                (RENDERED, FAILED)
+            ).fetchone()
+        return row[0] if row and row[0] is not None else None
+
+    def get(self, job_id: int) -> Optional[QueuedJob]:
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def complete_stage(self, job: QueuedJob, new_state: str, started_at: float, **artifacts):
+        """
+        Speichert die Ergebnisse einer Stufe und wechselt atomar in den nächsten Zustand
+
+        Args:
+            job: Bearbeitete Stelle
+            new_state: Neuer Zustand (normalerweise NEXT_STATE[job.state])
+            started_at: Startzeit der Stufe (für die Durchsatz-Statistik)
+            **artifacts: Zwischenergebnisse (html, job_info, letter, pdf_path, docx_path, duplicate_of)
+
+        Raises:
+            LeaseLostError: Die Stelle gehört nicht mehr diesem Worker
+        """
+        unknown = set(artifacts) - set(ARTIFACT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unbekannte Artefakte: {', '.join(sorted(unknown))}")
+
+        values = {key: json.dumps(value, ensure_ascii=False) if isinstance(value, dict) else value
+                  for key, value in artifacts.items()}
+        assignments = ''.join(f', {key} = ?' for key in values)
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f'UPDATE jobs SET state = ?, attempts = 0, last_error = NULL, next_attempt_at = 0, '
+                f'updated_at = ?{assignments} WHERE id = ? AND state = ? AND lease_token IS ?',
+                (new_state, now, *values.values(), job.id, job.state, job.lease_token)
+            )
+            if cursor.rowcount == 0:
+                raise LeaseLostError(f"Lease für {job.url} verloren (Stufe {job.stage})")
+            self._record_run(job.id, job.stage, started_at, now, True)
+        job.state = new_state
+        job.attempts = 0
+        job.last_error = None
+
+    def fail_stage(self, job: QueuedJob, error: str, started_at: float):
+        """
+        Vermerkt einen Fehler; nach ``max_retries`` Versuchen wird die Stelle als failed markiert
+
+        Bis dahin bleibt sie im aktuellen Zustand und wird mit exponentieller
+        Wartezeit erneut versucht. Der Lease wird freigegeben, damit auch ein
+        anderer Worker den nächsten Versuch übernehmen kann.
+
+        Raises:
+            LeaseLostError: Die Stelle gehört nicht mehr diesem Worker
+        """
+        now = time.time()
+        stage = job.stage
+        attempts = job.attempts + 1
+        release = 'lease_owner = NULL, lease_token = NULL, lease_expires_at = 0'
+        with self._lock, self._conn:
+            if attempts >= self.max_retries:
+                cursor = self._conn.execute(
+                    f'UPDATE jobs SET state = ?, failed_state = ?, attempts = ?, last_error = ?, updated_at = ?, '
+                    f'{release} WHERE id = ? AND lease_token IS ?',
+                    (FAILED, job.state, attempts, error, now, job.id, job.lease_token)
+                )
+            else:
+                cursor = self._conn.execute(
+                    f'UPDATE jobs SET attempts = ?, last_error = ?, next_attempt_at = ?, updated_at = ?, '
+                    f'{release} WHERE id = ? AND lease_token IS ?',
+                    (attempts, error, now + self.retry_delay * 2 ** (attempts - 1), now, job.id, job.lease_token)
+                )
+            if cursor.rowcount == 0:
+                raise LeaseLostError(f"Lease für {job.url} verloren (Stufe {stage})")
+            if attempts >= self.max_retries:
+                job.state = FAILED
+            self._record_run(job.id, stage, started_at, now, False, error)
+        job.attempts = attempts
+        job.last_error = error
+        job.lease_owner = None
+        job.lease_token = None
+
+    def retry_failed(self, urls: Optional[List[str]] = None) -> int:
+        """
+        Setzt fehlgeschlagene Stellen auf die Stufe zurück, an der sie gescheitert sind
+
+        Returns:
+            Anzahl zurückgesetzter Stellen
+        """
+        query = ('UPDATE jobs SET state = COALESCE(failed_state, ?), failed_state = NULL, attempts = 0, '
+                 'next_attempt_at = 0, lease_owner = NULL, lease_token = NULL, lease_expires_at = 0, '
+                 'updated_at = ? WHERE state = ?')
+        params: List[Any] = [PENDING, time.time(), FAILED]
+        if urls:
+            query += f" AND url IN ({', '.join('?' for _ in urls)})"
+            params.extend(urls)
+        with self._lock, self._conn:
+            return self._conn.execute(query, params).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Anzahl Stellen pro Zustand"""
+        with self._lock:
+            rows = self._conn.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall()
+        counts = {state: 0 for state in STATES}
+        counts.update({state: count for state, count in rows})
+        return counts
+
+    def stage_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Durchsatz pro Stufe aus den protokollierten Läufen
+
+        Returns:
+            {stage: {'done', 'errors', 'mean_duration', 'throughput_per_min'}}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT stage, SUM(success), SUM(1 - success), AVG(CASE WHEN success THEN duration END), '
+                'MIN(started_at), MAX(started_at + duration) FROM stage_runs GROUP BY stage'
+            ).fetchall()
+        stats = {}
+        for stage, done, errors, mean_duration, first_start, last_end in rows:
+            # Über die Wanduhr gemessen, damit parallele Worker zusammen zählen
+            window = max((last_end or 0) - (first_start or 0), mean_duration or 0)
+            stats[stage] = {
+                'done': done or 0,
+                'errors': errors or 0,
+                'mean_duration': mean_duration or 0.0,
+                'throughput_per_min': (done * 60 / window) if done and window else 0.0
+            }
+        return {stage: stats[stage] for stage in STAGES.values() if stage in stats}
+
+    def failed_jobs(self) -> List[QueuedJob]:
+        with self._lock:
+            rows = self._conn.execute('SELECT * FROM jobs WHERE state = ? ORDER BY id', (FAILED,)).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def active_leases(self) -> List[Dict[str, Any]]:
+        """Aktuell reservierte Stellen mit Worker und Restlaufzeit des Leases"""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT url, state, lease_owner, lease_expires_at FROM jobs '
+                'WHERE lease_expires_at > ? AND state NOT IN (?, ?) ORDER BY lease_owner, id',
+                (now, RENDERED, FAILED)
+            ).fetchall()
+        return [
+            {'url': url, 'stage': STAGES.get(state), 'worker': owner, 'expires_in': expires_at - now}
+            for url, state, owner, expires_at in rows
+        ]
+
+    def _record_run(self, job_id: int, stage: str, started_at: float, finished_at: float,
+                    success: bool, error: Optional[str] = None):
+        self._conn.execute(
+            'INSERT INTO stage_runs (job_id, stage, started_at, duration, success, error) VALUES (?, ?, ?, ?, ?, ?)',
+            (job_id, stage, started_at, finished_at - started_at, int(success), error)
+        )
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> QueuedJob:
+        return QueuedJob(
+            id=row['id'],
+            url=row['url'],
+            state=row['state'],
+            attempts=row['attempts'],
+            last_error=row['last_error'],
+            html=row['html'],
+            job_info=json.loads(row['job_info']) if row['job_info'] else None,
+            letter=json.loads(row['letter']) if row['letter'] else None,
+            pdf_path=row['pdf_path'],
+            docx_path=row['docx_path'],
+            duplicate_of=row['duplicate_of'],
+            lease_owner=row['lease_owner'],
+            lease_token=row['lease_token']
+        )
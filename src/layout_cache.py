@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Layout-Cache für AutomaticMotivation
+Speichert das Ergebnis des Zeilenumbruchs (Zeilen, Positionen, Höhe) pro Absatz,
+Style und Spaltenbreite. Wird derselbe Brief nach einer kleinen Änderung erneut
+gerendert (Review-/Bearbeitungsschleife), werden nur die geänderten Absätze neu
+umbrochen und vermessen.
+"""
+
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class LayoutCache:
+    """
+    Thread-sicherer LRU-Cache für Absatz-Layouts
+
+    Args:
+        max_entries: Maximale Anzahl Absätze (0 = Cache deaktiviert)
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Liefert das gespeicherte Layout oder berechnet und speichert es
+
+        Ausnahmen aus compute (z.B. LayoutOverflow) werden nicht gecacht.
+        """
+        if self.max_entries <= 0:
+            return compute()
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Einträge, Treffer, Fehlzugriffe und Trefferquote"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+# Prozessweiter Cache für alle Renderer
+layout_cache = LayoutCache(Config.LAYOUT_CACHE_SIZE)
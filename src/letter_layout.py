@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Brief-Layout für AutomaticMotivation
+Zwischenrepräsentation des Brieftexts (Anrede, Absätze aus Text- und Link-Runs,
+Grußformel, Signatur). Sie wird einmal pro Brief aufgebaut und von DOCX-, PDF- und
+Template-PDF-Renderer gemeinsam verwendet, statt dass jeder Renderer den Text selbst
+zerlegt und Links einsetzt.
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+from config.config import Config
+from src.models import MotivationLetter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLOSING = "Freundliche Grüsse"
+
+SALUTATION_PREFIXES = ("Sehr geehrte", "Liebe ", "Lieber ", "Guten Tag", "Hallo", "Grüezi")
+
+CLOSING_PREFIXES = (
+    "Mit freundlichen Grüßen", "Mit freundlichen Grüssen",
+    "Freundliche Grüße", "Freundliche Grüsse",
+    "Beste Grüße", "Beste Grüsse", "Herzliche Grüße", "Herzliche Grüsse"
+)
+
+# Nur als eigener, kurzer Absatz eine Grußformel - sonst normaler Inhalt
+SHORT_CLOSINGS = ("Vielen Dank", "Herzlichen Dank")
+
+SIGNATURE_FILLERS = {'ihr', 'ihre', 'dein', 'deine', 'euer', 'eure'}
+
+LINKEDIN_PATTERN = r"LinkedIn[\s\-]?Profil"
+
+
+@dataclass
+class Run:
+    """Textstück eines Absatzes, optional mit Hyperlink oder fett"""
+    text: str
+    link: Optional[str] = None
+    bold: bool = False
+
+
+@dataclass
+class Block:
+    """Ein Absatz des Brieftexts"""
+    runs: List[Run] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return ''.join(run.text for run in self.runs)
+
+
+@dataclass
+class LetterLayout:
+    """Aufbereiteter Brieftext, unabhängig vom Ausgabeformat"""
+    salutation: Optional[str]
+    blocks: List[Block]
+    closing: str
+    signature: str
+
+    @property
+    def links(self) -> List[Tuple[str, str]]:
+        """Alle (Text, URL)-Paare in Lesereihenfolge"""
+        return [(run.text, run.link) for block in self.blocks for run in block.runs if run.link]
+
+
+def link_runs(text: str, project_urls: Dict[str, str], linkedin_url: Optional[str]) -> List[Run]:
+    """
+    Zerlegt einen Absatz in Runs und verlinkt GitHub-Projekte und LinkedIn-Erwähnungen
+
+    Args:
+        text: Absatztext
+        project_urls: Projektname -> GitHub-URL
+        linkedin_url: URL des LinkedIn-Profils (ohne URL kein Link)
+    """
+    patterns = []
+    if project_urls:
+        # Längere Namen zuerst, damit "Auto-search-jobs-to-Email" nicht als "Auto-search-jobs" endet
+        projects = sorted(project_urls, key=len, reverse=True)
+        patterns.append(f"(?P<project>{'|'.join(re.escape(project) for project in projects)})")
+    if linkedin_url:
+        patterns.append(f"(?P<linkedin>{LINKEDIN_PATTERN})")
+    if not patterns:
+        return [Run(text)]
+
+    runs = []
+    position = 0
+    for match in re.finditer('|'.join(patterns), text):
+        if match.start() > position:
+            runs.append(Run(text[position:match.start()]))
+        url = project_urls[match.group('project')] if match.lastgroup == 'project' else linkedin_url
+        runs.append(Run(match.group(0), url))
+        position = match.end()
+    if position < len(text):
+        runs.append(Run(text[position:]))
+    return runs
+
+
+def _is_closing(paragraph: str) -> bool:
+    if paragraph.startswith(CLOSING_PREFIXES):
+        return True
+    return paragraph.startswith(SHORT_CLOSINGS) and len(paragraph.split()) <= 4
+
+
+def _is_signature(paragraph: str, sender_name: str) -> bool:
+    """Kurzer Absatz aus dem Absendernamen, z.B. "Max Muster" oder "Ihr Max Muster" """
+    words = [word.strip('.,;:!').lower() for word in paragraph.split()]
+    name_parts = {part.lower() for part in sender_name.split()}
+    if not name_parts or len(words) > len(name_parts) + 1:
+        return False
+    return any(word in name_parts for word in words) and all(
+        word in name_parts or word in SIGNATURE_FILLERS for word in words
+    )
+
+
+def build_layout(motivation_letter: MotivationLetter, project_urls: Optional[Dict[str, str]] = None,
+                 linkedin_url: Optional[str] = None) -> LetterLayout:
+    """
+    Baut das Layout eines Briefs
+
+    Die erste Anrede im Inhalt wird zur Anrede des Briefs, weitere (vom LLM doppelt
+    erzeugte) entfallen. Grußformeln und Signaturen im Inhalt entfallen ebenfalls, da
+    sie von den Renderern einheitlich gesetzt werden.
+
+    Args:
+        motivation_letter: Das Motivationsschreiben
+        project_urls: GitHub-Projekte (Standard: Config.get_github_project_urls())
+        linkedin_url: LinkedIn-Profil (Standard: Config.PERSONAL_LINKEDIN)
+    """
+    if project_urls is None:
+        project_urls = Config.get_github_project_urls()
+    if linkedin_url is None:
+        linkedin_url = Config.PERSONAL_LINKEDIN
+
+    salutation = None
+    blocks = []
+    for paragraph in motivation_letter.content.split('\n\n'):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if paragraph.startswith(SALUTATION_PREFIXES) and len(paragraph.split()) <= 8:
+            if salutation is None and not blocks:
+                salutation = paragraph
+            continue
+        if _is_closing(paragraph) or _is_signature(paragraph, motivation_letter.sender_name):
+            continue
+        blocks.append(Block(link_runs(paragraph, project_urls, linkedin_url)))
+
+    logger.debug(f"Layout: {len(blocks)} Absätze, {sum(len(block.runs) for block in blocks)} Runs")
+    return LetterLayout(salutation=salutation, blocks=blocks, closing=DEFAULT_CLOSING,
+                        signature=motivation_letter.sender_name)
+
+
+def reportlab_markup(block: Block) -> str:
+    """ReportLab-Paragraph-Markup eines Absatzes (Text escaped, Links blau)"""
+    parts = []
+    for run in block.runs:
+        text = f'<b>{escape(run.text)}</b>' if run.bold else escape(run.text)
+        if run.link:
+            parts.append(f'<a href={quoteattr(run.link)} color="blue">{text}</a>')
+        else:
+            parts.append(text)
+    return ''.join(parts)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Letter-Service für AutomaticMotivation
+Hält LLM-Clients, analysierte Templates und Caches über viele Anfragen warm.
+Grundlage für den API-Server (server.py): pro Anfrage fällt nur noch die LLM-Zeit an.
+"""
+
+import base64
+import os
+import queue
+import threading
+import time
+import uuid
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from config.config import Config
+from src.models import JobInfo, MotivationLetter, model_to_dict
+from src.job_extractor import JobExtractor
+from src.ai_generator import AIGenerator
+from src.template_pdf_generator import TemplateBasedPDFGenerator
+from src.docx_generator import DocxGenerator
+from src.output_sink import FileSink
+from src.letter_layout import build_layout
+from src.profiler import profiler
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceBusyError(Exception):
+    """Alle Worker sind belegt und innerhalb der Wartezeit wurde keiner frei"""
+
+
+class LetterPipeline:
+    """
+    Komponenten für genau eine Anfrage zur Zeit
+
+    Extractor und Generator halten ihre ChatOpenAI-Clients (und damit die
+    HTTP-Verbindungen), der PDF-Generator seine Template-Analyse.
+    """
+
+    def __init__(self, template_path: str = "templates/template.pdf"):
+        self.job_extractor = JobExtractor()
+        self.ai_generator = AIGenerator()
+        self.pdf_generator = TemplateBasedPDFGenerator(template_path)
+        self.docx_generator = DocxGenerator()
+
+    def run(self, job_info: Optional[JobInfo], url: Optional[str], personal_info: Dict[str, str],
+            sink: Optional[FileSink] = None) -> Dict[str, Any]:
+        """
+        Extraktion (falls nötig), Generierung und Rendering im Speicher
+
+        Args:
+            sink: Optionaler Datei-Sink; ohne Sink werden keine Dateien geschrieben
+
+        Returns:
+            job_info, letter, documents ({kind: {'filename', 'content', 'path'}}), timings
+        """
+        timings = {}
+
+        if job_info is None:
+            start = time.perf_counter()
+            with profiler.span('extraction'):
+                job_info = self.job_extractor.extract_from_url(url)
+            timings['extraction'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with profiler.span('generation'):
+            letter = self.ai_generator.generate_motivation_letter(job_info, personal_info)
+        timings['generation'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        documents = self.render(letter, sink)
+        timings['rendering'] = time.perf_counter() - start
+
+        return {'job_info': job_info, 'letter': letter, 'documents': documents, 'timings': timings}
+
+    def revise(self, letter: MotivationLetter, job_info: JobInfo, paragraph_index: int,
+               instruction: Optional[str] = None, sink: Optional[FileSink] = None) -> Dict[str, Any]:
+        """
+        Überarbeitet einen Absatz (siehe AIGenerator.regenerate_paragraph) und rendert neu
+
+        Returns:
+            job_info, letter, documents, timings (wie run)
+        """
+        start = time.perf_counter()
+        with profiler.span('revision'):
+            letter = self.ai_generator.regenerate_paragraph(letter, paragraph_index, job_info, instruction)
+        timings = {'revision': time.perf_counter() - start}
+
+        start = time.perf_counter()
+        documents = self.render(letter, sink)
+        timings['rendering'] = time.perf_counter() - start
+
+        return {'job_info': job_info, 'letter': letter, 'documents': documents, 'timings': timings}
+
+    def render(self, letter: MotivationLetter, sink: Optional[FileSink] = None) -> Dict[str, Dict[str, Any]]:
+        """PDF und DOCX im Speicher rendern, mit Sink zusätzlich als Dateien schreiben"""
+        with profiler.span('rendering'):
+            layout = build_layout(letter)
+            documents = {
+                'pdf': {'filename': self.pdf_generator._generate_filename(letter),
+                        'content': self.pdf_generator.render_pdf_bytes(letter, layout)},
+                'docx': {'filename': self.docx_generator._generate_filename(letter),
+                         'content': self.docx_generator.render_docx_bytes(letter, layout)}
+            }
+            for document in documents.values():
+                document['path'] = sink.write(document['filename'], document['content']) if sink else None
+        return documents
+
+
+class LetterService:
+    """
+    Pool warmer Pipelines mit begrenzter Parallelität
+
+    Es laufen höchstens ``workers`` Anfragen gleichzeitig; weitere warten bis zu
+    ``queue_timeout`` Sekunden auf eine freie Pipeline (sonst ServiceBusyError).
+    Dokumente werden im Speicher gerendert; Dateien entstehen nur mit ``save_files``.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue_timeout: Optional[float] = None,
+                 output_dir: str = os.path.join("output", "api"), template_path: str = "templates/template.pdf",
+                 save_files: Optional[bool] = None):
+        self.workers = workers or Config.SERVER_WORKERS
+        self.queue_timeout = queue_timeout if queue_timeout is not None else Config.SERVER_QUEUE_TIMEOUT
+        self.output_dir = output_dir
+        self.save_files = save_files if save_files is not None else Config.SERVER_SAVE_FILES
+        self._pool: "queue.Queue[LetterPipeline]" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'busy_rejections': 0}
+
+        started = time.perf_counter()
+        for _ in range(self.workers):
+            self._pool.put(LetterPipeline(template_path))
+        # GitHub-Cache einmal laden, damit die erste Anfrage ihn bereits im Speicher vorfindet
+        Config.get_github_project_urls()
+        logger.info(f"{self.workers} Pipelines in {time.perf_counter() - started:.2f}s vorgewärmt")
+
+    @property
+    def available(self) -> int:
+        return self._pool.qsize()
+
+    def create_letter(self, payload: Dict[str, Any], include_content: bool = True) -> Dict[str, Any]:
+        """
+        Erstellt ein Motivationsschreiben
+
+        Args:
+            payload: {"url": ...} oder {"job_info": {...}}, optional "personal_info" (überschreibt .env-Werte)
+                     und "save_files" (zusätzlich auf die Festplatte schreiben)
+            include_content: PDF und DOCX Base64-kodiert in die Antwort aufnehmen
+
+        Returns:
+            Antwort-Dictionary (JobInfo, Brief, Dateien, Zeiten)
+
+        Raises:
+            ValueError: Ungültige Anfrage
+            ServiceBusyError: Kein Worker innerhalb der Wartezeit frei
+        """
+        return self._response(self.render_letter(payload), include_content)
+
+    def revise_paragraph(self, payload: Dict[str, Any], include_content: bool = True) -> Dict[str, Any]:
+        """
+        Überarbeitet einen einzelnen Absatz eines bestehenden Briefs
+
+        Statt des ganzen Briefs gehen nur der Absatz, seine Nachbarn und eine kompakte
+        Stellenzusammenfassung an das LLM.
+
+        Args:
+            payload: {"letter": {...}, "job_info": {...}, "paragraph": Index (0-basiert)}, optional
+                     "instruction" (Überarbeitungswunsch) und "save_files"
+            include_content: PDF und DOCX Base64-kodiert in die Antwort aufnehmen
+
+        Returns:
+            Antwort-Dictionary wie create_letter, zusätzlich "paragraph" (überarbeiteter Index)
+
+        Raises:
+            ValueError: Ungültige Anfrage oder Absatz existiert nicht
+            ServiceBusyError: Kein Worker innerhalb der Wartezeit frei
+        """
+        letter_data = payload.get('letter')
+        job_info_data = payload.get('job_info')
+        paragraph_index = payload.get('paragraph')
+        instruction = payload.get('instruction')
+        if not isinstance(letter_data, dict) or not isinstance(job_info_data, dict):
+            raise ValueError("'letter' und 'job_info' (Objekte) erforderlich")
+        if not isinstance(paragraph_index, int) or isinstance(paragraph_index, bool):
+            raise ValueError("'paragraph' muss ein Absatz-Index (Ganzzahl) sein")
+        if instruction is not None and not isinstance(instruction, str):
+            raise ValueError("'instruction' muss ein Text sein")
+        try:
+            letter = MotivationLetter(**letter_data)
+            job_info = JobInfo(**{'url': '', **job_info_data})
+        except Exception as e:
+            raise ValueError(f"Ungültiger Brief oder job_info: {e}")
+
+        result = self._on_pipeline(payload, lambda pipeline, sink: pipeline.revise(
+            letter, job_info, paragraph_index, instruction, sink))
+        response = self._response(result, include_content)
+        response['paragraph'] = paragraph_index
+        return response
+
+    def render_letter(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wie create_letter, liefert aber die rohen Dokument-Bytes (für Streaming-Antworten)
+
+        Returns:
+            id, job_info, letter, documents ({kind: {'filename', 'content', 'path'}}), timings
+        """
+        url = payload.get('url')
+        job_info_data = payload.get('job_info')
+        if not url and not job_info_data:
+            raise ValueError("'url' oder 'job_info' erforderlich")
+        if job_info_data is not None and not isinstance(job_info_data, dict):
+            raise ValueError("'job_info' muss ein Objekt sein")
+        try:
+            job_info = JobInfo(**{'url': url or '', **job_info_data}) if job_info_data else None
+        except Exception as e:
+            raise ValueError(f"Ungültige job_info: {e}")
+
+        personal_info = Config.get_personal_info()
+        personal_info.update({key: value for key, value in (payload.get('personal_info') or {}).items()
+                              if key in personal_info and isinstance(value, str)})
+
+        return self._on_pipeline(payload, lambda pipeline, sink: pipeline.run(job_info, url, personal_info, sink))
+
+    def _on_pipeline(self, payload: Dict[str, Any],
+                     work: Callable[[LetterPipeline, Optional[FileSink]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Führt work mit einer freien Pipeline aus (Wartezeit, Statistik, optionaler Datei-Sink)"""
+        request_id = uuid.uuid4().hex[:12]
+        queued_at = time.perf_counter()
+        try:
+            pipeline = self._pool.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            self._count('busy_rejections')
+            raise ServiceBusyError(f"Alle {self.workers} Worker belegt")
+
+        save_files = payload.get('save_files', self.save_files)
+        sink = FileSink(os.path.join(self.output_dir, request_id)) if save_files else None
+        try:
+            wait_time = time.perf_counter() - queued_at
+            result = work(pipeline, sink)
+            self._count('requests')
+        except Exception:
+            self._count('errors')
+            raise
+        finally:
+            self._pool.put(pipeline)
+
+        result['id'] = request_id
+        result['timings'] = {'queue_wait': wait_time, **result['timings']}
+        return result
+
+    @staticmethod
+    def _response(result: Dict[str, Any], include_content: bool) -> Dict[str, Any]:
+        files = {}
+        for kind, document in result['documents'].items():
+            entry = {'path': document['path'], 'filename': document['filename']}
+            if include_content:
+                entry['content_base64'] = base64.b64encode(document['content']).decode('ascii')
+            files[kind] = entry
+
+        return {
+            'id': result['id'],
+            'job_info': model_to_dict(result['job_info']),
+            'letter': model_to_dict(result['letter']),
+            'files': files,
+            'timings': result['timings']
+        }
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
@@ -9,6 +9,7 @@ import logging
 from dataclasses import dataclass
 from typing import List, Optional, Dict
 from config.config import Config
+from src.profiler import profiler
 
 logger = logging.getLogger(__name__)
 
@@ -421,6 +422,7 @@ class LinkedInExtractor:
             logger.error(f"Fehler beim Ermitteln relevanter Zertifikate: {e}")
             return []
     
+    @profiler.traced('linkedin_profile', 'http')
     def format_profile_for_application(self, job_requirements: str) -> str:
         """
         Formatiert LinkedIn-Profil-Informationen für eine Bewerbung
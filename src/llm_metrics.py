@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+LLM-Metriken für AutomaticMotivation
+Erfasst echte Prompt-/Completion-Tokens, Kosten und Latenz jedes LLM-Aufrufs
+und speichert sie lokal für Auswertungen pro Stufe und Modell
+"""
+
+import json
+import math
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config.config import Config
+from src.llm_utils import LLMFactory
+from src.profiler import profiler
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Berechnet das q-Perzentil (0-100) nach der Nearest-Rank-Methode"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def extract_token_usage(response: Any) -> Tuple[Optional[int], Optional[int], Optional[float]]:
+    """
+    Liest Token-Verbrauch und (falls vom Provider geliefert) Kosten aus einer LLM-Antwort
+
+    Returns:
+        (Input-Tokens, Output-Tokens, Kosten in USD) - None wenn nicht verfügbar
+    """
+    usage = getattr(response, 'usage_metadata', None) or {}
+    token_usage = (getattr(response, 'response_metadata', None) or {}).get('token_usage') or {}
+
+    input_tokens = usage.get('input_tokens', token_usage.get('prompt_tokens'))
+    output_tokens = usage.get('output_tokens', token_usage.get('completion_tokens'))
+    # OpenRouter liefert mit aktiviertem Usage-Accounting die tatsächlichen Kosten
+    cost = token_usage.get('cost')
+
+    return input_tokens, output_tokens, cost
+
+
+class LLMMetricsStore:
+    """Lokaler Metrik-Speicher (JSON Lines) mit Auswertungen pro Stufe und Modell"""
+
+    def __init__(self, metrics_file: Optional[Path] = None):
+        self.metrics_file = Path(metrics_file or Config.LLM_METRICS_FILE)
+        self.session_records: List[Dict[str, Any]] = []
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]):
+        """Registriert einen Empfänger, der jeden neuen Datensatz erhält (z.B. den ModelRouter)"""
+        self._listeners.append(listener)
+
+    def record(self, record: Dict[str, Any]):
+        """Speichert einen Aufruf-Datensatz"""
+        for listener in self._listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                logger.error(f"Fehler beim Weitergeben der LLM-Metriken: {e}")
+        with self._lock:
+            self.session_records.append(record)
+            try:
+                self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.metrics_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            except Exception as e:
+                logger.error(f"Fehler beim Speichern der LLM-Metriken: {e}")
+
+    def load(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Lädt alle gespeicherten Datensätze (optional ab Zeitstempel)"""
+        records = []
+        if not self.metrics_file.exists():
+            return records
+        try:
+            with open(self.metrics_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if since is None or record.get('timestamp', 0) >= since:
+                        records.append(record)
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der LLM-Metriken: {e}")
+        return records
+
+    @staticmethod
+    def rollup(records: Iterable[Dict[str, Any]], key: Tuple[str, ...] = ('stage',)) -> Dict[Tuple, Dict[str, Any]]:
+        """
+        Fasst Datensätze nach den angegebenen Feldern zusammen
+
+        Args:
+            records: Aufruf-Datensätze
+            key: Gruppierungsfelder, z.B. ('stage',), ('model',) oder ('stage', 'model')
+
+        Returns:
+            Dictionary Gruppenschlüssel -> Kennzahlen
+        """
+        groups: Dict[Tuple, Dict[str, Any]] = {}
+        for record in records:
+            group_key = tuple(record.get(field, '') for field in key)
+            group = groups.setdefault(group_key, {
+                'calls': 0, 'errors': 0, 'timeouts': 0,
+                'input_tokens': 0, 'output_tokens': 0,
+                'cost': 0.0, 'latencies': []
+            })
+            group['calls'] += 1
+            if record.get('status') == 'error':
+                group['errors'] += 1
+            elif record.get('status') == 'timeout':
+                group['timeouts'] += 1
+            group['input_tokens'] += record.get('input_tokens') or 0
+            group['output_tokens'] += record.get('output_tokens') or 0
+            group['cost'] += record.get('cost') or 0.0
+            group['latencies'].append(record.get('latency', 0.0))
+
+        for group in groups.values():
+            latencies = group.pop('latencies')
+            group['latency_total'] = sum(latencies)
+            group['latency_p50'] = percentile(latencies, 50)
+            group['latency_p95'] = percentile(latencies, 95)
+            group['cost'] = round(group['cost'], 6)
+
+        return groups
+
+
+# Prozessweiter Standard-Speicher
+metrics_store = LLMMetricsStore()
+
+
+def tracked_invoke(llm: Any, messages: List[Any], stage: str,
+                   store: Optional[LLMMetricsStore] = None) -> Any:
+    """
+    Ruft das LLM auf und erfasst Tokens, Kosten und Latenz
+
+    Args:
+        llm: LLM-Instanz (z.B. ChatOpenAI oder RoutedLLM)
+        messages: Nachrichten für den Aufruf
+        stage: Pipeline-Stufe (z.B. 'extraction', 'project_selection', 'generation')
+        store: Metrik-Speicher (Standard: prozessweiter Speicher)
+
+    Returns:
+        Antwort des LLM
+    """
+    store = store or metrics_store
+    routed_llm = llm if hasattr(llm, 'route') else None
+    if routed_llm is not None:
+        # RoutedLLM: Modell wird pro Aufruf gewählt (siehe src/model_router.py)
+        llm = routed_llm.route()
+    provider, model = LLMFactory.describe_llm(llm)
+    record = {
+        'timestamp': time.time(),
+        'stage': stage,
+        'provider': provider,
+        'model': model,
+        'status': 'ok',
+        'input_tokens': None,
+        'output_tokens': None,
+        'cost': None,
+        'latency': 0.0
+    }
+
+    start = time.perf_counter()
+    try:
+        with profiler.span(f"llm:{stage}", 'llm', model=model):
+            if Config.HEDGED_REQUESTS:
+                response, provider, model = _hedged_invoke(llm, routed_llm, messages, stage, provider, model, store)
+                record.update({'provider': provider, 'model': model})
+            else:
+                response = llm.invoke(messages)
+    except Exception as e:
+        record['latency'] = round(time.perf_counter() - start, 4)
+        record['status'] = 'timeout' if 'timeout' in type(e).__name__.lower() else 'error'
+        record['error'] = str(e)[:200]
+        store.record(record)
+        raise
+
+    record['latency'] = round(time.perf_counter() - start, 4)
+    input_tokens, output_tokens, cost = extract_token_usage(response)
+
+    if input_tokens is None or output_tokens is None:
+        # Provider liefert keine Usage-Daten: lokal zählen und markieren
+        from src.token_budget import count_tokens
+        input_tokens = sum(count_tokens(str(getattr(m, 'content', m)), model) for m in messages)
+        output_tokens = count_tokens(getattr(response, 'content', '') or '', model)
+        record['estimated'] = True
+
+    if cost is None:
+        cost = LLMFactory.estimate_cost(provider, model, input_tokens, output_tokens)
+
+    record.update({
+        'input_tokens': input_tokens,
+        'output_tokens': output_tokens,
+        'cost': cost
+    })
+    store.record(record)
+
+    logger.info(f"LLM-Aufruf {stage} ({model}): {input_tokens} in / {output_tokens} out, "
+                f"{record['latency']:.2f}s, ${cost:.4f}")
+    return response
+
+
+def _hedged_invoke(llm: Any, routed_llm: Any, messages: List[Any], stage: str, provider: str, model: str,
+                   store: LLMMetricsStore) -> Tuple[Any, str, str]:
+    """
+    Aufruf über den RequestHedger (siehe src/hedging.py)
+
+    Returns:
+        (Antwort, Provider und Modell der gewinnenden Anfrage)
+    """
+    from src.hedging import get_request_hedger
+
+    def hedge_llm():
+        if Config.HEDGE_TARGET == 'fallback' and routed_llm is not None:
+            return routed_llm.fallback(provider, model) or llm
+        return llm
+
+    result = get_request_hedger(store).invoke(llm, messages, stage, provider, model, hedge_llm)
+    if result.cancelled_llm is not None:
+        # Abgebrochene Anfrage: Eingabe-Tokens sind bezahlt, die Ausgabe ist unbekannt
+        from src.token_budget import count_tokens
+        cancelled_provider, cancelled_model = LLMFactory.describe_llm(result.cancelled_llm)
+        input_tokens = sum(count_tokens(str(getattr(m, 'content', m)), cancelled_model) for m in messages)
+        store.record({
+            'timestamp': time.time(),
+            'stage': stage,
+            'provider': cancelled_provider,
+            'model': cancelled_model,
+            'status': 'cancelled',
+            'input_tokens': input_tokens,
+            'output_tokens': 0,
+            'cost': LLMFactory.estimate_cost(cancelled_provider, cancelled_model, input_tokens, 0),
+            'latency': round(result.cancelled_latency, 4),
+            'estimated': True
+        })
+    return (result.response, *LLMFactory.describe_llm(result.llm))
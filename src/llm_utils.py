@@ -1,10 +1,20 @@
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from langchain_openai import ChatOpenAI
 from config.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Stufen, die kein Spitzenmodell brauchen (strukturierte Extraktion, Projektnummern auswählen)
+FAST_STAGES = ('extraction', 'project_selection', 'requirements')
+
+# Schnelles, günstiges Standardmodell pro Provider für diese Stufen
+FAST_MODELS = {
+    'openrouter': 'anthropic/claude-3-haiku',
+    'openai': 'gpt-3.5-turbo'
+}
+
+
 class LLMFactory:
     """Factory für verschiedene LLM-Provider"""
     
@@ -41,6 +51,76 @@ class LLMFactory:
             logger.error(f"Fehler bei LLM-Erstellung: {e}")
             raise
     
+    @staticmethod
+    def create_llm_for_stage(stage: str, **kwargs) -> Any:
+        """
+        Erstellt das LLM für eine Pipeline-Stufe (siehe resolve_stage_model)
+        
+        Mit ADAPTIVE_ROUTING ein RoutedLLM, das bei jedem Aufruf das Modell neu wählt
+        und bei gestörten oder zu langsamen Modellen auf Ausweichmodelle umleitet.
+        
+        Args:
+            stage: 'extraction', 'project_selection', 'requirements' oder 'generation'
+            **kwargs: Zusätzliche Parameter (z.B. temperature, max_tokens)
+            
+        Returns:
+            Initialisiertes LLM
+        """
+        if Config.ADAPTIVE_ROUTING:
+            # Modell wird pro Aufruf anhand der beobachteten Kennzahlen gewählt
+            from src.model_router import RoutedLLM
+            return RoutedLLM(stage, **kwargs)
+        
+        provider, model = LLMFactory.resolve_stage_model(stage)
+        logger.info(f"LLM für Stufe '{stage}': {model} ({provider})")
+        return LLMFactory.create_llm(provider, model, **kwargs)
+    
+    @staticmethod
+    def resolve_stage_model(stage: str) -> Tuple[str, str]:
+        """
+        Ermittelt Provider und Modell einer Pipeline-Stufe
+        
+        Ein konfiguriertes Stufen-Modell (z.B. EXTRACTION_MODEL) hat Vorrang, sofern der
+        Provider verfügbar ist. Ohne Konfiguration erhalten die Stufen aus FAST_STAGES das
+        schnelle Modell des Providers, wenn es in get_available_models() gelistet ist;
+        alles andere (und jeder Fallback) nutzt das Hauptmodell.
+        
+        Args:
+            stage: Name der Stufe (wie in tracked_invoke)
+            
+        Returns:
+            Tuple (Provider, Modell-Name)
+        """
+        config = Config.get_llm_config()
+        provider, default_model = config['provider'], config['model']
+        configured = Config.get_stage_model(stage)
+        
+        if configured:
+            if LLMFactory.is_provider_available(provider):
+                return provider, configured
+            logger.warning(f"Provider {provider} nicht verfügbar, Stufe '{stage}' nutzt {default_model}")
+        elif stage in FAST_STAGES:
+            fast_model = FAST_MODELS.get(provider)
+            if fast_model and LLMFactory.is_model_available(provider, fast_model):
+                return provider, fast_model
+        
+        return provider, default_model
+    
+    @staticmethod
+    def is_provider_available(provider: str) -> bool:
+        """Prüft, ob für den Provider ein API-Key konfiguriert ist"""
+        if provider == 'openrouter':
+            return bool(Config.OPENROUTER_API_KEY)
+        if provider == 'openai':
+            return bool(Config.OPENAI_API_KEY)
+        return False
+    
+    @staticmethod
+    def is_model_available(provider: str, model: str) -> bool:
+        """Prüft, ob der Provider verfügbar ist und das Modell anbietet"""
+        return LLMFactory.is_provider_available(provider) and \
+            model in LLMFactory.get_available_models().get(provider, [])
+    
     @staticmethod
     def _create_openrouter_llm(model: str, **kwargs) -> ChatOpenAI:
         """Erstellt OpenRouter LLM"""
@@ -79,6 +159,30 @@ class LLMFactory:
             **params
         )
     
+    @staticmethod
+    def describe_llm(llm: Any) -> Tuple[str, str]:
+        """
+        Ermittelt Provider und Modell eines bestehenden LLM-Clients
+        
+        Args:
+            llm: LLM-Instanz (z.B. ChatOpenAI)
+            
+        Returns:
+            Tuple (Provider, Modell-Name)
+        """
+        model = getattr(llm, 'model_name', None) or getattr(llm, 'model', None) or Config.get_llm_config()['model']
+        base_url = str(getattr(llm, 'openai_api_base', None) or '')
+        
+        if 'openrouter' in base_url:
+            provider = 'openrouter'
+        elif not base_url or 'api.openai.com' in base_url:
+            provider = 'openai'
+        else:
+            # Eigener OpenAI-kompatibler Endpunkt (z.B. OPENROUTER_BASE_URL überschrieben)
+            provider = Config.get_llm_config()['provider']
+        
+        return provider, model
+    
     @staticmethod
     def get_available_models() -> Dict[str, list]:
         """
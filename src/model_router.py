@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Adaptive Modellwahl pro Stufe
+Beobachtet für jedes Modell die Latenz-Perzentile, Fehler- und Timeout-Quote und die
+tatsächlichen Kosten der letzten Aufrufe (aus den LLM-Metriken) und wählt bei jedem
+Aufruf das bevorzugte Modell, das gesund ist und das Latenz- bzw. Kostenbudget der Stufe
+einhält. Fällt ein Modell oder ein Provider aus, wandert der Verkehr zu den
+Ausweichmodellen, nach Ablauf des Zeitfensters wird das bevorzugte Modell erneut versucht.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from config.config import Config
+from src.llm_utils import LLMFactory, FAST_MODELS
+from src.llm_metrics import LLMMetricsStore, metrics_store, percentile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelStats:
+    """Beobachtete Kennzahlen eines Modells für eine Stufe (Latenz und Kosten in Sekunden bzw. USD)"""
+    provider: str
+    model: str
+    calls: int = 0
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    latency_p50: float = 0.0
+    latency_p95: float = 0.0
+    cost_per_call: float = 0.0
+    degraded: bool = False
+    within_budget: bool = True
+
+
+@dataclass
+class RoutingDecision:
+    """Gewähltes Modell einer Stufe samt Begründung und Kennzahlen aller Kandidaten"""
+    stage: str
+    provider: str
+    model: str
+    reason: str
+    candidates: List[ModelStats]
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def parse_budget(value: str) -> Dict[str, float]:
+    """
+    Liest ein Budget aus der Konfiguration
+
+    '20' gilt für alle Stufen, 'extraction=5,generation=30' pro Stufe; leer = kein Budget
+    """
+    budget = {}
+    for part in (value or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        stage, _, amount = part.rpartition('=')
+        try:
+            budget[stage.strip() or '*'] = float(amount)
+        except ValueError:
+            logger.warning(f"Ungültiges Routing-Budget ignoriert: {part}")
+    return budget
+
+
+def parse_models(value: str, default_provider: str) -> List[Tuple[str, str]]:
+    """'openai:gpt-4o-mini,anthropic/claude-3-haiku' -> [(Provider, Modell), ...]"""
+    models = []
+    for part in (value or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        provider, _, model = part.partition(':') if ':' in part else (default_provider, '', part)
+        models.append((provider, model))
+    return models
+
+
+def stage_family(stage: str) -> str:
+    """Abschnitte und Varianten zählen zur Hauptstufe ('generation:introduction' -> 'generation')"""
+    return stage.split(':', 1)[0]
+
+
+class ModelRouter:
+    """
+    Wählt pro Aufruf das Modell einer Stufe anhand der beobachteten Kennzahlen
+
+    Kandidaten in Vorzugsreihenfolge: das Stufen-Modell (LLMFactory.resolve_stage_model),
+    das Hauptmodell, das schnelle Modell des Providers, ROUTER_FALLBACK_MODELS und das
+    schnelle Modell jedes weiteren verfügbaren Providers. Gewählt wird der erste gesunde
+    Kandidat innerhalb des Budgets; so bleibt die Qualität erhalten, solange das bevorzugte
+    Modell funktioniert.
+
+    Args:
+        store: Metrik-Speicher, dessen Aufrufe beobachtet werden
+        window_seconds: Nur Aufrufe der letzten N Sekunden zählen
+        window_calls: Höchstens so viele Aufrufe pro Modell (bzw. Stufe und Modell)
+        min_calls: Mindestanzahl Aufrufe, bevor ein Modell als gestört oder zu langsam gilt
+        max_error_rate: Ab dieser Fehler- und Timeout-Quote gilt ein Modell als gestört
+        latency_budget: p95-Latenz in Sekunden pro Stufe ('*' = alle Stufen)
+        cost_budget: Kosten pro Aufruf in USD pro Stufe ('*' = alle Stufen)
+    """
+
+    def __init__(self, store: Optional[LLMMetricsStore] = None, window_seconds: Optional[float] = None,
+                 window_calls: Optional[int] = None, min_calls: Optional[int] = None,
+                 max_error_rate: Optional[float] = None, latency_budget: Optional[Dict[str, float]] = None,
+                 cost_budget: Optional[Dict[str, float]] = None):
+        self.store = store or metrics_store
+        self.window_seconds = window_seconds if window_seconds is not None else Config.ROUTER_WINDOW_SECONDS
+        self.window_calls = window_calls if window_calls is not None else Config.ROUTER_WINDOW_CALLS
+        self.min_calls = min_calls if min_calls is not None else Config.ROUTER_MIN_CALLS
+        self.max_error_rate = max_error_rate if max_error_rate is not None else Config.ROUTER_MAX_ERROR_RATE
+        self.latency_budget = latency_budget if latency_budget is not None else parse_budget(Config.ROUTER_LATENCY_BUDGET)
+        self.cost_budget = cost_budget if cost_budget is not None else parse_budget(Config.ROUTER_COST_BUDGET)
+
+        self._health: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {}  # (Provider, Modell)
+        self._performance: Dict[Tuple[str, str, str], Deque[Dict[str, Any]]] = {}  # (Stufe, Provider, Modell)
+        self._decisions: Deque[RoutingDecision] = deque(maxlen=100)
+        self._current: Dict[str, RoutingDecision] = {}
+        self._lock = threading.Lock()
+        self._created = time.time()
+        self._history_loaded = False
+        self.store.subscribe(self.observe)
+
+    def observe(self, record: Dict[str, Any]):
+        """Nimmt einen Aufruf-Datensatz auf (wird vom Metrik-Speicher aufgerufen)"""
+        if record.get('status') == 'cancelled':
+            return  # Vom Hedging abgebrochen: weder Fehler noch vollständige Latenz
+        model_key = (record.get('provider', ''), record.get('model', ''))
+        with self._lock:
+            self._health.setdefault(model_key, deque(maxlen=self.window_calls)).append(record)
+            if record.get('status') != 'error':
+                # Schnelle Fehler würden die Latenz schönen, Timeouts zählen mit
+                self._performance.setdefault(
+                    (stage_family(record.get('stage', '')), *model_key), deque(maxlen=self.window_calls)
+                ).append(record)
+
+    def candidates(self, stage: str) -> List[Tuple[str, str]]:
+        """Verfügbare Kandidaten einer Stufe in Vorzugsreihenfolge"""
+        config = Config.get_llm_config()
+        provider = config['provider']
+        ordered = [LLMFactory.resolve_stage_model(stage), (provider, config['model'])]
+        if FAST_MODELS.get(provider) and LLMFactory.is_model_available(provider, FAST_MODELS[provider]):
+            ordered.append((provider, FAST_MODELS[provider]))
+        ordered += [(p, m) for p, m in parse_models(Config.ROUTER_FALLBACK_MODELS, provider)
+                    if LLMFactory.is_provider_available(p)]
+        ordered += [(p, m) for p, m in FAST_MODELS.items() if p != provider and LLMFactory.is_model_available(p, m)]
+
+        unique = []
+        for candidate in ordered:
+            if candidate not in unique:
+                unique.append(candidate)
+        return unique
+
+    def stats(self, stage: str, provider: str, model: str) -> ModelStats:
+        """Kennzahlen eines Modells für eine Stufe im aktuellen Zeitfenster"""
+        self._load_history()
+        cutoff = time.time() - self.window_seconds
+        family = stage_family(stage)
+        with self._lock:
+            calls = [r for r in self._health.get((provider, model), ()) if r.get('timestamp', 0) >= cutoff]
+            provider_calls = [r for (p, _), records in self._health.items() if p == provider
+                              for r in records if r.get('timestamp', 0) >= cutoff]
+            performance = [r for r in self._performance.get((family, provider, model), ())
+                           if r.get('timestamp', 0) >= cutoff]
+
+        stats = ModelStats(provider, model, calls=len(calls))
+        if calls:
+            stats.error_rate = round(sum(r.get('status') != 'ok' for r in calls) / len(calls), 3)
+            stats.timeout_rate = round(sum(r.get('status') == 'timeout' for r in calls) / len(calls), 3)
+        if performance:
+            latencies = [r.get('latency', 0.0) for r in performance]
+            costs = [r.get('cost') or 0.0 for r in performance if r.get('status') == 'ok']
+            stats.latency_p50 = percentile(latencies, 50)
+            stats.latency_p95 = percentile(latencies, 95)
+            stats.cost_per_call = round(sum(costs) / len(costs), 6) if costs else 0.0
+
+        # Provider gilt als gestört, wenn mehrere seiner Modelle ausfallen (nicht nur ein einzelnes)
+        provider_failures = [r for r in provider_calls if r.get('status') != 'ok']
+        provider_degraded = len(provider_calls) >= self.min_calls and \
+            len(provider_failures) / len(provider_calls) > self.max_error_rate and \
+            len({r.get('model') for r in provider_failures}) > 1
+        stats.degraded = provider_degraded or (len(calls) >= self.min_calls and stats.error_rate > self.max_error_rate)
+        stats.within_budget = self._overshoot(stats, family) <= 1.0
+        return stats
+
+    def choose(self, stage: str, record: bool = True) -> RoutingDecision:
+        """
+        Wählt das Modell für den nächsten Aufruf einer Stufe
+
+        Args:
+            stage: Pipeline-Stufe (wie in tracked_invoke)
+            record: Entscheidung speichern (False für reine Abfragen, z.B. Modellname für Budgets)
+        """
+        candidates = [self.stats(stage, provider, model) for provider, model in self.candidates(stage)]
+        preferred = candidates[0]
+        healthy = [stats for stats in candidates if not stats.degraded]
+        within_budget = [stats for stats in healthy if stats.within_budget]
+
+        if within_budget:
+            chosen = within_budget[0]
+            skipped = candidates[:candidates.index(chosen)]
+            reason = "bevorzugtes Modell" if chosen is preferred else \
+                "; ".join(self._explain(stats, stage) for stats in skipped)
+        elif healthy:
+            chosen = min(healthy, key=lambda stats: self._overshoot(stats, stage_family(stage)))
+            reason = f"kein Kandidat im Budget, geringste Überschreitung ({self._explain(chosen, stage)})"
+        else:
+            chosen = min(candidates, key=lambda stats: stats.error_rate)
+            reason = f"alle Kandidaten gestört, geringste Fehlerquote ({chosen.error_rate:.0%})"
+
+        decision = RoutingDecision(stage, chosen.provider, chosen.model, reason, candidates)
+        if record:
+            with self._lock:
+                previous = self._current.get(stage)
+                self._current[stage] = decision
+                self._decisions.append(decision)
+            if previous is None or previous.model != decision.model:
+                log = logger.info if chosen is preferred else logger.warning
+                log(f"Routing {stage}: {decision.model} ({decision.provider}) - {reason}")
+        return decision
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Aktuelle Entscheidung pro Stufe und die letzten Entscheidungen (für /routing und Auswertungen)"""
+        with self._lock:
+            current = {stage: decision.to_dict() for stage, decision in self._current.items()}
+            recent = [
+                {'stage': d.stage, 'model': d.model, 'provider': d.provider, 'reason': d.reason,
+                 'timestamp': d.timestamp}
+                for d in list(self._decisions)[-20:]
+            ]
+        return {
+            'window_seconds': self.window_seconds,
+            'max_error_rate': self.max_error_rate,
+            'latency_budget': self.latency_budget,
+            'cost_budget': self.cost_budget,
+            'stages': current,
+            'recent': recent
+        }
+
+    def _overshoot(self, stats: ModelStats, family: str) -> float:
+        """Verhältnis zum Budget (<= 1 = im Budget); ohne genügend Aufrufe gilt ein Modell als im Budget"""
+        if stats.calls < self.min_calls:
+            return 0.0
+        ratios = [0.0]
+        latency_budget = self.latency_budget.get(family, self.latency_budget.get('*'))
+        if latency_budget:
+            ratios.append(stats.latency_p95 / latency_budget)
+        cost_budget = self.cost_budget.get(family, self.cost_budget.get('*'))
+        if cost_budget:
+            ratios.append(stats.cost_per_call / cost_budget)
+        return max(ratios)
+
+    def _explain(self, stats: ModelStats, stage: str) -> str:
+        if stats.degraded:
+            return f"{stats.model} gestört (Fehlerquote {stats.error_rate:.0%}, Timeouts {stats.timeout_rate:.0%})"
+        family = stage_family(stage)
+        details = [f"p95 {stats.latency_p95:.1f}s", f"${stats.cost_per_call:.4f}/Aufruf"]
+        if stats.within_budget:
+            return f"{stats.model} im Budget ({', '.join(details)})"
+        return f"{stats.model} über Budget ({', '.join(details)}, Faktor {self._overshoot(stats, family):.1f})"
+
+    def _load_history(self):
+        """Übernimmt beim ersten Bedarf die gespeicherten Aufrufe aus früheren Läufen"""
+        if self._history_loaded:
+            return
+        self._history_loaded = True
+        for record in self.store.load(since=time.time() - self.window_seconds):
+            if record.get('timestamp', 0) < self._created:  # Neuere kommen über observe()
+                self.observe(record)
+
+
+class RoutedLLM:
+    """
+    LLM-Stellvertreter, der bei jedem Aufruf über den ModelRouter das Modell einer Stufe wählt
+
+    tracked_invoke ruft route() auf und erfasst den Aufruf unter dem tatsächlich
+    gewählten Modell. Attribute (model_name, max_tokens, root_client, ...) kommen vom
+    aktuell gewählten Client.
+
+    Args:
+        stage: Pipeline-Stufe
+        router: Router (Standard: prozessweiter Router)
+        **kwargs: LLM-Parameter für LLMFactory.create_llm (z.B. temperature, max_tokens)
+    """
+
+    def __init__(self, stage: str, router: Optional[ModelRouter] = None, **kwargs):
+        self.stage = stage
+        self.router = router or get_model_router()
+        self.llm_kwargs = kwargs
+        self.bind_kwargs: Dict[str, Any] = {}
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._clients_lock = threading.Lock()
+        # Client des aktuell gewählten Modells sofort anlegen (wie bisher beim Start, nicht beim ersten Aufruf)
+        self._client(self.router.choose(stage, record=False))
+
+    def route(self, record: bool = True) -> Any:
+        """LLM-Client für den nächsten Aufruf (Entscheidung wird im Router gespeichert)"""
+        llm = self._client(self.router.choose(self.stage, record))
+        return llm.bind(**self.bind_kwargs) if self.bind_kwargs else llm
+
+    def bind(self, **kwargs) -> 'RoutedLLM':
+        """Wie Runnable.bind: zusätzliche Aufruf-Parameter, Clients werden geteilt"""
+        bound = RoutedLLM.__new__(RoutedLLM)
+        bound.__dict__.update(self.__dict__)
+        bound.bind_kwargs = {**self.bind_kwargs, **kwargs}
+        return bound
+
+    def fallback(self, provider: str, model: str) -> Optional[Any]:
+        """
+        Nächster gesunder Kandidat außer (provider, model), bevorzugt bei einem anderen Provider
+
+        Ziel einer Hedging-Anfrage (HEDGE_TARGET=fallback); None ohne weiteren Kandidaten
+        """
+        others = [stats for stats in self.router.choose(self.stage, record=False).candidates
+                  if not stats.degraded and (stats.provider, stats.model) != (provider, model)]
+        if not others:
+            return None
+        target = next((stats for stats in others if stats.provider != provider), others[0])
+        llm = self._client(RoutingDecision(self.stage, target.provider, target.model, 'hedging', []))
+        return llm.bind(**self.bind_kwargs) if self.bind_kwargs else llm
+
+    def invoke(self, messages: List[Any], *args, **kwargs) -> Any:
+        return self.route().invoke(messages, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_') or name in ('stage', 'router', 'llm_kwargs', 'bind_kwargs'):
+            raise AttributeError(name)
+        return getattr(self._client(self.router.choose(self.stage, record=False)), name)
+
+    def _client(self, decision: RoutingDecision) -> Any:
+        key = (decision.provider, decision.model)
+        with self._clients_lock:
+            if key not in self._clients:
+                self._clients[key] = LLMFactory.create_llm(decision.provider, decision.model, **self.llm_kwargs)
+            return self._clients[key]
+
+
+_model_router: Optional[ModelRouter] = None
+_model_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """Prozessweiter Router über dem Standard-Metrik-Speicher (wird beim ersten Bedarf angelegt)"""
+    global _model_router
+    with _model_router_lock:
+        if _model_router is None:
+            _model_router = ModelRouter()
+        return _model_router
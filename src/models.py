@@ -1,5 +1,6 @@
+import json
 from pydantic import BaseModel, HttpUrl
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 
 class JobInfo(BaseModel):
@@ -47,3 +48,9 @@ class MotivationLetter(BaseModel):
     sender_phone: str
     sender_email: str
     date: datetime = datetime.now()  # Geändert von datum zu date
+
+def model_to_dict(model: BaseModel) -> Dict[str, Any]:
+    """JSON-kompatibles Dictionary eines Modells (Pydantic 1 und 2)"""
+    if hasattr(model, 'model_dump'):
+        return model.model_dump(mode='json')
+    return json.loads(model.json())
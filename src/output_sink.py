@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Ausgabe-Sink für AutomaticMotivation
+Schreibt gerenderte Dokumente atomar und ohne Namenskollisionen ins Dateisystem.
+Parallele Läufe für dieselbe Firma am selben Tag überschreiben sich nicht mehr,
+Leser sehen nie eine halb geschriebene Datei.
+"""
+
+import os
+import tempfile
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_NAME_ATTEMPTS = 1000
+
+
+def _candidate_names(filename: str):
+    """Motivationsschreiben_X.pdf, Motivationsschreiben_X_2.pdf, _3, ..."""
+    stem, extension = os.path.splitext(filename)
+    yield filename
+    for index in range(2, MAX_NAME_ATTEMPTS + 1):
+        yield f"{stem}_{index}{extension}"
+
+
+def write_atomic(directory: str, filename: str, data: bytes, overwrite: bool = False) -> str:
+    """
+    Schreibt Daten atomar in eine Datei
+
+    Die Daten landen zuerst in einer temporären Datei im Zielverzeichnis. Ohne
+    ``overwrite`` wird sie per Hardlink unter dem ersten freien Namen veröffentlicht
+    (schlägt fehl, wenn der Name existiert - auch bei gleichzeitigen Schreibern),
+    sonst per ``os.replace`` über eine bestehende Datei gelegt.
+
+    Returns:
+        Pfad der geschriebenen Datei
+    """
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if overwrite:
+            target = os.path.join(directory, filename)
+            os.replace(tmp_path, target)
+            return target
+
+        for name in _candidate_names(filename):
+            target = os.path.join(directory, name)
+            try:
+                os.link(tmp_path, target)
+                return target
+            except FileExistsError:
+                continue
+            except OSError:
+                # Dateisystem ohne Hardlinks: Namen exklusiv reservieren, dann ersetzen
+                try:
+                    os.close(os.open(target, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                except FileExistsError:
+                    continue
+                os.replace(tmp_path, target)
+                return target
+        raise FileExistsError(f"Kein freier Dateiname für {filename} in {directory}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+class FileSink:
+    """Optionaler Datei-Ausgang für Renderer (atomar, kollisionsfrei)"""
+
+    def __init__(self, output_dir: str = "output", overwrite: bool = False):
+        self.output_dir = output_dir
+        self.overwrite = overwrite
+
+    def write(self, filename: str, data: bytes, output_dir: Optional[str] = None) -> str:
+        path = write_atomic(output_dir or self.output_dir, filename, data, self.overwrite)
+        logger.info(f"Datei geschrieben: {path}")
+        return path
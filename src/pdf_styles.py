@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Schrift- und Style-Registry für die PDF-Generatoren
+Schriften und ParagraphStyles ändern sich zwischen Briefen nicht. Statt sie in jedem
+Generator neu aufzubauen, werden TTF-Schriften hier einmal pro Prozess registriert,
+Textbreiten gecacht und die Style-Sets pro Vorlage einmal erstellt und als
+unveränderliche Mappings geteilt. Auch die Template-Analyse (pdfplumber) läuft nur
+einmal pro Template-Datei.
+"""
+
+import os
+import logging
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Optional, Tuple
+from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_JUSTIFY
+from reportlab.lib.fonts import ps2tt, tt2ps
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+PREFERRED_FONT = 'Aptos-Display'
+PREFERRED_FONT_BOLD = 'Aptos-Display-Bold'
+FALLBACK_FONT = 'Helvetica'
+FALLBACK_FONT_BOLD = 'Helvetica-Bold'
+
+# Style-Definitionen pro Vorlage; 'font'/'bold' werden durch die registrierten Schriften ersetzt
+STYLE_DEFINITIONS = {
+    'standard': {
+        'Sender': dict(fontSize=11, alignment=TA_RIGHT, spaceAfter=6, fontName='font'),
+        'Recipient': dict(fontSize=11, alignment=TA_LEFT, spaceAfter=12, spaceBefore=24, fontName='font'),
+        'Date': dict(fontSize=11, alignment=TA_RIGHT, spaceAfter=24, fontName='font'),
+        'Subject': dict(fontSize=14, alignment=TA_LEFT, spaceAfter=18, fontName='bold'),
+        'Salutation': dict(fontSize=11, alignment=TA_LEFT, spaceAfter=12, fontName='font'),
+        'MainText': dict(fontSize=11, alignment=TA_JUSTIFY, spaceAfter=12, leading=16, fontName='font'),
+        'Closing': dict(fontSize=11, alignment=TA_LEFT, spaceAfter=36, spaceBefore=12, fontName='font'),
+        'Signature': dict(fontSize=11, alignment=TA_LEFT, fontName='font')
+    },
+    'template': {
+        'Sender': dict(fontSize=10, alignment=TA_RIGHT, spaceAfter=6, fontName='font'),
+        'Recipient': dict(fontSize=11, alignment=TA_LEFT, spaceAfter=12, spaceBefore=24, fontName='font'),
+        'Date': dict(fontSize=10, alignment=TA_RIGHT, spaceAfter=24, fontName='font'),
+        'Subject': dict(fontSize=12, alignment=TA_LEFT, spaceAfter=18, fontName='bold'),
+        'Salutation': dict(fontSize=11, alignment=TA_LEFT, spaceAfter=12, fontName='font'),
+        'MainText': dict(fontSize=11, alignment=TA_JUSTIFY, spaceAfter=12, leading=16, fontName='font'),
+        'Closing': dict(fontSize=11, alignment=TA_LEFT, spaceAfter=36, spaceBefore=12, fontName='font'),
+        'Signature': dict(fontSize=11, alignment=TA_LEFT, fontName='font')
+    }
+}
+
+_lock = threading.Lock()
+_style_sets: Dict[Tuple[str, str, str], Mapping[str, ParagraphStyle]] = {}
+_template_analyses: Dict[Tuple[str, float], Optional[dict]] = {}
+
+
+@lru_cache(maxsize=None)
+def resolve_fonts(font_dir: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Registriert Aptos Display (normal + fett) einmal, falls die TTF-Dateien vorhanden sind
+
+    Args:
+        font_dir: Verzeichnis mit Aptos-Display.ttf und Aptos-Display-Bold.ttf
+                  (Standard: Config.PDF_FONT_DIR)
+
+    Returns:
+        (Schrift, fette Schrift) - Helvetica, wenn Aptos Display nicht verfügbar ist
+    """
+    font_dir = font_dir or Config.PDF_FONT_DIR
+    regular_path = os.path.join(font_dir, f"{PREFERRED_FONT}.ttf")
+    bold_path = os.path.join(font_dir, f"{PREFERRED_FONT_BOLD}.ttf")
+    if not (os.path.exists(regular_path) and os.path.exists(bold_path)):
+        logger.debug(f"Aptos Display nicht in {font_dir} gefunden, verwende {FALLBACK_FONT}")
+        return FALLBACK_FONT, FALLBACK_FONT_BOLD
+
+    try:
+        pdfmetrics.registerFont(TTFont(PREFERRED_FONT, regular_path))
+        pdfmetrics.registerFont(TTFont(PREFERRED_FONT_BOLD, bold_path))
+        # Familie registrieren, damit <b> in Paragraph und bold_font() die fette Variante finden
+        pdfmetrics.registerFontFamily(PREFERRED_FONT, normal=PREFERRED_FONT, bold=PREFERRED_FONT_BOLD,
+                                      italic=PREFERRED_FONT, boldItalic=PREFERRED_FONT_BOLD)
+    except Exception as e:
+        logger.warning(f"Aptos Display konnte nicht registriert werden ({e}), verwende {FALLBACK_FONT}")
+        return FALLBACK_FONT, FALLBACK_FONT_BOLD
+
+    logger.info(f"Schrift {PREFERRED_FONT} registriert ({font_dir})")
+    return PREFERRED_FONT, PREFERRED_FONT_BOLD
+
+
+def style_set(template: str = 'standard', font_dir: Optional[str] = None) -> Mapping[str, ParagraphStyle]:
+    """
+    Geteiltes, unveränderliches Style-Set einer Vorlage (Beispiel-Styles + Brief-Styles)
+
+    Args:
+        template: Schlüssel in STYLE_DEFINITIONS ('standard' oder 'template')
+        font_dir: Schriftverzeichnis (Standard: Config.PDF_FONT_DIR)
+    """
+    font_name, font_bold = resolve_fonts(font_dir)
+    key = (template, font_name, font_bold)
+    styles = _style_sets.get(key)
+    if styles is not None:
+        return styles
+
+    with _lock:
+        if key not in _style_sets:
+            stylesheet = getSampleStyleSheet()
+            fonts = {'font': font_name, 'bold': font_bold}
+            for name, definition in STYLE_DEFINITIONS[template].items():
+                stylesheet.add(ParagraphStyle(
+                    name=name,
+                    parent=stylesheet['Normal'],
+                    **{**definition, 'fontName': fonts[definition['fontName']]}
+                ))
+            _style_sets[key] = MappingProxyType(dict(stylesheet.byName))
+            logger.debug(f"Style-Set '{template}' erstellt ({font_name})")
+        return _style_sets[key]
+
+
+def template_analysis(template_path: str, analyze: Callable[[], Optional[dict]]) -> Optional[dict]:
+    """
+    Template-Analyse einmal pro Datei und Änderungszeitpunkt
+
+    Args:
+        template_path: Pfad zum PDF-Template
+        analyze: Führt die eigentliche Analyse aus (z.B. TemplateBasedPDFGenerator.analyze_template)
+    """
+    key = (os.path.abspath(template_path), os.path.getmtime(template_path))
+    with _lock:
+        if key not in _template_analyses:
+            _template_analyses[key] = analyze()
+        return _template_analyses[key]
+
+
+@lru_cache(maxsize=65536)
+def text_width(text: str, font_name: str, font_size: float) -> float:
+    """Gecachte Textbreite (Wörter wiederholen sich über Briefe hinweg)"""
+    return pdfmetrics.stringWidth(text, font_name, font_size)
+
+
+@lru_cache(maxsize=256)
+def bold_font(font_name: str) -> str:
+    """Fette Variante einer Schrift (wie <b> in Paragraph), sonst die Schrift selbst"""
+    try:
+        family, _, italic = ps2tt(font_name)
+        return tt2ps(family, 1, italic)
+    except ValueError:
+        return font_name
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Spekulatives Vorladen für das CLI
+Sobald eine gültige URL eingegeben ist, laufen Abruf, Textbereinigung, Duplikat-Prüfung
+und LLM-Extraktion im Hintergrund, während der Benutzer noch die persönlichen Angaben
+bestätigt. Schon während des Begrüßungsbildschirms werden die HTTP-Verbindung zum LLM
+aufgebaut und Template, Schriften und GitHub-Cache geladen.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from src.job_extractor import JobExtractor
+from src.duplicate_detector import DuplicateIndex, DuplicateMatch, posting_text
+from src.models import JobInfo
+from src.profiler import profiler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PrefetchedJob:
+    """Ergebnis des Vorladens einer Stellenanzeige"""
+    url: str
+    html_content: str
+    job_text: str
+    duplicate: Optional[DuplicateMatch] = None
+    job_info: Optional[JobInfo] = None  # None: Duplikat gefunden, nicht spekuliert oder Extraktion fehlgeschlagen
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class JobPrefetcher:
+    """
+    Lädt Stellenanzeigen im Hintergrund vor
+
+    Extrahiert wird nur, wenn die Stelle kein Duplikat ist - bei einem Duplikat entscheidet
+    der Benutzer erst, ob überhaupt ein LLM-Aufruf nötig ist.
+
+    Args:
+        job_extractor: Extractor für Abruf und Extraktion (sein LLM-Client wird vorgewärmt)
+        duplicate_index: Index für die Duplikat-Prüfung
+        template_path: PDF-Template, das beim Vorwärmen analysiert wird
+    """
+
+    def __init__(self, job_extractor: Optional[JobExtractor] = None, duplicate_index: Optional[DuplicateIndex] = None,
+                 template_path: str = "templates/template.pdf"):
+        self.job_extractor = job_extractor or JobExtractor()
+        self.duplicate_index = duplicate_index if duplicate_index is not None else DuplicateIndex()
+        self.template_path = template_path
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='prefetch')
+        self._jobs: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> Future:
+        """Baut die LLM-Verbindung auf und lädt Template, Schriften und GitHub-Cache (im Hintergrund)"""
+        return self._executor.submit(self._warm_up)
+
+    def prefetch(self, url: str) -> Future:
+        """Startet Abruf, Duplikat-Prüfung und Extraktion einer URL (mehrfacher Aufruf startet nur einmal)"""
+        with self._lock:
+            if url not in self._jobs:
+                logger.info(f"Lade Stellenanzeige im Hintergrund vor: {url}")
+                self._jobs[url] = self._executor.submit(self._load, url, True)
+            return self._jobs[url]
+
+    def get(self, url: str, timeout: Optional[float] = None) -> PrefetchedJob:
+        """
+        Ergebnis für eine URL; ohne vorheriges prefetch() wird nur geladen und geprüft (ohne Extraktion)
+
+        Raises:
+            Exception: Fehler beim Laden der Seite
+        """
+        with self._lock:
+            future = self._jobs.get(url)
+        if future is None:
+            return self._load(url, extract=False)
+        return future.result(timeout)
+
+    def shutdown(self):
+        """Laufende Arbeit wird nicht abgewartet"""
+        self._executor.shutdown(wait=False)
+
+    def _load(self, url: str, extract: bool) -> PrefetchedJob:
+        timings = {}
+        start = time.perf_counter()
+        with profiler.span('fetch'):
+            html_content = self.job_extractor.fetch(url)
+            job_text = posting_text(html_content)
+            duplicate = self.duplicate_index.find_duplicate(job_text)
+        timings['fetch'] = time.perf_counter() - start
+
+        job_info = None
+        if extract and duplicate is None:
+            start = time.perf_counter()
+            try:
+                with profiler.span('extraction'):
+                    job_info = self.job_extractor.extract_from_url(url, html_content=html_content)
+            except Exception as e:
+                # Der Aufrufer extrahiert dann erneut im Vordergrund und zeigt den Fehler an
+                logger.warning(f"Vorab-Extraktion fehlgeschlagen: {e}")
+            timings['extraction'] = time.perf_counter() - start
+
+        return PrefetchedJob(url, html_content, job_text, duplicate, job_info, timings)
+
+    def _warm_up(self):
+        from config.config import Config
+        from src.template_pdf_generator import TemplateBasedPDFGenerator
+
+        start = time.perf_counter()
+        with profiler.span('warm_up'):
+            try:
+                # Leichter Aufruf über denselben HTTP-Client: TLS-Verbindung liegt danach im Pool
+                self.job_extractor.llm.root_client.with_options(timeout=5, max_retries=0).models.list()
+            except Exception as e:
+                logger.debug(f"LLM-Verbindung nicht vorgewärmt: {e}")
+            try:
+                TemplateBasedPDFGenerator(self.template_path)
+                Config.get_github_project_urls()
+            except Exception as e:
+                logger.debug(f"Vorwärmen unvollständig: {e}")
+        logger.debug(f"Vorwärmen in {time.perf_counter() - start:.2f}s abgeschlossen")
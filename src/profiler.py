@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Leichtgewichtiger Span-Profiler für die Pipeline
+Misst Stufen sowie ausgehende HTTP- und LLM-Aufrufe und exportiert sie als
+Wasserfall-Ansicht oder Chrome-Trace (chrome://tracing, Perfetto)
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Wiederverwendbarer No-op-Kontext für den deaktivierten Profiler
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    """Aktiver Span - wird beim Verlassen im Profiler abgelegt"""
+
+    __slots__ = ('profiler', 'name', 'category', 'args', 'start', 'depth')
+
+    def __init__(self, profiler: 'Profiler', name: str, category: str, args: Dict[str, Any]):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        stack = self.profiler._stack()
+        self.depth = len(stack)
+        stack.append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        self.profiler._stack().pop()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.profiler._finish(self, end)
+        return False
+
+
+class Profiler:
+    """Sammelt Spans; im deaktivierten Zustand kostet jeder Span nur eine Attributprüfung"""
+
+    def __init__(self):
+        self.enabled = False
+        self.spans: List[Dict[str, Any]] = []
+        self._origin = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self):
+        """Aktiviert die Aufzeichnung und setzt den Zeitnullpunkt"""
+        self.spans = []
+        self._origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name: str, category: str = 'stage', **args):
+        """
+        Kontextmanager für einen Span
+
+        Args:
+            name: Anzeigename (z.B. 'fetch_webpage')
+            category: 'stage', 'http', 'llm' oder 'render'
+            **args: Zusätzliche Attribute für den Trace
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def traced(self, name: str, category: str = 'stage'):
+        """Decorator-Variante von span()"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, name, category, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _finish(self, span: _Span, end: int):
+        with self._lock:
+            self.spans.append({
+                'name': span.name,
+                'category': span.category,
+                'start_us': (span.start - self._origin) / 1000,
+                'duration_us': (end - span.start) / 1000,
+                'depth': span.depth,
+                'thread': threading.get_ident(),
+                'args': span.args
+            })
+
+    def export_chrome_trace(self, path: str) -> str:
+        """Schreibt die Spans im Chrome-Trace-Format (JSON)"""
+        pid = os.getpid()
+        events = [
+            {
+                'name': span['name'],
+                'cat': span['category'],
+                'ph': 'X',
+                'ts': round(span['start_us'], 1),
+                'dur': round(span['duration_us'], 1),
+                'pid': pid,
+                'tid': span['thread'],
+                'args': {key: str(value) for key, value in span['args'].items()}
+            }
+            for span in sorted(self.spans, key=lambda s: s['start_us'])
+        ]
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, indent=1)
+
+        logger.info(f"Profil exportiert: {path}")
+        return path
+
+    def print_waterfall(self, console: Optional[Any] = None, width: int = 40):
+        """Gibt die Spans als Wasserfall-Tabelle aus"""
+        from rich.console import Console
+        from rich.table import Table
+
+        console = console or Console()
+        spans = sorted(self.spans, key=lambda s: (s['start_us'], s['depth']))
+        if not spans:
+            console.print("Keine Profil-Daten aufgezeichnet")
+            return
+
+        total_us = max(s['start_us'] + s['duration_us'] for s in spans) or 1
+        colors = {'stage': 'green', 'http': 'cyan', 'llm': 'magenta', 'render': 'yellow'}
+
+        table = Table(title=f"⏱️  Profil ({total_us / 1e6:.2f}s)", show_header=True, header_style="bold magenta")
+        table.add_column("Span", style="white")
+        table.add_column("Start", justify="right")
+        table.add_column("Dauer", justify="right")
+        table.add_column("Verlauf")
+
+        for span in spans:
+            offset = int(span['start_us'] / total_us * width)
+            length = max(1, int(span['duration_us'] / total_us * width))
+            color = colors.get(span['category'], 'white')
+            bar = ' ' * offset + f"[{color}]" + '█' * min(length, width - offset) + f"[/{color}]"
+            table.add_row(
+                '  ' * span['depth'] + span['name'],
+                f"{span['start_us'] / 1000:.0f} ms",
+                f"{span['duration_us'] / 1000:.0f} ms",
+                bar
+            )
+
+        console.print(table)
+
+
+# Prozessweiter Profiler (standardmäßig deaktiviert)
+profiler = Profiler()
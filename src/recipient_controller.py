@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.models import JobDescription
 from src.company_address_searcher import CompanyAddressSearcher
+from src.profiler import profiler
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,7 @@ class RecipientController:
         self.logger = logger
         self.address_searcher = CompanyAddressSearcher()
     
+    @profiler.traced('recipient_normalization')
     def normalize_recipient_info(self, job_description: JobDescription) -> JobDescription:
         """
         Normalisiert Empfänger-Informationen basierend auf verfügbaren Daten
@@ -1,125 +1,49 @@
 import os
 import json
-import re
 from datetime import datetime
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm, mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Frame
-from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER, TA_JUSTIFY
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Frame
+from reportlab.lib.enums import TA_CENTER
 from reportlab.lib import colors
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import black
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 import pdfplumber
 import PyPDF2
 import logging
+from io import BytesIO
+from typing import BinaryIO, List, Optional
 from src.models import MotivationLetter
 from config.config import Config
+from src.profiler import profiler
+from src.output_sink import FileSink
+from src.letter_layout import LetterLayout, build_layout
+from src.pdf_styles import style_set, template_analysis
+from src.canvas_pdf_renderer import CanvasLetterRenderer, LayoutOverflow, TextBlock, letter_blocks, platypus_story
 
 logger = logging.getLogger(__name__)
 
 class TemplateBasedPDFGenerator:
     """Erweiterte PDF-Generator Klasse mit Template-Unterstützung"""
     
-    def __init__(self, template_path: str = None):
+    def __init__(self, template_path: str = None, use_canvas: Optional[bool] = None):
+        """
+        Args:
+            template_path: Pfad zum PDF-Template
+            use_canvas: Einseitige Briefe direkt auf den Canvas zeichnen (Standard: Config.PDF_CANVAS_RENDERER)
+        """
         self.template_path = template_path or "templates/template.pdf"
         self.page_width, self.page_height = A4
-        self.styles = getSampleStyleSheet()
+        self.styles = style_set('template')  # prozessweit geteilt (Schriften einmal registriert)
         self.template_analysis = None
-        self._setup_styles()
+        self.use_canvas = Config.PDF_CANVAS_RENDERER if use_canvas is None else use_canvas
+        self.canvas_renderer = CanvasLetterRenderer(self.styles, pagesize=A4, margin=2*cm)
         
-        # Template analysieren falls vorhanden
+        # Template analysieren falls vorhanden (einmal pro Datei)
         if os.path.exists(self.template_path):
-            self.template_analysis = self.analyze_template()
-    
-    def _setup_styles(self):
-        """Richtet Styles basierend auf Template ein"""
-        # Basis-Styles für deutsches Motivationsschreiben
-        
-        # Absender-Style (oben rechts)
-        self.styles.add(ParagraphStyle(
-            name='Sender',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_RIGHT,
-            spaceAfter=6,
-            fontName='Helvetica'
-        ))
-        
-        # Empfänger-Style (links)
-        self.styles.add(ParagraphStyle(
-            name='Recipient',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            alignment=TA_LEFT,
-            spaceAfter=12,
-            spaceBefore=24,
-            fontName='Helvetica'
-        ))
-        
-        # Datum-Style (rechts)
-        self.styles.add(ParagraphStyle(
-            name='Date',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_RIGHT,
-            spaceAfter=24,
-            fontName='Helvetica'
-        ))
-        
-        # Betreff-Style (fett)
-        self.styles.add(ParagraphStyle(
-            name='Subject',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            alignment=TA_LEFT,
-            spaceAfter=18,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Anrede-Style
-        self.styles.add(ParagraphStyle(
-            name='Salutation',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            alignment=TA_LEFT,
-            spaceAfter=12,
-            fontName='Helvetica'
-        ))
-        
-        # Haupttext-Style (Blocksatz)
-        self.styles.add(ParagraphStyle(
-            name='MainText',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            alignment=TA_JUSTIFY,
-            spaceAfter=12,
-            leading=16,
-            fontName='Helvetica'
-        ))
-        
-        # Grußformel-Style
-        self.styles.add(ParagraphStyle(
-            name='Closing',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            alignment=TA_LEFT,
-            spaceAfter=36,
-            spaceBefore=12,
-            fontName='Helvetica'
-        ))
-        
-        # Signatur-Style
-        self.styles.add(ParagraphStyle(
-            name='Signature',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            alignment=TA_LEFT,
-            fontName='Helvetica'
-        ))
+            self.template_analysis = template_analysis(self.template_path, self.analyze_template)
     
+    @profiler.traced('template_analysis')
     def analyze_template(self) -> dict:
         """Analysiert das PDF-Template und extrahiert Layout-Informationen"""
         try:
@@ -176,64 +100,53 @@ class TemplateBasedPDFGenerator:
             return None
     
     def create_pdf_from_template(self, motivation_letter: MotivationLetter, 
-                               output_dir: str = "output") -> str:
-        """Erstellt PDF basierend auf Template-Analyse"""
+                               output_dir: str = "output", sink: Optional[FileSink] = None,
+                               layout: Optional[LetterLayout] = None) -> str:
+        """Erstellt PDF basierend auf Template-Analyse und schreibt es über den Datei-Sink"""
         try:
-            # Ausgabeordner erstellen
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Dateiname generieren
-            date_str = datetime.now().strftime("%d%m%y")  # Format: TTMMJJ
+            pdf_bytes = self.render_pdf_bytes(motivation_letter, layout)
+            filepath = (sink or FileSink(output_dir)).write(self._generate_filename(motivation_letter), pdf_bytes)
             
-            # Verwende Firmenname, falls vorhanden, sonst Empfängername
-            if motivation_letter.recipient_company and motivation_letter.recipient_company != "Nicht angegeben":
-                company_name = motivation_letter.recipient_company
-            else:
-                company_name = motivation_letter.recipient_name
-            
-            # Bereinige Firmennamen für Dateinamen
-            company_name = company_name.replace(" ", "_").replace("/", "_").replace("\\", "_").replace(":", "_").replace("?", "_").replace("*", "_").replace("|", "_").replace("<", "_").replace(">", "_").replace('"', "_")
+            logger.info(f"Template-basiertes PDF erstellt: {filepath}")
+            return filepath
             
-            # Extrahiere Ort aus der Firmenadresse
-            location = ""
-            if motivation_letter.recipient_company_address and motivation_letter.recipient_company_address != "Nicht angegeben":
-                address = motivation_letter.recipient_company_address
-                
-                # Verschiedene Parsing-Strategien versuchen
-                address_parts = address.split(", ")
-                
-                for part in address_parts:
-                    part = part.strip()
-                    
-                    # Prüfe ob Teil eine Stadt sein könnte
-                    if part:
-                        # Strategie 1: Suche nach PLZ + Stadt Muster (z.B. "4052 Basel")
-                        if " " in part:
-                            words = part.split()
-                            # Wenn erste Wort eine PLZ ist (4-5 Ziffern), nehme den Rest als Stadt
-                            if len(words) >= 2 and words[0].isdigit() and len(words[0]) >= 4:
-                                location = " ".join(words[1:])
-                                break
-                        
-                        # Strategie 2: Prüfe ob Teil nur eine Stadt ist (keine Straße, keine PLZ)
-                        if (not part[0].isdigit() and  # Keine PLZ/Hausnummer
-                            not any(street_word in part.lower() for street_word in ["platz", "strasse", "straße", "weg", "gasse", "allee"]) and  # Keine Straßennamen
-                            part.lower() not in ["schweiz", "switzerland", "ch", "deutschland", "germany", "österreich", "austria"]):  # Nicht Land
-                            location = part
-                            break
+        except Exception as e:
+            logger.error(f"Fehler bei Template-PDF-Erstellung: {e}")
+            raise
+    
+    def render_pdf_bytes(self, motivation_letter: MotivationLetter, layout: Optional[LetterLayout] = None) -> bytes:
+        """Rendert das PDF im Speicher und gibt die Bytes zurück"""
+        buffer = BytesIO()
+        self.render_pdf(motivation_letter, buffer, layout)
+        return buffer.getvalue()
+    
+    def render_pdf(self, motivation_letter: MotivationLetter, stream: BinaryIO,
+                   layout: Optional[LetterLayout] = None):
+        """
+        Rendert das PDF in einen beschreibbaren Stream (BytesIO, Datei, Socket-Wrapper, ...)
+        
+        Passt der Brief auf eine Seite, wird er direkt auf den Canvas gezeichnet;
+        sonst (oder mit use_canvas=False) baut platypus das Dokument.
+        
+        Args:
+            motivation_letter: Das Motivationsschreiben
+            stream: Beschreibbares Binär-Objekt mit write()
+            layout: Bereits aufgebautes Brief-Layout (sonst wird es hier erstellt)
+        """
+        try:
+            blocks = self._letter_blocks(motivation_letter, layout or build_layout(motivation_letter))
             
-            # Bereinige Ort für Dateinamen
-            if location:
-                location = location.replace(" ", "_").replace("/", "_").replace("\\", "_").replace(":", "_").replace("?", "_").replace("*", "_").replace("|", "_").replace("<", "_").replace(">", "_").replace('"', "_")
-                filename = f"Motivationsschreiben_{company_name}_{location}_{date_str}.pdf"
-            else:
-                filename = f"Motivationsschreiben_{company_name}_{date_str}.pdf"
-                
-            filepath = os.path.join(output_dir, filename)
+            if self.use_canvas:
+                try:
+                    with profiler.span('canvas_build', 'render'):
+                        self.canvas_renderer.render(blocks, stream)
+                    return
+                except LayoutOverflow as e:
+                    logger.info(f"Canvas-Layout übergelaufen ({e}), verwende platypus")
             
             # PDF erstellen
             doc = SimpleDocTemplate(
-                filepath,
+                stream,
                 pagesize=A4,
                 rightMargin=2*cm,
                 leftMargin=2*cm,
@@ -241,83 +154,76 @@ class TemplateBasedPDFGenerator:
                 bottomMargin=2*cm
             )
             
-            # Inhalt basierend auf deutschem Standard erstellen
-            story = []
-            
-            # 1. Absender (oben rechts - exaktes Format)
-            sender_text = f"""
-            {motivation_letter.sender_name}<br/>
-            Hinterdorfstrasse 12<br/>
-            6235 Winikon<br/>
-            Tel: {motivation_letter.sender_phone}<br/>
-            E-Mail: {motivation_letter.sender_email}
-            """
-            story.append(Paragraph(sender_text, self.styles['Sender']))
-            story.append(Spacer(1, 12))
-            
-            # 2. Empfänger (links)
-            recipient_parts = []
-            
-            # Firmenname (immer zuerst)
-            if motivation_letter.recipient_company and motivation_letter.recipient_company != "Nicht angegeben":
-                recipient_parts.append(f"<b>{motivation_letter.recipient_company}</b>")
-            
-            # Firmenadresse
-            if motivation_letter.recipient_company_address and motivation_letter.recipient_company_address != "Nicht angegeben":
-                address = motivation_letter.recipient_company_address
-                # Ersetze Kommas durch Zeilenumbrüche für bessere Formatierung
-                if ", " in address:
-                    address_lines = address.split(", ")
-                    recipient_parts.extend(address_lines)
-                else:
-                    recipient_parts.append(address)
-            
-            # Kontaktperson (falls vorhanden und nicht gleich Firmenname)
-            if (motivation_letter.recipient_name and 
-                motivation_letter.recipient_name != "Nicht angegeben" and 
-                motivation_letter.recipient_name != motivation_letter.recipient_company):
-                recipient_parts.append("")  # Leerzeile
-                recipient_parts.append(f"z.H. {motivation_letter.recipient_name}")
-            
-            if recipient_parts:
-                recipient_text = "<br/>".join(recipient_parts)
-                story.append(Paragraph(recipient_text, self.styles['Recipient']))
-            else:
-                # Fallback, falls keine Empfängerinformationen vorhanden sind
-                story.append(Paragraph("Empfänger", self.styles['Recipient']))
-            
-            # 3. Datum (rechts)
-            date_text = self._format_german_date()
-            story.append(Paragraph(date_text, self.styles['Date']))
-            
-            # 4. Betreff
-            subject_text = f"<b>{motivation_letter.subject}</b>"
-            story.append(Paragraph(subject_text, self.styles['Subject']))
-            
-            # 5. Haupttext (in Absätze aufgeteilt) - Anrede ist bereits im Content enthalten
-            content_paragraphs = self._format_content_paragraphs(motivation_letter.content)
-            for paragraph in content_paragraphs:
-                # Füge GitHub-Projekt-Hyperlinks hinzu
-                paragraph_with_links = self._add_github_links_to_paragraph(paragraph)
-                story.append(Paragraph(paragraph_with_links, self.styles['MainText']))
-                story.append(Spacer(1, 6))
-            
-            # 7. Grußformel
-            story.append(Paragraph("Freundliche Grüsse", self.styles['Closing']))
-            
-            # 8. Signatur
-            story.append(Paragraph(motivation_letter.sender_name, self.styles['Signature']))
-            
             # PDF generieren
-            doc.build(story)
-            
-            logger.info(f"Template-basiertes PDF erstellt: {filepath}")
-            return filepath
+            with profiler.span('reportlab_build', 'render'):
+                doc.build(platypus_story(blocks, self.styles))
             
         except Exception as e:
             logger.error(f"Fehler bei Template-PDF-Erstellung: {e}")
             raise
     
+    def _letter_blocks(self, motivation_letter: MotivationLetter, layout: LetterLayout) -> List[TextBlock]:
+        """Seitenaufbau nach deutschem Standard (Absender rechts, Empfänger links, Datum, Betreff, Text)"""
+        sender_lines = [
+            motivation_letter.sender_name,
+            "Hinterdorfstrasse 12",
+            "6235 Winikon",
+            f"Tel: {motivation_letter.sender_phone}",
+            f"E-Mail: {motivation_letter.sender_email}"
+        ]
+        return letter_blocks(motivation_letter, layout, sender_lines, self._format_german_date())
+    
+    def _generate_filename(self, motivation_letter: MotivationLetter) -> str:
+        """Generiert den Dateinamen (Firma, Ort, Datum) für die PDF-Datei"""
+        # Dateiname generieren
+        date_str = datetime.now().strftime("%d%m%y")  # Format: TTMMJJ
+        
+        # Verwende Firmenname, falls vorhanden, sonst Empfängername
+        if motivation_letter.recipient_company and motivation_letter.recipient_company != "Nicht angegeben":
+            company_name = motivation_letter.recipient_company
+        else:
+            company_name = motivation_letter.recipient_name
+        
+        # Bereinige Firmennamen für Dateinamen
+        company_name = company_name.replace(" ", "_").replace("/", "_").replace("\\", "_").replace(":", "_").replace("?", "_").replace("*", "_").replace("|", "_").replace("<", "_").replace(">", "_").replace('"', "_")
+        
+        # Extrahiere Ort aus der Firmenadresse
+        location = ""
+        if motivation_letter.recipient_company_address and motivation_letter.recipient_company_address != "Nicht angegeben":
+            address = motivation_letter.recipient_company_address
+            
+            # Verschiedene Parsing-Strategien versuchen
+            address_parts = address.split(", ")
+            
+            for part in address_parts:
+                part = part.strip()
+                
+                # Prüfe ob Teil eine Stadt sein könnte
+                if part:
+                    # Strategie 1: Suche nach PLZ + Stadt Muster (z.B. "4052 Basel")
+                    if " " in part:
+                        words = part.split()
+                        # Wenn erste Wort eine PLZ ist (4-5 Ziffern), nehme den Rest als Stadt
+                        if len(words) >= 2 and words[0].isdigit() and len(words[0]) >= 4:
+                            location = " ".join(words[1:])
+                            break
+                    
+                    # Strategie 2: Prüfe ob Teil nur eine Stadt ist (keine Straße, keine PLZ)
+                    if (not part[0].isdigit() and  # Keine PLZ/Hausnummer
+                        not any(street_word in part.lower() for street_word in ["platz", "strasse", "straße", "weg", "gasse", "allee"]) and  # Keine Straßennamen
+                        part.lower() not in ["schweiz", "switzerland", "ch", "deutschland", "germany", "österreich", "austria"]):  # Nicht Land
+                        location = part
+                        break
+        
+        # Bereinige Ort für Dateinamen
+        if location:
+            location = location.replace(" ", "_").replace("/", "_").replace("\\", "_").replace(":", "_").replace("?", "_").replace("*", "_").replace("|", "_").replace("<", "_").replace(">", "_").replace('"', "_")
+            filename = f"Motivationsschreiben_{company_name}_{location}_{date_str}.pdf"
+        else:
+            filename = f"Motivationsschreiben_{company_name}_{date_str}.pdf"
+            
+        return filename
+    
     def _format_german_date(self) -> str:
         """Formatiert Datum auf Deutsch"""
         today = datetime.now()
@@ -343,42 +249,6 @@ class TemplateBasedPDFGenerator:
         else:
             return "Sehr geehrte Damen und Herren,"
     
-    def _format_content_paragraphs(self, content: str) -> list:
-        """Formatiert Inhalt in deutsche Absätze und entfernt doppelte Anreden"""
-        # Inhalt in Absätze aufteilen
-        paragraphs = content.split('\n\n')
-        
-        formatted_paragraphs = []
-        for paragraph in paragraphs:
-            if paragraph.strip():
-                # Deutschen Stil anwenden
-                formatted_paragraph = paragraph.strip()
-                
-                # Entferne doppelte Anreden (falls LLM beide generiert hat)
-                if (formatted_paragraph.startswith("Sehr geehrte Damen und Herren") or 
-                    formatted_paragraph == "Sehr geehrte Damen und Herren," or
-                    formatted_paragraph.startswith("Sehr geehrte Damen und Herren,")):
-                    continue
-                
-                # Entferne Grußformeln aus dem Inhalt, da sie separat hinzugefügt werden
-                if (formatted_paragraph.startswith("Mit freundlichen Grüßen") or 
-                    formatted_paragraph.startswith("Mit freundlichen Grüssen") or
-                    formatted_paragraph.startswith("Freundliche Grüße") or
-                    formatted_paragraph.startswith("Freundliche Grüsse") or
-                    formatted_paragraph.startswith("Vielen Dank") or
-                    formatted_paragraph.startswith("Herzlichen Dank")):
-                    continue
-                    
-                # Entferne auch Namen am Ende, die wie eine Signatur aussehen
-                words = formatted_paragraph.split()
-                if len(words) <= 3:
-                    # Prüfe, ob es sich um eine Signatur handelt
-                    if any(word.lower() in ['daniel', 'zurmühle'] for word in words):
-                        continue
-                        
-                formatted_paragraphs.append(formatted_paragraph)
-        
-        return formatted_paragraphs
     
     def get_template_info(self) -> dict:
         """Gibt Template-Informationen zurück"""
@@ -395,69 +265,20 @@ class TemplateBasedPDFGenerator:
             }
     
     def create_pdf(self, motivation_letter: MotivationLetter, 
-                   output_dir: str = "output") -> str:
+                   output_dir: str = "output", sink: Optional[FileSink] = None,
+                   layout: Optional[LetterLayout] = None) -> str:
         """Hauptmethode - verwendet Template falls verfügbar"""
         if self.template_analysis:
             logger.info("Verwende Template-basierte PDF-Erstellung")
-            return self.create_pdf_from_template(motivation_letter, output_dir)
+            return self.create_pdf_from_template(motivation_letter, output_dir, sink, layout)
         else:
             logger.info("Verwende Standard-PDF-Erstellung")
-            return self.create_standard_pdf(motivation_letter, output_dir)
+            return self.create_standard_pdf(motivation_letter, output_dir, sink, layout)
     
-    def _add_github_links_to_paragraph(self, paragraph_text):
-        """Fügt GitHub-Projekt-Hyperlinks und LinkedIn-Links zu einem Absatz hinzu"""
-        # Dynamische GitHub-Projekt-URLs aus Config laden
-        project_urls = Config.get_github_project_urls()
-        
-        # Erstelle Regex-Pattern dynamisch aus verfügbaren Projekten
-        if project_urls:
-            # Escape spezielle Regex-Zeichen in Projektnamen
-            escaped_projects = [re.escape(project) for project in project_urls.keys()]
-            github_project_pattern = f"({'|'.join(escaped_projects)})"
-        else:
-            # Fallback-Pattern falls keine Projekte verfügbar
-            github_project_pattern = r'(AutomaticMotivation|ZurdLLMWS|Auto-search-jobs)'
-        
-        # Regex-Pattern für LinkedIn-Erwähnungen
-        # Sucht nach: "LinkedIn-Profil" oder "LinkedIn Profil"
-        linkedin_pattern = r"(LinkedIn[\s\-]?Profil)"
-        
-        # Verwende Config für dynamische URL-Generierung
-        linkedin_url = Config.PERSONAL_LINKEDIN
-        
-        def replace_project_with_link(match):
-            project_name = match.group(1)    # "ProjectName"
-            
-            # GitHub-URL für das Projekt suchen
-            github_url = project_urls.get(project_name)
-            
-            if github_url:
-                # Erstelle Hyperlink im ReportLab-Format
-                return f'<a href="{github_url}" color="blue">{project_name}</a>'
-            else:
-                # Kein Link verfügbar, verwende normalen Text
-                return project_name
-        
-        def replace_linkedin_with_link(match):
-            linkedin_text = match.group(1)
-            
-            if linkedin_url:
-                # Erstelle LinkedIn-Hyperlink im ReportLab-Format
-                return f'<a href="{linkedin_url}" color="blue">{linkedin_text}</a>'
-            else:
-                # Kein Link verfügbar, verwende normalen Text
-                return linkedin_text
-        
-        # Ersetze alle Projekt-Erwähnungen durch Links
-        processed_text = re.sub(github_project_pattern, replace_project_with_link, paragraph_text)
-        
-        # Ersetze LinkedIn-Erwähnungen durch Links
-        processed_text = re.sub(linkedin_pattern, replace_linkedin_with_link, processed_text)
-        
-        return processed_text
     
     def create_standard_pdf(self, motivation_letter: MotivationLetter, 
-                          output_dir: str = "output") -> str:
+                          output_dir: str = "output", sink: Optional[FileSink] = None,
+                   layout: Optional[LetterLayout] = None) -> str:
         """Standard-PDF-Erstellung als Fallback"""
         # Hier würde die ursprüngliche PDF-Erstellung stehen
-        return self.create_pdf_from_template(motivation_letter, output_dir)
+        return self.create_pdf_from_template(motivation_letter, output_dir, sink, layout)
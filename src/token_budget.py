@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Token-Budgetierung für LLM-Prompts
+Misst Prompt-Abschnitte, entfernt Wiederholungen und kürzt Abschnitte mit
+geringer Priorität, bis der Prompt in das Budget des Modells passt
+"""
+
+import math
+import re
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.config import Config
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken kommt mit langchain-openai
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Grobe Näherung, falls kein Tokenizer verfügbar ist
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=16)
+def _get_encoding(model: str):
+    """Lädt die passende tiktoken-Kodierung (gecacht pro Modell)"""
+    if tiktoken is None:
+        return None
+    # OpenRouter-Modelle haben ein Provider-Präfix (z.B. "openai/gpt-4")
+    base_model = model.split('/')[-1] if model else ''
+    try:
+        return tiktoken.encoding_for_model(base_model)
+    except Exception:
+        try:
+            return tiktoken.get_encoding('cl100k_base')
+        except Exception as e:
+            logger.debug(f"Keine tiktoken-Kodierung verfügbar: {e}")
+            return None
+
+
+def count_tokens(text: str, model: str = '') -> int:
+    """Zählt die Tokens eines Textes (tiktoken, sonst Zeichen-Näherung)"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = '') -> str:
+    """Kürzt einen Text auf max_tokens, möglichst an einer Satz- oder Zeilengrenze"""
+    if max_tokens <= 0 or not text:
+        return ''
+    if count_tokens(text, model) <= max_tokens:
+        return text
+
+    # Platz für die Kürzungsmarkierung freihalten
+    max_tokens = max(1, max_tokens - 2)
+    encoding = _get_encoding(model)
+    if encoding is None:
+        cut = text[:max_tokens * CHARS_PER_TOKEN]
+    else:
+        cut = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+    boundary = max(cut.rfind('\n'), cut.rfind('. '), cut.rfind('! '), cut.rfind('? '))
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary + 1]
+    return cut.rstrip() + ' […]'
+
+
+def _normalize_sentence(sentence: str) -> str:
+    return re.sub(r'[\W_]+', ' ', sentence.lower()).strip()
+
+
+def deduplicate_text(text: str, reference_texts: Iterable[str] = (), min_length: int = 30) -> str:
+    """
+    Entfernt Sätze, die bereits früher im Text oder in einem Referenztext vorkommen
+
+    Args:
+        text: Zu bereinigender Text
+        reference_texts: Texte, deren Inhalt nicht wiederholt werden soll
+        min_length: Kürzere Sätze werden nie entfernt (z.B. Aufzählungspunkte)
+
+    Returns:
+        Text ohne wiederholte Sätze
+    """
+    if not text:
+        return text
+
+    references = ' '.join(_normalize_sentence(ref) for ref in reference_texts if ref)
+    seen = set()
+    kept_lines = []
+
+    for line in text.split('\n'):
+        sentences = re.split(r'(?<=[.!?;])\s+', line)
+        kept = []
+        for sentence in sentences:
+            normalized = _normalize_sentence(sentence)
+            if len(normalized) >= min_length and (normalized in seen or normalized in references):
+                continue
+            seen.add(normalized)
+            kept.append(sentence)
+        if kept or not line.strip():
+            kept_lines.append(' '.join(kept))
+
+    deduplicated = '\n'.join(kept_lines)
+    return re.sub(r'\n{3,}', '\n\n', deduplicated)
+
+
+@dataclass
+class PromptSection:
+    """Ein variabler Abschnitt eines Prompts"""
+    name: str
+    text: str
+    priority: int  # Höher = wichtiger, wird zuletzt gekürzt
+    min_tokens: int = 0  # Mindestumfang beim Kürzen (0 = darf komplett entfallen)
+    fallback: str = ''  # Ersatztext, falls der Abschnitt entfällt
+
+
+@dataclass
+class BudgetReport:
+    """Ergebnis einer Budgetierung"""
+    model: str
+    budget: int
+    fixed_tokens: int
+    section_tokens: Dict[str, int] = field(default_factory=dict)
+    trimmed: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.fixed_tokens + sum(self.section_tokens.values())
+
+    def summary(self) -> str:
+        text = f"{self.total_tokens}/{self.budget} Input-Tokens ({self.model})"
+        if self.trimmed:
+            trimmed = ', '.join(f"{name} {before}→{after}" for name, (before, after) in self.trimmed.items())
+            text += f", gekürzt: {trimmed}"
+        return text
+
+
+class TokenBudgeter:
+    """Passt Prompt-Abschnitte an das Token-Budget eines Modells an"""
+
+    def __init__(self, provider: str, model: str, output_tokens: int = 2000,
+                 max_prompt_tokens: Optional[int] = None):
+        self.provider = provider
+        self.model = model
+        self.output_tokens = output_tokens
+        self.max_prompt_tokens = max_prompt_tokens or Config.PROMPT_TOKEN_BUDGET
+
+    @property
+    def budget(self) -> int:
+        """Verfügbare Input-Tokens: Kontextfenster abzüglich Output-Reserve, begrenzt durch Config"""
+        from src.llm_utils import LLMFactory
+
+        model_info = LLMFactory.get_model_info(self.provider, self.model)
+        context_window = model_info.get('context_window', Config.DEFAULT_CONTEXT_WINDOW)
+        output_reserve = min(self.output_tokens, model_info.get('max_tokens', self.output_tokens))
+        return max(0, min(self.max_prompt_tokens, context_window - output_reserve))
+
+    def count(self, text: str) -> int:
+        return count_tokens(text, self.model)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        return truncate_to_tokens(text, max_tokens, self.model)
+
+    def fit(self, sections: List[PromptSection], fixed_tokens: int = 0) -> Tuple[Dict[str, str], BudgetReport]:
+        """
+        Kürzt Abschnitte nach aufsteigender Priorität, bis das Budget eingehalten wird
+
+        Args:
+            sections: Variable Prompt-Abschnitte
+            fixed_tokens: Tokens des festen Prompt-Gerüsts
+
+        Returns:
+            (Abschnittstexte nach Name, BudgetReport)
+        """
+        budget = self.budget
+        texts = {section.name: section.text or '' for section in sections}
+        tokens = {name: self.count(text) for name, text in texts.items()}
+        report = BudgetReport(model=self.model, budget=budget, fixed_tokens=fixed_tokens)
+
+        overflow = fixed_tokens + sum(tokens.values()) - budget
+        for section in sorted(sections, key=lambda s: s.priority):
+            if overflow <= 0:
+                break
+            before = tokens[section.name]
+            target = max(section.min_tokens, before - overflow)
+            if target >= before:
+                continue
+
+            if target <= 0:
+                texts[section.name] = section.fallback
+            else:
+                texts[section.name] = self.truncate(texts[section.name], target)
+            tokens[section.name] = self.count(texts[section.name])
+            overflow -= before - tokens[section.name]
+            report.trimmed[section.name] = (before, tokens[section.name])
+
+        report.section_tokens = tokens
+        if overflow > 0:
+            logger.warning(f"Prompt überschreitet Budget trotz Kürzung: {report.summary()}")
+        return texts, report
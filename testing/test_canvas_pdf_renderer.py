@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test für den Canvas-Renderer
+Einseitige Briefe müssen Wort für Wort an denselben Positionen stehen wie beim
+platypus-Pfad (inkl. Links); zu lange Briefe fallen auf platypus zurück
+"""
+
+import os
+import sys
+from io import BytesIO
+
+import pdfplumber
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from src.letter_layout import build_layout
+from src.pdf_generator import PDFGenerator
+from src.template_pdf_generator import TemplateBasedPDFGenerator
+from src.canvas_pdf_renderer import LayoutOverflow
+from test_letter_layout import LETTER, PROJECT_URLS, LINKEDIN_URL, make_letter
+
+
+def read_page(data):
+    with pdfplumber.open(BytesIO(data)) as pdf:
+        page = pdf.pages[0]
+        words = [(word['text'], round(word['x0'], 1), round(word['top'], 1)) for word in page.extract_words()]
+        links = [(link['uri'], round(link['x0']), round(link['top'])) for link in page.hyperlinks]
+        return len(pdf.pages), words, links
+
+
+def test_same_page_as_platypus():
+    letters = [
+        LETTER,
+        make_letter("Sehr geehrte Frau Meier,\n\n"
+                    "Zeichen wie <b>, & und \"Anführungszeichen\" bleiben Text. " * 6 + "\n\n"
+                    "Mit AutomaticMotivation. Und mein LinkedIn Profil, bitte.")
+    ]
+    for generator_class in (PDFGenerator, TemplateBasedPDFGenerator):
+        for letter in letters:
+            layout = build_layout(letter, PROJECT_URLS, LINKEDIN_URL)
+            reference = read_page(generator_class(use_canvas=False).render_pdf_bytes(letter, layout))
+            canvas = read_page(generator_class(use_canvas=True).render_pdf_bytes(letter, layout))
+
+            assert canvas[0] == reference[0] == 1, "Brief muss einseitig sein"
+            assert [word[0] for word in canvas[1]] == [word[0] for word in reference[1]], "Text weicht ab"
+            for ours, theirs in zip(canvas[1], reference[1]):
+                assert abs(ours[1] - theirs[1]) <= 0.2 and abs(ours[2] - theirs[2]) <= 0.2, (ours, theirs)
+            assert canvas[2] == reference[2], f"Links weichen ab: {canvas[2]} != {reference[2]}"
+            print(f"✅ {generator_class.__name__}: {len(canvas[1])} Wörter und {len(canvas[2])} Links "
+                  f"an denselben Positionen")
+
+
+def test_overflow_falls_back_to_platypus():
+    letter = make_letter("Sehr geehrte Frau Meier,\n\n" + "\n\n".join(
+        f"Absatz {index}: AutomaticMotivation erzeugt Motivationsschreiben aus Stelleninseraten." * 3
+        for index in range(20)
+    ))
+    layout = build_layout(letter, PROJECT_URLS, LINKEDIN_URL)
+    generator = PDFGenerator(use_canvas=True)
+
+    blocks = generator._letter_blocks(letter, layout)
+    try:
+        generator.canvas_renderer.render(blocks, BytesIO())
+        raise AssertionError("LayoutOverflow erwartet")
+    except LayoutOverflow:
+        pass
+
+    pages, words, links = read_page(generator.render_pdf_bytes(letter, layout))
+    reference = read_page(PDFGenerator(use_canvas=False).render_pdf_bytes(letter, layout))
+    assert pages > 1, "Langer Brief sollte über platypus mehrseitig werden"
+    assert (words, links) == reference[1:], "Fallback muss dem platypus-Pfad entsprechen"
+    print(f"✅ Überlauf erkannt, platypus-Fallback mit {pages} Seiten")
+
+
+if __name__ == "__main__":
+    test_same_page_as_platypus()
+    test_overflow_falls_back_to_platypus()
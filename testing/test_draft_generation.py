@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test für Entwurf und finale Fassung
+Der Entwurf kommt von einem schnellen LLM-Fake, die finale Fassung läuft mit demselben
+Prompt gleichzeitig gegen einen langsamen Fake und ist erst danach fertig; ihre Dateien
+ersetzen die des Entwurfs
+"""
+
+import os
+import sys
+import time
+import zipfile
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from langchain_openai import ChatOpenAI
+
+from benchmarks.fake_llm_server import FakeLLMServer
+from benchmarks.offline_http import OfflineHTTP
+from benchmarks.run_benchmarks import configure_offline
+from test_paragraph_revision import JOB
+
+
+def test_draft_then_final():
+    print("=== Test: Entwurf und finale Fassung ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeLLMServer(latency=0.6) as slow, \
+            FakeLLMServer(latency=0.05) as fast, OfflineHTTP():
+        configure_offline(Path(tmp_dir), slow.base_url)
+
+        from src.ai_generator import AIGenerator
+        from src.llm_metrics import metrics_store
+        from src.models import JobInfo
+
+        generator = AIGenerator()
+        draft_llm = ChatOpenAI(api_key='benchmark', base_url=fast.base_url, model='benchmark/draft-model')
+
+        start = time.perf_counter()
+        draft, final = generator.generate_draft_and_final(JobInfo(**JOB), draft_llm)
+        draft_time = time.perf_counter() - start
+        assert draft is not None and not final.done(), "Entwurf muss vor der finalen Fassung fertig sein"
+
+        letter = final.result(timeout=10)
+        final_time = time.perf_counter() - start
+        # Beide starten nach dem Prompt-Aufbau (inkl. Projektauswahl); der Entwurf spart die langsame Latenz
+        assert final_time - draft_time > 0.4, (draft_time, final_time)
+        assert letter.content == draft.content and letter.subject == draft.subject, "Gleicher Prompt, gleiche Antwort"
+
+        models = {record['stage']: record['model'] for record in metrics_store.session_records}
+        assert models['draft'] == 'benchmark/draft-model' and models['generation'] == 'benchmark/fake-model', models
+        print(f"✅ Entwurf nach {draft_time * 1000:.0f} ms, finale Fassung nach {final_time * 1000:.0f} ms")
+
+        broken_llm = ChatOpenAI(api_key='benchmark', base_url='http://127.0.0.1:9/v1', model='broken',
+                                max_retries=0, timeout=2)
+        draft, final = generator.generate_draft_and_final(JobInfo(**JOB), broken_llm)
+        assert draft is None and final.result(timeout=10).content, "Ohne Entwurf bleibt die finale Fassung"
+        print("✅ Fehlgeschlagener Entwurf: finale Fassung wird trotzdem geliefert")
+
+
+def test_final_replaces_draft_files():
+    """Die finale Fassung landet unter den Dateinamen des Entwurfs, nicht daneben"""
+    print("\n=== Test: Finale Fassung ersetzt die Entwurfsdateien ===\n")
+
+    from app import render_documents
+    from src.models import MotivationLetter
+
+    def letter(content):
+        return MotivationLetter(
+            recipient_company='Muster AG', recipient_company_address='Bahnhofstrasse 1, 8001 Zürich',
+            recipient_name='Muster AG', recipient_address='Zürich', subject='Bewerbung als Python Entwickler',
+            content=content, sender_name='Max Muster', sender_address='Musterweg 1, 8000 Zürich',
+            sender_phone='+41 79 000 00 00', sender_email='max@example.com'
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        draft_pdf, draft_docx, _ = render_documents(letter("Sehr geehrte Damen und Herren,\n\nEntwurfstext."),
+                                                    output_dir=tmp_dir)
+        pdf_path, docx_path, _ = render_documents(letter("Sehr geehrte Damen und Herren,\n\nFinaler Text."),
+                                                  (draft_pdf, draft_docx), output_dir=tmp_dir)
+
+        assert (pdf_path, docx_path) == (draft_pdf, draft_docx), (pdf_path, docx_path)
+        assert sorted(os.listdir(tmp_dir)) == sorted(os.path.basename(path) for path in (pdf_path, docx_path))
+        with zipfile.ZipFile(docx_path) as archive:
+            document = archive.read('word/document.xml').decode('utf-8')
+        assert 'Finaler Text.' in document and 'Entwurfstext.' not in document
+        print(f"✅ Finale Fassung ersetzt {os.path.basename(pdf_path)} und {os.path.basename(docx_path)}")
+
+
+if __name__ == "__main__":
+    test_draft_then_final()
+    test_final_replaces_draft_files()
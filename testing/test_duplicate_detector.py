@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test für die Duplikat-Erkennung
+Prüft MinHash/LSH gegen die aufgezeichneten Stellenseiten: leicht veränderte
+Kopien (anderes Board, andere Navigation) werden erkannt, andere Stellen nicht
+"""
+
+import os
+import sys
+import json
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from src.duplicate_detector import DuplicateIndex, posting_text
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'job_pages')
+
+
+def load_pages():
+    with open(os.path.join(FIXTURES_DIR, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    pages = {}
+    for page in manifest['pages']:
+        with open(os.path.join(FIXTURES_DIR, page['file']), 'r', encoding='utf-8') as f:
+            pages[page['url']] = f.read()
+    return pages
+
+
+def cross_posted(html_content):
+    """Simuliert dieselbe Stelle auf einem anderen Board (andere Navigation, Zusatzhinweis)"""
+    return html_content.replace(
+        '<body>',
+        '<body><nav>Agentur-Portal · Alle Jobs · Login</nav>'
+        '<p>Diese Stelle wird von unserer Personalagentur betreut.</p>',
+        1
+    )
+
+
+def test_cross_posted_duplicates():
+    """Quer gepostete Stellen werden erkannt, unterschiedliche nicht"""
+    print("=== Test: Duplikat-Erkennung ===\n")
+
+    pages = load_pages()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_file = Path(tmp_dir) / 'duplicate_index.json'
+        index = DuplicateIndex(index_file=index_file, threshold=0.8)
+
+        for url, html_content in pages.items():
+            assert index.find_duplicate(posting_text(html_content)) is None, f"Falscher Treffer für {url}"
+            index.add(url, posting_text(html_content), outputs={'pdf': f"output/{len(index)}.pdf"})
+        print(f"✅ {len(pages)} unterschiedliche Stellen ohne Falschtreffer indexiert")
+
+        # Neuer Prozess: Index wird von der Festplatte geladen
+        reloaded = DuplicateIndex(index_file=index_file, threshold=0.8)
+        assert len(reloaded) == len(pages)
+
+        for url, html_content in pages.items():
+            match = reloaded.find_duplicate(posting_text(cross_posted(html_content)))
+            assert match is not None, f"Duplikat von {url} nicht erkannt"
+            assert match.url == url, f"Falsches Original: {match.url}, erwartet {url}"
+            assert match.outputs.get('pdf'), "Ausgabedateien fehlen im Treffer"
+            print(f"✅ Duplikat erkannt: {url} (Ähnlichkeit {match.similarity:.2f})")
+
+
+def test_unrelated_text():
+    """Kurze oder fremde Texte liefern keinen Treffer"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = DuplicateIndex(index_file=Path(tmp_dir) / 'index.json', threshold=0.8)
+        index.add('https://example.com/a', 'Wir suchen eine Python-Entwicklerin für unser Team in Zürich')
+        assert index.find_duplicate('Bäckerei sucht Verkäufer für Samstagsaushilfe in Bern') is None
+        assert index.find_duplicate('') is None
+    print("✅ Unterschiedliche Texte werden nicht als Duplikat gemeldet")
+
+
+def add_postings(index_file, worker, count):
+    """Worker-Prozess: nimmt eigene Stellen in den gemeinsamen Index auf"""
+    index = DuplicateIndex(index_file=index_file, threshold=0.8)
+    for number in range(count):
+        index.add(f"https://example.com/worker-{worker}/job-{number}",
+                  f"Stelle {number} von Worker {worker}: Wir suchen Verstärkung für Projekt {worker * 100 + number}")
+
+
+def test_concurrent_processes():
+    """Mehrere Prozesse schreiben in denselben Index, ohne Einträge der anderen zu verlieren"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_file = Path(tmp_dir) / 'index.json'
+        # Eigener Stand vor den Worker-Prozessen: muss nach deren Schreibzugriffen neu geladen werden
+        index = DuplicateIndex(index_file=index_file, threshold=0.8)
+        index.add('https://example.com/main', 'Hauptprozess sucht eine Entwicklerin für die Datenplattform')
+
+        workers = [multiprocessing.Process(target=add_postings, args=(index_file, worker, 10)) for worker in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert all(worker.exitcode == 0 for worker in workers)
+
+        index.update('https://example.com/main', outputs={'pdf': 'output/main.pdf'})
+        reloaded = DuplicateIndex(index_file=index_file, threshold=0.8)
+        assert len(reloaded) == 41, f"{len(reloaded)} statt 41 Einträge"
+        assert reloaded.find_duplicate('Hauptprozess sucht eine Entwicklerin für die Datenplattform').outputs
+    print("✅ 4 Prozesse schreiben gleichzeitig in den Index, kein Eintrag geht verloren")
+
+
+if __name__ == "__main__":
+    test_cross_posted_duplicates()
+    test_unrelated_text()
+    test_concurrent_processes()
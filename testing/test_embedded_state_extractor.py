@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test für den Embedded-State-Extraktor
+Prüft __NEXT_DATA__, window.__INITIAL_STATE__ und Nuxt-Payloads gegen
+aufgezeichnete HTML-Shells, ohne Netzwerk und ohne LLM
+"""
+
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from bs4 import BeautifulSoup
+
+from src.embedded_state_extractor import find_data_islands, extract_embedded_fields, unflatten_nuxt_payload
+from src.job_posting_mapper import missing_fields
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'embedded_state')
+
+
+def test_embedded_state_pages():
+    """Testet die Extraktion aus allen aufgezeichneten Seiten"""
+    print("=== Test: Embedded-State-Extraktion ===\n")
+
+    with open(os.path.join(FIXTURES_DIR, 'cases.json'), 'r', encoding='utf-8') as f:
+        cases = json.load(f)['cases']
+
+    for case in cases:
+        with open(os.path.join(FIXTURES_DIR, case['file']), 'r', encoding='utf-8') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+
+        sources = [source for source, _ in find_data_islands(soup)]
+        assert case['source'] in sources, f"{case['file']}: Quelle {case['source']} nicht gefunden ({sources})"
+
+        fields = extract_embedded_fields(soup)
+        for key, value in case['expected'].items():
+            assert fields.get(key) == value, f"{case['file']}: {key} = {fields.get(key)!r}, erwartet {value!r}"
+        assert case['requirements_contains'] in fields.get('requirements', ''), \
+            f"{case['file']}: Anforderungen unvollständig: {fields.get('requirements')!r}"
+        assert not missing_fields(fields), f"{case['file']}: Pflichtfelder fehlen: {missing_fields(fields)}"
+
+        print(f"✅ {case['file']} ({case['source']}): {fields['company']} - {fields['position']}")
+
+
+def test_nuxt_payload_references():
+    """Nuxt-Payloads referenzieren Werte über Indizes und Wrapper"""
+    payload = [["Reactive", 1], {"a": 2, "b": 3}, "Text", [4, 2], 42]
+    assert unflatten_nuxt_payload(payload) == {"a": "Text", "b": [42, "Text"]}
+    print("✅ Nuxt-Payload wird korrekt aufgelöst")
+
+
+def test_page_without_state():
+    """Seiten ohne Daten-Insel liefern keine Felder"""
+    soup = BeautifulSoup("<html><body><script>var x = 1;</script><p>Hallo</p></body></html>", 'html.parser')
+    assert extract_embedded_fields(soup) == {}
+    print("✅ Seiten ohne eingebettete Daten werden ignoriert")
+
+
+if __name__ == "__main__":
+    test_embedded_state_pages()
+    test_nuxt_payload_references()
+    test_page_without_state()
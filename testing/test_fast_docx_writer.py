@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test für den direkten DOCX-Writer
+document.xml und Relationships müssen mit dem python-docx-Pfad übereinstimmen,
+auch bei Sonderzeichen, Tabs, Zeilenumbrüchen und mehrfach verlinkten Projekten
+"""
+
+import os
+import sys
+import zipfile
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from src.letter_layout import Block, Run, build_layout
+from src.docx_generator import DocxGenerator
+from test_letter_layout import LETTER, PROJECT_URLS, LINKEDIN_URL, make_letter
+
+
+def read_parts(data):
+    with zipfile.ZipFile(BytesIO(data)) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def test_same_package_as_python_docx():
+    letters = [
+        LETTER,
+        make_letter("Hallo Frau Meier,\n\n"
+                    "AutomaticMotivation\tund erneut AutomaticMotivation <b>&</b> \"Zitat\"\n"
+                    "  mit Leerzeichen am Rand  \n\n"
+                    "Mein LinkedIn Profil ist öffentlich.")
+    ]
+    for letter in letters:
+        layout = build_layout(letter, PROJECT_URLS, LINKEDIN_URL)
+        reference = read_parts(DocxGenerator(fast_writer=False).render_docx_bytes(letter, layout))
+        fast = read_parts(DocxGenerator(fast_writer=True).render_docx_bytes(letter, layout))
+
+        assert sorted(reference) == sorted(fast), "Unterschiedliche Paket-Teile"
+        for name in ('word/document.xml', 'word/_rels/document.xml.rels'):
+            assert reference[name] == fast[name], f"{name} weicht vom python-docx-Pfad ab"
+        print(f"✅ {len(layout.links)} Links, {len(fast)} Teile identisch zum python-docx-Pfad")
+
+
+def test_link_text_keeps_spaces():
+    """Leerzeichen am Rand eines Linktexts bleiben in beiden Pfaden erhalten"""
+    layout = build_layout(LETTER, PROJECT_URLS, LINKEDIN_URL)
+    layout.blocks.append(Block([Run("Siehe"), Run(" AutomaticMotivation ", PROJECT_URLS['AutomaticMotivation']),
+                                Run("auf GitHub.")]))
+    reference = read_parts(DocxGenerator(fast_writer=False).render_docx_bytes(LETTER, layout))
+    fast = read_parts(DocxGenerator(fast_writer=True).render_docx_bytes(LETTER, layout))
+
+    assert b'<w:t xml:space="preserve"> AutomaticMotivation </w:t>' in fast['word/document.xml']
+    assert reference['word/document.xml'] == fast['word/document.xml'], "Linktext weicht vom python-docx-Pfad ab"
+    print("✅ Linktext mit Leerzeichen am Rand bleibt erhalten (xml:space=\"preserve\")")
+
+
+if __name__ == "__main__":
+    test_same_package_as_python_docx()
+    test_link_text_keeps_spaces()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test für den GitHub-Projekt-Store
+Die GitHub-API wird durch einen Stub ersetzt: der erste Aufbau lädt alle READMEs, eine
+Aktualisierung nur die READMEs neuer oder seit dem letzten Stand veränderter Repositories;
+ist die API nicht erreichbar, wird sie erst nach Ablauf der Cache-Dauer erneut gefragt
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+import src.github_project_store as github_project_store
+from config.config import Config
+from src.github_project_store import GitHubProjectStore, summarize_readme
+
+USERNAME = 'octo'
+README = ("# Projekt\n\n![Build](https://img.shields.io/badge/build-ok.svg)\n\n"
+          "Ein Werkzeug, das Bewerbungsschreiben aus Stellenanzeigen und eigenen Projekten erstellt.\n\n"
+          "```bash\npip install projekt\n```\n")
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None, text=''):
+        self.status_code = status_code
+        self._data = data
+        self.text = text
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise github_project_store.requests.HTTPError(f"HTTP {self.status_code}")
+
+
+class FakeGitHubAPI:
+    """Beantwortet Repository-Liste und README-Abrufe und zählt die README-Anfragen"""
+
+    def __init__(self, repos):
+        self.repos = repos
+        self.readme_requests = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        if url.endswith(f'/users/{USERNAME}/repos'):
+            page = (params or {}).get('page', 1)
+            return FakeResponse(data=self.repos if page == 1 else [])
+        if url.endswith('/readme'):
+            name = url.rsplit('/', 2)[-2]
+            self.readme_requests.append(name)
+            if name == 'ohne-readme':
+                return FakeResponse(status_code=404)
+            return FakeResponse(text=README.replace('Projekt', name))
+        return FakeResponse(status_code=404)
+
+
+def repo(name, pushed_at, stars=0, fork=False, private=False):
+    return {'name': name, 'description': f'{name} Beschreibung', 'html_url': f'https://github.com/{USERNAME}/{name}',
+            'language': 'Python', 'topics': ['llm'], 'stargazers_count': stars, 'fork': fork,
+            'private': private, 'pushed_at': pushed_at}
+
+
+def test_incremental_refresh():
+    print("=== Test: GitHub-Projekt-Store ===\n")
+
+    api = FakeGitHubAPI([
+        repo('bewerbung', '2026-01-01T00:00:00Z', stars=5),
+        repo('ohne-readme', '2026-01-01T00:00:00Z', stars=1),
+        repo('fork', '2026-01-01T00:00:00Z', fork=True),
+        repo('geheim', '2026-01-01T00:00:00Z', private=True),
+    ])
+    original_get, original_cache = github_project_store.requests.get, Config.GITHUB_CACHE_FILE
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        github_project_store.requests.get = api.get
+        Config.GITHUB_CACHE_FILE = Path(tmp_dir) / 'github_cache.json'
+        try:
+            store_file = Path(tmp_dir) / 'github_projects.json'
+            store = GitHubProjectStore(store_file)
+            projects = store.get_projects(USERNAME)
+
+            assert [project.name for project in projects] == ['bewerbung', 'ohne-readme'], projects
+            assert projects[0].readme_summary.startswith('Ein Werkzeug'), projects[0].readme_summary
+            assert projects[1].readme_summary == ''
+            assert sorted(api.readme_requests) == ['bewerbung', 'fork', 'ohne-readme']
+            print(f"✅ Erster Aufbau: {len(projects)} Projekte (ohne Forks und private), "
+                  f"{len(api.readme_requests)} READMEs geladen")
+
+            # Neuer Prozess: nur das veränderte und das neue Repository brauchen ein README
+            api.readme_requests.clear()
+            api.repos[0] = repo('bewerbung', '2026-02-01T00:00:00Z', stars=6)
+            api.repos.append(repo('neu', '2026-02-01T00:00:00Z', stars=10))
+            reloaded = GitHubProjectStore(store_file)
+            assert reloaded.refresh(USERNAME)
+            assert sorted(api.readme_requests) == ['bewerbung', 'neu'], api.readme_requests
+            projects = reloaded.get_projects(USERNAME, refresh=False)
+            assert [project.name for project in projects] == ['neu', 'bewerbung', 'ohne-readme']
+            print(f"✅ Aktualisierung lädt nur {len(api.readme_requests)} READMEs neu")
+
+            # Ein frischer Store fragt die API nicht erneut ab
+            api.readme_requests.clear()
+            assert len(GitHubProjectStore(store_file).get_projects(USERNAME)) == 3
+            assert api.readme_requests == []
+            assert Config._load_github_cache()['project_urls']['neu'] == f'https://github.com/{USERNAME}/neu'
+            print("✅ Frischer Store wird ohne API-Abfrage verwendet, URL-Cache ist synchron")
+        finally:
+            github_project_store.requests.get = original_get
+            Config.GITHUB_CACHE_FILE = original_cache
+
+
+def test_failed_refresh_is_remembered():
+    """Ein fehlgeschlagener erster Abruf wird gemerkt, nicht bei jedem Brief wiederholt"""
+    print("\n=== Test: GitHub-API nicht erreichbar ===\n")
+
+    calls = []
+
+    def failing_get(url, headers=None, params=None, timeout=None):
+        calls.append(url)
+        raise github_project_store.requests.ConnectionError("API nicht erreichbar")
+
+    original_get = github_project_store.requests.get
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        github_project_store.requests.get = failing_get
+        try:
+            store_file = Path(tmp_dir) / 'github_projects.json'
+            assert GitHubProjectStore(store_file).get_projects(USERNAME) == []
+            assert len(calls) == 1, calls
+
+            # Zweiter Brief im selben und in einem neuen Prozess: kein erneuter API-Aufruf
+            store = GitHubProjectStore(store_file)
+            assert store.get_projects(USERNAME) == [] and store.get_projects(USERNAME) == []
+            assert len(calls) == 1, calls
+            print("✅ Fehlgeschlagener Abruf wird gemerkt, weitere Briefe fragen die API nicht erneut")
+        finally:
+            github_project_store.requests.get = original_get
+
+
+def test_summarize_readme():
+    summary = summarize_readme(README)
+    assert summary == "Ein Werkzeug, das Bewerbungsschreiben aus Stellenanzeigen und eigenen Projekten erstellt."
+    assert len(summarize_readme(README.replace('erstellt.', 'erstellt. ' * 60), max_chars=120)) <= 122
+    print("✅ README-Zusammenfassung ohne Überschriften, Badges und Code-Blöcke")
+
+
+if __name__ == "__main__":
+    test_incremental_refresh()
+    test_failed_refresh_is_remembered()
+    test_summarize_readme()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test für das Hedging von LLM-Aufrufen
+Ein langsamer Ausreißer wird nach dem beobachteten p90 durch eine zweite Anfrage überholt
+und abgebrochen; das Budget begrenzt zusätzliche Anfragen; mit HEDGE_TARGET=fallback geht
+die zweite Anfrage an das Ausweichmodell des Routers
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from langchain.schema import HumanMessage
+
+from benchmarks.fake_llm_server import FakeLLMServer
+from benchmarks.offline_http import OfflineHTTP
+from benchmarks.run_benchmarks import configure_offline, BENCHMARK_MODEL
+
+MESSAGES = [HumanMessage(content="Schreibe das Motivationsschreiben")]
+
+
+def test_hedging():
+    print("=== Test: Hedging langsamer LLM-Aufrufe ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeLLMServer(latency=0.05) as llm, OfflineHTTP():
+        configure_offline(Path(tmp_dir), llm.base_url)
+
+        from config.config import Config
+        import src.hedging as hedging
+        from src.llm_metrics import LLMMetricsStore, metrics_store, tracked_invoke
+        from src.llm_utils import LLMFactory, FAST_MODELS
+        from src.hedging import get_request_hedger
+        from src.model_router import RoutedLLM
+
+        settings = ('HEDGED_REQUESTS', 'HEDGE_MIN_SAMPLES', 'HEDGE_BUDGET', 'HEDGE_TARGET')
+        original = {name: getattr(Config, name) for name in settings}
+        Config.HEDGED_REQUESTS = True
+        Config.HEDGE_MIN_SAMPLES = 5
+        Config.HEDGE_BUDGET = 0.1
+        try:
+            hedger = get_request_hedger()
+            generation_llm = LLMFactory.create_llm('openrouter', BENCHMARK_MODEL)
+
+            for _ in range(10):
+                tracked_invoke(generation_llm, MESSAGES, 'generation')
+            delay = hedger.hedge_delay('generation', 'openrouter', BENCHMARK_MODEL)
+            assert delay is not None and delay < 0.2, delay
+
+            llm.slow_next(1, 2.0)
+            start = time.perf_counter()
+            tracked_invoke(generation_llm, MESSAGES, 'generation')
+            elapsed = time.perf_counter() - start
+            cancelled, winner = metrics_store.session_records[-2:]
+            assert elapsed < 0.5, f"Zweite Anfrage hätte gewinnen müssen ({elapsed:.2f}s)"
+            assert cancelled['status'] == 'cancelled' and cancelled['input_tokens'] > 0, cancelled
+            assert winner['status'] == 'ok' and hedger.stats['hedged'] == 1, hedger.stats
+            print(f"✅ Ausreißer (2s) nach p90 {delay * 1000:.0f} ms überholt: {elapsed * 1000:.0f} ms, "
+                  f"abgebrochene Anfrage mit {cancelled['input_tokens']} Eingabe-Tokens erfasst")
+
+            llm.slow_next(1, 1.0)
+            start = time.perf_counter()
+            tracked_invoke(generation_llm, MESSAGES, 'generation')
+            elapsed = time.perf_counter() - start
+            assert elapsed > 1.0 and metrics_store.session_records[-2]['status'] == 'ok', "Budget ausgeschöpft"
+            assert hedger.stats['hedge_rate'] <= Config.HEDGE_BUDGET, hedger.stats
+            print(f"✅ Budget {Config.HEDGE_BUDGET:.0%} ausgeschöpft: kein weiteres Hedging ({hedger.stats})")
+
+            # Eigener Metrik-Speicher: eigener Hedger, der nur dessen Aufrufe kennt
+            store = LLMMetricsStore(Path(tmp_dir) / 'own_calls.jsonl')
+            tracked_invoke(generation_llm, MESSAGES, 'generation', store)
+            own_hedger = get_request_hedger(store)
+            assert own_hedger is not hedger and get_request_hedger(store) is own_hedger
+            assert own_hedger.hedge_delay('generation', 'openrouter', BENCHMARK_MODEL) is None
+            assert own_hedger.stats['calls'] == 1 and len(store.session_records) == 1, own_hedger.stats
+            print("✅ Aufrufe mit eigenem Metrik-Speicher nutzen einen eigenen Hedger")
+
+            # Ausweichmodell: das bevorzugte schnelle Modell wird langsam, die zweite Anfrage geht an das Hauptmodell
+            Config.HEDGE_TARGET = 'fallback'
+            hedger.budget = 1.0
+            fast_model = FAST_MODELS['openrouter']
+            extraction_llm = RoutedLLM('extraction')
+            for _ in range(10):
+                tracked_invoke(extraction_llm, MESSAGES, 'extraction')
+            llm.model_latency[fast_model] = 2.0
+            start = time.perf_counter()
+            tracked_invoke(extraction_llm, MESSAGES, 'extraction')
+            elapsed = time.perf_counter() - start
+            cancelled, winner = metrics_store.session_records[-2:]
+            assert (cancelled['model'], winner['model']) == (fast_model, BENCHMARK_MODEL), (cancelled, winner)
+            assert elapsed < 0.5, elapsed
+            print(f"✅ Zweite Anfrage an {BENCHMARK_MODEL} statt {fast_model}: {elapsed * 1000:.0f} ms")
+        finally:
+            for name, value in original.items():
+                setattr(Config, name, value)
+            # Beobachtete Latenzen und Budget nicht in spätere Tests mitnehmen
+            hedging._request_hedgers.clear()
+
+if __name__ == "__main__":
+    test_hedging()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test für die Job-Board-Plugins
+Prüft jedes Plugin gegen aufgezeichnete Fixtures (API-Antworten und HTML-Seiten),
+ohne Netzwerk und ohne LLM
+"""
+
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from bs4 import BeautifulSoup
+
+from src.job_board_plugins import find_plugin, extract_known_fields
+from src.job_posting_mapper import missing_fields
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'job_boards')
+
+
+def load_cases():
+    with open(os.path.join(FIXTURES_DIR, 'cases.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)['cases']
+
+
+def check_expected(fields, expected, source):
+    """Vergleicht extrahierte Felder mit den erwarteten Werten"""
+    for key, value in expected.items():
+        assert fields.get(key) == value, f"{source}: {key} = {fields.get(key)!r}, erwartet {value!r}"
+    missing = missing_fields(fields)
+    assert not missing, f"{source}: Pflichtfelder fehlen: {missing}"
+
+
+def test_job_board_plugins():
+    """Testet alle Plugins gegen ihre Fixtures"""
+    print("=== Test: Job-Board-Plugins ===\n")
+
+    for case in load_cases():
+        url = case['url']
+        plugin = find_plugin(url)
+        assert plugin is not None, f"Kein Plugin für {url}"
+        assert plugin.name == case['plugin'], f"{url}: Plugin {plugin.name}, erwartet {case['plugin']}"
+        print(f"🔌 {plugin.name}: {url}")
+
+        if 'api_file' in case:
+            assert plugin.api_url(url) == case['api_url'], f"{plugin.name}: API-URL {plugin.api_url(url)}"
+            with open(os.path.join(FIXTURES_DIR, case['api_file']), 'r', encoding='utf-8') as f:
+                api_fields = {key: value for key, value in plugin.extract_api(json.load(f), url).items() if value}
+            check_expected(api_fields, case['expected'], f"{plugin.name} (API)")
+            print(f"   ✅ API: {api_fields['company']} - {api_fields['position']}")
+            print(f"      Anforderungen: {api_fields['requirements'][:80]}...")
+
+        if 'html_file' in case:
+            with open(os.path.join(FIXTURES_DIR, case['html_file']), 'r', encoding='utf-8') as f:
+                soup = BeautifulSoup(f.read(), 'html.parser')
+            html_fields = extract_known_fields(soup, url)
+            check_expected(html_fields, case['expected'], f"{plugin.name} (HTML)")
+            print(f"   ✅ HTML: {html_fields['company']} - {html_fields['position']}")
+            print(f"      Anforderungen: {html_fields['requirements'][:80]}...")
+
+    print("\n✅ Alle Plugins liefern vollständige Job-Informationen ohne LLM")
+
+
+def test_unknown_url_uses_generic_path():
+    """URLs ohne Plugin fallen auf den generischen Pfad zurück"""
+    assert find_plugin("https://www.example.com/karriere/job-123") is None
+    assert find_plugin("https://boards.greenhouse.io.evil.example/jobs/1") is None
+    print("✅ Unbekannte URLs verwenden den generischen Pfad")
+
+
+if __name__ == "__main__":
+    test_job_board_plugins()
+    test_unknown_url_uses_generic_path()
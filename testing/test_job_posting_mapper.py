@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test für den JobPosting-Mapper
+Ein vollständiges JSON-LD JobPosting wird ohne LLM in alle JobInfo-Felder überführt,
+bei einem unvollständigen werden die fehlenden Pflichtfelder gemeldet
+"""
+
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from bs4 import BeautifulSoup
+
+from src.job_posting_mapper import (
+    extract_contact_details, find_job_postings, map_job_posting, missing_fields, REQUIRED_FIELDS
+)
+
+COMPLETE_POSTING = {
+    "@context": "https://schema.org",
+    "@type": "JobPosting",
+    "title": "Python-Entwickler (m/w/d)",
+    "hiringOrganization": {"@type": "Organization", "name": "Beispiel AG"},
+    "jobLocation": {
+        "@type": "Place",
+        "address": {"@type": "PostalAddress", "streetAddress": "Bahnhofstrasse 1",
+                    "postalCode": "8001", "addressLocality": "Zürich", "addressCountry": "CH"}
+    },
+    "description": ("<p>Du entwickelst unsere Datenplattform weiter.</p>"
+                    "<h3>Dein Profil</h3><ul><li>Erfahrung mit Python</li><li>Kenntnisse in SQL</li></ul>"),
+    "jobBenefits": "Flexible Arbeitszeiten",
+    "employmentType": ["FULL_TIME"],
+    "baseSalary": {"@type": "MonetaryAmount", "currency": "CHF",
+                   "value": {"@type": "QuantitativeValue", "minValue": 100000, "maxValue": 120000, "unitText": "YEAR"}},
+    "applicationContact": {"@type": "ContactPoint", "name": "Anna Muster", "jobTitle": "Talent Acquisition",
+                           "email": "anna.muster@beispiel.ch", "telephone": "+41 44 123 45 67"}
+}
+
+INCOMPLETE_POSTING = {
+    "@type": "JobPosting",
+    "title": "Data Engineer",
+    "hiringOrganization": "Beispiel GmbH",
+    "jobLocationType": "TELECOMMUTE"
+}
+
+
+def test_complete_posting():
+    print("=== Test: JobPosting-Mapper ===\n")
+
+    html = ('<html><head><script type="application/ld+json">'
+            + json.dumps({"@context": "https://schema.org", "@graph": [{"@type": "WebPage"}, COMPLETE_POSTING]})
+            + '</script></head><body></body></html>')
+    postings = find_job_postings(BeautifulSoup(html, 'html.parser'))
+    assert len(postings) == 1, postings
+
+    fields = map_job_posting(postings[0])
+    assert fields['position'] == "Python-Entwickler (m/w/d)"
+    assert fields['company'] == "Beispiel AG"
+    assert fields['location'] == "Zürich"
+    assert fields['address'] == "Bahnhofstrasse 1, 8001 Zürich, Schweiz"
+    assert fields['description'].startswith("Du entwickelst unsere Datenplattform weiter.")
+    assert fields['requirements'] == "Erfahrung mit Python; Kenntnisse in SQL"
+    assert fields['salary'] == "CHF 100000 - 120000 pro Jahr"
+    assert fields['working_hours'] == "Vollzeit"
+    assert fields['contact_person'] == "Anna Muster" and fields['contact_title'] == "Talent Acquisition"
+    assert fields['email'] == "anna.muster@beispiel.ch" and fields['phone'] == "+41 44 123 45 67"
+    assert missing_fields(fields) == []
+    print(f"✅ Vollständiges JobPosting (aus @graph): {len(fields)} Felder, keine Pflichtfelder fehlen")
+
+
+def test_incomplete_posting():
+    fields = map_job_posting(INCOMPLETE_POSTING)
+    assert fields == {'position': "Data Engineer", 'company': "Beispiel GmbH", 'location': "Remote"}, fields
+    assert missing_fields(fields) == ['description', 'requirements']
+    assert missing_fields({}) == list(REQUIRED_FIELDS)
+    print(f"✅ Unvollständiges JobPosting: fehlend {missing_fields(fields)}")
+
+
+def test_contact_details():
+    text = ("Fragen beantwortet jobs@beispiel.ch oder direkt Anna Muster, anna.muster@beispiel.ch, "
+            "Tel. 044 123 45 67. Logo: team@2x.png")
+    assert extract_contact_details(text) == {'email': "anna.muster@beispiel.ch", 'phone': "044 123 45 67"}
+    assert extract_contact_details("Bewerbungen an jobs@beispiel.ch") == {'email': "jobs@beispiel.ch"}
+    assert extract_contact_details('') == {}
+    print("✅ Persönliche E-Mail-Adresse und Telefonnummer werden im Seitentext erkannt")
+
+
+if __name__ == "__main__":
+    test_complete_posting()
+    test_incomplete_posting()
+    test_contact_details()
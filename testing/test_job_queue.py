@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test für die persistente Job-Warteschlange
+Simuliert Abbruch (Ctrl-C), Provider-Ausfälle, abgelaufene Leases und mehrere
+Worker mit Ersatz-Stufen, ohne Netzwerk und ohne LLM
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from src.job_queue import JobQueue, LeaseLostError, PENDING, FETCHED, EXTRACTED, RENDERED, FAILED
+from src.batch_processor import BatchProcessor
+from src.duplicate_detector import DuplicateIndex
+
+
+class FakeBatchProcessor(BatchProcessor):
+    """Ersetzt die echten Stufen und zählt die Aufrufe"""
+
+    def __init__(self, queue, index_file, interrupt_at=None, failing_urls=(), stage_delay=0.0, worker_id=None):
+        super().__init__(queue, personal_info={'name': 'Test'},
+                         duplicate_index=DuplicateIndex(index_file=index_file), worker_id=worker_id,
+                         poll_interval=0.05)
+        self.calls = Counter()
+        self.processed = []
+        self.interrupt_at = interrupt_at
+        self.failing_urls = set(failing_urls)
+        self.stage_delay = stage_delay
+
+    def _stage(self, name, job, result):
+        self.calls[name] += 1
+        self.processed.append((name, job.url))
+        time.sleep(self.stage_delay)
+        if name == self.interrupt_at:
+            raise KeyboardInterrupt
+        if job.url in self.failing_urls and name == 'generate':
+            raise ConnectionError("Provider nicht erreichbar")
+        return result
+
+    def _fetch(self, job):
+        return self._stage('fetch', job, {'html': f"<p>{job.url}</p>"})
+
+    def _extract(self, job):
+        return self._stage('extract', job, {'job_info': {'url': job.url, 'company': 'Firma'}})
+
+    def _generate(self, job):
+        return self._stage('generate', job, {'letter': {'content': f"Brief für {job.job_info['company']}"}})
+
+    def _render(self, job):
+        return self._stage('render', job, {'pdf_path': f"output/{job.id}.pdf", 'docx_path': f"output/{job.id}.docx"})
+
+
+def test_resume_after_interrupt():
+    """Nach einem Abbruch werden abgeschlossene Stufen nicht wiederholt"""
+    print("=== Test: Fortsetzen nach Abbruch ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = Path(tmp_dir) / 'queue.sqlite3'
+        index_file = Path(tmp_dir) / 'index.json'
+        queue = JobQueue(db_file, max_retries=3, retry_delay=0)
+        assert queue.add(['https://example.com/a', 'https://example.com/b', 'https://example.com/a']) == 2
+
+        processor = FakeBatchProcessor(queue, index_file, interrupt_at='generate')
+        try:
+            processor.run()
+            assert False, "KeyboardInterrupt erwartet"
+        except KeyboardInterrupt:
+            pass
+        assert queue.get(1).state == EXTRACTED
+        assert queue.get(1).job_info == {'url': 'https://example.com/a', 'company': 'Firma'}
+        queue.close()
+        print("✅ Abbruch in 'generate' lässt die Stelle im Zustand 'extracted'")
+
+        # Neuer Prozess
+        queue = JobQueue(db_file, max_retries=3, retry_delay=0)
+        processor = FakeBatchProcessor(queue, index_file)
+        assert processor.run() == 2
+        assert processor.calls == Counter({'fetch': 1, 'extract': 1, 'generate': 2, 'render': 2}), processor.calls
+        assert queue.counts()[RENDERED] == 2
+        assert queue.get(1).pdf_path == 'output/1.pdf'
+        print(f"✅ Fortgesetzt ohne erledigte Stufen zu wiederholen: {dict(processor.calls)}")
+
+        stats = queue.stage_stats()
+        assert list(stats) == ['fetch', 'extract', 'generate', 'render']
+        assert stats['generate']['done'] == 2
+        queue.close()
+        print("✅ Durchsatz pro Stufe wird protokolliert")
+
+
+def test_retries_and_failed_state():
+    """Provider-Fehler werden wiederholt, danach failed und per retry wieder eingereiht"""
+    print("\n=== Test: Wiederholungen ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        queue = JobQueue(Path(tmp_dir) / 'queue.sqlite3', max_retries=2, retry_delay=0)
+        queue.add(['https://example.com/down', 'https://example.com/ok'])
+
+        processor = FakeBatchProcessor(queue, Path(tmp_dir) / 'index.json', failing_urls=['https://example.com/down'])
+        assert processor.run() == 1
+        failed = queue.failed_jobs()
+        assert [job.url for job in failed] == ['https://example.com/down']
+        assert failed[0].attempts == 2 and 'ConnectionError' in failed[0].last_error
+        assert queue.stage_stats()['generate']['errors'] == 2
+        print("✅ Nach 2 Versuchen als failed markiert")
+
+        assert queue.retry_failed() == 1
+        job = queue.get(failed[0].id)
+        assert job.state == EXTRACTED and job.attempts == 0
+        processor.failing_urls.clear()
+        assert processor.run() == 1
+        assert queue.counts()[FAILED] == 0 and queue.counts()[PENDING] == 0
+        queue.close()
+        print("✅ retry setzt an der fehlgeschlagenen Stufe wieder an")
+
+
+def test_expired_lease_is_taken_over():
+    """Ein abgestürzter Worker verliert seine Stelle nach dem Sichtbarkeits-Timeout"""
+    print("\n=== Test: Leases ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = Path(tmp_dir) / 'queue.sqlite3'
+        crashed = JobQueue(db_file, visibility_timeout=0.2)
+        crashed.add(['https://example.com/a'])
+        job = crashed.lease_job('worker-crashed')
+        assert job is not None and crashed.lease_job('worker-crashed') is None
+        print("✅ Reservierte Stelle ist für andere Worker unsichtbar")
+
+        time.sleep(0.3)
+        survivor = JobQueue(db_file, visibility_timeout=5)
+        taken_over = survivor.lease_job('worker-survivor')
+        assert taken_over is not None and taken_over.id == job.id
+        print("✅ Abgelaufener Lease wird von einem anderen Worker übernommen")
+
+        try:
+            crashed.complete_stage(job, FETCHED, time.time(), html='<p>zu spät</p>')
+            assert False, "LeaseLostError erwartet"
+        except LeaseLostError:
+            pass
+        assert not crashed.heartbeat(job)
+        assert survivor.heartbeat(taken_over)
+        survivor.complete_stage(taken_over, FETCHED, time.time(), html='<p>ok</p>')
+        assert survivor.get(job.id).html == '<p>ok</p>'
+        crashed.close()
+        survivor.close()
+        print("✅ Ergebnisse ohne gültigen Lease werden verworfen")
+
+
+def run_workers(db_file, index_file, worker_count, stage_delay):
+    """Startet Worker-Threads mit eigener Datenbankverbindung (wie getrennte Prozesse)"""
+    processors = []
+    threads = []
+    for index in range(worker_count):
+        queue = JobQueue(db_file, visibility_timeout=5)
+        processor = FakeBatchProcessor(queue, index_file, stage_delay=stage_delay, worker_id=f"worker-{index}")
+        processors.append(processor)
+        threads.append(threading.Thread(target=processor.run))
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    for processor in processors:
+        processor.queue.close()
+    return processors, elapsed
+
+
+def test_multiple_workers():
+    """Jede Stufe läuft genau einmal, die Stellen verteilen sich auf mehrere Worker"""
+    print("\n=== Test: Mehrere Worker ===\n")
+
+    urls = [f"https://example.com/job-{i}" for i in range(12)]
+    elapsed = {}
+    for worker_count in (1, 4):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_file = Path(tmp_dir) / 'queue.sqlite3'
+            queue = JobQueue(db_file)
+            queue.add(urls)
+            processors, elapsed[worker_count] = run_workers(db_file, Path(tmp_dir) / 'index.json',
+                                                            worker_count, stage_delay=0.02)
+
+            runs = Counter(run for processor in processors for run in processor.processed)
+            assert len(runs) == len(urls) * 4 and set(runs.values()) == {1}, "Stufen doppelt ausgeführt"
+            assert queue.counts()[RENDERED] == len(urls)
+            if worker_count > 1:
+                active = sum(1 for processor in processors if processor.processed)
+                assert active > 1, "Nur ein Worker hat Stellen übernommen"
+            queue.close()
+        print(f"✅ {worker_count} Worker: {len(urls)} Stellen in {elapsed[worker_count]:.2f}s, jede Stufe genau einmal")
+
+    # Laufzeiten schwanken je nach Maschine, daher nur zur Information
+    print(f"📊 Durchsatz mit 4 Workern: {elapsed[1] / elapsed[4]:.1f}x")
+
+
+if __name__ == "__main__":
+    test_resume_after_interrupt()
+    test_retries_and_failed_state()
+    test_expired_lease_is_taken_over()
+    test_multiple_workers()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test für den Absatz-Layout-Cache
+Nach einer kleinen Änderung wird nur der geänderte Absatz neu umbrochen, das
+Ergebnis entspricht einem Rendern ohne Cache
+"""
+
+import os
+import re
+import sys
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from src.letter_layout import build_layout
+from src.pdf_generator import PDFGenerator
+from src.layout_cache import LayoutCache
+from src.canvas_pdf_renderer import CanvasLetterRenderer, letter_blocks
+from test_letter_layout import LETTER, PROJECT_URLS, LINKEDIN_URL, make_letter
+
+
+def blocks_for(letter):
+    generator = PDFGenerator()
+    layout = build_layout(letter, PROJECT_URLS, LINKEDIN_URL)
+    return letter_blocks(letter, layout, generator._sender_lines(letter), "Zürich, 1. Januar 2026")
+
+
+def test_only_changed_paragraph_is_wrapped():
+    cache = LayoutCache(max_entries=100)
+    renderer = CanvasLetterRenderer(PDFGenerator().styles, cache=cache)
+
+    blocks = blocks_for(LETTER)
+    renderer.layout(blocks)
+    assert cache.stats()['misses'] == len(blocks) and cache.stats()['hits'] == 0
+
+    edited = make_letter(LETTER.content.replace("Pipelines gebaut", "robuste Pipelines gebaut"))
+    edited_blocks = blocks_for(edited)
+    cached_lines = renderer.layout(edited_blocks)
+    stats = cache.stats()
+    assert stats['misses'] == len(blocks) + 1, stats
+    assert stats['hits'] == len(blocks) - 1, stats
+
+    uncached_lines = CanvasLetterRenderer(PDFGenerator().styles, cache=LayoutCache(0)).layout(edited_blocks)
+    assert cached_lines == uncached_lines, "Cache verändert das Layout"
+    print(f"✅ Re-Render nach Änderung: 1 Absatz neu umbrochen, {stats['hits']} aus dem Cache")
+
+
+def test_lru_eviction_and_disabled_cache():
+    cache = LayoutCache(max_entries=2)
+    for key in ('a', 'b', 'a', 'c'):
+        cache.get_or_compute(key, lambda: key.upper())
+    assert cache.stats()['entries'] == 2
+    assert cache.get_or_compute('a', lambda: 'neu') == 'A', "'a' wurde zuletzt benutzt und bleibt"
+    assert cache.get_or_compute('b', lambda: 'neu') == 'neu', "'b' sollte verdrängt sein"
+
+    disabled = LayoutCache(0)
+    disabled.get_or_compute('a', lambda: 1)
+    assert disabled.stats()['entries'] == 0
+    print("✅ LRU-Verdrängung und deaktivierter Cache")
+
+
+def test_rendered_pdf_unchanged():
+    blocks = blocks_for(LETTER)
+    styles = PDFGenerator().styles
+    cache = LayoutCache(100)
+    first, second, reference = BytesIO(), BytesIO(), BytesIO()
+    CanvasLetterRenderer(styles, cache=cache).render(blocks, first)
+    CanvasLetterRenderer(styles, cache=cache).render(blocks, second)
+    CanvasLetterRenderer(styles, cache=LayoutCache(0)).render(blocks, reference)
+
+    def strip_ids(data):
+        # Erstellungsdatum und Dokument-ID unterscheiden sich pro Lauf
+        data = re.sub(rb"\(D:[^)]*\)", b"", data.getvalue())
+        return re.sub(rb"\[<[0-9a-fA-F]+>\s*<[0-9a-fA-F]+>\]", b"", data)
+    assert strip_ids(first) == strip_ids(second) == strip_ids(reference)
+    print("✅ PDF mit und ohne Cache identisch")
+
+
+if __name__ == "__main__":
+    test_only_changed_paragraph_is_wrapped()
+    test_lru_eviction_and_disabled_cache()
+    test_rendered_pdf_unchanged()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test für das gemeinsame Brief-Layout
+Anrede, doppelte Anreden, Grußformel und Signatur werden einmal erkannt; Links
+erscheinen in PDF und DOCX identisch
+"""
+
+import os
+import sys
+import zipfile
+from io import BytesIO
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from src.models import MotivationLetter
+from src.letter_layout import build_layout, reportlab_markup
+
+PROJECT_URLS = {
+    'Auto-search-jobs': 'https://github.com/muster/Auto-search-jobs',
+    'Auto-search-jobs-to-Email': 'https://github.com/muster/Auto-search-jobs-to-Email',
+    'AutomaticMotivation': 'https://github.com/muster/AutomaticMotivation'
+}
+LINKEDIN_URL = 'https://linkedin.com/in/muster'
+
+
+def make_letter(content):
+    return MotivationLetter(
+        sender_name="Anna Beispiel", sender_address="Musterweg 1, 8000 Zürich",
+        sender_phone="+41 79 000 00 00", sender_email="anna@example.com",
+        recipient_name="Frau Meier", recipient_company="Müller & Co AG",
+        recipient_company_address="Bahnhofstrasse 1, 8001 Zürich", recipient_address="",
+        subject="Bewerbung als Data Engineer", content=content
+    )
+
+
+LETTER = make_letter(
+    "Sehr geehrte Frau Meier,\n\n"
+    "Sehr geehrte Damen und Herren,\n\n"
+    "Mit AutomaticMotivation und Auto-search-jobs-to-Email habe ich Pipelines gebaut.\n\n"
+    "Details zu Kunden wie Müller & Co finden Sie in meinem LinkedIn-Profil.\n\n"
+    "Vielen Dank für Ihre Zeit, ich freue mich auf ein persönliches Gespräch.\n\n"
+    "Freundliche Grüsse\n\n"
+    "Ihre Anna Beispiel"
+)
+
+
+def test_structure():
+    """Anrede einmal, Grußformel und Signatur nicht im Inhalt, Dankes-Absatz bleibt"""
+    layout = build_layout(LETTER, PROJECT_URLS, LINKEDIN_URL)
+    assert layout.salutation == "Sehr geehrte Frau Meier,", layout.salutation
+    texts = [block.text for block in layout.blocks]
+    assert len(texts) == 3, texts
+    assert texts[-1].startswith("Vielen Dank für Ihre Zeit")
+    assert layout.signature == "Anna Beispiel" and layout.closing == "Freundliche Grüsse"
+    print(f"✅ Anrede, {len(texts)} Absätze, Grußformel und Signatur (ohne festen Namen) erkannt")
+
+
+def test_links():
+    """Längster Projektname gewinnt, LinkedIn wird verlinkt, Sonderzeichen werden escaped"""
+    layout = build_layout(LETTER, PROJECT_URLS, LINKEDIN_URL)
+    assert layout.links == [
+        ('AutomaticMotivation', PROJECT_URLS['AutomaticMotivation']),
+        ('Auto-search-jobs-to-Email', PROJECT_URLS['Auto-search-jobs-to-Email']),
+        ('LinkedIn-Profil', LINKEDIN_URL)
+    ], layout.links
+    markup = reportlab_markup(layout.blocks[1])
+    assert 'Müller &amp; Co' in markup and f'<a href="{LINKEDIN_URL}" color="blue">' in markup, markup
+    print(f"✅ {len(layout.links)} Links erkannt, ReportLab-Markup escaped")
+
+
+def test_renderers_share_layout():
+    """PDF und DOCX enthalten dieselben Links aus demselben Layout"""
+    from src.template_pdf_generator import TemplateBasedPDFGenerator
+    from src.docx_generator import DocxGenerator
+
+    layout = build_layout(LETTER, PROJECT_URLS, LINKEDIN_URL)
+    pdf = TemplateBasedPDFGenerator().render_pdf_bytes(LETTER, layout)
+    docx = DocxGenerator().render_docx_bytes(LETTER, layout)
+
+    for _, url in layout.links:
+        assert url.encode() in pdf, f"{url} fehlt im PDF"
+    with zipfile.ZipFile(BytesIO(docx)) as archive:
+        relations = archive.read('word/_rels/document.xml.rels').decode('utf-8')
+        document = archive.read('word/document.xml').decode('utf-8')
+    for _, url in layout.links:
+        assert url in relations, f"{url} fehlt im DOCX"
+    assert 'Sehr geehrte Frau Meier,' in document and 'Sehr geehrte Damen und Herren' not in document
+    assert 'Ihre Anna Beispiel' not in document, "Signatur aus dem Inhalt im DOCX"
+    print("✅ PDF und DOCX aus einem Layout gerendert, Links in beiden Formaten")
+
+
+if __name__ == "__main__":
+    test_structure()
+    test_links()
+    test_renderers_share_layout()
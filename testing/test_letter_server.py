@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test für den API-Server
+Startet den Server gegen den LLM-Fake und die aufgezeichneten Stellenseiten aus
+benchmarks/ und schickt parallele Anfragen an POST /letters
+"""
+
+import os
+import sys
+import json
+import base64
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from benchmarks.fake_llm_server import FakeLLMServer
+from benchmarks.offline_http import OfflineHTTP, load_job_pages
+from benchmarks.run_benchmarks import configure_offline
+
+
+def post_json(base_url, path, payload):
+    request = urllib.request.Request(
+        base_url + path, data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}, method='POST'
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_letter_server():
+    """Parallele Anfragen mit URL und mit JobInfo-JSON"""
+    print("=== Test: API-Server ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeLLMServer(latency=0.05) as llm, OfflineHTTP():
+        configure_offline(Path(tmp_dir), llm.base_url)
+
+        from server import LetterServer
+        from src.letter_service import LetterService
+
+        service = LetterService(workers=2, output_dir=os.path.join(tmp_dir, 'api'))
+        server = LetterServer(('127.0.0.1', 0), service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+        try:
+            with urllib.request.urlopen(base_url + '/health') as response:
+                health = json.loads(response.read())
+            assert health['status'] == 'ok' and health['available'] == 2
+            print("✅ /health meldet 2 freie Worker")
+
+            payloads = [{'url': url} for url in load_job_pages()]
+            payloads.append({'job_info': {'company': 'Muster AG', 'position': 'Data Analyst',
+                                          'address': 'Bahnhofstrasse 1, 8001 Zürich',
+                                          'requirements': 'SQL; Python', 'location': 'Zürich'}})
+            with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+                responses = list(executor.map(lambda payload: post_json(base_url, '/letters', payload), payloads))
+
+            for payload, (status, body) in zip(payloads, responses):
+                assert status == 200, f"{payload}: {status} {body}"
+                pdf = base64.b64decode(body['files']['pdf']['content_base64'])
+                docx = base64.b64decode(body['files']['docx']['content_base64'])
+                assert pdf.startswith(b'%PDF') and docx.startswith(b'PK')
+                timings = ', '.join(f"{stage} {seconds * 1000:.0f}ms" for stage, seconds in body['timings'].items())
+                print(f"✅ {body['job_info']['company']}: {body['files']['pdf']['filename']} ({timings})")
+
+            assert not os.path.exists(os.path.join(tmp_dir, 'api')), "Ohne save_files dürfen keine Dateien entstehen"
+            print("✅ Dokumente im Speicher gerendert, keine Dateien geschrieben")
+
+            request = urllib.request.Request(
+                base_url + '/letters?format=pdf', data=json.dumps(payloads[-1]).encode('utf-8'), method='POST'
+            )
+            with urllib.request.urlopen(request, timeout=60) as response:
+                assert response.headers['Content-Type'] == 'application/pdf'
+                assert 'attachment' in response.headers['Content-Disposition']
+                assert response.read().startswith(b'%PDF')
+            print(f"✅ PDF direkt gestreamt: {response.headers['Content-Disposition']}")
+
+            status, body = post_json(base_url, '/letters', {**payloads[-1], 'save_files': True})
+            assert status == 200 and os.path.exists(body['files']['docx']['path']), body['files']
+            print(f"✅ save_files schreibt zusätzlich: {body['files']['docx']['path']}")
+
+            revise_payload = {'letter': body['letter'], 'job_info': body['job_info'], 'paragraph': 1,
+                              'instruction': 'Mehr Kennzahlen', 'include_content': False}
+            status, revised = post_json(base_url, '/letters/revise', revise_payload)
+            assert status == 200 and revised['paragraph'] == 1, revised
+            assert revised['letter']['content'] != body['letter']['content']
+            assert 'content_base64' not in revised['files']['pdf'] and 'revision' in revised['timings']
+            print(f"✅ /letters/revise überarbeitet Absatz 1 "
+                  f"({revised['timings']['revision'] * 1000:.0f}ms statt Neu-Generierung)")
+
+            with urllib.request.urlopen(base_url + '/routing') as response:
+                routing = json.loads(response.read())
+            chosen = {stage: decision['model'] for stage, decision in routing['stages'].items()}
+            assert {'extraction', 'project_selection', 'generation'} <= set(chosen), chosen
+            assert all(decision['candidates'] for decision in routing['stages'].values())
+            print(f"✅ /routing: {', '.join(f'{stage} → {model}' for stage, model in chosen.items())}")
+
+            status, body = post_json(base_url, '/letters/revise', {**revise_payload, 'paragraph': 99})
+            assert status == 400, body
+
+            status, body = post_json(base_url, '/letters', {'position': 'ohne URL'})
+            assert status == 400, body
+            print(f"✅ Ungültige Anfrage wird mit 400 abgelehnt: {body['error']}")
+            assert service.stats['requests'] == len(payloads) + 3
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    test_letter_server()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test für die adaptive Modellwahl
+Ein gestörtes Modell wird nach wenigen Fehlern umgangen und nach Ablauf des Zeitfensters
+erneut versucht; ein zu langsames Modell verliert den Verkehr an ein Modell im
+Latenzbudget; Entscheidungen und Kennzahlen lassen sich abfragen
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from langchain.schema import HumanMessage
+
+from benchmarks.fake_llm_server import FakeLLMServer
+from benchmarks.offline_http import OfflineHTTP
+from benchmarks.run_benchmarks import configure_offline, BENCHMARK_MODEL
+
+MESSAGES = [HumanMessage(content="Extrahiere die Angaben aus der Stellenanzeige")]
+
+
+def test_degraded_model():
+    print("=== Test: Gestörtes Modell wird umgangen ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeLLMServer() as llm, OfflineHTTP():
+        configure_offline(Path(tmp_dir), llm.base_url)
+
+        from src.llm_metrics import LLMMetricsStore, tracked_invoke
+        from src.llm_utils import FAST_MODELS
+        from src.model_router import ModelRouter, RoutedLLM
+
+        fast_model = FAST_MODELS['openrouter']
+        llm.failing_models.add(fast_model)
+        store = LLMMetricsStore(Path(tmp_dir) / 'router_calls.jsonl')
+        router = ModelRouter(store, window_seconds=1.0, min_calls=3, max_error_rate=0.5,
+                             latency_budget={}, cost_budget={})
+        extraction_llm = RoutedLLM('extraction', router, max_retries=0)
+
+        failures = 0
+        for _ in range(6):
+            try:
+                tracked_invoke(extraction_llm, MESSAGES, 'extraction', store)
+            except Exception:
+                failures += 1
+        assert failures == 3, f"Nach {router.min_calls} Fehlern umleiten ({failures} Fehler)"
+
+        decision = router.snapshot()['stages']['extraction']
+        assert decision['model'] == BENCHMARK_MODEL and 'gestört' in decision['reason'], decision
+        assert decision['candidates'][0]['error_rate'] == 1.0
+        print(f"✅ {fast_model} nach {failures} Fehlern umgangen: {decision['reason']}")
+
+        models = [record['model'] for record in store.session_records]
+        assert models[-3:] == [BENCHMARK_MODEL] * 3, models
+        print(f"✅ Verkehr läuft über {BENCHMARK_MODEL}")
+
+        llm.failing_models.clear()
+        time.sleep(1.1)
+        tracked_invoke(extraction_llm, MESSAGES, 'extraction', store)
+        assert store.session_records[-1]['model'] == fast_model
+        print("✅ Nach Ablauf des Zeitfensters wird das bevorzugte Modell erneut versucht")
+
+
+def test_latency_budget():
+    print("\n=== Test: Latenzbudget ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeLLMServer(model_latency={BENCHMARK_MODEL: 0.3}) as llm, \
+            OfflineHTTP():
+        configure_offline(Path(tmp_dir), llm.base_url)
+
+        from src.llm_metrics import LLMMetricsStore, tracked_invoke
+        from src.llm_utils import FAST_MODELS
+        from src.model_router import ModelRouter, RoutedLLM
+
+        store = LLMMetricsStore(Path(tmp_dir) / 'router_calls.jsonl')
+        router = ModelRouter(store, min_calls=3, latency_budget={'generation': 0.15}, cost_budget={})
+        generation_llm = RoutedLLM('generation', router).bind(max_tokens=300)
+
+        for _ in range(5):
+            tracked_invoke(generation_llm, MESSAGES, 'generation', store)
+
+        models = [record['model'] for record in store.session_records]
+        assert models == [BENCHMARK_MODEL] * 3 + [FAST_MODELS['openrouter']] * 2, models
+        slow = router.stats('generation', 'openrouter', BENCHMARK_MODEL)
+        assert slow.latency_p95 >= 0.3 and not slow.within_budget and not slow.degraded, slow
+        decision = router.choose('generation', record=False)
+        assert 'über Budget' in decision.reason, decision.reason
+        print(f"✅ {BENCHMARK_MODEL} (p95 {slow.latency_p95 * 1000:.0f} ms) über Budget, "
+              f"Verkehr zu {decision.model}")
+
+        # Andere Stufen haben eigene Latenzen und kein Budget
+        assert router.choose('extraction', record=False).reason == "bevorzugtes Modell"
+        print("✅ Budget gilt nur für die konfigurierte Stufe")
+
+
+def test_parse_config():
+    from src.model_router import parse_budget, parse_models
+
+    assert parse_budget('20') == {'*': 20.0}
+    assert parse_budget('extraction=5, generation=30') == {'extraction': 5.0, 'generation': 30.0}
+    assert parse_budget('') == {}
+    assert parse_models('openai:gpt-4o-mini,anthropic/claude-3-haiku', 'openrouter') == [
+        ('openai', 'gpt-4o-mini'), ('openrouter', 'anthropic/claude-3-haiku')]
+    print("✅ Budgets und Ausweichmodelle werden aus der Konfiguration gelesen")
+
+
+if __name__ == "__main__":
+    test_degraded_model()
+    test_latency_budget()
+    test_parse_config()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test für den Ausgabe-Sink und das Rendern im Speicher
+Gleichnamige Dokumente (gleiche Firma, gleicher Tag) dürfen sich auch bei parallelen
+Schreibern nicht überschreiben; PDF und DOCX lassen sich ohne Datei als Bytes rendern
+"""
+
+import os
+import sys
+import tempfile
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from src.output_sink import FileSink, write_atomic
+
+
+def test_collision_free_names():
+    """Zweiter Brief für dieselbe Firma erhält _2 statt die erste Datei zu ersetzen"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        first = write_atomic(tmp_dir, 'Motivationsschreiben_Muster_AG_191026.pdf', b'eins')
+        second = write_atomic(tmp_dir, 'Motivationsschreiben_Muster_AG_191026.pdf', b'zwei')
+        assert os.path.basename(second) == 'Motivationsschreiben_Muster_AG_191026_2.pdf', second
+        with open(first, 'rb') as f:
+            assert f.read() == b'eins'
+
+        replaced = write_atomic(tmp_dir, 'Motivationsschreiben_Muster_AG_191026.pdf', b'drei', overwrite=True)
+        assert replaced == first
+        with open(first, 'rb') as f:
+            assert f.read() == b'drei'
+        assert not [name for name in os.listdir(tmp_dir) if name.endswith('.tmp')], "Temporäre Dateien übrig"
+    print("✅ Gleichnamige Dateien werden nummeriert, overwrite ersetzt atomar")
+
+
+def test_concurrent_writers():
+    """32 parallele Schreiber auf denselben Namen erzeugen 32 vollständige Dateien"""
+    payloads = [str(index).encode() * 10000 for index in range(32)]
+    with tempfile.TemporaryDirectory() as tmp_dir, ThreadPoolExecutor(max_workers=8) as executor:
+        sink = FileSink(tmp_dir)
+        paths = list(executor.map(lambda data: sink.write('Motivationsschreiben_Muster_AG.docx', data), payloads))
+
+        assert len(set(paths)) == len(payloads), "Namenskollision zwischen parallelen Schreibern"
+        for path, data in zip(paths, payloads):
+            with open(path, 'rb') as f:
+                assert f.read() == data, f"Inhalt von {path} beschädigt"
+    print(f"✅ {len(paths)} parallele Schreiber, keine Kollision, keine halben Dateien")
+
+
+def test_render_to_stream():
+    """PDF und DOCX landen in einem BytesIO; create_pdf schreibt zweimal ohne Überschreiben"""
+    from src.models import MotivationLetter
+    from src.template_pdf_generator import TemplateBasedPDFGenerator
+    from src.docx_generator import DocxGenerator
+
+    letter = MotivationLetter(
+        sender_name="Max Muster", sender_address="Musterweg 1, 8000 Zürich",
+        sender_phone="+41 79 000 00 00", sender_email="max@example.com",
+        recipient_name="Sehr geehrte Damen und Herren", recipient_company="Muster AG",
+        recipient_company_address="Bahnhofstrasse 1, 8001 Zürich", recipient_address="",
+        subject="Bewerbung als Data Analyst",
+        content="Sehr geehrte Damen und Herren\n\nIch bewerbe mich hiermit.\n\nFreundliche Grüsse"
+    )
+    pdf_stream = BytesIO()
+    TemplateBasedPDFGenerator().render_pdf(letter, pdf_stream)
+    docx_bytes = DocxGenerator().render_docx_bytes(letter)
+    assert pdf_stream.getvalue().startswith(b'%PDF')
+    assert docx_bytes.startswith(b'PK')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        first = TemplateBasedPDFGenerator().create_pdf(letter, output_dir=tmp_dir)
+        second = TemplateBasedPDFGenerator().create_pdf(letter, output_dir=tmp_dir)
+        assert first != second and os.path.exists(first) and os.path.exists(second)
+    print(f"✅ Im Speicher gerendert: PDF {len(pdf_stream.getvalue())} Bytes, DOCX {len(docx_bytes)} Bytes")
+
+
+if __name__ == "__main__":
+    test_collision_free_names()
+    test_concurrent_writers()
+    test_render_to_stream()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test für die Absatz-Überarbeitung
+Ein einzelner Absatz wird gegen den LLM-Fake neu geschrieben und an derselben Stelle
+eingesetzt; der Aufruf braucht nur einen Bruchteil der Tokens und der Zeit einer
+vollständigen Generierung; Anrede und Schluss sind nicht wählbar und eine fehlgeschlagene
+Überarbeitung lässt den Brief unverändert, sodass die CLI ihn trotzdem rendert
+"""
+
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from benchmarks.fake_llm_server import FakeLLMServer, PARAGRAPH_RESPONSE
+from benchmarks.offline_http import OfflineHTTP
+from benchmarks.run_benchmarks import configure_offline
+
+JOB = {
+    'company': 'Muster AG', 'position': 'Python Entwickler', 'address': 'Bahnhofstrasse 1, 8001 Zürich',
+    'description': 'Entwicklung und Betrieb von Python-Services in einem agilen Team.',
+    'requirements': 'Python; Docker; CI/CD; Teamfähigkeit', 'location': 'Zürich', 'url': ''
+}
+
+
+def test_paragraph_revision():
+    print("=== Test: Absatz-Überarbeitung ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeLLMServer(latency_per_token=0.001) as llm, \
+            OfflineHTTP():
+        configure_offline(Path(tmp_dir), llm.base_url)
+
+        from src.ai_generator import AIGenerator, letter_paragraphs
+        from src.llm_metrics import metrics_store
+        from src.models import JobInfo
+
+        generator = AIGenerator()
+        job_info = JobInfo(**JOB)
+        letter = generator.generate_motivation_letter(job_info)
+        before = letter_paragraphs(letter.content)
+
+        revised = generator.regenerate_paragraph(letter, 1, job_info, "Mehr Kennzahlen")
+        after = letter_paragraphs(revised.content)
+        assert after[1] == PARAGRAPH_RESPONSE, after[1]
+        assert after[:1] + after[2:] == before[:1] + before[2:], "Andere Absätze dürfen sich nicht ändern"
+        assert letter_paragraphs(letter.content) == before, "Original-Brief darf nicht verändert werden"
+        assert (revised.subject, revised.sender_name) == (letter.subject, letter.sender_name)
+        print(f"✅ Absatz 1 ersetzt, {len(after) - 1} weitere Absätze unverändert")
+
+        records = {record['stage']: record for record in metrics_store.session_records}
+        generation, revision = records['generation'], records['revision']
+        input_ratio = revision['input_tokens'] / generation['input_tokens']
+        output_ratio = revision['output_tokens'] / generation['output_tokens']
+        assert input_ratio < 0.6 and output_ratio < 0.5, (input_ratio, output_ratio)
+        assert revision['latency'] < generation['latency']
+        print(f"✅ Tokens: Eingabe {revision['input_tokens']}/{generation['input_tokens']}, "
+              f"Ausgabe {revision['output_tokens']}/{generation['output_tokens']}, "
+              f"Latenz {revision['latency'] * 1000:.0f}/{generation['latency'] * 1000:.0f} ms")
+
+        try:
+            generator.regenerate_paragraph(letter, len(before), job_info)
+            raise AssertionError("ValueError erwartet")
+        except ValueError:
+            print("✅ Ungültiger Absatz-Index wird abgelehnt")
+
+
+def test_cli_revision_failure():
+    """Fehlgeschlagene Überarbeitung in der CLI: Brief bleibt erhalten und wird gerendert"""
+    print("\n=== Test: Fehlgeschlagene Überarbeitung in der CLI ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeLLMServer() as llm, OfflineHTTP():
+        configure_offline(Path(tmp_dir), llm.base_url)
+
+        from langchain_openai import ChatOpenAI
+        from app import render_documents, revise_paragraphs
+        from src.ai_generator import AIGenerator, FINAL_SENTENCE_PREFIX, letter_paragraphs, revisable_paragraphs
+        from src.llm_metrics import metrics_store
+        from src.models import JobInfo
+
+        generator = AIGenerator()
+        job_info = JobInfo(**JOB)
+        letter = generator.generate_motivation_letter(job_info)
+        # Wie beim echten Modell: Anrede vorne, fester Schlusssatz als letzter Absatz
+        letter.content = (f"Sehr geehrte Damen und Herren,\n\n{letter.content}\n\n"
+                          f"{FINAL_SENTENCE_PREFIX} und dabei gezielt auf Ihre Fragen einzugehen.")
+        paragraphs = letter_paragraphs(letter.content)
+        revisable = revisable_paragraphs(letter.content)
+        assert revisable == list(range(1, len(paragraphs) - 1)), revisable
+        calls = len(metrics_store.session_records)
+        try:
+            generator.regenerate_paragraph(letter, 0, job_info)
+            raise AssertionError("ValueError erwartet")
+        except ValueError:
+            pass
+        assert len(metrics_store.session_records) == calls, "Anrede darf nicht an das LLM gehen"
+        print(f"✅ Anrede und Schlusssatz nicht wählbar, {len(revisable)} Absätze überarbeitbar")
+
+        # Nicht erreichbares LLM: Absatz 1 wählen, Fehler anzeigen, dann mit Enter beenden
+        generator.llm = ChatOpenAI(api_key='benchmark', base_url='http://127.0.0.1:9/v1', model='broken',
+                                   max_retries=0, timeout=2)
+        stdin, sys.stdin = sys.stdin, io.StringIO("1\n\n\n")
+        try:
+            revised = revise_paragraphs(generator, letter, job_info)
+        finally:
+            sys.stdin = stdin
+        assert revised.content == letter.content, "Brief muss unverändert bleiben"
+
+        pdf_path, docx_path, _ = render_documents(revised, output_dir=tmp_dir)
+        assert os.path.getsize(pdf_path) > 0 and os.path.getsize(docx_path) > 0
+        print(f"✅ Fehlgeschlagene Überarbeitung: Brief bleibt erhalten und wird gerendert "
+              f"({os.path.basename(pdf_path)})")
+
+
+def test_clean_paragraph():
+    from src.ai_generator import AIGenerator
+
+    raw = '„Sehr geehrte Damen und Herren,\n\nErster Teil\nmit Umbruch.\n\nZweiter Teil.\n\nFreundliche Grüsse"'
+    assert AIGenerator._clean_paragraph(raw) == "Erster Teil mit Umbruch. Zweiter Teil.", AIGenerator._clean_paragraph(raw)
+    print("✅ Anrede, Grußformel und Anführungszeichen entfernt, ein Absatz")
+
+
+if __name__ == "__main__":
+    test_paragraph_revision()
+    test_cli_revision_failure()
+    test_clean_paragraph()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test für die Schrift- und Style-Registry
+Generatoren teilen ein unveränderliches Style-Set, die zweite Konstruktion kostet
+(fast) nichts, und eine vorhandene Aptos-Display-Schrift wird einmal registriert
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+from io import BytesIO
+
+import pdfplumber
+import reportlab
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from src.letter_layout import build_layout
+from src.pdf_generator import PDFGenerator
+from src.template_pdf_generator import TemplateBasedPDFGenerator
+from src.canvas_pdf_renderer import CanvasLetterRenderer, letter_blocks
+from src.pdf_styles import PREFERRED_FONT, bold_font, resolve_fonts, style_set
+from test_letter_layout import LETTER, PROJECT_URLS, LINKEDIN_URL
+
+
+def test_shared_styles():
+    first, second = PDFGenerator(), PDFGenerator()
+    assert first.styles is second.styles, "Style-Set sollte geteilt werden"
+    assert TemplateBasedPDFGenerator().styles is TemplateBasedPDFGenerator().styles
+    assert first.styles['Subject'].fontSize == 14 and TemplateBasedPDFGenerator().styles['Subject'].fontSize == 12
+
+    try:
+        first.styles['MainText'] = None
+        raise AssertionError("Style-Set sollte unveränderlich sein")
+    except TypeError:
+        pass
+
+    start = time.perf_counter()
+    for _ in range(100):
+        TemplateBasedPDFGenerator()
+    per_instance_ms = (time.perf_counter() - start) * 10
+    assert per_instance_ms < 1, f"Konstruktion zu teuer: {per_instance_ms:.3f} ms"
+    print(f"✅ Geteilte, unveränderliche Styles; Konstruktion {per_instance_ms:.3f} ms")
+
+
+def test_ttf_font_registration():
+    """Vera aus reportlab als Ersatz für Aptos Display"""
+    vera_dir = os.path.join(os.path.dirname(reportlab.__file__), 'fonts')
+    with tempfile.TemporaryDirectory() as font_dir:
+        shutil.copy(os.path.join(vera_dir, 'Vera.ttf'), os.path.join(font_dir, 'Aptos-Display.ttf'))
+        shutil.copy(os.path.join(vera_dir, 'VeraBd.ttf'), os.path.join(font_dir, 'Aptos-Display-Bold.ttf'))
+
+        assert resolve_fonts(font_dir) == (PREFERRED_FONT, f"{PREFERRED_FONT}-Bold")
+        assert resolve_fonts(font_dir) is resolve_fonts(font_dir), "Registrierung sollte gecacht sein"
+        assert bold_font(PREFERRED_FONT) == f"{PREFERRED_FONT}-Bold"
+
+        styles = style_set('standard', font_dir)
+        assert styles['MainText'].fontName == PREFERRED_FONT and styles['Subject'].fontName.endswith('-Bold')
+
+        layout = build_layout(LETTER, PROJECT_URLS, LINKEDIN_URL)
+        generator = PDFGenerator()
+        blocks = letter_blocks(LETTER, layout, generator._sender_lines(LETTER), generator._format_german_date())
+        buffer = BytesIO()
+        CanvasLetterRenderer(styles).render(blocks, buffer)
+        with pdfplumber.open(BytesIO(buffer.getvalue())) as pdf:
+            fonts = {char['fontname'].split('+')[-1] for char in pdf.pages[0].chars}
+            text = pdf.pages[0].extract_text()
+        assert any('Vera' in font for font in fonts), fonts
+        assert "Müller & Co AG" in text
+    print(f"✅ TTF-Schrift einmal registriert und eingebettet ({', '.join(sorted(fonts))})")
+
+
+def test_missing_font_falls_back_to_helvetica():
+    with tempfile.TemporaryDirectory() as font_dir:
+        assert resolve_fonts(font_dir) == ('Helvetica', 'Helvetica-Bold')
+    print("✅ Ohne Aptos Display wird Helvetica verwendet")
+
+
+if __name__ == "__main__":
+    test_shared_styles()
+    test_ttf_font_registration()
+    test_missing_font_falls_back_to_helvetica()
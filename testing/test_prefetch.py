@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test für das spekulative Vorladen
+Abruf, Duplikat-Prüfung und Extraktion laufen im Hintergrund, während der Benutzer noch
+Eingaben macht; danach ist das Ergebnis ohne Wartezeit verfügbar
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from benchmarks.fake_llm_server import FakeLLMServer
+from benchmarks.offline_http import OfflineHTTP, load_job_pages
+from benchmarks.run_benchmarks import configure_offline
+
+
+def test_prefetch():
+    print("=== Test: Spekulatives Vorladen ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeLLMServer(latency=0.3) as llm, OfflineHTTP():
+        configure_offline(Path(tmp_dir), llm.base_url)
+
+        from src.prefetch import JobPrefetcher
+        from src.duplicate_detector import DuplicateIndex
+        from src.job_extractor import JobExtractor
+
+        duplicate_index = DuplicateIndex(index_file=Path(tmp_dir) / 'duplicates.json')
+        prefetcher = JobPrefetcher(JobExtractor(), duplicate_index)
+        try:
+            prefetcher.warm_up().result(timeout=30)
+            print("✅ Vorwärmen abgeschlossen (LLM-Verbindung, Template, GitHub-Cache)")
+
+            url = next(iter(load_job_pages()))
+            prefetched = prefetcher.get(url)
+            assert prefetched.job_info is None and prefetched.duplicate is None, \
+                "Ohne prefetch() wird nur geladen, nicht extrahiert"
+
+            for url in load_job_pages():
+                # Benutzer bestätigt die persönlichen Angaben, während im Hintergrund geladen wird
+                future = prefetcher.prefetch(url)
+                assert prefetcher.prefetch(url) is future, "Zweiter Aufruf darf nicht erneut laden"
+                future.result(timeout=30)
+
+                start = time.perf_counter()
+                prefetched = prefetcher.get(url)
+                wait = time.perf_counter() - start
+                assert prefetched.job_info is not None and prefetched.duplicate is None
+                assert wait < 0.05, f"Ergebnis sollte bereits vorliegen ({wait:.3f}s)"
+                print(f"✅ {prefetched.job_info.company}: vorab geladen und extrahiert "
+                      f"({', '.join(f'{k} {v * 1000:.0f}ms' for k, v in prefetched.timings.items())}), "
+                      f"Wartezeit {wait * 1000:.1f} ms")
+
+                duplicate_index.add(url, prefetched.job_text, prefetched.job_info)
+
+            # Zweiter CLI-Lauf mit einer bereits verarbeiteten Stelle
+            second_run = JobPrefetcher(prefetcher.job_extractor, duplicate_index)
+            prefetched = second_run.prefetch(url).result(timeout=30)
+            second_run.shutdown()
+            assert prefetched.duplicate is not None and prefetched.job_info is None, \
+                "Bei Duplikaten wird nicht spekulativ extrahiert"
+            print(f"✅ Duplikat erkannt ({prefetched.duplicate.similarity:.0%}), keine spekulative Extraktion")
+        finally:
+            prefetcher.shutdown()
+
+
+if __name__ == "__main__":
+    test_prefetch()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test für die abschnittsweise Generierung
+Einleitung, Erfahrung und Motivation laufen gleichzeitig gegen den LLM-Fake; der
+zusammengesetzte Brief entspricht dem sequenziell generierten und die Wartezeit liegt
+nahe am längsten Abschnitt
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from benchmarks.fake_llm_server import FakeLLMServer
+from benchmarks.offline_http import OfflineHTTP
+from benchmarks.run_benchmarks import configure_offline
+from test_paragraph_revision import JOB
+
+
+def test_sectioned_generation():
+    print("=== Test: Abschnittsweise Generierung ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeLLMServer(latency_per_token=0.002) as llm, \
+            OfflineHTTP():
+        configure_offline(Path(tmp_dir), llm.base_url)
+
+        from src.ai_generator import AIGenerator, LETTER_SECTIONS, letter_paragraphs
+        from src.llm_metrics import metrics_store
+        from src.models import JobInfo
+
+        generator = AIGenerator()
+        job_info = JobInfo(**JOB)
+
+        start = time.perf_counter()
+        sequential = generator.generate_motivation_letter(job_info, sectioned=False)
+        sequential_time = time.perf_counter() - start
+
+        metrics_store.session_records.clear()
+        start = time.perf_counter()
+        sectioned = generator.generate_motivation_letter(job_info, sectioned=True)
+        sectioned_time = time.perf_counter() - start
+
+        paragraphs = letter_paragraphs(sectioned.content)
+        assert paragraphs[0] == "Sehr geehrte Damen und Herren,", paragraphs[0]
+        assert paragraphs[1:-1] == letter_paragraphs(sequential.content)[:-1], "Abschnitte in falscher Reihenfolge"
+        assert paragraphs[-1].startswith("Ich freue mich darauf"), paragraphs[-1]
+        print(f"✅ {len(paragraphs)} Absätze in fester Reihenfolge zusammengesetzt")
+
+        records = [record for record in metrics_store.session_records if record['stage'].startswith('generation')]
+        assert sorted(record['stage'] for record in records) == sorted(
+            f"generation:{name}" for name, *_ in LETTER_SECTIONS)
+        longest = max(record['latency'] for record in records)
+        assert sectioned_time < sequential_time, (sectioned_time, sequential_time)
+        assert sum(record['latency'] for record in records) > longest * 1.5
+        print(f"✅ Generierung {sectioned_time * 1000:.0f} ms statt {sequential_time * 1000:.0f} ms "
+              f"(längster Abschnitt {longest * 1000:.0f} ms)")
+
+
+def test_stitch_sections():
+    from src.ai_generator import AIGenerator
+
+    final_sentence = "Ich freue mich auf ein Gespräch."
+    sections = [
+        "Sehr geehrte Damen und Herren,\n\nEinleitung:\n\nIch bewerbe mich mit grossem Interesse auf diese Stelle.",
+        "Ich bewerbe mich mit grossem Interesse auf diese Stelle. Seit fünf Jahren betreue ich Kunden.",
+        f"„Mich reizt die Arbeit im Team.\n\n{final_sentence}\n\nFreundliche Grüsse“"
+    ]
+    content = AIGenerator._stitch_sections(sections, "Sehr geehrte Frau Meier,", final_sentence)
+    assert content.split('\n\n') == [
+        "Sehr geehrte Frau Meier,",
+        "Ich bewerbe mich mit grossem Interesse auf diese Stelle.",
+        "Seit fünf Jahren betreue ich Kunden.",
+        "Mich reizt die Arbeit im Team.",
+        final_sentence
+    ], content
+    print("✅ Konsistenzdurchlauf entfernt Anreden, Überschriften, Grußformeln und Wiederholungen")
+
+
+if __name__ == "__main__":
+    test_sectioned_generation()
+    test_stitch_sections()
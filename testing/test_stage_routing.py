@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test für die Modellwahl pro Stufe
+Extraktion, Projektauswahl und Anforderungen laufen auf dem schnellen Modell des Providers,
+das Schreiben auf dem Hauptmodell; konfigurierte Stufen-Modelle haben Vorrang und ohne
+verfügbaren Provider fällt jede Stufe auf das Hauptmodell zurück
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))  # Für root-level imports
+
+from benchmarks.fake_llm_server import FakeLLMServer
+from benchmarks.offline_http import OfflineHTTP, load_job_pages
+from benchmarks.run_benchmarks import configure_offline, BENCHMARK_MODEL
+
+
+def test_stage_routing():
+    print("=== Test: Modell pro Stufe ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, FakeLLMServer() as llm, OfflineHTTP():
+        configure_offline(Path(tmp_dir), llm.base_url)
+
+        from config.config import Config
+        from src.ai_generator import AIGenerator
+        from src.job_extractor import JobExtractor
+        from src.llm_metrics import metrics_store
+        from src.llm_utils import LLMFactory, FAST_MODELS
+
+        fast_model = FAST_MODELS['openrouter']
+        extractor = JobExtractor()
+        # Nicht jede Seite braucht das LLM (strukturierte Daten werden direkt übernommen)
+        for url in load_job_pages():
+            job_info = extractor.extract_from_url(url)
+        generator = AIGenerator()
+        generator.extract_key_requirements(job_info)
+        generator.generate_motivation_letter(job_info)
+
+        models = {record['stage']: record['model'] for record in metrics_store.session_records}
+        assert models['extraction'] == fast_model, models
+        assert models['project_selection'] == fast_model, models
+        assert models['requirements'] == fast_model, models
+        assert models['generation'] == BENCHMARK_MODEL, models
+        print(f"✅ Extraktion, Projektauswahl, Anforderungen: {fast_model}; Schreiben: {BENCHMARK_MODEL}")
+
+        Config.EXTRACTION_MODEL = 'benchmark/custom-extractor'
+        try:
+            assert LLMFactory.resolve_stage_model('extraction') == ('openrouter', 'benchmark/custom-extractor')
+            assert LLMFactory.resolve_stage_model('project_selection')[1] == fast_model
+            print("✅ Konfiguriertes Stufen-Modell hat Vorrang")
+
+            api_key, Config.OPENROUTER_API_KEY = Config.OPENROUTER_API_KEY, None
+            try:
+                for stage in ('extraction', 'project_selection', 'requirements', 'generation'):
+                    assert LLMFactory.resolve_stage_model(stage)[1] == BENCHMARK_MODEL, stage
+            finally:
+                Config.OPENROUTER_API_KEY = api_key
+            print("✅ Ohne verfügbaren Provider nutzen alle Stufen das Hauptmodell")
+        finally:
+            Config.EXTRACTION_MODEL = ''
+
+
+if __name__ == "__main__":
+    test_stage_routing()